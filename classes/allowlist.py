@@ -0,0 +1,211 @@
+"""
+# Allowlist
+
+Sets of Discord user IDs that opted in to a feature, kept in memory.
+
+Each allowlist is persisted as an append log, one `+<id>` or `-<id>` line per
+change, replayed on load and compacted once it grows past twice the live
+entries. Membership checks never touch the disk.
+"""
+
+import os
+from collections.abc import Iterator
+from threading import Lock
+
+AUTOEMBED_ALLOWLIST_PATH = "database/allowlist_autoembed.log"
+"""Path of the autoembed allowlist log"""
+AUTOEMBED_LEGACY_DIR = "database/allowlist_autoembed"
+"""Folder of per-user marker files the autoembed allowlist used before"""
+COMPACT_MIN_LINES = 1024
+"""Log lines below which the log is never compacted"""
+
+
+class Allowlist:
+    """Set of user IDs persisted as an append log"""
+
+    def __init__(self, path: str, legacy_dir: str | None = None):
+        """
+        Initialize the allowlist, without loading it
+
+        Args:
+            path (str): Path of the log
+            legacy_dir (str | None, optional): Folder of per-user marker files to migrate from. Defaults to None.
+        """
+        self.path = path
+        self.legacy_dir = legacy_dir
+        self._ids: set[int] = set()
+        self._lines = 0
+        self._loaded = False
+        self._lock = Lock()
+
+    def __contains__(self, user_id: object) -> bool:
+        if not self._loaded:
+            self.load()
+        try:
+            return int(user_id) in self._ids  # type: ignore[call-overload]
+        except (TypeError, ValueError):
+            return False
+
+    def __len__(self) -> int:
+        if not self._loaded:
+            self.load()
+        return len(self._ids)
+
+    def __iter__(self) -> Iterator[int]:
+        if not self._loaded:
+            self.load()
+        return iter(set(self._ids))
+
+    def load(self) -> "Allowlist":
+        """
+        Read the log, migrating legacy marker files into it first
+
+        Returns:
+            Allowlist: The allowlist itself
+        """
+        with self._lock:
+            if self._loaded:
+                return self
+            ids: set[int] = set()
+            lines = 0
+            try:
+                with open(self.path, "r", encoding="utf-8") as file:
+                    for line in file:
+                        lines += 1
+                        op, user_id = line[:1], line[1:].strip()
+                        if not user_id.isdigit():
+                            continue
+                        if op == "+":
+                            ids.add(int(user_id))
+                        elif op == "-":
+                            ids.discard(int(user_id))
+            except FileNotFoundError:
+                pass
+            self._ids, self._lines = ids, lines
+            migrated = self._migrate_legacy()
+            if migrated or lines >= max(COMPACT_MIN_LINES, 2 * len(ids)):
+                self._compact()
+            if migrated:
+                self._remove_legacy(migrated)
+            self._loaded = True
+        return self
+
+    def _migrate_legacy(self) -> list[str]:
+        """Add IDs of legacy marker files, returning the files to remove"""
+        if not self.legacy_dir or not os.path.isdir(self.legacy_dir):
+            return []
+        migrated: list[str] = []
+        for name in os.listdir(self.legacy_dir):
+            if name.isdigit():
+                self._ids.add(int(name))
+                migrated.append(name)
+        return migrated
+
+    def _remove_legacy(self, migrated: list[str]) -> None:
+        """Remove migrated marker files, and their folder once empty"""
+        for name in migrated:
+            try:
+                os.remove(os.path.join(self.legacy_dir, name))  # type: ignore[arg-type]
+            except OSError:
+                pass
+        try:
+            os.rmdir(self.legacy_dir)  # type: ignore[arg-type]
+        except OSError:
+            pass
+
+    def _compact(self) -> None:
+        """Rewrite the log with one line per member, caller must hold the lock"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            file.writelines(f"+{user_id}\n" for user_id in sorted(self._ids))
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, self.path)
+        self._lines = len(self._ids)
+
+    def _append(self, op: str, user_id: int) -> None:
+        """Log a change, caller must hold the lock"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.write(f"{op}{user_id}\n")
+        self._lines += 1
+        if self._lines >= max(COMPACT_MIN_LINES, 2 * len(self._ids)):
+            self._compact()
+
+    def add(self, user_id: int) -> bool:
+        """
+        Add a user
+
+        Args:
+            user_id (int): Discord user ID
+
+        Returns:
+            bool: True if the user was not listed yet
+        """
+        if not self._loaded:
+            self.load()
+        user_id = int(user_id)
+        with self._lock:
+            if user_id in self._ids:
+                return False
+            # update first, so a compaction triggered by the append keeps it
+            self._ids.add(user_id)
+            try:
+                self._append("+", user_id)
+            except OSError:
+                self._ids.discard(user_id)
+                raise
+        return True
+
+    def discard(self, user_id: int) -> bool:
+        """
+        Remove a user
+
+        Args:
+            user_id (int): Discord user ID
+
+        Returns:
+            bool: True if the user was listed
+        """
+        if not self._loaded:
+            self.load()
+        user_id = int(user_id)
+        with self._lock:
+            if user_id not in self._ids:
+                return False
+            self._ids.discard(user_id)
+            try:
+                self._append("-", user_id)
+            except OSError:
+                self._ids.add(user_id)
+                raise
+        return True
+
+
+autoembed_allowlist = Allowlist(AUTOEMBED_ALLOWLIST_PATH, AUTOEMBED_LEGACY_DIR)
+"""Users who enabled autoembed"""
+
+
+def get_autoembed_allowlist() -> Allowlist:
+    """
+    Get the autoembed allowlist, loading it on first use
+
+    Returns:
+        Allowlist: The loaded allowlist
+    """
+    return autoembed_allowlist.load()
+
+
+__all__ = [
+    "AUTOEMBED_ALLOWLIST_PATH",
+    "AUTOEMBED_LEGACY_DIR",
+    "COMPACT_MIN_LINES",
+    "Allowlist",
+    "autoembed_allowlist",
+    "get_autoembed_allowlist",
+]
@@ -1,21 +1,22 @@
 """AniList Asynchronous API Wrapper"""
 
+from collections.abc import Iterable
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from enum import Enum
 from typing import Any, Literal
 
 from aiohttp import ClientSession
-from dacite import Config, from_dict
 
 from classes.cache import Caching
+from classes.decoder import DecoderRegistry
 from classes.excepts import ProviderHttpError, ProviderTypeError
 from modules.const import ANILIST_ACCESS_TOKEN, ANILIST_OAUTH_EXPIRY, USER_AGENT
 
 Cache = Caching(cache_directory="cache/anilist", cache_expiration_time=86400)
 
 
-@dataclass
+@dataclass(slots=True)
 class AniListTitleStruct:
     """AniList title dataclass"""
 
@@ -27,7 +28,7 @@ class AniListTitleStruct:
     """Native title"""
 
 
-@dataclass
+@dataclass(slots=True)
 class AniListDateStruct:
     """AniList date dataclass"""
 
@@ -39,7 +40,7 @@ class AniListDateStruct:
     """Day"""
 
 
-@dataclass
+@dataclass(slots=True)
 class AniListImageStruct:
     """AniList image dataclass"""
 
@@ -54,7 +55,7 @@ class AniListImageStruct:
     """Average HEX ("#RRGGBB") color of the image"""
 
 
-@dataclass
+@dataclass(slots=True)
 class AniListTagsStruct:
     """AniList tags dataclass"""
 
@@ -71,7 +72,7 @@ class AniListTagsStruct:
     """Whether the tag is only for adult 18+ media"""
 
 
-@dataclass
+@dataclass(slots=True)
 class AniListTrailerStruct:
     """AniList trailer dataclass"""
 
@@ -82,7 +83,7 @@ class AniListTrailerStruct:
     """Trailer site, commonly "youtube" or "dailymotion"."""
 
 
-@dataclass
+@dataclass(slots=True)
 class AniListMediaStruct:
     """AniList media dataclass"""
 
@@ -161,7 +162,7 @@ class AniListMediaStruct:
     """Anime episode duration in minutes"""
 
 
-@dataclass
+@dataclass(slots=True)
 class AniListStatusBase:
     """Base AniList status dataclass"""
 
@@ -174,7 +175,7 @@ class AniListStatusBase:
     """Status count"""
 
 
-@dataclass
+@dataclass(slots=True)
 class AniListStatisticBase:
     """Base AniList statistic dataclass"""
 
@@ -187,7 +188,7 @@ class AniListStatisticBase:
     """Statistic statuses"""
 
 
-@dataclass
+@dataclass(slots=True)
 class AniListAnimeStatistic(AniListStatisticBase):
     """AniList anime statistic dataclass"""
 
@@ -199,7 +200,7 @@ class AniListAnimeStatistic(AniListStatisticBase):
     """Episodes watched"""
 
 
-@dataclass
+@dataclass(slots=True)
 class AniListMangaStatistic(AniListStatisticBase):
     """AniList manga statistic dataclass"""
 
@@ -211,7 +212,7 @@ class AniListMangaStatistic(AniListStatisticBase):
     """Volumes read"""
 
 
-@dataclass
+@dataclass(slots=True)
 class AniListUserStatisticStruct:
     """AniList user statistic dataclass"""
 
@@ -221,14 +222,14 @@ class AniListUserStatisticStruct:
     """Manga statistic object"""
 
 
-@dataclass
+@dataclass(slots=True)
 class AniListUserMediaNode:
     """AniList user media node dataclass"""
 
     nodes: list[AniListMediaStruct] | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class AniListUserFavoriteStruct:
     """AniList user favorite dataclass"""
 
@@ -244,7 +245,7 @@ class AniListUserFavoriteStruct:
     """Studio favorites"""
 
 
-@dataclass
+@dataclass(slots=True)
 class AniListUserStruct:
     """AniList user dataclass"""
 
@@ -279,6 +280,213 @@ class AniListUserStruct:
     favourites: AniListUserFavoriteStruct | None = None
 
 
+decoders = DecoderRegistry(
+    type_hooks={datetime: lambda value: datetime.fromtimestamp(value, timezone.utc)}
+)
+"""Compiled decoders of AniList structs"""
+
+decode_media = decoders.register(AniListMediaStruct)
+# favourites carry whole media nodes, but are only read by the profile embed
+decode_user = decoders.register(AniListUserStruct, lazy=["favourites"])
+
+
+_MEDIA_FRAGMENT = """fragment media on Media {
+    id
+    idMal
+    title {
+        romaji
+        english
+        native
+    }
+    isAdult
+    description(asHtml: false)
+    synonyms
+    format
+    startDate {
+        year
+        month
+        day
+    }
+    endDate {
+        year
+        month
+        day
+    }
+    status
+    episodes
+    duration
+    chapters
+    volumes
+    coverImage {
+        extraLarge
+        large
+        color
+    }
+    bannerImage
+    genres
+    tags {
+        id
+        name
+        isMediaSpoiler
+        isAdult
+    }
+    averageScore
+    meanScore
+    stats {
+        scoreDistribution {
+            score
+            amount
+        }
+    }
+    siteUrl
+    trailer {
+        id
+        site
+    }
+}"""
+
+QUERIES: dict[str, str] = {
+    "nsfw": """query ($id: Int, $type: MediaType) {
+    Media(id: $id, type: $type) {
+        id
+        isAdult
+    }
+}""",
+    "media": """query ($id: Int, $type: MediaType) {
+    Media(id: $id, type: $type) {
+        ...media
+    }
+}
+"""
+    + _MEDIA_FRAGMENT,
+    "media_by_mal": """query ($id: Int, $type: MediaType) {
+    Media(idMal: $id, type: $type) {
+        ...media
+    }
+}
+"""
+    + _MEDIA_FRAGMENT,
+    "media_batch": """query ($ids: [Int], $type: MediaType, $perPage: Int) {
+    Page(perPage: $perPage) {
+        media(id_in: $ids, type: $type) {
+            ...media
+        }
+    }
+}
+"""
+    + _MEDIA_FRAGMENT,
+    "hot_media": """query ($type: MediaType, $sort: [MediaSort], $season: MediaSeason, $seasonYear: Int, $perPage: Int) {
+    Page(perPage: $perPage) {
+        media(type: $type, sort: $sort, season: $season, seasonYear: $seasonYear) {
+            ...media
+        }
+    }
+}
+"""
+    + _MEDIA_FRAGMENT,
+    "user_id": """query ($name: String) {
+    User(name: $name) {
+        id
+        name
+    }
+}""",
+    "user_id_by_id": """query ($id: Int) {
+    User(id: $id) {
+        id
+        name
+    }
+}""",
+    "user": """query ($name: String) {
+    User(name: $name) {
+        id
+        name
+        about
+        avatar {
+            large
+            medium
+        }
+        bannerImage
+        statistics {
+            anime {
+                count
+                meanScore
+                minutesWatched
+                episodesWatched
+                statuses {
+                    count
+                    status
+                }
+            }
+            manga {
+                count
+                meanScore
+                chaptersRead
+                volumesRead
+                statuses {
+                    count
+                    status
+                }
+            }
+        }
+        favourites {
+            anime(perPage: 5) {
+                nodes {
+                    id
+                    title {
+                        romaji
+                        english
+                        native
+                    }
+                    siteUrl
+                }
+            }
+            manga(perPage: 5) {
+                nodes {
+                    id
+                    title {
+                        romaji
+                        english
+                        native
+                    }
+                    siteUrl
+                }
+            }
+        }
+        siteUrl
+        donatorTier
+        donatorBadge
+        createdAt
+        moderatorRoles
+    }
+}""",
+    "search": """query ($search: String, $mediaType: MediaType, $limit: Int) {
+    Page(page: 1, perPage: $limit) {
+        results: media(search: $search, type: $mediaType) {
+            id
+            idMal
+            title {
+                romaji
+                english
+                native
+            }
+            format
+            isAdult
+            startDate {
+                year
+            }
+            season
+            status
+        }
+    }
+}""",
+}
+"""Static query documents sent with variables, keyed by name. Documents never
+change between calls, so AniList and proxies in between can cache them"""
+
+BATCH_SIZE = 50
+"""Maximum media per page, and so per batched request"""
+
+
 class AniList:
     """AniList Asynchronous API Wrapper"""
 
@@ -318,6 +526,48 @@ class AniList:
         ANIME = "ANIME"
         MANGA = "MANGA"
 
+    async def _post(self, query: str, variables: dict[str, Any]) -> dict[str, Any]:
+        """
+        Send a registered query document with its variables
+
+        Args:
+            query (str): Name of the query in `QUERIES`
+            variables (dict[str, Any]): Query variables
+
+        Raises:
+            ProviderHttpError: Raised when the HTTP request fails, or AniList returns errors
+
+        Returns:
+            dict[str, Any]: The `data` object of the response
+        """
+        async with self.session.post(
+            self.base_url, json={"query": QUERIES[query], "variables": variables}
+        ) as response:
+            try:
+                data: dict[str, Any] = await response.json()
+            except Exception as err:
+                raise ProviderHttpError(str(err), response.status) from err
+            errors: list[dict[str, Any]] | None = data.get("errors", None)
+            if errors:
+                err_strings: str = "\n".join(
+                    [
+                        f"- [{err['status']}] {err['message']}{' Hint:' + err['hint'] if err.get('hint', None) else ''}"
+                        for err in errors
+                    ]
+                )
+                raise ProviderHttpError(err_strings, response.status)
+            return data["data"]
+
+    @staticmethod
+    def _clean_media(media_data: dict[str, Any]) -> dict[str, Any]:
+        """Handle None scoreDistribution by converting to empty list"""
+        if (
+            media_data.get("stats")
+            and media_data["stats"].get("scoreDistribution") is None
+        ):
+            media_data["stats"]["scoreDistribution"] = []
+        return media_data
+
     async def nsfw_check(
         self,
         media_id: int,
@@ -347,29 +597,9 @@ class AniList:
         )
         if cached_data is not None:
             return cached_data
-        query = f"""query {{
-    Media(id: {media_id}, type: {media}) {{
-        id
-        isAdult
-    }}
-}}"""
-        async with self.session.post(self.base_url, json={"query": query}) as response:
-            try:
-                data: dict[str, Any] = await response.json()
-            # pylint: disable-next=broad-except
-            except Exception as err:
-                raise ProviderHttpError(str(err), response.status) from err
-            errors: list[dict[str, Any]] | None = data.get("errors", None)
-            if errors:
-                err_strings: str = "\n".join(
-                    [
-                        f"- [{err['status']}] {err['message']}{' Hint:' + err['hint'] if err.get('hint', None) else ''}"
-                        for err in errors
-                    ]
-                )
-                raise ProviderHttpError(err_strings, response.status)
-            Cache.write_data_to_cache(data["data"]["Media"]["isAdult"], cache_file_path)
-            return data["data"]["Media"]["isAdult"]
+        data = await self._post("nsfw", {"id": media_id, "type": media})
+        Cache.write_data_to_cache(data["Media"]["isAdult"], cache_file_path)
+        return data["Media"]["isAdult"]
 
     async def anime(self, media_id: int) -> AniListMediaStruct:
         """
@@ -387,79 +617,11 @@ class AniList:
         cache_file_path = Cache.get_cache_file_path(f"anime/{media_id}.json")
         cached_data = Cache.read_cached_data(cache_file_path)
         if cached_data is not None:
-            # return self._media_dict_to_dataclass(cached_data)
-            return from_dict(AniListMediaStruct, cached_data)
-        gqlquery = f"""query {{
-    Media(id: {media_id}, type: ANIME) {{
-        id
-        idMal
-        title {{
-            romaji
-            english
-            native
-        }}
-        isAdult
-        description(asHtml: false)
-        synonyms
-        format
-        startDate {{
-            year
-            month
-            day
-        }}
-        endDate {{
-            year
-            month
-            day
-        }}
-        status
-        episodes
-        duration
-        coverImage {{
-            large
-            extraLarge
-            color
-        }}
-        bannerImage
-        genres
-        tags {{
-            id
-            name
-            isMediaSpoiler
-            isAdult
-        }}
-        averageScore
-        meanScore
-        stats {{
-            scoreDistribution {{
-                score
-                amount
-            }}
-        }}
-        trailer {{
-            id
-            site
-        }}
-    }}
-}}"""
-        async with self.session.post(
-            self.base_url, json={"query": gqlquery}
-        ) as response:
-            try:
-                data: dict[str, Any] = await response.json()
-            except Exception as err:
-                raise ProviderHttpError(str(err), response.status) from err
-            errors: list[dict[str, Any]] | None = data.get("errors", None)
-            if errors:
-                err_strings: str = "\n".join(
-                    [
-                        f"- [{err['status']}] {err['message']}{' Hint:' + err['hint'] if err.get('hint', None) else ''}"
-                        for err in errors
-                    ]
-                )
-                raise ProviderHttpError(err_strings, response.status)
-            Cache.write_data_to_cache(data["data"]["Media"], cache_file_path)
-            return from_dict(AniListMediaStruct, data["data"]["Media"])
+            return decode_media(cached_data)
+        data = await self._post("media", {"id": media_id, "type": "ANIME"})
+        media_data = self._clean_media(data["Media"])
+        Cache.write_data_to_cache(media_data, cache_file_path)
+        return decode_media(media_data)
 
     async def manga(self, media_id: int, from_mal: bool = False) -> AniListMediaStruct:
         """
@@ -475,89 +637,116 @@ class AniList:
         cache_file_path = Cache.get_cache_file_path(f"manga/{media_id}.json")
         cached_data = Cache.read_cached_data(cache_file_path)
         if cached_data is not None:
-            return from_dict(AniListMediaStruct, cached_data)
-        gqlquery = f"""query {{
-    Media(id: {media_id}, type: MANGA) {{
-        id
-        idMal
-        title {{
-            romaji
-            english
-            native
-        }}
-        isAdult
-        description(asHtml: false)
-        synonyms
-        format
-        startDate {{
-            year
-            month
-            day
-        }}
-        endDate {{
-            year
-            month
-            day
-        }}
-        status
-        chapters
-        volumes
-        coverImage {{
-            extraLarge
-            large
-            color
-        }}
-        bannerImage
-        genres
-        tags {{
-            id
-            name
-            isMediaSpoiler
-            isAdult
-        }}
-        averageScore
-        meanScore
-        stats {{
-            scoreDistribution {{
-                score
-                amount
-            }}
-        }}
-        siteUrl
-        trailer {{
-            id
-            site
-        }}
-    }}
-}}"""
-        if from_mal:
-            # replace Media(id: to Media(idMal:
-            gqlquery = gqlquery.replace("Media(id:", "Media(idMal:")
-        async with self.session.post(
-            self.base_url, json={"query": gqlquery}
-        ) as response:
-            try:
-                data: dict[str, Any] = await response.json()
-            except Exception as err:
-                raise ProviderHttpError(str(err), response.status) from err
-            errors: list[dict[str, Any]] | None = data.get("errors", None)
-            if errors:
-                err_strings: str = "\n".join(
-                    [
-                        f"- [{err['status']}] {err['message']}{' Hint:' + err['hint'] if err.get('hint', None) else ''}"
-                        for err in errors
-                    ]
+            return decode_media(cached_data)
+        data = await self._post(
+            "media_by_mal" if from_mal else "media",
+            {"id": media_id, "type": "MANGA"},
+        )
+        media_data = self._clean_media(data["Media"])
+        Cache.write_data_to_cache(media_data, cache_file_path)
+        return decode_media(media_data)
+
+    async def media_batch(
+        self,
+        media_ids: Iterable[int],
+        media_type: Literal["ANIME", "MANGA"] | MediaType = MediaType.ANIME,
+        max_age: float | None = None,
+    ) -> dict[int, AniListMediaStruct]:
+        """
+        Get information of many media by their IDs, in as few requests as possible
+
+        Cached media are read from the cache, the rest is fetched in pages of
+        `BATCH_SIZE` media per request, and cached for `anime()`/`manga()`.
+
+        Args:
+            media_ids (Iterable[int]): The AniList IDs of the media
+            media_type (Literal['ANIME', 'MANGA'] | MediaType, optional): The type of the media. Defaults to MediaType.ANIME.
+            max_age (float | None, optional): Seconds after which cached media are fetched again. Defaults to None, the cache expiration time.
+
+        Raises:
+            ProviderHttpError: Raised when the HTTP request fails
+
+        Returns:
+            dict[int, AniListMediaStruct]: The media information by ID, IDs not found on AniList are left out
+        """
+        if isinstance(media_type, self.MediaType):
+            media_type = media_type.value
+        folder = media_type.lower()
+        found: dict[int, AniListMediaStruct] = {}
+        missing: list[int] = []
+        for media_id in dict.fromkeys(media_ids):
+            cached_data = Cache.read_cached_data(
+                Cache.get_cache_file_path(f"{folder}/{media_id}.json"), max_age
+            )
+            if cached_data is not None:
+                found[media_id] = decode_media(cached_data)
+            else:
+                missing.append(media_id)
+        for start in range(0, len(missing), BATCH_SIZE):
+            data = await self._post(
+                "media_batch",
+                {
+                    "ids": missing[start : start + BATCH_SIZE],
+                    "type": media_type,
+                    "perPage": BATCH_SIZE,
+                },
+            )
+            for media_data in data["Page"]["media"]:
+                media_data = self._clean_media(media_data)
+                Cache.write_data_to_cache(
+                    media_data,
+                    Cache.get_cache_file_path(f"{folder}/{media_data['id']}.json"),
                 )
-                raise ProviderHttpError(err_strings, response.status)
-            media_data = data["data"]["Media"]
-            # Handle None scoreDistribution by converting to empty list
-            if (
-                media_data.get("stats")
-                and media_data["stats"].get("scoreDistribution") is None
-            ):
-                media_data["stats"]["scoreDistribution"] = []
-            Cache.write_data_to_cache(media_data, cache_file_path)
-            return from_dict(AniListMediaStruct, media_data)
+                found[media_data["id"]] = decode_media(media_data)
+        return found
+
+    async def hot_media(
+        self,
+        media_type: Literal["ANIME", "MANGA"] | MediaType = MediaType.ANIME,
+        sort: str = "TRENDING_DESC",
+        season: Literal["WINTER", "SPRING", "SUMMER", "FALL"] | None = None,
+        season_year: int | None = None,
+        per_page: int = BATCH_SIZE,
+    ) -> list[AniListMediaStruct]:
+        """
+        Get a page of trending or seasonal media, and cache every entry
+
+        Args:
+            media_type (Literal['ANIME', 'MANGA'] | MediaType, optional): The type of the media. Defaults to MediaType.ANIME.
+            sort (str, optional): AniList MediaSort value. Defaults to "TRENDING_DESC".
+            season (Literal['WINTER', 'SPRING', 'SUMMER', 'FALL'] | None, optional): Only list media of this season. Defaults to None.
+            season_year (int | None, optional): Year of the season. Defaults to None.
+            per_page (int, optional): Number of media, up to BATCH_SIZE. Defaults to BATCH_SIZE.
+
+        Raises:
+            ProviderHttpError: Raised when the HTTP request fails
+
+        Returns:
+            list[AniListMediaStruct]: The media, in the requested order
+        """
+        if isinstance(media_type, self.MediaType):
+            media_type = media_type.value
+        variables: dict[str, Any] = {
+            "type": media_type,
+            "sort": [sort],
+            "perPage": min(per_page, BATCH_SIZE),
+        }
+        # unset variables leave their filter out of the query
+        if season is not None:
+            variables["season"] = season
+            variables["seasonYear"] = season_year
+        data = await self._post("hot_media", variables)
+        media: list[AniListMediaStruct] = []
+        for media_data in data["Page"]["media"]:
+            media_data = self._clean_media(media_data)
+            Cache.write_data_to_cache(
+                media_data,
+                Cache.get_cache_file_path(
+                    f"{media_type.lower()}/{media_data['id']}.json"
+                ),
+            )
+            media.append(decode_media(media_data))
+        return media
 
     async def user_by_id(
         self, user_id: int, return_as_is: bool = False
@@ -575,37 +764,10 @@ class AniList:
         Returns:
             AniListUserStruct: The user information
         """
-        config = Config(
-            type_hooks={
-                datetime: lambda value: datetime.fromtimestamp(value, timezone.utc)
-            }
-        )
-        gqlquery = f"""query {{
-    User (id: {user_id}) {{
-        id
-        name
-    }}
-}}"""
-        async with self.session.post(
-            self.base_url, json={"query": gqlquery}
-        ) as response:
-            try:
-                response.raise_for_status()
-                data: dict[str, Any] = await response.json()
-            except Exception as err:
-                raise ProviderHttpError(str(err), response.status) from err
-            errors: list[dict[str, Any]] | None = data.get("errors", None)
-            if errors:
-                err_strings: str = "\n".join(
-                    [
-                        f"- [{err['status']}] {err['message']}{' Hint:' + err['hint'] if err.get('hint', None) else ''}"
-                        for err in errors
-                    ]
-                )
-                raise ProviderHttpError(err_strings, response.status)
-            user_data = data["data"]["User"]
+        data = await self._post("user_id_by_id", {"id": user_id})
+        user_data = data["User"]
         if return_as_is:
-            return from_dict(AniListUserStruct, user_data, config=config)
+            return decode_user(user_data)
         return await self.user(user_data["name"])
 
     async def user(self, username: str, return_id: bool = False) -> AniListUserStruct:
@@ -624,104 +786,13 @@ class AniList:
         """
         cache_file_path = Cache.get_cache_file_path(f"user/{username}.json")
         cached_data = Cache.read_cached_data(cache_file_path, 43200)
-        config = Config(
-            type_hooks={
-                datetime: lambda value: datetime.fromtimestamp(value, timezone.utc)
-            }
-        )
         if cached_data is not None and not return_id:
-            return from_dict(AniListUserStruct, cached_data, config=config)
-        if return_id:
-            gqlquery = f"""query {{
-    User(name: "{username}") {{
-        id
-        name
-    }}
-}}"""
-        else:
-            gqlquery = f"""query {{
-    User(name: "{username}") {{
-        id
-        name
-        about
-        avatar {{
-            large
-            medium
-        }}
-        bannerImage
-        statistics {{
-            anime {{
-                count
-                meanScore
-                minutesWatched
-                episodesWatched
-                statuses{{
-                    count
-                    status
-                }}
-            }}
-            manga {{
-                count
-                meanScore
-                chaptersRead
-                volumesRead
-                statuses{{
-                    count
-                    status
-                }}
-            }}
-        }}
-        favourites {{
-            anime(perPage:5){{
-                nodes {{
-                    id
-                    title {{
-                        romaji
-                        english
-                        native
-                    }}
-                    siteUrl
-                }}
-            }}
-            manga(perPage:5){{
-                nodes {{
-                    id
-                    title {{
-                        romaji
-                        english
-                        native
-                    }}
-                    siteUrl
-                }}
-            }}
-        }}
-        siteUrl
-        donatorTier
-        donatorBadge
-        createdAt
-        moderatorRoles
-    }}
-}}"""
-        async with self.session.post(
-            self.base_url, json={"query": gqlquery}
-        ) as response:
-            try:
-                data: dict[str, Any] = await response.json()
-            except Exception as err:
-                raise ProviderHttpError(str(err), response.status) from err
-            errors: list[dict[str, Any]] | None = data.get("errors", None)
-            if errors:
-                err_strings: str = "\n".join(
-                    [
-                        f"- [{err['status']}] {err['message']}{' Hint:' + err['hint'] if err.get('hint', None) else ''}"
-                        for err in errors
-                    ]
-                )
-                raise ProviderHttpError(err_strings, response.status)
-            user_data = data["data"]["User"]
-            if not return_id:
-                Cache.write_data_to_cache(user_data, cache_file_path)
-            return from_dict(AniListUserStruct, user_data, config=config)
+            return decode_user(cached_data)
+        data = await self._post("user_id" if return_id else "user", {"name": username})
+        user_data = data["User"]
+        if not return_id:
+            Cache.write_data_to_cache(user_data, cache_file_path)
+        return decode_user(user_data)
 
     async def random_media(
         self,
@@ -834,48 +905,13 @@ class AniList:
             raise ProviderTypeError("limit must be less than or equal to 10", "int")
         if isinstance(media_type, self.MediaType):
             media_type = media_type.value
-        gqlquery = """query ($search: String, $mediaType: MediaType, $limit: Int) {
-    Page(page: 1, perPage: $limit) {
-        results: media(search: $search, type: $mediaType) {
-            id
-            idMal
-            title {
-                romaji
-                english
-                native
-            }
-            format
-            isAdult
-            startDate {
-                year
-            }
-            season
-            status
-        }
-    }
-}"""
         variables = {
             "search": query,
             "mediaType": media_type,
             "limit": limit,
         }
-        async with self.session.post(
-            self.base_url, json={"query": gqlquery, "variables": variables}
-        ) as response:
-            try:
-                data: dict[str, Any] = await response.json()
-            except Exception as err:
-                raise ProviderHttpError(str(err), response.status) from err
-            errors: list[dict[str, Any]] | None = data.get("errors", None)
-            if errors:
-                err_strings: str = "\n".join(
-                    [
-                        f"- [{err['status']}] {err['message']}{' Hint:' + err['hint'] if err.get('hint', None) else ''}"
-                        for err in errors
-                    ]
-                )
-                raise ProviderHttpError(err_strings, response.status)
-            return data["data"]["Page"]["results"]
+        data = await self._post("search", variables)
+        return data["Page"]["results"]
 
 
-__all__ = ["AniList"]
+__all__ = ["BATCH_SIZE", "QUERIES", "AniList"]
@@ -1,11 +1,16 @@
+import csv
+from collections.abc import Callable
+from dataclasses import fields
 from datetime import datetime as dt
-from typing import Literal
+from threading import Lock
+from typing import Any, Literal, get_args
 
 from animeapi import AsyncAnimeAPI, Platform
 from animeapi.models import AnimeRelation, TmdbMediaType, TraktMediaType
 
 from classes.excepts import ProviderHttpError
 from modules.commons import save_traceback_to_file
+from modules.oobe.malIndexer import FILE_PATH as ANIMEAPI_DUMP_PATH
 
 
 class _SystemUser:
@@ -14,12 +19,261 @@ class _SystemUser:
     id = 0
 
 
+def _to_bool(value: str) -> bool:
+    """Parse a boolean cell from AnimeAPI dump"""
+    return value.strip().lower() in ("true", "1", "yes")
+
+
+def _to_int(value: str) -> int:
+    """Parse an integer cell from AnimeAPI dump, tolerating float notation"""
+    try:
+        return int(value)
+    except ValueError:
+        return int(float(value))
+
+
+def _column_parser(field_type: Any) -> Callable[[str], Any]:
+    """
+    Pick the parser for an AnimeRelation field from its type annotation
+
+    Args:
+        field_type (Any): Annotation of the field
+
+    Returns:
+        Callable[[str], Any]: Parser of a non-empty cell
+    """
+    args = [arg for arg in get_args(field_type) if arg is not type(None)]
+    base = args[0] if args else field_type
+    if base is bool:
+        return _to_bool
+    if base is int:
+        return _to_int
+    if base in (TraktMediaType, TmdbMediaType):
+        return base
+    return str
+
+
+_RELATION_PARSERS: dict[str, Callable[[str], Any]] = {
+    field.name: _column_parser(field.type)
+    for field in fields(AnimeRelation)
+    if field.name != "title"
+}
+"""Cell parsers of every AnimeRelation field, keyed by column name"""
+
+
+class AnimeApiRelationIndex:
+    """
+    Offline AnimeAPI relation index built from the `animeapi.tsv` dump
+
+    Each AnimeRelation field is stored as a column list, and every platform
+    has a hash map from its ID to the row number, so a lookup is one dict
+    access plus one dataclass construction. IDs claimed by more than one row
+    are left out, so ambiguous lookups still go to the API.
+    """
+
+    __slots__ = ("columns", "keys", "size")
+
+    def __init__(self, rows: list[dict[str, str]]):
+        """
+        Initialize the index
+
+        Args:
+            rows (list[dict[str, str]]): Rows of the dump, keyed by column name
+        """
+        columns: dict[str, list[Any]] = {"title": []}
+        columns.update({name: [] for name in _RELATION_PARSERS})
+        for row in rows:
+            columns["title"].append(row.get("title") or "")
+            for name, parser in _RELATION_PARSERS.items():
+                cell = row.get(name)
+                try:
+                    value = parser(cell) if cell not in (None, "") else None
+                except ValueError:
+                    value = None
+                columns[name].append(value)
+        self.columns = columns
+        """AnimeRelation values stored per field"""
+        self.size = len(rows)
+        """Number of rows in the index"""
+        self.keys: dict[str, dict[str, int]] = {}
+        """Row number per platform ID, keyed by platform value"""
+        ambiguous: set[tuple[str, str]] = set()
+        for row_number in range(self.size):
+            for platform, key in self._row_keys(row_number):
+                mapping = self.keys.setdefault(platform, {})
+                if key in mapping:
+                    ambiguous.add((platform, key))
+                mapping[key] = row_number
+        for platform, key in ambiguous:
+            del self.keys[platform][key]
+
+    @classmethod
+    def from_file(cls, path: str = ANIMEAPI_DUMP_PATH) -> "AnimeApiRelationIndex":
+        """
+        Build the index from AnimeAPI TSV dump
+
+        Args:
+            path (str, optional): Path to the dump. Defaults to ANIMEAPI_DUMP_PATH.
+
+        Returns:
+            AnimeApiRelationIndex: The loaded index
+        """
+        with open(path, "r", encoding="utf-8", newline="") as file:
+            reader = csv.DictReader(file, delimiter="\t")
+            return cls(list(reader))
+
+    @staticmethod
+    def make_key(
+        platform: str,
+        media_id: str | int,
+        media_type: str | None = None,
+        title_season: int | None = None,
+    ) -> str:
+        """
+        Build the lookup key of a platform ID
+
+        Args:
+            platform (str): Platform value
+            media_id (str | int): ID on the platform
+            media_type (str | None, optional): Media type, for Trakt and TMDB. Defaults to None.
+            title_season (int | None, optional): Season number, for Trakt. Defaults to None.
+
+        Returns:
+            str: The lookup key
+        """
+        key = str(media_id).strip()
+        if platform in ("trakt", "themoviedb"):
+            key = f"{media_type}/{key}"
+        if platform == "trakt" and title_season is not None:
+            key = f"{key}/{title_season}"
+        return key
+
+    def _row_keys(self, row_number: int) -> list[tuple[str, str]]:
+        """
+        List every platform key of a row
+
+        Args:
+            row_number (int): Row number
+
+        Returns:
+            list[tuple[str, str]]: Platform value and key pairs
+        """
+        keys: list[tuple[str, str]] = []
+        columns = self.columns
+        for platform in Platform:
+            column = columns.get(platform.value)
+            if column is None or column[row_number] is None:
+                continue
+            value = column[row_number]
+            if platform == Platform.TRAKT:
+                media_type = columns["trakt_type"][row_number]
+                if media_type is None:
+                    continue
+                keys.append(
+                    (
+                        platform.value,
+                        self.make_key(
+                            platform.value,
+                            value,
+                            media_type.value,
+                            columns["trakt_season"][row_number],
+                        ),
+                    )
+                )
+            elif platform == Platform.THEMOVIEDB:
+                media_type = columns["themoviedb_type"][row_number]
+                if media_type is None:
+                    continue
+                keys.append(
+                    (
+                        platform.value,
+                        self.make_key(platform.value, value, media_type.value),
+                    )
+                )
+            else:
+                keys.append((platform.value, self.make_key(platform.value, value)))
+        return keys
+
+    def __len__(self) -> int:
+        return self.size
+
+    def lookup(
+        self,
+        media_id: str | int,
+        platform: Platform,
+        media_type: TraktMediaType | TmdbMediaType | str | None = None,
+        title_season: int | None = None,
+    ) -> AnimeRelation | None:
+        """
+        Resolve a platform ID to its relation without network access
+
+        Args:
+            media_id (str | int): ID of the media
+            platform (Platform): Platform of the ID
+            media_type (TraktMediaType | TmdbMediaType | str | None, optional): Type of the media. Defaults to None.
+            title_season (int | None, optional): Season number of the media. Defaults to None.
+
+        Returns:
+            AnimeRelation | None: The relation, or None if the ID is unknown or ambiguous
+        """
+        if isinstance(media_type, (TraktMediaType, TmdbMediaType)):
+            media_type = media_type.value
+        mapping = self.keys.get(platform.value)
+        if not mapping:
+            return None
+        row_number = mapping.get(
+            self.make_key(platform.value, media_id, media_type, title_season)
+        )
+        if row_number is None:
+            return None
+        return AnimeRelation(
+            **{name: column[row_number] for name, column in self.columns.items()}
+        )
+
+
+_relation_index: AnimeApiRelationIndex | None = None
+_relation_index_lock = Lock()
+
+
+def get_relation_index() -> AnimeApiRelationIndex | None:
+    """
+    Get the process-wide AnimeAPI relation index, if it has been built
+
+    Returns:
+        AnimeApiRelationIndex | None: The index, or None before the first build
+    """
+    return _relation_index
+
+
+def reload_relation_index(path: str = ANIMEAPI_DUMP_PATH) -> AnimeApiRelationIndex:
+    """
+    Rebuild the AnimeAPI relation index from the dump and swap it in atomically
+
+    Args:
+        path (str, optional): Path to the dump. Defaults to ANIMEAPI_DUMP_PATH.
+
+    Returns:
+        AnimeApiRelationIndex: The new index
+    """
+    global _relation_index  # pylint: disable=global-statement
+    index = AnimeApiRelationIndex.from_file(path)
+    with _relation_index_lock:
+        _relation_index = index
+    return index
+
+
 class AnimeApi:
     """AnimeAPI API Wrapper"""
 
-    def __init__(self):
-        """Initialize the AniAPI API Wrapper"""
+    def __init__(self, use_local_index: bool = True):
+        """
+        Initialize the AniAPI API Wrapper
+
+        Args:
+            use_local_index (bool, optional): Resolve relations from the local index before asking the API. Defaults to True.
+        """
         self.api = AsyncAnimeAPI()
+        self.use_local_index = use_local_index
 
     async def __aenter__(self):
         """Create the session with aiohttp"""
@@ -107,6 +361,12 @@ class AnimeApi:
             except ValueError:
                 pass
 
+        index = get_relation_index()
+        if index is not None and self.use_local_index:
+            relation = index.lookup(media_id, platform, media_type, title_season)
+            if relation is not None:
+                return relation
+
         try:
             return await self.api.get_anime_relations(
                 media_id, platform, media_type, title_season
@@ -123,4 +383,11 @@ class AnimeApi:
 
 AnimeApiAnime = AnimeRelation
 
-__all__ = ["AnimeApi", "AnimeApiAnime"]
+__all__ = [
+    "ANIMEAPI_DUMP_PATH",
+    "AnimeApi",
+    "AnimeApiAnime",
+    "AnimeApiRelationIndex",
+    "get_relation_index",
+    "reload_relation_index",
+]
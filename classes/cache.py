@@ -1,8 +1,18 @@
+import asyncio
 import json
 import os
 import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable
 from dataclasses import asdict, dataclass
-from typing import Any
+from datetime import datetime, timezone
+from typing import Any, Generic, TypeVar
+
+from modules.oobe.downloader import conditional_download
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+T = TypeVar("T")
 
 
 @dataclass
@@ -131,4 +141,353 @@ class Caching:
         self.write_cache(cache_path, data)
 
 
-__all__ = ["Caching"]
+class TtlCache(Generic[K, V]):
+    """
+    In-memory cache with per-entry expiration, evicting least recently used
+    entries once full
+
+    Unlike `Caching`, values are kept as Python objects, so they don't need to
+    be JSON serializable, and are gone once the bot restarts.
+    """
+
+    def __init__(self, ttl: float, maxsize: int = 1024):
+        """
+        Args:
+            ttl (float): The time in seconds before an entry is considered expired
+            maxsize (int, optional): Maximum number of entries to keep. Defaults to 1024.
+        """
+        self.ttl = float(ttl)
+        self.maxsize = maxsize
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: K) -> bool:
+        return self.get(key) is not None
+
+    def get(self, key: K, default: V | None = None) -> V | None:
+        """
+        Get an entry
+
+        Args:
+            key (K): The entry key
+            default (V | None, optional): Value if the entry is missing or expired. Defaults to None.
+
+        Returns:
+            V | None: The entry value
+        """
+        item = self._data.get(key)
+        if item is None:
+            return default
+        expires, value = item
+        if expires <= time.monotonic():
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: K, value: V, ttl: float | None = None) -> None:
+        """
+        Store an entry
+
+        Args:
+            key (K): The entry key
+            value (V): The entry value
+            ttl (float | None, optional): Override the expiration time of this entry. Defaults to None.
+        """
+        expires = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._data[key] = (expires, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: K, default: V | None = None) -> V | None:
+        """
+        Remove an entry
+
+        Args:
+            key (K): The entry key
+            default (V | None, optional): Value if the entry is missing. Defaults to None.
+
+        Returns:
+            V | None: The removed entry value
+        """
+        item = self._data.pop(key, None)
+        return default if item is None else item[1]
+
+    def clear(self) -> None:
+        """Remove all entries"""
+        self._data.clear()
+
+    def purge_expired(self) -> int:
+        """
+        Remove expired entries
+
+        Returns:
+            int: Number of removed entries
+        """
+        now = time.monotonic()
+        expired = [key for key, (expires, _) in self._data.items() if expires <= now]
+        for key in expired:
+            del self._data[key]
+        return len(expired)
+
+
+@dataclass(frozen=True)
+class RenderedMessage:
+    """Serialized embed and components of a rendered response"""
+
+    embed: dict[str, Any]
+    """Embed, as sent to Discord"""
+    components: list[dict[str, Any]]
+    """Action rows, as sent to Discord"""
+
+
+class RenderCache:
+    """
+    In-memory cache of rendered responses, tied to the provider cache files
+    they were rendered from
+
+    An entry is only returned while every source file is unchanged and not
+    expired for its `Caching` instance, so a refreshed or deleted provider
+    cache invalidates the rendered response with it. An embed timestamp is
+    set to the time of the hit, not the one of the first render.
+    """
+
+    def __init__(self, maxsize: int = 512):
+        """
+        Args:
+            maxsize (int, optional): Maximum number of responses to keep. Defaults to 512.
+        """
+        self._entries: TtlCache[Hashable, tuple[RenderedMessage, list[tuple[str, int]]]]
+        self._entries = TtlCache(ttl=0, maxsize=maxsize)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> RenderedMessage | None:
+        """
+        Get a rendered response
+
+        Args:
+            key (Hashable): Command name and the arguments affecting the output
+
+        Returns:
+            RenderedMessage | None: The response, None if missing or any source has changed
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        rendered, stamps = entry
+        for path, mtime in stamps:
+            try:
+                if os.stat(path).st_mtime_ns != mtime:
+                    break
+            except OSError:
+                break
+        else:
+            if "timestamp" not in rendered.embed:
+                return rendered
+            embed = {
+                **rendered.embed,
+                "timestamp": datetime.now(tz=timezone.utc).isoformat(),
+            }
+            return RenderedMessage(embed=embed, components=rendered.components)
+        self._entries.pop(key)
+        return None
+
+    def set(
+        self,
+        key: Hashable,
+        embed: Any,
+        components: Any,
+        sources: Iterable[tuple[Caching, str]],
+    ) -> bool:
+        """
+        Store a rendered response
+
+        Args:
+            key (Hashable): Command name and the arguments affecting the output
+            embed (Any): Embed, or its dict form
+            components (Any): Components in any form accepted when sending a message
+            sources (Iterable[tuple[Caching, str]]): Provider caches and cache names the response was rendered from
+
+        Returns:
+            bool: True if stored, False if a source file is missing or already expired
+        """
+        # kept local, so caching helpers stay usable without a Discord client
+        from interactions.models.discord.components import process_components
+
+        now = time.time()
+        stamps: list[tuple[str, int]] = []
+        ttl: float | None = None
+        for cache, name in sources:
+            path = cache.get_cache_path(name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                return False
+            remaining = stat.st_mtime + cache.cache_expiration_time - now
+            if remaining <= 0:
+                return False
+            ttl = remaining if ttl is None else min(ttl, remaining)
+            stamps.append((path, stat.st_mtime_ns))
+        if ttl is None:
+            return False
+        rendered = RenderedMessage(
+            embed=embed if isinstance(embed, dict) else embed.to_dict(),
+            components=process_components(components) or [],
+        )
+        self._entries.set(key, (rendered, stamps), ttl=ttl)
+        return True
+
+    def pop(self, key: Hashable) -> None:
+        """
+        Remove a rendered response
+
+        Args:
+            key (Hashable): Command name and the arguments affecting the output
+        """
+        self._entries.pop(key)
+
+
+class SharedRemoteDataset(Generic[T]):
+    """
+    Process-wide copy of a remote JSON dataset, kept in memory
+
+    The dataset is downloaded once, parsed into `T`, and shared by every
+    caller. Once it is older than `refresh_after` seconds, lookups keep using
+    the current copy while a background task sends a conditional request and
+    swaps in the new copy if upstream has changed. Callers only wait when no
+    copy exists at all, neither in memory nor on disk.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        url: str,
+        file_path: str,
+        parser: Callable[[Any], T],
+        refresh_after: float,
+        headers: dict[str, str] | None = None,
+    ):
+        """
+        Args:
+            name (str): Dataset name, used in logs
+            url (str): URL of the JSON dataset
+            file_path (str): Path to store the raw dataset at
+            parser (Callable[[Any], T]): Converts decoded JSON to the shared object, run in a worker thread
+            refresh_after (float): The time in seconds before a background refresh is started
+            headers (dict[str, str] | None, optional): Headers sent with every download, such as User-Agent. Defaults to None.
+        """
+        self.name = name
+        self.url = url
+        self.file_path = file_path
+        self.parser = parser
+        self.refresh_after = float(refresh_after)
+        self.headers = dict(headers or {})
+        self._value: T | None = None
+        self._checked_at = 0.0
+        self._refresh_task: asyncio.Task[bool] | None = None
+
+    @property
+    def value(self) -> T | None:
+        """The current copy of the dataset, None if not loaded yet"""
+        return self._value
+
+    @property
+    def is_stale(self) -> bool:
+        """Whether the dataset should be checked against upstream"""
+        return time.time() - self._checked_at >= self.refresh_after
+
+    def _load_file(self) -> T | None:
+        """Read and parse the stored dataset, None if missing or unreadable"""
+        try:
+            with open(self.file_path, "r", encoding="utf-8") as file:
+                parsed = self.parser(json.load(file))
+            checked_at = os.path.getmtime(self.file_path)
+        except (OSError, ValueError):
+            return None
+        # swap a fully parsed object, lookups never see a partial dataset
+        self._value = parsed
+        self._checked_at = checked_at
+        return parsed
+
+    async def refresh(self) -> bool:
+        """
+        Check upstream for a new version, and swap it in if there is one
+
+        Raises:
+            aiohttp.ClientError: If there is an issue with the GET request.
+
+        Returns:
+            bool: True if a new version was loaded
+        """
+        changed = await conditional_download(
+            self.url, self.file_path, headers=self.headers
+        )
+        if changed or self._value is None:
+            await asyncio.to_thread(self._load_file)
+        else:
+            # mark the stored copy as fresh, so it is not checked again soon
+            os.utime(self.file_path)
+        self._checked_at = time.time()
+        return changed
+
+    def _schedule_refresh(self) -> "asyncio.Task[bool]":
+        """Start a refresh unless one is already running"""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(
+                self._refresh_logged(), name=f"refresh:{self.name}"
+            )
+        return self._refresh_task
+
+    async def _refresh_logged(self) -> bool:
+        """Refresh, logging failures instead of raising them"""
+        try:
+            return await self.refresh()
+        # pylint: disable=broad-exception-caught
+        except Exception as error:  # noqa: BLE001
+            print(f"[Cch] [{self.name}] Failed to refresh dataset: {error}")
+            return False
+
+    async def get(self) -> T:
+        """
+        Get the dataset, starting a background refresh if it is stale
+
+        Raises:
+            RuntimeError: Dataset is not available locally and can't be downloaded
+
+        Returns:
+            T: The dataset
+        """
+        if self._value is None:
+            await asyncio.to_thread(self._load_file)
+        if self._value is None:
+            await self._schedule_refresh()
+        elif self.is_stale:
+            self._schedule_refresh()
+        if self._value is None:
+            raise RuntimeError(f"{self.name} dataset is not available")
+        return self._value
+
+    async def refresh_if_stale(self) -> bool:
+        """
+        Refresh the dataset if it is loaded and stale, for periodic tasks
+
+        Returns:
+            bool: True if a new version was loaded
+        """
+        if self._value is None or not self.is_stale:
+            return False
+        return await self._schedule_refresh()
+
+
+__all__ = [
+    "Caching",
+    "RenderCache",
+    "RenderedMessage",
+    "SharedRemoteDataset",
+    "TtlCache",
+]
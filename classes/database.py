@@ -1,14 +1,21 @@
 import json
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import datetime
 from pathlib import Path
 from typing import Any, ClassVar, Literal
 
-import pandas as pd
 from interactions.models import Snowflake
 
+from classes.allowlist import autoembed_allowlist
+from classes.user_table import UserTable, timestamp_to_datetime
 from modules.const import DATABASE_PATH, EMOJI_UNEXPECTED_ERROR
 from modules.jikan import check_club_membership
+from modules.lazy_import import lazy_import
+
+pd = lazy_import("pandas")
 
 
 class UserBirthdayPermission:
@@ -107,6 +114,109 @@ class UserDatabaseClass:
     """User's birthday permissions"""
 
 
+FileStamp = tuple[int, int] | None
+"""Modification time and size of a file, None if the file is missing"""
+
+
+def _file_stamp(filepath: Path) -> FileStamp:
+    """
+    Get the stamp of a file, used to tell if a cached read is still fresh
+
+    Args:
+        filepath (Path): Path to the file
+
+    Returns:
+        FileStamp: Modification time in nanoseconds and size, None if missing
+    """
+    try:
+        stat = filepath.stat()
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _user_from_record(record: dict[str, Any]) -> UserDatabaseClass:
+    """
+    Build a user from a row of the typed user table
+
+    Args:
+        record (dict[str, Any]): Row from `UserTable.records`
+
+    Returns:
+        UserDatabaseClass: Dataclass contains information about an user
+    """
+    permission = record["userBirthdayPermission"]
+    return UserDatabaseClass(
+        discord_id=Snowflake(record["discordId"]),
+        discord_username=record["discordUsername"] or "",
+        mal_id=int(record["malId"]),
+        mal_username=record["malUsername"] or "",
+        mal_joined=timestamp_to_datetime(int(record["malJoined"])),  # type: ignore[arg-type]
+        registered_at=timestamp_to_datetime(int(record["registeredAt"])),  # type: ignore[arg-type]
+        registered_guild_id=Snowflake(record["registeredGuildId"]),
+        registered_guild_name=record["registeredGuildName"] or "",
+        registered_by=Snowflake(record["registeredBy"]),
+        anilist_id=record["anilistId"],
+        anilist_username=record["anilistUsername"],
+        lastfm_username=record["lastfmUsername"],
+        shikimori_id=record["shikimoriId"],
+        shikimori_username=record["shikimoriUsername"],
+        user_birthdate=record["userBirthdate"],
+        user_timezone=record["userTimezone"],
+        birthday_permissions=None
+        if permission is None
+        else UserBirthdayPermission(permission),
+    )
+
+
+class _ReadSnapshot:
+    """Reads issued within a single request, reused while the files are unchanged"""
+
+    def __init__(self):
+        self.frames: dict[tuple[str, tuple], tuple[FileStamp, Any]] = {}
+        """Parsed CSV files, keyed by path and read options"""
+        self.tables: dict[str, tuple[FileStamp, UserTable | None]] = {}
+        """Typed user tables, keyed by database path"""
+        self.users: dict[str, tuple[FileStamp, list[UserDatabaseClass]]] = {}
+        """Parsed user records, keyed by database path"""
+
+    def clear(self) -> None:
+        """Forget all reads, as a write happened"""
+        self.frames.clear()
+        self.tables.clear()
+        self.users.clear()
+
+
+_request_snapshot: ContextVar[_ReadSnapshot | None] = ContextVar(
+    "user_database_snapshot", default=None
+)
+
+
+@contextmanager
+def request_snapshot() -> Iterator[None]:
+    """
+    Share database reads across every helper of a command
+
+    Within the block, identical `UserDatabase` reads are parsed once and
+    reused, including by tasks spawned from it, until the file changes or the
+    same request writes to it. Nested blocks reuse the outer snapshot.
+
+    Example:
+        >>> with request_snapshot():
+        ...     async with UserDatabase() as db:
+        ...         if await db.check_if_registered(user_id):
+        ...             data = await db.get_user_data(user_id)  # no reparse
+    """
+    if _request_snapshot.get() is not None:
+        yield
+        return
+    token = _request_snapshot.set(_ReadSnapshot())
+    try:
+        yield
+    finally:
+        _request_snapshot.reset(token)
+
+
 class UserDatabase:
     """User Database Wrapper"""
 
@@ -118,9 +228,10 @@ class UserDatabase:
         """
         self.database_path = Path(database_path)
 
-    def _read_csv_safe(self, filepath: Path | str, **kwargs) -> pd.DataFrame | None:
+    def _read_csv_safe(self, filepath: Path | str, **kwargs) -> "pd.DataFrame | None":
         """
-        Safely read CSV file with error handling
+        Safely read CSV file with error handling, reusing the read of the
+        current request snapshot if any
 
         Args:
             filepath: Path to the CSV file
@@ -130,6 +241,31 @@ class UserDatabase:
             DataFrame if successful, None if file doesn't exist or is empty
         """
         filepath = Path(filepath)
+        snapshot = _request_snapshot.get()
+        if snapshot is None:
+            return self._read_csv(filepath, **kwargs)
+        key = (str(filepath), tuple(sorted(kwargs.items())))
+        stamp = _file_stamp(filepath)
+        cached = snapshot.frames.get(key)
+        if cached is None or cached[0] != stamp:
+            cached = (stamp, self._read_csv(filepath, **kwargs))
+            snapshot.frames[key] = cached
+        df = cached[1]
+        # callers modify frames in place, hand out copies
+        return None if df is None else df.copy()
+
+    @staticmethod
+    def _read_csv(filepath: Path, **kwargs) -> "pd.DataFrame | None":
+        """
+        Read CSV file from disk
+
+        Args:
+            filepath: Path to the CSV file
+            **kwargs: Additional arguments to pass to pd.read_csv
+
+        Returns:
+            DataFrame if successful, None if file doesn't exist or is empty
+        """
         if not filepath.exists():
             return None
         try:
@@ -137,6 +273,39 @@ class UserDatabase:
         except (FileNotFoundError, pd.errors.EmptyDataError):
             return None
 
+    def _read_table_safe(self) -> UserTable | None:
+        """
+        Read the typed user table, reusing the read of the current request
+        snapshot if any
+
+        Returns:
+            UserTable | None: The table, None if the database doesn't exist or is empty
+        """
+        snapshot = _request_snapshot.get()
+        if snapshot is None:
+            return self._read_table(self.database_path)
+        key = str(self.database_path)
+        stamp = _file_stamp(self.database_path)
+        cached = snapshot.tables.get(key)
+        if cached is None or cached[0] != stamp:
+            cached = (stamp, self._read_table(self.database_path))
+            snapshot.tables[key] = cached
+        # the table is never modified in place, share it
+        return cached[1]
+
+    @staticmethod
+    def _read_table(filepath: Path) -> UserTable | None:
+        """
+        Read the typed user table from disk
+
+        Args:
+            filepath: Path to the database
+
+        Returns:
+            UserTable | None: The table, None if the file doesn't exist or is empty
+        """
+        return UserTable.read(filepath)
+
     def _database_exists_check(self, raise_on_missing: bool = False) -> bool:
         """
         Check if database exists and optionally raise exception
@@ -177,6 +346,13 @@ class UserDatabase:
     async def close(self):
         """Close the database"""
 
+    @staticmethod
+    def _invalidate_snapshot() -> None:
+        """Drop reads of the current request snapshot, called after writes"""
+        snapshot = _request_snapshot.get()
+        if snapshot is not None:
+            snapshot.clear()
+
     async def check_if_registered(self, discord_id: Snowflake) -> bool:
         """
         Check if user is registered on Database
@@ -187,10 +363,10 @@ class UserDatabase:
         Returns:
             bool: True if user is registered, False if not
         """
-        df = self._read_csv_safe(self.database_path)
-        if df is None:
+        table = self._read_table_safe()
+        if table is None:
             return False
-        return str(discord_id) in df["discordId"].values
+        return discord_id in table
 
     async def check_if_platform_registered(
         self, platform: Literal["mal", "anilist", "lastfm", "shikimori"], value: Any
@@ -258,6 +434,7 @@ class UserDatabase:
             header=not self._database_exists(),
             mode="a",
         )
+        self._invalidate_snapshot()
 
     async def update_user(
         self,
@@ -291,6 +468,7 @@ class UserDatabase:
             return False
         df.loc[df["discordId"] == str(discord_id), row] = modified_input
         df.to_csv(self.database_path, sep="\t", index=False)
+        self._invalidate_snapshot()
         return True
 
     async def drop_user(self, discord_id: Snowflake) -> bool:
@@ -314,6 +492,7 @@ class UserDatabase:
         if df2 is not None:
             df2.drop(df2[df2["discordId"] == str(discord_id)].index, inplace=True)
             df2.to_csv(member_csv, sep="\t", index=False)
+        self._invalidate_snapshot()
 
         # verify if its success
         verify = await self.check_if_registered(discord_id)
@@ -352,81 +531,28 @@ class UserDatabase:
         Returns:
             list[UserDatabaseClass]: List of dataclasses contains information about an user
         """
-        df = self._read_csv_safe(self.database_path)
-        if df is None:
+        snapshot = _request_snapshot.get()
+        if snapshot is None:
+            return self._parse_all_users()
+        key = str(self.database_path)
+        stamp = _file_stamp(self.database_path)
+        cached = snapshot.users.get(key)
+        if cached is None or cached[0] != stamp:
+            cached = (stamp, self._parse_all_users())
+            snapshot.users[key] = cached
+        return list(cached[1])
+
+    def _parse_all_users(self) -> list[UserDatabaseClass]:
+        """
+        Parse all users from the database file
+
+        Returns:
+            list[UserDatabaseClass]: List of dataclasses contains information about an user
+        """
+        table = self._read_table_safe()
+        if table is None:
             return []
-        df.fillna("", inplace=True)
-        data = df.to_dict(orient="records")
-        users: list[UserDatabaseClass] = []
-        for row in data:
-            user = UserDatabaseClass(
-                discord_id=Snowflake(row["discordId"]),
-                discord_username=row["discordUsername"],
-                mal_id=int(row["malId"]),
-                mal_username=row["malUsername"],
-                mal_joined=datetime.fromtimestamp(
-                    int(row["malJoined"]), tz=timezone.utc
-                ),
-                registered_at=datetime.fromtimestamp(
-                    int(row["registeredAt"]), tz=timezone.utc
-                ),
-                registered_guild_id=Snowflake(row["registeredGuildId"]),
-                registered_guild_name=row["registeredGuildName"],
-                registered_by=Snowflake(row["registeredBy"]),
-            )
-            migration: dict[str, dict[str, Any]] = {
-                "anilist_id": {
-                    "type": int,
-                    "key": "anilistId",
-                    "default": None,
-                },
-                "anilist_username": {
-                    "type": str,
-                    "key": "anilistUsername",
-                    "default": None,
-                },
-                "lastfm_username": {
-                    "type": str,
-                    "key": "lastfmUsername",
-                    "default": None,
-                },
-                "shikimori_id": {
-                    "type": int,
-                    "key": "shikimoriId",
-                    "default": None,
-                },
-                "shikimori_username": {
-                    "type": str,
-                    "key": "shikimoriUsername",
-                    "default": None,
-                },
-                "user_birthdate": {
-                    "type": lambda x: datetime.strptime(x, "%Y-%m-%d").replace(
-                        tzinfo=timezone.utc
-                    ),
-                    "key": "userBirthdate",
-                    "default": None,
-                },
-                "user_timezone": {
-                    "type": str,
-                    "key": "userTimezone",
-                    "default": None,
-                },
-                "birthday_permissions": {
-                    "type": lambda x: UserBirthdayPermission(int(x)),
-                    "key": "userBirthdayPermission",
-                    "default": None,
-                },
-            }
-            for key, value in migration.items():
-                setattr(user, key, value["default"])
-                try:
-                    if row[value["key"]]:
-                        setattr(user, key, value["type"](row[value["key"]]))
-                except (ValueError, TypeError, KeyError):
-                    ...
-            users.append(user)
-        return users
+        return [_user_from_record(record) for record in table.records()]
 
     async def get_user_data(self, discord_id: Snowflake) -> UserDatabaseClass:
         """
@@ -438,10 +564,10 @@ class UserDatabase:
         Returns:
             UserDatabaseClass: Dataclass contains information about an user
         """
-        dbs = await self.get_all_users()
-        for db in dbs:
-            if db.discord_id == discord_id:
-                return db
+        table = self._read_table_safe()
+        position = None if table is None else table.find(discord_id)
+        if table is not None and position is not None:
+            return _user_from_record(table.record(position))
         raise DatabaseException(
             f"{EMOJI_UNEXPECTED_ERROR} User may not be registered to the bot, or there's unknown error"
         )
@@ -484,10 +610,8 @@ class UserDatabase:
                 data["has_user_settings"] = True
                 data.update(data2)
 
-        # if user exist as a file in database/allowlist_autoembed/ directory
-        # then add it to the data
-        autoembed_path = Path(f"database/allowlist_autoembed/{discord_id}")
-        if autoembed_path.exists():
+        # if user enabled autoembed, then add it to the data
+        if discord_id in autoembed_allowlist:
             data["has_user_settings"] = True
             data["settings_allowlist_autoembed"] = True
         if data["userBirthdate"]:
@@ -526,4 +650,4 @@ class DatabaseException(Exception):
     """Exception raised for errors in the database."""
 
 
-__all__ = ["DatabaseException", "UserDatabase"]
+__all__ = ["DatabaseException", "UserDatabase", "request_snapshot"]
@@ -0,0 +1,210 @@
+"""
+# Compiled Dataclass Decoder
+
+Turns decoded JSON payloads into the provider dataclasses. Instead of walking
+fields by reflection on every call, a registry generates one specialised
+constructor function per dataclass when it is registered, so decoding a
+cached payload only runs the lookups and conversions that struct needs.
+
+Nested sections that are rarely read can be decoded lazily: the raw payload
+is kept in the slot and decoded on first attribute access.
+"""
+
+import dataclasses
+import types
+from collections.abc import Callable, Iterable
+from typing import Any, Generic, TypeVar, Union, get_args, get_origin, get_type_hints
+
+T = TypeVar("T")
+Converter = Callable[[Any], Any]
+"""Function converting a raw JSON value"""
+
+
+class _Pending:
+    """Raw value of a lazy field, waiting to be decoded"""
+
+    __slots__ = ("decode", "raw")
+
+    def __init__(self, raw: Any, decode: Converter):
+        self.raw = raw
+        self.decode = decode
+
+
+class _LazySlot:
+    """Slot descriptor decoding a pending raw value on first read"""
+
+    __slots__ = ("member",)
+
+    def __init__(self, member: Any):
+        self.member = member
+
+    def __get__(self, obj: Any, objtype: type | None = None) -> Any:
+        if obj is None:
+            return self
+        value = self.member.__get__(obj, objtype)
+        if type(value) is _Pending:
+            value = value.decode(value.raw)
+            self.member.__set__(obj, value)
+        return value
+
+    def __set__(self, obj: Any, value: Any) -> None:
+        self.member.__set__(obj, value)
+
+    def __delete__(self, obj: Any) -> None:
+        self.member.__delete__(obj)
+
+
+def _without_none(hint: Any) -> list[Any]:
+    """Members of a type hint, without NoneType"""
+    if get_origin(hint) in (Union, types.UnionType):
+        return [arg for arg in get_args(hint) if arg is not type(None)]
+    return [hint]
+
+
+class DecoderRegistry(Generic[T]):
+    """
+    Registry of compiled decoders sharing type hooks
+
+    Nested dataclasses without their own registration are compiled on first
+    use with the registry's type hooks.
+
+    ## Usage
+
+    >>> registry = DecoderRegistry(type_hooks={datetime: datetime.fromisoformat})
+    >>> decode_user = registry.register(UserStruct, lazy=["favorites"])
+    >>> user = decode_user(payload)
+    """
+
+    def __init__(self, type_hooks: dict[type, Converter] | None = None):
+        """
+        Initialize the registry
+
+        Args:
+            type_hooks (dict[type, Converter] | None, optional): Converters of non-dataclass field types, e.g. datetime. Defaults to None.
+        """
+        self.type_hooks = type_hooks or {}
+        self._decoders: dict[type, Callable[[dict[str, Any]], Any]] = {}
+
+    def decoder(self, cls: type[T]) -> Callable[[dict[str, Any]], T]:
+        """
+        Get the decoder of a dataclass, compiling it on first use
+
+        Args:
+            cls (type[T]): The dataclass
+
+        Returns:
+            Callable[[dict[str, Any]], T]: The decoder
+        """
+        found = self._decoders.get(cls)
+        if found is None:
+            found = self.register(cls)
+        return found
+
+    def register(
+        self,
+        cls: type[T],
+        hooks: dict[str, Converter] | None = None,
+        lazy: Iterable[str] = (),
+    ) -> Callable[[dict[str, Any]], T]:
+        """
+        Compile and register the decoder of a dataclass
+
+        Field names ending with an underscore read the key without it, e.g.
+        `from_` reads `from`. Converters only run on truthy values; None,
+        empty lists, and empty dicts are kept as is. Unknown keys are ignored.
+
+        Args:
+            cls (type[T]): The dataclass
+            hooks (dict[str, Converter] | None, optional): Converters of specific fields, overriding the inferred ones. Defaults to None.
+            lazy (Iterable[str], optional): Fields decoded on first access, the dataclass must use slots. Defaults to ().
+
+        Raises:
+            TypeError: A lazy field has no slot
+
+        Returns:
+            Callable[[dict[str, Any]], T]: The decoder
+        """
+        hooks = hooks or {}
+        lazy = set(lazy)
+        hints = get_type_hints(cls)
+        namespace: dict[str, Any] = {"_cls": cls, "_Pending": _Pending}
+        lines = ["def decode(data):", "    get = data.get"]
+        args: list[str] = []
+        for index, field in enumerate(dataclasses.fields(cls)):
+            if not field.init:
+                continue
+            name = field.name
+            key = name.removesuffix("_")
+            var = f"v{index}"
+            if field.default is not dataclasses.MISSING:
+                namespace[f"d{index}"] = field.default
+                lines.append(f"    {var} = get({key!r}, d{index})")
+            elif field.default_factory is not dataclasses.MISSING:
+                namespace[f"f{index}"] = field.default_factory
+                lines.append(f"    {var} = get({key!r})")
+                lines.append(f"    if {var} is None and {key!r} not in data:")
+                lines.append(f"        {var} = f{index}()")
+            else:
+                lines.append(f"    {var} = data[{key!r}]")
+
+            converter = hooks.get(name) or self._converter(hints[name])
+            if converter is not None:
+                namespace[f"c{index}"] = converter
+                if name in lazy:
+                    lines.append(f"    if {var}:")
+                    lines.append(f"        {var} = _Pending({var}, c{index})")
+                else:
+                    lines.append(f"    if {var}:")
+                    lines.append(f"        {var} = c{index}({var})")
+            args.append(f"{name}={var}" if field.kw_only else var)
+        lines.append(f"    return _cls({', '.join(args)})")
+
+        # pylint: disable-next=exec-used
+        exec("\n".join(lines), namespace)  # noqa: S102
+        decode = namespace["decode"]
+        decode.__name__ = decode.__qualname__ = f"decode_{cls.__name__}"
+        for name in lazy:
+            member = cls.__dict__.get(name)
+            if member is None or not hasattr(member, "__set__"):
+                raise TypeError(f"Lazy field {cls.__name__}.{name} needs a slot")
+            if not isinstance(member, _LazySlot):
+                setattr(cls, name, _LazySlot(member))
+        self._decoders[cls] = decode
+        return decode
+
+    def _converter(self, hint: Any) -> Converter | None:
+        """
+        Infer the converter of a field from its type hint
+
+        Args:
+            hint (Any): Resolved type hint
+
+        Returns:
+            Converter | None: The converter, None if the value is kept as is
+        """
+        members = _without_none(hint)
+        if len(members) != 1:
+            return None
+        target = members[0]
+        if dataclasses.is_dataclass(target):
+            return self._nested(target)
+        if get_origin(target) is list:
+            items = _without_none(get_args(target)[0]) if get_args(target) else []
+            if len(items) == 1 and dataclasses.is_dataclass(items[0]):
+                nested = self._nested(items[0])
+                return lambda value: [nested(item) for item in value]
+            return None
+        return self.type_hooks.get(target)
+
+    def _nested(self, cls: type) -> Converter:
+        """Converter of a nested dataclass, compiled on first call"""
+
+        def convert(value: Any) -> Any:
+            if type(value) is not dict:
+                return value
+            return self.decoder(cls)(value)
+
+        return convert
+
+
+__all__ = ["Converter", "DecoderRegistry"]
@@ -6,8 +6,12 @@ ONLY USE THIS IF YOU DO NOT WANT JIKAN AUTOCACHE
 Can be easily broken if MAL changes their HTML structure
 """
 
+import asyncio
 import re
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
+from html.parser import HTMLParser
+from typing import Literal
 
 import aiohttp
 from bs4 import BeautifulSoup, Tag
@@ -16,21 +20,256 @@ from classes.excepts import ProviderHttpError
 from classes.jikan import JikanImages, JikanImageStruct, JikanUserStruct
 from modules.const import USER_AGENT
 
+STATUS_TITLES = ("Last Online", "Gender", "Birthday", "Location", "Joined")
+"""Titles of the profile status rows used to build user information"""
+
+
+@dataclass
+class ProfileFields:
+    """Raw fields extracted from a MyAnimeList profile page"""
+
+    report_link: str | None = None
+    """Link of the report button, carrying the user ID"""
+    image: str | None = None
+    """Profile picture URL"""
+    statuses: dict[str, str] = field(default_factory=dict)
+    """Status rows, keyed by title, e.g. `{"Joined": "Mar 4, 2015"}`"""
+
+
+def _has_class(classes: str, wanted: str) -> bool:
+    """Match a class attribute the way BeautifulSoup does, by full value or by token"""
+    return classes == wanted or wanted in classes.split()
+
+
+class _StopParsing(Exception):
+    """Raised by the extractor to abort parsing once every field is found"""
+
+
+class _ProfileExtractor(HTMLParser):
+    """
+    Streaming extractor of a MyAnimeList profile page
+
+    Only tracks the report button, profile picture, and the first status list,
+    and aborts as soon as the status list is closed instead of building a tree
+    of the whole page.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.fields = ProfileFields()
+        self._in_image_div = 0
+        self._image_seen = False
+        self._status_ul_depth = 0
+        self._status_ul_done = False
+        self._capture: Literal["title", "data"] | None = None
+        self._capture_depth = 0
+        self._buffer: list[str] = []
+        self._pending_title: str | None = None
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        attributes = dict(attrs)
+        classes = attributes.get("class") or ""
+        if self._capture is not None:
+            if tag == "span":
+                self._capture_depth += 1
+            return
+        if tag == "a" and _has_class(classes, "header-right mt4 mr0"):
+            if self.fields.report_link is None:
+                self.fields.report_link = attributes.get("href")
+        elif tag == "div":
+            if self._in_image_div:
+                self._in_image_div += 1
+            elif _has_class(classes, "user-image mb8") and not self._image_seen:
+                self._in_image_div = 1
+        elif tag == "img" and self._in_image_div and not self._image_seen:
+            self._image_seen = True
+            self.fields.image = attributes.get("data-src")
+        elif tag == "ul" and not self._status_ul_done:
+            if self._status_ul_depth:
+                self._status_ul_depth += 1
+            elif _has_class(classes, "user-status"):
+                self._status_ul_depth = 1
+        elif tag == "span" and _has_class(classes, "user-status-title"):
+            self._start_capture("title")
+        elif (
+            tag == "span"
+            and _has_class(classes, "user-status-data")
+            and self._pending_title is not None
+        ):
+            self._start_capture("data")
+
+    def handle_endtag(self, tag: str) -> None:
+        if self._capture is not None:
+            if tag != "span":
+                return
+            if self._capture_depth:
+                self._capture_depth -= 1
+                return
+            self._end_capture()
+        elif tag == "div" and self._in_image_div:
+            self._in_image_div -= 1
+            if not self._in_image_div:
+                self._image_seen = True
+        elif tag == "ul" and self._status_ul_depth:
+            self._status_ul_depth -= 1
+            if not self._status_ul_depth:
+                self._status_ul_done = True
+                if self.fields.report_link is not None:
+                    raise _StopParsing
+
+    def handle_data(self, data: str) -> None:
+        if self._capture is not None:
+            self._buffer.append(data)
+
+    def _start_capture(self, kind: Literal["title", "data"]) -> None:
+        self._capture = kind
+        self._capture_depth = 0
+        self._buffer = []
+
+    def _end_capture(self) -> None:
+        text = "".join(self._buffer).strip()
+        if self._capture == "title":
+            self._pending_title = text if text in STATUS_TITLES else None
+        elif self._pending_title is not None:
+            self.fields.statuses.setdefault(self._pending_title, text)
+            self._pending_title = None
+        self._capture = None
+
+
+def extract_profile_fields(html: str) -> ProfileFields:
+    """
+    Extract raw profile fields with a streaming parser that stops early
+
+    Args:
+        html (str): Profile page HTML
+
+    Returns:
+        ProfileFields: Extracted fields
+    """
+    extractor = _ProfileExtractor()
+    try:
+        extractor.feed(html)
+        extractor.close()
+    except _StopParsing:
+        pass
+    return extractor.fields
+
+
+def extract_profile_fields_soup(html: str) -> ProfileFields:
+    """
+    Extract raw profile fields by parsing the whole page with html5lib
+
+    Slower, but more forgiving to broken markup than `extract_profile_fields`.
+
+    Args:
+        html (str): Profile page HTML
+
+    Returns:
+        ProfileFields: Extracted fields
+    """
+    soup = BeautifulSoup(html, "html5lib")
+    fields = ProfileFields()
+    report_link = soup.find("a", {"class": "header-right mt4 mr0"})
+    if isinstance(report_link, Tag):
+        href = report_link.get("href")
+        fields.report_link = href[0] if isinstance(href, list) else href
+    image_div = soup.find("div", class_="user-image mb8")
+    if image_div:
+        image = image_div.find("img")
+        if isinstance(image, Tag):
+            src = image.get("data-src")
+            fields.image = src[0] if isinstance(src, list) else src
+    for title in STATUS_TITLES:
+        title_find = soup.find("span", class_="user-status-title", string=title)
+        if not title_find:
+            continue
+        data_find = title_find.find_next("span", class_="user-status-data")
+        if data_find:
+            fields.statuses[title] = data_find.text.strip()
+    return fields
+
+
+def _parse_last_online(last_online: str) -> datetime:
+    """
+    Parse the "Last Online" status of a profile
+
+    Args:
+        last_online (str): Status text, e.g. "Now", "Today, 1:23 AM", "5 hours ago"
+
+    Returns:
+        datetime: Last online time in UTC
+    """
+    if last_online == "Now":
+        return datetime.now(timezone.utc)
+    last_online += " -0700"
+    activity = last_online.split(", ")
+    date_format = "%b %d, %Y %H:%M %p %z"
+    match activity[0]:
+        case "Today":
+            today_str = datetime.now(timezone.utc).strftime("%b %d, %Y")
+            return datetime.strptime(f"{today_str} {activity[1]}", date_format).replace(
+                tzinfo=timezone.utc
+            )
+        case "Yesterday":
+            yesterday_str = (datetime.now(timezone.utc) - timedelta(days=1)).strftime(
+                "%b %d, %Y"
+            )
+            return datetime.strptime(
+                f"{yesterday_str} {activity[1]}", date_format
+            ).replace(tzinfo=timezone.utc)
+        case _:
+            if len(activity) == 2:
+                # check if in activity[1] has a year after the comma
+                date_split = activity[1].split(" ")
+                if re.match(r"\d{4}", date_split[0]) is not None:
+                    return datetime.strptime(
+                        f"{activity[0]}, {activity[1]}", date_format
+                    ).replace(tzinfo=timezone.utc)
+                current_year = datetime.now(timezone.utc).year
+                return datetime.strptime(
+                    f"{activity[0]}, {current_year} {activity[1]}",
+                    date_format,
+                ).replace(tzinfo=timezone.utc)
+            # handle relative time like 1 hour ago
+            regex = r"(\d+) (\w+) ago"
+            matching = re.search(regex, activity[0])
+            # get time
+            time_value: int = int(matching.group(1))  # type: ignore
+            # get unit
+            time_unit: str = matching.group(2)  # type: ignore
+            # add s to the unit if it is not already there
+            if not time_unit.endswith("s"):
+                time_unit += "s"
+            # convert to timedelta
+            time_delta = timedelta(**{time_unit: time_value})
+            return datetime.now(timezone.utc) - time_delta
+
 
 class HtmlMyAnimeList:
     """MyAnimeList HTML Scraper"""
 
-    def __init__(self, user_agent: str = USER_AGENT):
-        """Initialize the class"""
+    def __init__(
+        self,
+        user_agent: str = USER_AGENT,
+        session: aiohttp.ClientSession | None = None,
+    ):
+        """
+        Initialize the class
+
+        Args:
+            user_agent (str, optional): User agent to use. Defaults to USER_AGENT.
+            session (aiohttp.ClientSession | None, optional): Session to share with other clients, left open on exit. Defaults to None.
+        """
         self.user_agent = user_agent
         self.base_url = "https://myanimelist.net/"
-        self.headers = {}
-        self.session = None
+        self.headers = {"User-Agent": user_agent}
+        self.session = session
+        self._owns_session = session is None
 
     async def __aenter__(self):
         """Create a new session"""
-        self.headers["User-Agent"] = self.user_agent
-        self.session = aiohttp.ClientSession(headers=self.headers)
+        if self.session is None:
+            self.session = aiohttp.ClientSession(headers=self.headers)
         return self
 
     async def __aexit__(self, exc_type, exc_value, traceback):
@@ -39,7 +278,7 @@ class HtmlMyAnimeList:
 
     async def close(self):
         """Close the session"""
-        if self.session:
+        if self.session and self._owns_session:
             await self.session.close()
 
     async def get_user(self, username: str) -> JikanUserStruct:
@@ -57,130 +296,67 @@ class HtmlMyAnimeList:
         """
         if not self.session:
             raise RuntimeError("Session not created")
-        async with self.session.get(self.base_url + f"profile/{username}") as resp:
+        async with self.session.get(
+            self.base_url + f"profile/{username}", headers=self.headers
+        ) as resp:
             if resp.status != 200:
                 raise ProviderHttpError(resp.reason, resp.status)
             html = await resp.text()
-        soup = BeautifulSoup(html, "html5lib")
-        report_link = soup.find("a", {"class": "header-right mt4 mr0"})
-        if not isinstance(report_link, Tag):
-            raise TypeError("Could not find user information")
-        report_link = report_link.get("href")
-        if not report_link:
-            raise RuntimeError("Could not find user information")
-        elif isinstance(report_link, list):
-            report_link = report_link[0]
-        user_id = re.search(r"id=(\d+)", report_link).group(1)  # type: ignore
-        image_div = soup.find("div", class_="user-image mb8")
-        if image_div:
-            image = image_div.find("img")
-            if isinstance(image, Tag):
-                image = image.get("data-src")
-            else:
-                image = None
-        else:
-            image = None
-
-        if isinstance(image, list):
-            image = image[0]
-
-        # Extract the relevant information
-        last_online = soup.find("span", class_="user-status-title", text="Last Online")
-        if last_online:
-            last_online = last_online.find_next("span", class_="user-status-data")
-            if not last_online:
-                raise RuntimeError("Could not find user information")
-            last_online = last_online.text.strip()
-            if last_online == "Now":
-                last_online = datetime.now(timezone.utc)
-            else:
-                last_online += " -0700"
-                activity = last_online.split(", ")
-                date_format = "%b %d, %Y %H:%M %p %z"
-                match activity[0]:
-                    case "Today":
-                        today_str = datetime.now(timezone.utc).strftime("%b %d, %Y")
-                        last_online = datetime.strptime(
-                            f"{today_str} {activity[1]}", date_format
-                        ).replace(tzinfo=timezone.utc)
-                        # last_online -= timedelta(days=1)
-                    case "Yesterday":
-                        yesterday_str = (
-                            datetime.now(timezone.utc) - timedelta(days=1)
-                        ).strftime("%b %d, %Y")
-                        last_online = datetime.strptime(
-                            f"{yesterday_str} {activity[1]}", date_format
-                        ).replace(tzinfo=timezone.utc)
-                        # last_online -= timedelta(days=1)
-                    case _:
-                        if len(activity) == 2:
-                            # check if in activity[1] has a year after the comma
-                            date_split = activity[1].split(" ")
-                            if re.match(r"\d{4}", date_split[0]) is not None:
-                                last_online = datetime.strptime(
-                                    f"{activity[0]}, {activity[1]}", date_format
-                                ).replace(tzinfo=timezone.utc)
-                            else:
-                                current_year = datetime.now(timezone.utc).year
-                                last_online = datetime.strptime(
-                                    f"{activity[0]}, {current_year} {activity[1]}",
-                                    date_format,
-                                ).replace(tzinfo=timezone.utc)
-                        else:
-                            # handle relative time like 1 hour ago
-                            regex = r"(\d+) (\w+) ago"
-                            matching = re.search(regex, activity[0])
-                            # get time
-                            time_value: int = int(matching.group(1))  # type: ignore
-                            # get unit
-                            time_unit: str = matching.group(2)  # type: ignore
-                            # add s to the unit if it is not already there
-                            if not time_unit.endswith("s"):
-                                time_unit += "s"
-                            # convert to timedelta
-                            time_delta = timedelta(**{time_unit: time_value})
-                            # get the current time
-                            current_time = datetime.now(timezone.utc)
-                            last_online = current_time - time_delta
+        # parsing is CPU bound, keep it off the event loop
+        return await asyncio.to_thread(self.parse_user, html, username)
+
+    def parse_user(
+        self,
+        html: str,
+        username: str,
+        engine: Literal["fast", "soup"] = "fast",
+    ) -> JikanUserStruct:
+        """
+        Parse user information from a profile page
+
+        Args:
+            html (str): Profile page HTML
+            username (str): Username
+            engine (Literal["fast", "soup"], optional): Extraction engine, "soup" parses the whole page with html5lib. Defaults to "fast".
+
+        Raises:
+            TypeError: User information is missing from the page
+
+        Returns:
+            JikanUserStruct: User information
+        """
+        if engine == "soup":
+            fields = extract_profile_fields_soup(html)
         else:
-            last_online = None
+            fields = extract_profile_fields(html)
+        if not fields.report_link:
+            raise TypeError("Could not find user information")
+        user_id = re.search(r"id=(\d+)", fields.report_link).group(1)  # type: ignore
+        image = fields.image
+        statuses = fields.statuses
 
-        gender: str | None = None
-        gender_find = soup.find("span", class_="user-status-title", text="Gender")
-        if gender_find:
-            gender_find = gender_find.find_next("span", class_="user-status-data")
-            if gender_find:
-                gender = gender_find.text.strip()
+        last_online: datetime | None = None
+        if "Last Online" in statuses:
+            last_online = _parse_last_online(statuses["Last Online"])
 
-        birthday: datetime | None = None
-        birthday_find = soup.find("span", class_="user-status-title", text="Birthday")
-        if birthday_find:
-            birthday_find = birthday_find.find_next("span", class_="user-status-data")
-            if birthday_find:
-                birthday_str = birthday_find.text.strip()
-                try:
-                    birthday = datetime.strptime(birthday_str, "%b %d, %Y").replace(
-                        tzinfo=timezone.utc
-                    )
-                except ValueError:
-                    birthday = None
-
-        location = None
-        location_find = soup.find("span", class_="user-status-title", text="Location")
-        if location_find:
-            location_find = location_find.find_next("span", class_="user-status-data")
-            if location_find:
-                location = location_find.text.strip()
+        gender: str | None = statuses.get("Gender")
 
-        joined = None
-        joined_find = soup.find("span", class_="user-status-title", text="Joined")
-        if joined_find:
-            joined_find = joined_find.find_next("span", class_="user-status-data")
-            if joined_find:
-                joined_find = joined_find.text.strip()
-                joined = datetime.strptime(joined_find, "%b %d, %Y").replace(
+        birthday: datetime | None = None
+        if "Birthday" in statuses:
+            try:
+                birthday = datetime.strptime(statuses["Birthday"], "%b %d, %Y").replace(
                     tzinfo=timezone.utc
                 )
+            except ValueError:
+                birthday = None
+
+        location = statuses.get("Location")
+
+        joined = None
+        if "Joined" in statuses:
+            joined = datetime.strptime(statuses["Joined"], "%b %d, %Y").replace(
+                tzinfo=timezone.utc
+            )
 
         user = JikanUserStruct(
             mal_id=int(user_id),
@@ -203,3 +379,11 @@ class HtmlMyAnimeList:
         )
 
         return user
+
+
+__all__ = [
+    "HtmlMyAnimeList",
+    "ProfileFields",
+    "extract_profile_fields",
+    "extract_profile_fields_soup",
+]
@@ -2,6 +2,7 @@
 
 import asyncio
 import traceback
+from collections.abc import AsyncIterator
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Any, Literal
@@ -9,11 +10,17 @@ from typing import Any, Literal
 from aiohttp import ClientSession
 
 from classes.cache import Caching
+from classes.decoder import DecoderRegistry
 from classes.excepts import ProviderHttpError
 from modules.const import JIKAN_URL, USER_AGENT
 
 Cache = Caching(cache_directory="cache/jikan", cache_expiration_time=86400)
 
+PAGE_CONCURRENCY = 3
+"""Paginated requests in flight at once, Jikan allows 3 per second"""
+PAGE_INTERVAL = 3.0
+"""Seconds a paginated request holds its slot, keeping under 60 per minute"""
+
 
 class JikanException(Exception):
     """Exception for Jikan errors"""
@@ -28,7 +35,7 @@ class JikanException(Exception):
         return f"JikanException [{self.status_code}]: {self.message}"
 
 
-@dataclass
+@dataclass(slots=True)
 class JikanImageStruct:
     """Jikan Image Struct"""
 
@@ -44,7 +51,7 @@ class JikanImageStruct:
     """Maximum size image url (usually used for backgrounds)"""
 
 
-@dataclass
+@dataclass(slots=True)
 class JikanImages:
     """Jikan Images Type"""
 
@@ -54,7 +61,7 @@ class JikanImages:
     """WebP image"""
 
 
-@dataclass
+@dataclass(slots=True)
 class JikanTrailerStruct:
     """Jikan Trailer Struct"""
 
@@ -68,7 +75,7 @@ class JikanTrailerStruct:
     """Images of the trailer"""
 
 
-@dataclass
+@dataclass(slots=True)
 class JikanTitlesStruct:
     """Jikan Titles Struct"""
 
@@ -93,7 +100,7 @@ class JikanTitlesStruct:
     """Title"""
 
 
-@dataclass
+@dataclass(slots=True)
 class JikanPropStruct:
     """Jikan Date Property Struct"""
 
@@ -105,7 +112,7 @@ class JikanPropStruct:
     """Year"""
 
 
-@dataclass
+@dataclass(slots=True)
 class JikanPropParentStruct:
     """Jikan Date Property Parent Struct"""
 
@@ -116,7 +123,7 @@ class JikanPropParentStruct:
     """Properties of the end date"""
 
 
-@dataclass
+@dataclass(slots=True)
 class JikanDateStruct:
     """Jikan Date Struct"""
 
@@ -131,7 +138,7 @@ class JikanDateStruct:
     """Date as a string"""
 
 
-@dataclass
+@dataclass(slots=True)
 class JikanBroadcastStruct:
     """Jikan Broadcast Struct"""
 
@@ -156,7 +163,7 @@ class JikanBroadcastStruct:
     """Broadcast as a string"""
 
 
-@dataclass
+@dataclass(slots=True)
 class JikanOtherStruct:
     """Jikan Other Struct"""
 
@@ -170,7 +177,7 @@ class JikanOtherStruct:
     """URL of the entry"""
 
 
-@dataclass
+@dataclass(slots=True)
 class JikanRelationStruct:
     """Jikan Relation Struct"""
 
@@ -180,7 +187,7 @@ class JikanRelationStruct:
     """Entry"""
 
 
-@dataclass
+@dataclass(slots=True)
 class JikanThemeSongStruct:
     """Jikan Theme Song Struct"""
 
@@ -190,7 +197,7 @@ class JikanThemeSongStruct:
     """List of ending songs"""
 
 
-@dataclass
+@dataclass(slots=True)
 class JikanExternalStruct:
     """Jikan External Struct"""
 
@@ -200,7 +207,7 @@ class JikanExternalStruct:
     """URL of the external site"""
 
 
-@dataclass
+@dataclass(slots=True)
 class JikanAnimeStruct:
     """Jikan Anime Struct"""
 
@@ -311,7 +318,7 @@ class JikanAnimeStruct:
     """List of streaming sites"""
 
 
-@dataclass
+@dataclass(slots=True)
 class JikanStatisticsStruct:
     """Jikan Statistics Struct"""
 
@@ -327,7 +334,7 @@ class JikanStatisticsStruct:
     """Total number of entries listed"""
 
 
-@dataclass
+@dataclass(slots=True)
 class JikanAnimeStatisticStruct(JikanStatisticsStruct):
     """Jikan Anime Statistics Struct"""
 
@@ -343,7 +350,7 @@ class JikanAnimeStatisticStruct(JikanStatisticsStruct):
     """Number of episodes watched"""
 
 
-@dataclass
+@dataclass(slots=True)
 class JikanMangaStatisticStruct(JikanStatisticsStruct):
     """Jikan Manga Statistics Struct"""
 
@@ -361,7 +368,7 @@ class JikanMangaStatisticStruct(JikanStatisticsStruct):
     """Number of volumes read"""
 
 
-@dataclass
+@dataclass(slots=True)
 class JikanStatistics:
     """Jikan Statistics"""
 
@@ -371,7 +378,7 @@ class JikanStatistics:
     """Manga statistics"""
 
 
-@dataclass
+@dataclass(slots=True)
 class JikanUserTitleStruct:
     """Jikan User Title Struct"""
 
@@ -383,7 +390,7 @@ class JikanUserTitleStruct:
     """Images of the entry"""
 
 
-@dataclass
+@dataclass(slots=True)
 class JikanUserAniMangaStruct(JikanUserTitleStruct):
     """Jikan User Anime/Manga Struct"""
 
@@ -395,7 +402,7 @@ class JikanUserAniMangaStruct(JikanUserTitleStruct):
     """Start year of the entry"""
 
 
-@dataclass
+@dataclass(slots=True)
 class JikanUserCastStruct(JikanUserTitleStruct):
     """Jikan User Cast Struct"""
 
@@ -403,7 +410,7 @@ class JikanUserCastStruct(JikanUserTitleStruct):
     """Name of the person/character"""
 
 
-@dataclass
+@dataclass(slots=True)
 class JikanUpdateEntry:
     """Jikan Update Entry"""
 
@@ -417,7 +424,7 @@ class JikanUpdateEntry:
     """Date of the update"""
 
 
-@dataclass
+@dataclass(slots=True)
 class JikanAnimeUpdateEntry(JikanUpdateEntry):
     """Jikan Anime Update Entry"""
 
@@ -427,7 +434,7 @@ class JikanAnimeUpdateEntry(JikanUpdateEntry):
     """Total number of episodes"""
 
 
-@dataclass
+@dataclass(slots=True)
 class JikanMangaUpdateEntry(JikanUpdateEntry):
     """Jikan Manga Update Entry"""
 
@@ -437,7 +444,7 @@ class JikanMangaUpdateEntry(JikanUpdateEntry):
     """Total number of chapters"""
 
 
-@dataclass
+@dataclass(slots=True)
 class JikanUserFavorite:
     """Jikan User Favorite"""
 
@@ -451,7 +458,7 @@ class JikanUserFavorite:
     """List of favorite people"""
 
 
-@dataclass
+@dataclass(slots=True)
 class JikanUserStatus:
     """Jikan User Status"""
 
@@ -461,7 +468,7 @@ class JikanUserStatus:
     """List of manga updates"""
 
 
-@dataclass
+@dataclass(slots=True)
 class JikanUserStruct:
     """Jikan User Struct"""
 
@@ -495,6 +502,36 @@ class JikanUserStruct:
     """External links of the user"""
 
 
+def _parse_datetime(value: str) -> datetime:
+    """Parse an ISO 8601 timestamp returned by Jikan"""
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return datetime.strptime(value, "%Y-%m-%dT%H:%M:%S%z")
+
+
+decoders = DecoderRegistry(type_hooks={datetime: _parse_datetime})
+"""Compiled decoders of Jikan structs"""
+
+decode_trailer = decoders.register(
+    JikanTrailerStruct,
+    # trailer thumbnails are a flat set of sizes, not a jpg/webp pair
+    hooks={"images": decoders.decoder(JikanImageStruct)},
+)
+decode_anime = decoders.register(
+    JikanAnimeStruct,
+    hooks={
+        "trailer": lambda value: (
+            [decode_trailer(trailer) for trailer in value]
+            if isinstance(value, list)
+            else decode_trailer(value)
+        ),
+        "theme": decoders.decoder(JikanThemeSongStruct),
+    },
+)
+decode_user = decoders.register(JikanUserStruct, lazy=["favorites", "updates"])
+
+
 def define_jikan_exception(error_code: int, error_message: Any) -> None:
     """
     Define Jikan Exception
@@ -545,11 +582,17 @@ Full message:```
 class JikanApi:
     """Jikan API wrapper"""
 
-    def __init__(self):
-        """Init"""
+    def __init__(self, page_interval: float = PAGE_INTERVAL):
+        """
+        Init
+
+        Args:
+            page_interval (float, optional): Seconds a paginated request holds its slot. Defaults to PAGE_INTERVAL.
+        """
         self.base_url = JIKAN_URL
         self.session = None
         self.user_agent = ""
+        self.page_interval = page_interval
 
     async def __aenter__(self):
         """Enter the session"""
@@ -575,274 +618,98 @@ class JikanApi:
         Returns:
             JikanAnimeStruct: Anime dataclass
         """
-        if data.get("images", None):
-            data["images"]["jpg"] = JikanImageStruct(**data["images"]["jpg"])
-            data["images"]["webp"] = JikanImageStruct(**data["images"]["webp"])
-            data["images"] = JikanImages(**data["images"])
-
-        if data.get("trailer", None):
-            data["trailer"]["images"] = JikanImageStruct(**data["trailer"]["images"])
-            data["trailer"] = JikanTrailerStruct(**data["trailer"])
-
-        if data.get("titles", None):
-            data["titles"] = [
-                JikanTitlesStruct(
-                    type=title["type"],
-                    title=title["title"],
-                )
-                for title in data["titles"]
-            ]
-
-        if data.get("aired", None):
-            data["aired"]["prop"]["from_"] = data["aired"]["prop"]["from"]
-            data["aired"]["prop"]["from_"] = JikanPropStruct(
-                **data["aired"]["prop"]["from_"]
-            )
-            del data["aired"]["prop"]["from"]
-            data["aired"]["prop"]["to"] = data["aired"]["prop"]["to"]
-            data["aired"]["prop"]["to"] = JikanPropStruct(**data["aired"]["prop"]["to"])
-            data["aired"]["prop"] = JikanPropParentStruct(**data["aired"]["prop"])
-            if data["aired"].get("from", None):
-                data["aired"]["from_"] = datetime.strptime(
-                    data["aired"]["from"], "%Y-%m-%dT%H:%M:%S%z"
-                )
-            del data["aired"]["from"]
-            if data["aired"].get("to", None):
-                data["aired"]["to"] = datetime.strptime(
-                    data["aired"]["to"], "%Y-%m-%dT%H:%M:%S%z"
-                )
-            data["aired"] = JikanDateStruct(**data["aired"])
-
-        if data.get("broadcast", None):
-            data["broadcast"] = JikanBroadcastStruct(**data["broadcast"])
-
-        if data.get("producers", None):
-            data["producers"] = [
-                JikanOtherStruct(
-                    mal_id=producer["mal_id"],
-                    type=producer["type"],
-                    name=producer["name"],
-                    url=producer["url"],
-                )
-                for producer in data["producers"]
-            ]
-        if data.get("licensors", None):
-            data["licensors"] = [
-                JikanOtherStruct(
-                    mal_id=licensor["mal_id"],
-                    type=licensor["type"],
-                    name=licensor["name"],
-                    url=licensor["url"],
-                )
-                for licensor in data["licensors"]
-            ]
-        if data.get("studios", None):
-            data["studios"] = [
-                JikanOtherStruct(
-                    mal_id=studio["mal_id"],
-                    type=studio["type"],
-                    name=studio["name"],
-                    url=studio["url"],
-                )
-                for studio in data["studios"]
-            ]
-        if data.get("genres", None):
-            data["genres"] = [
-                JikanOtherStruct(
-                    mal_id=genre["mal_id"],
-                    type=genre["type"],
-                    name=genre["name"],
-                    url=genre["url"],
-                )
-                for genre in data["genres"]
-            ]
-        if data.get("explicit_genres", None):
-            data["explicit_genres"] = [
-                JikanOtherStruct(
-                    mal_id=genre["mal_id"],
-                    type=genre["type"],
-                    name=genre["name"],
-                    url=genre["url"],
-                )
-                for genre in data["explicit_genres"]
-            ]
-        if data.get("themes", None):
-            data["themes"] = [
-                JikanOtherStruct(
-                    mal_id=theme["mal_id"],
-                    type=theme["type"],
-                    name=theme["name"],
-                    url=theme["url"],
-                )
-                for theme in data["themes"]
-            ]
-        if data.get("demographics", None):
-            data["demographics"] = [
-                JikanOtherStruct(
-                    mal_id=demographic["mal_id"],
-                    type=demographic["type"],
-                    name=demographic["name"],
-                    url=demographic["url"],
-                )
-                for demographic in data["demographics"]
-            ]
-
-        if data.get("relations", None):
-            data["relations"] = [
-                JikanRelationStruct(
-                    relation=rel["relation"],
-                    entry=[
-                        JikanOtherStruct(
-                            mal_id=entry["mal_id"],
-                            type=entry["type"],
-                            name=entry["name"],
-                            url=entry["url"],
-                        )
-                        for entry in rel["entry"]
-                    ],
-                )
-                for rel in data["relations"]
-            ]
-
-        if data.get("theme", None):
-            data["theme"] = JikanThemeSongStruct(**data["theme"])
-
-        if data.get("external", None):
-            data["external"] = [
-                JikanExternalStruct(**external) for external in data["external"]
-            ]
-
-        if data.get("streaming", None):
-            data["streaming"] = [
-                JikanExternalStruct(**stream) for stream in data["streaming"]
-            ]
-
-        return JikanAnimeStruct(**data)
+        return decode_anime(data)
 
     @staticmethod
     def user_dict_to_dataclass(data: dict) -> JikanUserStruct:
         """
         Convert user dict to dataclass
 
+        Favorites and updates are decoded on first access, as only the
+        profile embed reads them.
+
         Args:
             data (dict): User dict
 
         Returns:
             JikanUserStruct: User dataclass
         """
-        if data["images"]:
-            data["images"]["jpg"] = JikanImageStruct(**data["images"]["jpg"])
-            data["images"]["webp"] = JikanImageStruct(**data["images"]["webp"])
-            data["images"] = JikanImages(**data["images"])
-
-        if data["last_online"]:
-            data["last_online"] = datetime.strptime(
-                data["last_online"], "%Y-%m-%dT%H:%M:%S%z"
-            )
-
-        if data["birthday"]:
-            data["birthday"] = datetime.strptime(
-                data["birthday"], "%Y-%m-%dT%H:%M:%S%z"
-            )
-
-        if data["joined"]:
-            data["joined"] = datetime.strptime(data["joined"], "%Y-%m-%dT%H:%M:%S%z")
-
-        if data["statistics"]:
-            if data["statistics"]["anime"]:
-                data["statistics"]["anime"] = JikanAnimeStatisticStruct(
-                    **data["statistics"]["anime"]
-                )
-            if data["statistics"]["manga"]:
-                data["statistics"]["manga"] = JikanMangaStatisticStruct(
-                    **data["statistics"]["manga"]
-                )
-            data["statistics"] = JikanStatistics(**data["statistics"])
-
-        if data["favorites"]:
-            if data["favorites"]["anime"]:
-                for anime in data["favorites"]["anime"]:
-                    anime["images"]["jpg"] = JikanImageStruct(**anime["images"]["jpg"])
-                    anime["images"]["webp"] = JikanImageStruct(
-                        **anime["images"]["webp"]
-                    )
-                    anime["images"] = JikanImages(**anime["images"])
-                data["favorites"]["anime"] = [
-                    JikanUserAniMangaStruct(**anime)
-                    for anime in data["favorites"]["anime"]
-                ]
-            if data["favorites"]["manga"]:
-                for manga in data["favorites"]["manga"]:
-                    manga["images"]["jpg"] = JikanImageStruct(**manga["images"]["jpg"])
-                    manga["images"]["webp"] = JikanImageStruct(
-                        **manga["images"]["webp"]
-                    )
-                    manga["images"] = JikanImages(**manga["images"])
-                data["favorites"]["manga"] = [
-                    JikanUserAniMangaStruct(**manga)
-                    for manga in data["favorites"]["manga"]
-                ]
-            if data["favorites"]["characters"]:
-                for character in data["favorites"]["characters"]:
-                    character["images"]["jpg"] = JikanImageStruct(
-                        **character["images"]["jpg"]
-                    )
-                    character["images"]["webp"] = JikanImageStruct(
-                        **character["images"]["webp"]
-                    )
-                    character["images"] = JikanImages(**character["images"])
-                data["favorites"]["characters"] = [
-                    JikanUserCastStruct(**character)
-                    for character in data["favorites"]["characters"]
-                ]
-            if data["favorites"]["people"]:
-                for person in data["favorites"]["people"]:
-                    person["images"]["jpg"] = JikanImageStruct(
-                        **person["images"]["jpg"]
-                    )
-                    person["images"] = JikanImages(**person["images"])
-                data["favorites"]["people"] = [
-                    JikanUserCastStruct(**person)
-                    for person in data["favorites"]["people"]
-                ]
-            data["favorites"] = JikanUserFavorite(**data["favorites"])
-
-        if data["updates"]:
-            if data["updates"]["anime"]:
-                for anime in data["updates"]["anime"]:
-                    anime["entry"]["images"]["jpg"] = JikanImageStruct(
-                        **anime["entry"]["images"]["jpg"]
-                    )
-                    anime["entry"]["images"]["webp"] = JikanImageStruct(
-                        **anime["entry"]["images"]["webp"]
-                    )
-                    anime["entry"]["images"] = JikanImages(**anime["entry"]["images"])
-                    anime["entry"] = JikanUserAniMangaStruct(**anime["entry"])
-                    anime["date"] = datetime.strptime(
-                        anime["date"], "%Y-%m-%dT%H:%M:%S%z"
-                    )
-                data["updates"]["anime"] = [
-                    JikanAnimeUpdateEntry(**anime) for anime in data["updates"]["anime"]
-                ]
-            if data["updates"]["manga"]:
-                for manga in data["updates"]["manga"]:
-                    manga["entry"]["images"]["jpg"] = JikanImageStruct(
-                        **manga["entry"]["images"]["jpg"]
-                    )
-                    manga["entry"]["images"]["webp"] = JikanImageStruct(
-                        **manga["entry"]["images"]["webp"]
-                    )
-                    manga["entry"]["images"] = JikanImages(**manga["entry"]["images"])
-                    manga["entry"] = JikanUserAniMangaStruct(**manga["entry"])
-                    manga["date"] = datetime.strptime(
-                        manga["date"], "%Y-%m-%dT%H:%M:%S%z"
-                    )
-                data["updates"]["manga"] = [
-                    JikanMangaUpdateEntry(**manga) for manga in data["updates"]["manga"]
-                ]
-            data["updates"] = JikanUserStatus(**data["updates"])
+        return decode_user(data)
+
+    async def _get_page(self, path: str, page: int) -> dict:
+        """
+        Get a page of a paginated endpoint
+
+        Args:
+            path (str): Endpoint path, relative to the base URL
+            page (int): Page number
+
+        Returns:
+            dict: The response, with `data` and `pagination`
+        """
+        async with self.session.get(
+            f"{self.base_url}/{path}", params={"page": page}
+        ) as resp:
+            if resp.status not in [200, 304]:
+                define_jikan_exception(resp.status, resp.reason)
+            return await resp.json()
+
+    async def iter_pages(
+        self,
+        path: str,
+        concurrency: int = PAGE_CONCURRENCY,
+        interval: float | None = None,
+    ) -> AsyncIterator[list[dict]]:
+        """
+        Iterate the entries of a paginated endpoint, one page at a time
 
-        return JikanUserStruct(**data)
+        The first page tells how many pages there are; the others are fetched
+        concurrently, at most `concurrency` requests every `interval` seconds,
+        and yielded as they arrive, not in page order. A request keeps its
+        slot for `interval` seconds after it started, but its page is yielded
+        right away. Pages still pending when the caller stops iterating are
+        cancelled.
+
+        Args:
+            path (str): Endpoint path, relative to the base URL
+            concurrency (int, optional): Requests in flight at once. Defaults to PAGE_CONCURRENCY.
+            interval (float | None, optional): Seconds each request holds its slot. Defaults to None, the instance `page_interval`.
+
+        Yields:
+            list[dict]: Entries of a page
+        """
+        interval = self.page_interval if interval is None else interval
+        loop = asyncio.get_running_loop()
+        slots = asyncio.Semaphore(concurrency)
+
+        async def fetch(page: int) -> dict:
+            await slots.acquire()
+            release = True
+            try:
+                return await self._get_page(path, page)
+            except asyncio.CancelledError:
+                # nothing is waiting on the rate anymore
+                slots.release()
+                release = False
+                raise
+            finally:
+                if release:
+                    # hold the slot without delaying the page
+                    loop.call_later(interval, slots.release)
+
+        first = await fetch(1)
+        yield first["data"]
+        last_page: int = first["pagination"]["last_visible_page"]
+        if last_page < 2:
+            return
+        tasks = [asyncio.create_task(fetch(page)) for page in range(2, last_page + 1)]
+        try:
+            for task in asyncio.as_completed(tasks):
+                yield (await task)["data"]
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
 
     async def get_user_clubs(self, username: str) -> list[dict]:
         """
@@ -855,33 +722,57 @@ class JikanApi:
             list[dict]: List of clubs
         """
         try:
-            resp_data: dict = {}
-            async with self.session.get(
-                f"{self.base_url}/users/{username}/clubs"
-            ) as resp:
-                if resp.status in [200, 304]:
-                    resp_data = await resp.json()
-                else:
-                    define_jikan_exception(resp.status, resp.reason)
-            clubs: list = resp_data["data"]
-            paging: int = resp_data["pagination"]["last_visible_page"]
-            if paging > 1:
-                for i in range(2, paging + 1):
-                    params = {"page": i}
-                    async with self.session.get(
-                        f"{self.base_url}/users/{username}/clubs", params=params
-                    ) as resp:
-                        if resp.status in [200, 304]:
-                            respd2: dict = await resp.json()
-                            clubs.extend(respd2["data"])
-                            await asyncio.sleep(2)
-                        else:
-                            define_jikan_exception(resp.status, resp.reason)
+            clubs: list[dict] = []
+            async for page in self.iter_pages(f"users/{username}/clubs"):
+                clubs.extend(page)
             return clubs
         # pylint: disable-next=broad-except
         except Exception as error:  # noqa: BLE001
             define_jikan_exception(601, error)
 
+    async def user_in_club(self, username: str, club_id: int) -> bool:
+        """
+        Check if a user joined a club, stopping at the page listing it
+
+        Args:
+            username (str): MyAnimeList username
+            club_id (int): MyAnimeList club ID
+
+        Returns:
+            bool: True if the user is a member of the club
+        """
+        try:
+            pages = self.iter_pages(f"users/{username}/clubs")
+            try:
+                async for page in pages:
+                    if any(str(club["mal_id"]) == str(club_id) for club in page):
+                        return True
+            finally:
+                await pages.aclose()
+            return False
+        # pylint: disable-next=broad-except
+        except Exception as error:  # noqa: BLE001
+            define_jikan_exception(601, error)
+
+    async def get_club_members(self, club_id: int) -> list[str]:
+        """
+        Get usernames of every member of a club
+
+        Args:
+            club_id (int): MyAnimeList club ID
+
+        Returns:
+            list[str]: Usernames of the members
+        """
+        try:
+            members: list[str] = []
+            async for page in self.iter_pages(f"clubs/{club_id}/members"):
+                members.extend(member["username"] for member in page)
+            return members
+        # pylint: disable-next=broad-except
+        except Exception as error:  # noqa: BLE001
+            define_jikan_exception(601, error)
+
     async def get_user_data(self, username: str) -> JikanUserStruct:
         """
         Get user data
@@ -955,18 +846,21 @@ class JikanApi:
         gud = await self.get_user_data(res)
         return gud
 
-    async def get_anime_data(self, anime_id: int) -> JikanAnimeStruct:
+    async def get_anime_data(
+        self, anime_id: int, max_age: float | None = None
+    ) -> JikanAnimeStruct:
         """
         Get anime data
 
         Args:
             anime_id (int): MyAnimeList anime ID
+            max_age (float | None, optional): Seconds a cached response is served for, an older one is only replaced once the new one arrives. Defaults to None, the cache expiration time.
 
         Returns:
             dict: Anime data
         """
         cache_file_path = Cache.get_cache_file_path(f"anime/{anime_id}.json")
-        cached_file = Cache.read_cached_data(cache_file_path)
+        cached_file = Cache.read_cached_data(cache_file_path, max_age)
         if cached_file:
             return self.anime_dict_to_dataclass(cached_file)
         try:
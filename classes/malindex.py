@@ -0,0 +1,336 @@
+import csv
+import random
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable
+from dataclasses import dataclass
+from threading import Lock
+
+MAL_INDEX_PATH = "database/mal.csv"
+"""Default path of the MAL title index generated by malIndexer"""
+
+_SEPARATOR = "\x00"
+_random = random.SystemRandom()
+
+
+@dataclass
+class MalIndexEntry:
+    """MAL Title Index Entry"""
+
+    mal_id: int
+    """MyAnimeList ID of the title"""
+    title: str
+    """Title of the anime"""
+
+
+class _PackedStrings:
+    """Read-only sequence of strings packed in one buffer with an offsets array"""
+
+    __slots__ = ("buffer", "offsets")
+
+    def __init__(self, strings: Iterable[str]):
+        offsets = array("q", [0])
+        parts: list[str] = []
+        position = 0
+        for string in strings:
+            parts.append(string)
+            position += len(string) + 1
+            offsets.append(position)
+        self.buffer = _SEPARATOR.join(parts) + (_SEPARATOR if parts else "")
+        self.offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, row: int) -> str:
+        return self.buffer[self.offsets[row] : self.offsets[row + 1] - 1]
+
+    def find_all(self, needle: str) -> Iterable[int]:
+        """
+        Yield every row containing the needle, in row order
+
+        Args:
+            needle (str): String to find, must not contain the separator
+
+        Yields:
+            int: Row number
+        """
+        position = self.buffer.find(needle)
+        while position != -1:
+            row = bisect_right(self.offsets, position) - 1
+            yield row
+            # skip the rest of this row
+            position = self.buffer.find(needle, self.offsets[row + 1])
+
+
+class _SortedView:
+    """Sequence view of packed strings in sorted order, used for bisect"""
+
+    __slots__ = ("order", "strings")
+
+    def __init__(self, strings: _PackedStrings, order: array):
+        self.strings = strings
+        self.order = order
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def __getitem__(self, position: int) -> str:
+        return self.strings[self.order[position]]
+
+
+class MalTitleIndex:
+    """
+    In-memory, read-only MyAnimeList title index built from `database/mal.csv`
+
+    IDs are stored in a packed `array`, while titles are stored in a single
+    string buffer with an offsets array, so the whole index costs a handful of
+    Python objects regardless of how many titles it holds.
+
+    ## Usage
+
+    >>> from classes.malindex import get_mal_index
+    >>> index = get_mal_index()
+    >>> index.random_id()
+    5114
+    >>> index.search("fullmetal")
+    [MalIndexEntry(mal_id=121, title='Fullmetal Alchemist'), ...]
+    """
+
+    __slots__ = ("folded", "ids", "sorted_rows", "titles")
+
+    def __init__(self, rows: Iterable[tuple[int, str]]):
+        """
+        Initialize the index
+
+        Args:
+            rows (Iterable[tuple[int, str]]): `(mal_id, title)` pairs to index
+        """
+        ids = array("q")
+        titles: list[str] = []
+        for mal_id, title in rows:
+            ids.append(int(mal_id))
+            titles.append(title.replace(_SEPARATOR, ""))
+        folded = [title.casefold() for title in titles]
+        self.ids = ids
+        """MAL IDs, one per row"""
+        self.titles = _PackedStrings(titles)
+        """Titles, one per row"""
+        self.folded = _PackedStrings(folded)
+        """Casefolded titles, one per row"""
+        self.sorted_rows = array(
+            "q", sorted(range(len(folded)), key=folded.__getitem__)
+        )
+        """Row numbers sorted by casefolded title"""
+
+    @classmethod
+    def from_file(cls, path: str = MAL_INDEX_PATH) -> "MalTitleIndex":
+        """
+        Build the index from a TSV file with `mal_id` and `title` columns
+
+        Args:
+            path (str, optional): Path to the TSV file. Defaults to MAL_INDEX_PATH.
+
+        Returns:
+            MalTitleIndex: The loaded index
+        """
+        with open(path, "r", encoding="utf-8", newline="") as file:
+            reader = csv.reader(file, delimiter="\t")
+            header = next(reader, None)
+            if header is None:
+                return cls([])
+            id_col = header.index("mal_id")
+            title_col = header.index("title")
+            return cls(
+                (int(row[id_col]), row[title_col])
+                for row in reader
+                if row and row[id_col]
+            )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def entry_at(self, row: int) -> MalIndexEntry:
+        """
+        Get an entry stored in a row
+
+        Args:
+            row (int): Row number
+
+        Returns:
+            MalIndexEntry: The entry
+        """
+        return MalIndexEntry(mal_id=self.ids[row], title=self.titles[row])
+
+    def random_id(self) -> int:
+        """
+        Pick a random MAL ID from the index
+
+        Raises:
+            IndexError: The index is empty
+
+        Returns:
+            int: MAL ID of a random anime
+        """
+        if not self.ids:
+            raise IndexError("MAL title index is empty")
+        return self.ids[_random.randrange(len(self.ids))]
+
+    def prefix_search(self, query: str, limit: int = 5) -> list[MalIndexEntry]:
+        """
+        Search titles starting with the query, case insensitive
+
+        Args:
+            query (str): Title prefix
+            limit (int, optional): Maximum number of results. Defaults to 5.
+
+        Returns:
+            list[MalIndexEntry]: Matching entries, sorted by title
+        """
+        query = query.casefold().strip()
+        if not query:
+            return []
+        view = _SortedView(self.folded, self.sorted_rows)
+        start = bisect_left(view, query)
+        end = min(bisect_right(view, query + "\U0010ffff", lo=start), start + limit)
+        return [self.entry_at(self.sorted_rows[i]) for i in range(start, end)]
+
+    def substring_search(
+        self, query: str, limit: int = 5, exclude: set[int] | None = None
+    ) -> list[MalIndexEntry]:
+        """
+        Search titles containing the query, case insensitive
+
+        Args:
+            query (str): Title fragment
+            limit (int, optional): Maximum number of results. Defaults to 5.
+            exclude (set[int] | None, optional): MAL IDs to skip. Defaults to None.
+
+        Returns:
+            list[MalIndexEntry]: Matching entries, in index order
+        """
+        query = query.casefold().strip()
+        exclude = exclude or set()
+        if not query or _SEPARATOR in query or limit <= 0:
+            return []
+        results: list[MalIndexEntry] = []
+        for row in self.folded.find_all(query):
+            if self.ids[row] in exclude:
+                continue
+            results.append(self.entry_at(row))
+            if len(results) >= limit:
+                break
+        return results
+
+    def fuzzy_search(
+        self, query: str, limit: int = 5, cutoff: int = 70
+    ) -> list[MalIndexEntry]:
+        """
+        Search titles with fuzzy matching, slowest of all search strategies
+
+        Args:
+            query (str): Title to search
+            limit (int, optional): Maximum number of results. Defaults to 5.
+            cutoff (int, optional): Minimum similarity score, 0-100. Defaults to 70.
+
+        Returns:
+            list[MalIndexEntry]: Matching entries, best match first
+        """
+        # imported lazily, fuzzy search is only a last resort
+        from fuzzywuzzy import fuzz, process  # type: ignore
+
+        query = query.casefold().strip()
+        if not query or limit <= 0:
+            return []
+        choices = {row: self.folded[row] for row in range(len(self.ids))}
+        matches = process.extractBests(
+            query,
+            choices,
+            processor=None,
+            scorer=fuzz.WRatio,
+            score_cutoff=cutoff,
+            limit=limit,
+        )
+        return [self.entry_at(row) for _, _, row in matches]
+
+    def search(self, query: str, limit: int = 5) -> list[MalIndexEntry]:
+        """
+        Search titles locally, trying prefix, substring, then fuzzy matches
+
+        Args:
+            query (str): Title to search
+            limit (int, optional): Maximum number of results. Defaults to 5.
+
+        Returns:
+            list[MalIndexEntry]: Matching entries
+        """
+        results = self.prefix_search(query, limit)
+        seen = {entry.mal_id for entry in results}
+        if len(results) < limit:
+            results += self.substring_search(query, limit - len(results), seen)
+            seen.update(entry.mal_id for entry in results)
+        if len(results) < limit:
+            for entry in self.fuzzy_search(query, limit):
+                if entry.mal_id in seen:
+                    continue
+                results.append(entry)
+                seen.add(entry.mal_id)
+                if len(results) >= limit:
+                    break
+        return results
+
+
+_index: MalTitleIndex | None = None
+_index_lock = Lock()
+
+
+def get_mal_index(path: str = MAL_INDEX_PATH) -> MalTitleIndex:
+    """
+    Get the process-wide MAL title index, loading it on first use
+
+    Args:
+        path (str, optional): Path to the TSV file. Defaults to MAL_INDEX_PATH.
+
+    Returns:
+        MalTitleIndex: The loaded index
+    """
+    index = _index
+    if index is None:
+        with _index_lock:
+            index = _index
+            if index is None:
+                index = _swap_index(MalTitleIndex.from_file(path))
+    return index
+
+
+def reload_mal_index(path: str = MAL_INDEX_PATH) -> MalTitleIndex:
+    """
+    Rebuild the MAL title index from disk and swap it in atomically
+
+    Readers holding the old index keep using it until they finish.
+
+    Args:
+        path (str, optional): Path to the TSV file. Defaults to MAL_INDEX_PATH.
+
+    Returns:
+        MalTitleIndex: The new index
+    """
+    index = MalTitleIndex.from_file(path)
+    with _index_lock:
+        return _swap_index(index)
+
+
+def _swap_index(index: MalTitleIndex) -> MalTitleIndex:
+    """Replace the process-wide index, caller must hold the lock"""
+    global _index  # pylint: disable=global-statement
+    _index = index
+    return index
+
+
+__all__ = [
+    "MAL_INDEX_PATH",
+    "MalIndexEntry",
+    "MalTitleIndex",
+    "get_mal_index",
+    "reload_mal_index",
+]
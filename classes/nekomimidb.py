@@ -1,12 +1,18 @@
+import csv
+import random
+from array import array
 from dataclasses import dataclass
 from enum import Enum
+from threading import Lock
 from typing import Literal
 
-import pandas as pd
-
-from modules.commons import get_random_seed
 from modules.platforms import Platform
 
+NEKOMIMI_DB_PATH = "database/nekomimiDb.tsv"
+"""Default path of nekomimiDb index downloaded by getNekomimi"""
+
+_random = random.SystemRandom()
+
 
 class NekomimiGender(Enum):
     """Supported NekomimiGender Enum"""
@@ -39,6 +45,136 @@ class NekomimiDbStruct:
     """NekomimiGender of featured character(s)"""
 
 
+class NekomimiDataset:
+    """
+    In-memory nekomimiDb dataset, with row indexes pre-partitioned per gender
+
+    Rows are kept as tuples in file column order, the dataset is read-only
+    once built and replaced as a whole when the file is refreshed.
+    """
+
+    __slots__ = ("by_gender", "rows")
+
+    COLUMNS = (
+        "id",
+        "imageUrl",
+        "artist",
+        "artistUrl",
+        "platform",
+        "imageSourceUrl",
+        "mediaSource",
+        "girlOrBoy",
+    )
+    """Columns read from the dataset, in tuple order"""
+
+    def __init__(self, rows: list[tuple[str, ...]]):
+        """
+        Initialize the dataset
+
+        Args:
+            rows (list[tuple[str, ...]]): Rows with values ordered as `COLUMNS`
+        """
+        self.rows = rows
+        """All rows of the dataset"""
+        self.by_gender: dict[str, array] = {
+            gender.value: array("l") for gender in NekomimiGender
+        }
+        """Row numbers of each gender, keyed by NekomimiGender value"""
+        gender_col = self.COLUMNS.index("girlOrBoy")
+        for number, row in enumerate(rows):
+            bucket = self.by_gender.get(row[gender_col])
+            if bucket is not None:
+                bucket.append(number)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    @classmethod
+    def from_file(cls, path: str = NEKOMIMI_DB_PATH) -> "NekomimiDataset":
+        """
+        Load the dataset from nekomimiDb TSV file
+
+        Args:
+            path (str, optional): Path to the TSV file. Defaults to NEKOMIMI_DB_PATH.
+
+        Returns:
+            NekomimiDataset: The loaded dataset
+        """
+        with open(path, "r", encoding="utf-8", newline="") as file:
+            reader = csv.DictReader(file, delimiter="\t")
+            rows = [
+                tuple(row.get(column) or "" for column in cls.COLUMNS) for row in reader
+            ]
+        return cls(rows)
+
+    def pick(self, gender: str | None = None) -> tuple[str, ...]:
+        """
+        Pick a random row, optionally from a gender
+
+        Args:
+            gender (str | None, optional): NekomimiGender value to pick from. Defaults to None.
+
+        Raises:
+            IndexError: No row matches the gender
+
+        Returns:
+            tuple[str, ...]: The picked row
+        """
+        if gender is None:
+            if not self.rows:
+                raise IndexError("nekomimiDb is empty")
+            return self.rows[_random.randrange(len(self.rows))]
+        bucket = self.by_gender.get(gender)
+        if not bucket:
+            raise IndexError(f"nekomimiDb has no image for gender {gender}")
+        return self.rows[bucket[_random.randrange(len(bucket))]]
+
+
+_dataset: NekomimiDataset | None = None
+_dataset_lock = Lock()
+
+
+def get_nekomimi_dataset(path: str = NEKOMIMI_DB_PATH) -> NekomimiDataset:
+    """
+    Get the process-wide nekomimiDb dataset, loading it on first use
+
+    Args:
+        path (str, optional): Path to the TSV file. Defaults to NEKOMIMI_DB_PATH.
+
+    Returns:
+        NekomimiDataset: The loaded dataset
+    """
+    dataset = _dataset
+    if dataset is None:
+        with _dataset_lock:
+            dataset = _dataset
+            if dataset is None:
+                dataset = _swap_dataset(NekomimiDataset.from_file(path))
+    return dataset
+
+
+def reload_nekomimi_dataset(path: str = NEKOMIMI_DB_PATH) -> NekomimiDataset:
+    """
+    Reload the nekomimiDb dataset from disk and swap it in atomically
+
+    Args:
+        path (str, optional): Path to the TSV file. Defaults to NEKOMIMI_DB_PATH.
+
+    Returns:
+        NekomimiDataset: The new dataset
+    """
+    dataset = NekomimiDataset.from_file(path)
+    with _dataset_lock:
+        return _swap_dataset(dataset)
+
+
+def _swap_dataset(dataset: NekomimiDataset) -> NekomimiDataset:
+    """Replace the process-wide dataset, caller must hold the lock"""
+    global _dataset  # pylint: disable=global-statement
+    _dataset = dataset
+    return dataset
+
+
 class NekomimiDb:
     """
     # nattadasu/nekomimiDb Official Class for Ryuuzaki Ryuusei
@@ -68,29 +204,42 @@ class NekomimiDb:
             self.gender = gender.value
         else:
             self.gender = gender
-        self.seed = get_random_seed()
-        self.nmDb = pd.read_csv("database/nekomimiDb.tsv", sep="\t").fillna("")
+        self.nmDb = get_nekomimi_dataset()
 
     def get_random_nekomimi(self) -> NekomimiDbStruct:
         """
         Get a random nekomimi image from the database
 
         Returns:
-            Series: a random row from the database
+            NekomimiDbStruct: a random row from the database
         """
-        if self.gender is not None:
-            query = self.nmDb[self.nmDb["girlOrBoy"] == self.gender]
-        else:
-            query = self.nmDb
-        # get a random row from the query
-        row = query.sample(n=1, random_state=self.seed)
+        (
+            id_,
+            image_url,
+            artist,
+            artist_url,
+            platform,
+            image_source_url,
+            media_source,
+            gender,
+        ) = self.nmDb.pick(self.gender)
         return NekomimiDbStruct(
-            id=row["id"].values[0],
-            imageUrl=row["imageUrl"].values[0],
-            artist=row["artist"].values[0],
-            artistUrl=row["artistUrl"].values[0],
-            platform=Platform(row["platform"].values[0]),
-            imageSourceUrl=row["imageSourceUrl"].values[0],
-            mediaSource=row["mediaSource"].values[0],
-            girlOrBoy=NekomimiGender(row["girlOrBoy"].values[0]),
+            id=int(id_),
+            imageUrl=image_url,
+            artist=artist,
+            artistUrl=artist_url,
+            platform=Platform(platform),
+            imageSourceUrl=image_source_url,
+            mediaSource=media_source,
+            girlOrBoy=NekomimiGender(gender),
         )
+
+
+__all__ = [
+    "NekomimiDataset",
+    "NekomimiDb",
+    "NekomimiDbStruct",
+    "NekomimiGender",
+    "get_nekomimi_dataset",
+    "reload_nekomimi_dataset",
+]
@@ -1,14 +1,21 @@
+import asyncio
+from contextlib import suppress
 from dataclasses import dataclass
 from enum import Enum
 from typing import Literal, TypedDict
 
 import aiohttp
 
-from classes.cache import Caching
+from classes.cache import Caching, TtlCache
 from modules.const import USER_AGENT
 
 Cache = Caching(cache_directory="cache/pronoundb", cache_expiration_time=604800)
 
+BATCH_WINDOW = 0.05
+"""Seconds to wait for more lookups before sending a batch"""
+BATCH_SIZE = 50
+"""Maximum number of IDs PronounDB accepts per lookup"""
+
 
 en_locale = Literal["he", "it", "she", "they", "any", "ask", "avoid", "other"]
 
@@ -69,6 +76,91 @@ class PronounData:
         return f"PronounData(pronouns={self.pronouns})"
 
 
+_memory: "TtlCache[tuple[str, str], PronounData]" = TtlCache(ttl=86400, maxsize=8192)
+"""Pronouns looked up recently, keyed by platform and user ID, in front of the file cache"""
+_MISSING_TTL = 3600
+"""Seconds to remember users that have no PronounDB entry"""
+
+
+class _LookupBatcher:
+    """
+    Collect lookups arriving within a short window into one request per platform
+
+    Concurrent lookups of the same ID share a single pending future.
+    """
+
+    def __init__(self, window: float = BATCH_WINDOW, batch_size: int = BATCH_SIZE):
+        self.window = window
+        self.batch_size = batch_size
+        self._pending: dict[str, dict[str, asyncio.Future[UserId | None]]] = {}
+        self._timers: dict[str, asyncio.TimerHandle] = {}
+        # the loop keeps tasks weakly, and only they resolve the futures
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    async def lookup(
+        self, platform: "PronounDBV2.Platform", user_id: str
+    ) -> UserId | None:
+        """
+        Queue a lookup, and wait for the batch it lands in
+
+        Args:
+            platform (PronounDBV2.Platform): The platform of the user
+            user_id (str): The ID of the user
+
+        Returns:
+            UserId | None: The data of the user, None if not in PronounDB
+        """
+        loop = asyncio.get_running_loop()
+        pending = self._pending.setdefault(platform.value, {})
+        future = pending.get(user_id)
+        if future is None:
+            future = loop.create_future()
+            pending[user_id] = future
+            if len(pending) >= self.batch_size:
+                self._flush(platform)
+            elif platform.value not in self._timers:
+                self._timers[platform.value] = loop.call_later(
+                    self.window, self._flush, platform
+                )
+        # a cancelled caller must not cancel the lookup for the others
+        return await asyncio.shield(future)
+
+    def _flush(self, platform: "PronounDBV2.Platform") -> None:
+        """Send every pending lookup of a platform"""
+        timer = self._timers.pop(platform.value, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._pending.pop(platform.value, {})
+        if batch:
+            task = asyncio.create_task(self._send(platform, batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _send(
+        self,
+        platform: "PronounDBV2.Platform",
+        batch: dict[str, "asyncio.Future[UserId | None]"],
+    ) -> None:
+        """Look up a batch, resolving its futures"""
+        ids = list(batch)
+        try:
+            async with PronounDBV2() as pdb:
+                for start in range(0, len(ids), self.batch_size):
+                    chunk = ids[start : start + self.batch_size]
+                    data = await pdb.lookup(platform, chunk)
+                    for user_id in chunk:
+                        if not batch[user_id].done():
+                            batch[user_id].set_result(data.get(user_id))
+        # pylint: disable=broad-exception-caught
+        except Exception as error:  # noqa: BLE001
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(error)
+
+
+_batcher = _LookupBatcher()
+
+
 class PronounDBV2:
     """PronounDB API wrapper"""
 
@@ -143,6 +235,9 @@ class PronounDBV2:
         """
         Get the pronouns of a user
 
+        Lookups are served from memory, then from the file cache, and the rest
+        are batched with other lookups arriving at the same time.
+
         Args:
             platform (Platform): The platform of the user
             user_id (str): The ID of the user
@@ -150,13 +245,60 @@ class PronounDBV2:
         Returns:
             Pronoun: The pronouns of the user
         """
+        user_id = str(user_id)
+        key = (platform.value, user_id)
+        cached = _memory.get(key)
+        if cached is not None:
+            return cached
         cache_file_path = Cache.get_cache_file_path(f"{platform.value}/{user_id}.json")
         cached_file = Cache.read_cached_data(cache_file_path)
         if cached_file:
-            return PronounData(Pronouns(en=cached_file["sets"]["en"]))
-        data = await self.lookup(platform, user_id)
-        if not data:
-            return PronounData(Pronouns(en=[]))
-        user_data = data[user_id]
+            pronouns = PronounData(Pronouns(en=cached_file["sets"]["en"]))
+            _memory.set(key, pronouns)
+            return pronouns
+        user_data = await _batcher.lookup(platform, user_id)
+        if not user_data:
+            pronouns = PronounData(Pronouns(en=[]))
+            _memory.set(key, pronouns, ttl=_MISSING_TTL)
+            return pronouns
         Cache.write_cache(cache_file_path, user_data)
-        return PronounData(Pronouns(en=user_data["sets"]["en"]))
+        pronouns = PronounData(Pronouns(en=user_data["sets"]["en"]))
+        _memory.set(key, pronouns)
+        return pronouns
+
+    async def get_pronouns_bulk(
+        self, platform: Platform, user_ids: list[str]
+    ) -> dict[str, PronounData]:
+        """
+        Get the pronouns of multiple users, looking up uncached ones in batches
+
+        Args:
+            platform (Platform): The platform of the users
+            user_ids (list[str]): The IDs of the users
+
+        Returns:
+            dict[str, PronounData]: The pronouns, keyed by user ID
+        """
+        user_ids = list(dict.fromkeys(str(user_id) for user_id in user_ids))
+        results = await asyncio.gather(
+            *(self.get_pronouns(platform, user_id) for user_id in user_ids)
+        )
+        return dict(zip(user_ids, results, strict=True))
+
+    async def prefetch(self, platform: Platform, user_ids: list[str]) -> None:
+        """
+        Warm the cache for a list of users, e.g. before rendering a paginated list
+
+        Failures are ignored, as uncached users are looked up again on use.
+
+        Args:
+            platform (Platform): The platform of the users
+            user_ids (list[str]): The IDs of the users
+        """
+        # best effort, whatever the error
+        with suppress(Exception):
+            await self.get_pronouns_bulk(platform, user_ids)
+
+
+PronounDB = PronounDBV2
+"""Legacy alias of PronounDBV2"""
@@ -2,17 +2,18 @@
 
 from copy import deepcopy
 from dataclasses import dataclass
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Any, Literal
 
 from aiohttp import ClientSession
 
 from classes.cache import Caching
+from classes.decoder import DecoderRegistry
 from classes.excepts import ProviderHttpError, ProviderTypeError
 from modules.const import RAWG_API_KEY, USER_AGENT
 
 
-@dataclass
+@dataclass(slots=True)
 class RawgBaseData:
     """Rawg base data class"""
 
@@ -25,7 +26,7 @@ class RawgBaseData:
     """Name"""
 
 
-@dataclass
+@dataclass(slots=True)
 class EsrbRating:
     """ESRB rating data class"""
 
@@ -58,7 +59,7 @@ class EsrbRating:
     """Name"""
 
 
-@dataclass
+@dataclass(slots=True)
 class PlatformData:
     """Each platform data class"""
 
@@ -81,7 +82,7 @@ class PlatformData:
     """Image background"""
 
 
-@dataclass
+@dataclass(slots=True)
 class StoreData(RawgBaseData):
     """Store data class"""
 
@@ -93,7 +94,7 @@ class StoreData(RawgBaseData):
     """Image background"""
 
 
-@dataclass
+@dataclass(slots=True)
 class StudioData(RawgBaseData):
     """Studio (developer, publisher) data class"""
 
@@ -103,7 +104,7 @@ class StudioData(RawgBaseData):
     """Image background"""
 
 
-@dataclass
+@dataclass(slots=True)
 class GenreData(RawgBaseData):
     """Genre data class"""
 
@@ -113,7 +114,7 @@ class GenreData(RawgBaseData):
     """Image background"""
 
 
-@dataclass
+@dataclass(slots=True)
 class TagData(RawgBaseData):
     """Tag data class"""
 
@@ -125,7 +126,7 @@ class TagData(RawgBaseData):
     """Language"""
 
 
-@dataclass
+@dataclass(slots=True)
 class Stores:
     """Stores data class"""
 
@@ -138,7 +139,7 @@ class Stores:
     """URL"""
 
 
-@dataclass
+@dataclass(slots=True)
 class ParentPlatform:
     """Parent platform data class"""
 
@@ -146,7 +147,7 @@ class ParentPlatform:
     """Platform"""
 
 
-@dataclass
+@dataclass(slots=True)
 class MetacriticPlatformData:
     """Metacritic platform data class"""
 
@@ -158,7 +159,7 @@ class MetacriticPlatformData:
     """Slug"""
 
 
-@dataclass
+@dataclass(slots=True)
 class Requirements:
     """Requirements data class"""
 
@@ -168,7 +169,7 @@ class Requirements:
     """Recommended"""
 
 
-@dataclass
+@dataclass(slots=True)
 class Platforms:
     """Platforms data class"""
 
@@ -180,7 +181,7 @@ class Platforms:
     """Requirements"""
 
 
-@dataclass
+@dataclass(slots=True)
 class MetacriticPlatforms:
     """Metacritic platforms data class"""
 
@@ -191,7 +192,7 @@ class MetacriticPlatforms:
     platform: MetacriticPlatformData | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Ratings:
     """Ratings data class"""
 
@@ -206,7 +207,7 @@ class Ratings:
     """Percent"""
 
 
-@dataclass
+@dataclass(slots=True)
 class AddedByStatus:
     """Added by status data class"""
 
@@ -224,7 +225,7 @@ class AddedByStatus:
     """Playing"""
 
 
-@dataclass
+@dataclass(slots=True)
 class RawgGameData(RawgBaseData):
     """Rawg game data class"""
 
@@ -337,6 +338,27 @@ class RawgGameData(RawgBaseData):
 Cache = Caching("cache/rawg", 86400)
 
 
+def _parse_date(value: str) -> datetime:
+    """Parse a RAWG date, e.g. `2013-09-17`, as midnight UTC"""
+    return datetime.fromisoformat(value).replace(tzinfo=timezone.utc)
+
+
+decoders = DecoderRegistry()
+"""Compiled decoders of RAWG structs"""
+
+decoders.register(Platforms, hooks={"released_at": _parse_date})
+decode_game = decoders.register(
+    RawgGameData,
+    hooks={
+        "released": _parse_date,
+        # timestamps are UTC, without an offset
+        "updated": _parse_date,
+        "playtime": lambda value: timedelta(hours=value),
+        "description_raw": lambda value: value.replace("<br>", "\n"),
+    },
+)
+
+
 class RawgApi:
     """RAWG API Wrapper"""
 
@@ -362,7 +384,6 @@ class RawgApi:
         """Exit the async context manager"""
         await self.session.close()
 
-    # pylint: disable=too-many-branches
     @staticmethod
     def _convert(data: dict[str, Any]) -> RawgGameData:
         """
@@ -374,150 +395,7 @@ class RawgApi:
         Returns:
             RawgGameData: RawgGameData class
         """
-        if data.get("metacritic_platforms", None):
-            data["metacritic_platforms"] = [
-                MetacriticPlatforms(
-                    metascore=x["metascore"],
-                    url=x["url"],
-                    platform=MetacriticPlatformData(**x["platform"]),
-                )
-                for x in data["metacritic_platforms"]
-            ]
-        if data.get("released", None):
-            rel = f"{data['released']}T00:00:00+0000"
-            data["released"] = datetime.strptime(rel, "%Y-%m-%dT%H:%M:%S%z")
-        if data.get("updated", None):
-            upd = f"{data['updated']}+0000"
-            data["updated"] = datetime.strptime(upd, "%Y-%m-%dT%H:%M:%S%z")
-        if data.get("ratings", None):
-            data["ratings"] = [
-                Ratings(
-                    **{k: v for k, v in x.items() if k in Ratings.__dataclass_fields__}
-                )
-                for x in data["ratings"]
-            ]
-        if data.get("added_by_status", None):
-            data["added_by_status"] = AddedByStatus(
-                **{
-                    k: v
-                    for k, v in data["added_by_status"].items()
-                    if k in AddedByStatus.__dataclass_fields__
-                }
-            )
-        if data.get("playtime", None):
-            data["playtime"] = timedelta(hours=data["playtime"])
-        if data.get("parent_platforms", None):
-            data["parent_platforms"] = [
-                ParentPlatform(
-                    PlatformData(
-                        **{
-                            k: v
-                            for k, v in x["platform"].items()
-                            if k in PlatformData.__dataclass_fields__
-                        }
-                    )
-                )
-                for x in data["parent_platforms"]
-            ]
-        if data.get("platforms", None):
-            data["platforms"] = [
-                Platforms(
-                    platform=PlatformData(
-                        **{
-                            k: v
-                            for k, v in x["platform"].items()
-                            if k in PlatformData.__dataclass_fields__
-                        }
-                    ),
-                    released_at=datetime.strptime(
-                        f"{x['released_at']}T00:00:00+0000", "%Y-%m-%dT%H:%M:%S%z"
-                    )
-                    if x.get("released_at")
-                    else None,
-                    requirements=Requirements(
-                        **{
-                            k: v
-                            for k, v in x["requirements"].items()
-                            if k in Requirements.__dataclass_fields__
-                        }
-                    )
-                    if x.get("requirements") and isinstance(x["requirements"], dict)
-                    else None,
-                )
-                for x in data["platforms"]
-            ]
-        if data.get("stores", None):
-            data["stores"] = [
-                Stores(
-                    store=StoreData(
-                        **{
-                            k: v
-                            for k, v in x["store"].items()
-                            if k in StoreData.__dataclass_fields__
-                        }
-                    )
-                    if isinstance(x.get("store"), dict)
-                    else None,
-                    url=x.get("url"),
-                    id=x.get("id"),
-                )
-                for x in data["stores"]
-            ]
-        if data.get("developers", None):
-            data["developers"] = [
-                StudioData(
-                    **{
-                        k: v
-                        for k, v in x.items()
-                        if k in StudioData.__dataclass_fields__
-                    }
-                )
-                for x in data["developers"]
-            ]
-        if data.get("publishers", None):
-            data["publishers"] = [
-                StudioData(
-                    **{
-                        k: v
-                        for k, v in x.items()
-                        if k in StudioData.__dataclass_fields__
-                    }
-                )
-                for x in data["publishers"]
-            ]
-        if data.get("genres", None):
-            data["genres"] = [
-                GenreData(
-                    **{
-                        k: v
-                        for k, v in x.items()
-                        if k in GenreData.__dataclass_fields__
-                    }
-                )
-                for x in data["genres"]
-            ]
-        if data.get("tags", None):
-            data["tags"] = [
-                TagData(
-                    **{k: v for k, v in x.items() if k in TagData.__dataclass_fields__}
-                )
-                for x in data["tags"]
-            ]
-        if data.get("esrb_rating", None):
-            data["esrb_rating"] = EsrbRating(
-                **{
-                    k: v
-                    for k, v in data["esrb_rating"].items()
-                    if k in EsrbRating.__dataclass_fields__
-                }
-            )
-        if data.get("description_raw", None):
-            data["description_raw"] = data["description_raw"].replace("<br>", "\n")
-
-        valid_fields = {
-            k: v for k, v in data.items() if k in RawgGameData.__dataclass_fields__
-        }
-        return RawgGameData(**valid_fields)
+        return decode_game(data)
 
     async def search(self, query: str) -> list[dict[str, Any]]:
         """
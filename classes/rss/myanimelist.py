@@ -76,6 +76,7 @@ class MyAnimeListRss:
         self,
         media_type: Literal["anime", "manga"] = "anime",
         fetch_individual: bool = False,
+        session: aiohttp.ClientSession | None = None,
     ):
         """
         Initialize the class
@@ -83,6 +84,7 @@ class MyAnimeListRss:
         Args:
             media_type (Literal["anime", "manga"], optional): The type of media to parse. Defaults to "anime".
             fetch_individual (bool, optional): Whether to fetch individual media. Defaults to False.
+            session (aiohttp.ClientSession | None, optional): Session to share with other clients, left open on exit. Defaults to None.
         """
         if media_type == "anime" and fetch_individual:
             self.media_type = "rwe"
@@ -96,11 +98,15 @@ class MyAnimeListRss:
         self.user_agent = user_agent
         self.username: str | None = None
         self.feeds: str | None = None
-        self.session = None
+        self.session = session
+        self._owns_session = session is None
 
     async def __aenter__(self):
         """Create a new session"""
-        self.session = aiohttp.ClientSession(headers={"User-Agent": self.user_agent})
+        if self.session is None:
+            self.session = aiohttp.ClientSession(
+                headers={"User-Agent": self.user_agent}
+            )
         return self
 
     async def __aexit__(self, exc_type, exc_value, traceback):
@@ -109,7 +115,8 @@ class MyAnimeListRss:
 
     async def close(self):
         """Close the session"""
-        await self.session.close()
+        if self.session and self._owns_session:
+            await self.session.close()
 
     def _parse_title(self, title: str) -> str:
         """Parse title from string to string"""
@@ -195,7 +202,8 @@ class MyAnimeListRss:
         """
         self.username = username
         async with self.session.get(
-            f"https://myanimelist.net/rss.php?type={self.media_type}&u={self.username}"
+            f"https://myanimelist.net/rss.php?type={self.media_type}&u={self.username}",
+            headers={"User-Agent": self.user_agent},
         ) as resp:
             if resp.status != 200:
                 raise ProviderHttpError("Failed to get RSS feed", resp.status)
@@ -95,24 +95,31 @@ class DiscordBotsGGBotStruct:
 class DiscordBotsGG:
     """# Discord Bots API Wrapper"""
 
-    def __init__(self, token: str = DBGG_API_TOKEN, bot_id: int = BOT_CLIENT_ID):
+    def __init__(
+        self,
+        token: str = DBGG_API_TOKEN,
+        bot_id: int = BOT_CLIENT_ID,
+        session: aiohttp.ClientSession | None = None,
+    ):
         """
         ## Discord Bots API Wrapper
 
         Args:
             token (str, optional): Discord Bots API token. Defaults to DBGG_API_TOKEN.
             bot_id (int, optional): Bot's client ID. Defaults to BOT_CLIENT_ID.
+            session (aiohttp.ClientSession | None, optional): Session shared with other clients, left open on exit. Defaults to None.
         """
         self.token = token
         self.base_url = "https://discord.bots.gg/api/v1"
-        self.session = None
-        self.headers = None
+        self.session = session
+        self._own_session = session is None
+        self.headers = {"Authorization": self.token, "Content-Type": "application/json"}
         self.bot_id = bot_id
 
     async def __aenter__(self):
         """Enter async context"""
-        self.session = aiohttp.ClientSession()
-        self.headers = {"Authorization": self.token, "Content-Type": "application/json"}
+        if self.session is None:
+            self.session = aiohttp.ClientSession()
         return self
 
     async def __aexit__(self, exc_type, exc, tb):  # type: ignore
@@ -121,7 +128,8 @@ class DiscordBotsGG:
 
     async def close(self):
         """Close the session"""
-        await self.session.close() if self.session else None
+        if self.session and self._own_session:
+            await self.session.close()
 
     async def get_bot_stats(self, sanitize: bool = False) -> DiscordBotsGGBotStruct:
         """
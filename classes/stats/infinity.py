@@ -272,27 +272,34 @@ class BotStruct(BaseBotStruct):
 class InfinityBots:
     """# Infinity Bots API Wrapper"""
 
-    def __init__(self, token: str = INFINITY_API_TOKEN, bot_id: int = BOT_CLIENT_ID):
+    def __init__(
+        self,
+        token: str = INFINITY_API_TOKEN,
+        bot_id: int = BOT_CLIENT_ID,
+        session: aiohttp.ClientSession | None = None,
+    ):
         """
         ## Infinity Bots API Wrapper
 
         Args:
             token (str, optional): Infinity Bots API token. Defaults to INFINITY_API_TOKEN.
             bot_id (int, optional): Bot's client ID. Defaults to BOT_CLIENT_ID.
+            session (aiohttp.ClientSession | None, optional): Session shared with other clients, left open on exit. Defaults to None.
         """
         self.token = token
         self.base_url = "https://spider.omniplex.gg"
-        self.session = None
-        self.headers = None
-        self.bot_id = bot_id
-
-    async def __aenter__(self):
-        """Enter async context"""
-        self.session = aiohttp.ClientSession()
+        self.session = session
+        self._own_session = session is None
         self.headers = {
             "Authorization": f"Bot {self.token}",
             "Content-Type": "application/json",
         }
+        self.bot_id = bot_id
+
+    async def __aenter__(self):
+        """Enter async context"""
+        if self.session is None:
+            self.session = aiohttp.ClientSession()
         return self
 
     async def __aexit__(self, exc_type, exc, tb):  # type: ignore
@@ -301,7 +308,7 @@ class InfinityBots:
 
     async def close(self):
         """Close the session"""
-        if self.session:
+        if self.session and self._own_session:
             await self.session.close()
             self.session = None
 
@@ -0,0 +1,220 @@
+"""
+# Bot Listing Sites
+
+Posts the bot stats to every listing site, and fetches the upvotes the bot
+got on them, concurrently through one session. Each site has its own
+timeout, so a slow site only delays its own result.
+
+Fetched upvotes are kept in memory for a while, so `/stats general` can show
+the ones from the last poll instead of waiting for every site again.
+"""
+
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+import aiohttp
+
+from classes.cache import TtlCache
+from classes.stats.dbgg import DiscordBotsGG
+from classes.stats.dbl import DiscordBotList
+from classes.stats.infinity import InfinityBots
+from classes.stats.topgg import TopGG
+
+T = TypeVar("T")
+
+LISTING_TIMEOUT = 10.0
+"""Seconds a single listing site may take to answer"""
+LISTING_VOTES_TTL = 1200
+"""Seconds fetched upvotes are shown for, a bit longer than the poll interval"""
+
+
+@dataclass
+class ProviderVoteStruct:
+    """Provider Vote Struct"""
+
+    name: str
+    """Name of the provider"""
+    bot_id: int
+    """ID of the bot"""
+    base_url: str
+    """Base URL of the provider"""
+    total_votes: int
+    """Total votes on the provider"""
+    upvote_path: str = "/vote"
+    """Path to upvote on the provider"""
+    time_limit: int = 0
+    """Time limit of vote stats on the provider in hours"""
+
+    @property
+    def as_text(self) -> str:
+        """
+        Get the provider vote stats as text
+
+        Returns:
+            str: The provider vote stats as text
+        """
+        url = f"{self.base_url}{self.bot_id}{self.upvote_path}"
+        if self.time_limit == 0:
+            return f"* [{self.name}]({url}): {self.total_votes:,} in total"
+        return f"* [{self.name}]({url}): {self.total_votes:,} in last {self.time_limit} hours"
+
+
+listing_votes: TtlCache[int, list[ProviderVoteStruct]] = TtlCache(
+    ttl=LISTING_VOTES_TTL, maxsize=4
+)
+"""Upvotes of the bot on listing sites, keyed by bot ID"""
+
+
+@asynccontextmanager
+async def _shared_session(
+    session: aiohttp.ClientSession | None,
+) -> AsyncIterator[aiohttp.ClientSession]:
+    """Use the given session, or open one for the duration of the block"""
+    if session is not None:
+        yield session
+        return
+    async with aiohttp.ClientSession() as own_session:
+        yield own_session
+
+
+async def gather_sites(
+    calls: dict[str, Awaitable[T]], timeout: float = LISTING_TIMEOUT
+) -> tuple[dict[str, T], dict[str, BaseException]]:
+    """
+    Run calls to several sites at once, each under its own timeout
+
+    Args:
+        calls (dict[str, Awaitable[T]]): Calls keyed by site
+        timeout (float, optional): Seconds each call may take. Defaults to LISTING_TIMEOUT.
+
+    Returns:
+        tuple[dict[str, T], dict[str, BaseException]]: Results and failures, keyed by site
+    """
+    results = await asyncio.gather(
+        *(asyncio.wait_for(call, timeout) for call in calls.values()),
+        return_exceptions=True,
+    )
+    done: dict[str, T] = {}
+    failed: dict[str, BaseException] = {}
+    for site, result in zip(calls, results):
+        if isinstance(result, asyncio.CancelledError):
+            raise result
+        if isinstance(result, BaseException):
+            failed[site] = result
+        else:
+            done[site] = result
+    return done, failed
+
+
+async def post_listing_stats(
+    guild_count: int,
+    shard_count: int,
+    session: aiohttp.ClientSession | None = None,
+    timeout: float = LISTING_TIMEOUT,
+) -> dict[str, BaseException]:
+    """
+    Post the bot stats to every listing site
+
+    Args:
+        guild_count (int): Number of guilds the bot is in
+        shard_count (int): Number of shards
+        session (aiohttp.ClientSession | None, optional): Session to reuse. Defaults to None.
+        timeout (float, optional): Seconds each site may take. Defaults to LISTING_TIMEOUT.
+
+    Returns:
+        dict[str, BaseException]: Failures, keyed by site name
+    """
+    async with _shared_session(session) as shared:
+        calls: dict[str, Awaitable[int]] = {
+            "Top.gg": TopGG(session=shared).post_bot_stats(
+                guild_count=guild_count, shard_count=shard_count
+            ),
+            "DiscordBots.gg": DiscordBotsGG(session=shared).post_bot_stats(
+                guild_count=guild_count, shard_count=shard_count
+            ),
+            "DiscordBotList.com": DiscordBotList(session=shared).post_bot_stats(
+                guild_count=guild_count, members=0
+            ),
+            "InfinityBots": InfinityBots(session=shared).post_bot_stats(
+                guild_count=guild_count, shard_count=shard_count, members=0
+            ),
+        }
+        _, failed = await gather_sites(calls, timeout)
+    return failed
+
+
+async def _topgg_votes(session: aiohttp.ClientSession, _bot_id: int) -> int:
+    """Total upvotes on Top.gg"""
+    return (await TopGG(session=session).get_bot_stats()).points
+
+
+async def _dbl_votes(session: aiohttp.ClientSession, _bot_id: int) -> int:
+    """Upvotes on Discord Bot List in the past 12 hours"""
+    return (await DiscordBotList(session=session).get_recent_upvotes()).total
+
+
+async def _ibl_votes(session: aiohttp.ClientSession, bot_id: int) -> int:
+    """Total upvotes on Infinity Bots"""
+    return (await InfinityBots(session=session).get_bot_info(bot_id)).votes
+
+
+_VOTE_SITES: dict[
+    str, tuple[Callable[[aiohttp.ClientSession, int], Awaitable[int]], dict[str, Any]]
+] = {
+    "Top.gg": (_topgg_votes, {"base_url": "https://top.gg/bot/"}),
+    "Discord Bot List": (
+        _dbl_votes,
+        {
+            "base_url": "https://discordbotlist.com/bots/",
+            "upvote_path": "/upvotes",
+            "time_limit": 12,
+        },
+    ),
+    "Infinity Bots": (_ibl_votes, {"base_url": "https://omniplex.gg/bot/"}),
+}
+
+
+async def fetch_listing_votes(
+    bot_id: int,
+    session: aiohttp.ClientSession | None = None,
+    timeout: float = LISTING_TIMEOUT,
+) -> tuple[list[ProviderVoteStruct], dict[str, BaseException]]:
+    """
+    Fetch the bot upvotes from every listing site, and keep them in memory
+
+    Args:
+        bot_id (int): Bot's client ID
+        session (aiohttp.ClientSession | None, optional): Session to reuse. Defaults to None.
+        timeout (float, optional): Seconds each site may take. Defaults to LISTING_TIMEOUT.
+
+    Returns:
+        tuple[list[ProviderVoteStruct], dict[str, BaseException]]: Upvotes sorted by site name, and failures keyed by site name
+    """
+    async with _shared_session(session) as shared:
+        done, failed = await gather_sites(
+            {name: fetch(shared, bot_id) for name, (fetch, _) in _VOTE_SITES.items()},
+            timeout,
+        )
+    votes = [
+        ProviderVoteStruct(
+            name=name, bot_id=bot_id, total_votes=total, **_VOTE_SITES[name][1]
+        )
+        for name, total in sorted(done.items())
+    ]
+    if votes:
+        listing_votes.set(bot_id, votes)
+    return votes, failed
+
+
+__all__ = [
+    "LISTING_TIMEOUT",
+    "LISTING_VOTES_TTL",
+    "ProviderVoteStruct",
+    "fetch_listing_votes",
+    "gather_sites",
+    "listing_votes",
+    "post_listing_stats",
+]
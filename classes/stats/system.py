@@ -0,0 +1,286 @@
+"""
+# System and Package Inventory
+
+Hosts the data shown by `/stats system` and `/deepstats packages`.
+
+Installed packages can't change while the bot runs, so they are listed once,
+in a worker thread. System metrics are sampled in the background into a
+ring buffer; commands read the latest sample, and the buffer gives a short
+trend history.
+"""
+
+import platform as pfm
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import cache
+from importlib.metadata import distributions
+
+import psutil
+
+SAMPLE_INTERVAL = 60
+"""Seconds between system samples"""
+SAMPLE_HISTORY = 60
+"""Samples kept in the ring buffer, an hour with the default interval"""
+
+
+@dataclass
+class DiskInfo:
+    """Disk Information"""
+
+    mountpoint: str
+    disk_total: str | None
+    disk_used: str | None
+    disk_free: str | None
+    disk_percentage: float
+
+
+@dataclass
+class SystemInfo:
+    """System Information"""
+
+    system: str
+    release: str
+    version: str
+    machine: str
+    processor: str
+    uptime: datetime
+    cpu_physical_cores: int
+    cpu_total_cores: int
+    cpu_max_frequency: str
+    cpu_min_frequency: str
+    cpu_current_frequency: str
+    cpu_usage_cores: list[float]
+    cpu_usage_total: float
+    ram_total: str | None
+    ram_available: str | None
+    ram_used: str | None
+    ram_free: str | None
+    ram_percentage: float
+    swap_total: str | None
+    swap_used: str | None
+    swap_free: str | None
+    swap_percentage: float
+    disks: list[DiskInfo]
+    sampled_at: float = 0.0
+    """Unix time the metrics were sampled at"""
+
+
+@dataclass
+class PackageInfo:
+    """Package Information"""
+
+    name: str
+    version: str
+    license: str
+
+
+@dataclass(frozen=True)
+class MetricTrend:
+    """Spread of a metric over the sample history"""
+
+    minimum: float
+    average: float
+    maximum: float
+    samples: int
+
+
+def get_size(bytes: float | None, suffix: str = "B") -> str | None:
+    """
+    Scale bytes to its proper format
+    e.g:
+        1253656 => '1.20MB'
+        1253656678 => '1.17GB'
+    """
+    if bytes is None:
+        return None
+    factor = 1024
+    for unit in ["", "K", "M", "G", "T", "P"]:
+        if bytes < factor:
+            return f"{bytes:.2f}{unit}{suffix}"
+        bytes /= factor
+
+
+def get_disk_info() -> list[DiskInfo]:
+    """
+    Get disk information
+
+    Returns:
+        list[DiskInfo]: List of disk information
+    """
+    disks: list[DiskInfo] = []
+    partitions = psutil.disk_partitions()
+    for partition in partitions:
+        try:
+            disk_usage = psutil.disk_usage(partition.mountpoint)
+        except PermissionError:
+            continue
+        disks.append(
+            DiskInfo(
+                mountpoint=partition.mountpoint,
+                disk_total=get_size(disk_usage.total),
+                disk_used=get_size(disk_usage.used),
+                disk_free=get_size(disk_usage.free),
+                disk_percentage=disk_usage.percent,
+            )
+        )
+    return disks
+
+
+def _frequency(value: float | None) -> str:
+    """Format a CPU frequency, some platforms don't report one"""
+    return f"{value:.2f}Mhz" if value else "Unknown"
+
+
+class SystemSampler:
+    """
+    Ring buffer of system metric samples
+
+    Details that can't change while the bot runs are read once; `sample` is
+    blocking and meant to run in a worker thread.
+    """
+
+    def __init__(self, history: int = SAMPLE_HISTORY):
+        """
+        Initialize the sampler
+
+        Args:
+            history (int, optional): Samples to keep. Defaults to SAMPLE_HISTORY.
+        """
+        self.samples: deque[SystemInfo] = deque(maxlen=history)
+        self._static: dict[str, object] | None = None
+
+    def _static_info(self) -> dict[str, object]:
+        """System details fixed for the lifetime of the process"""
+        if self._static is None:
+            frequency = psutil.cpu_freq()
+            self._static = {
+                "system": pfm.system(),
+                "release": pfm.release(),
+                "version": pfm.version(),
+                "machine": pfm.machine(),
+                "processor": pfm.processor(),
+                "uptime": datetime.fromtimestamp(psutil.boot_time(), tz=timezone.utc),
+                "cpu_physical_cores": psutil.cpu_count(logical=False),
+                "cpu_total_cores": psutil.cpu_count(logical=True),
+                "cpu_max_frequency": _frequency(frequency and frequency.max),
+                "cpu_min_frequency": _frequency(frequency and frequency.min),
+            }
+        return self._static
+
+    def sample(self) -> SystemInfo:
+        """
+        Take a sample and add it to the buffer
+
+        CPU usage is averaged since the previous sample, so the first one
+        only covers the time since the sampler was created.
+
+        Returns:
+            SystemInfo: The sample
+        """
+        cpu_usage_cores = psutil.cpu_percent(percpu=True)
+        frequency = psutil.cpu_freq()
+        ram = psutil.virtual_memory()
+        swap = psutil.swap_memory()
+        info = SystemInfo(
+            **self._static_info(),  # type: ignore[arg-type]
+            cpu_current_frequency=_frequency(frequency and frequency.current),
+            cpu_usage_cores=cpu_usage_cores,
+            cpu_usage_total=psutil.cpu_percent(),
+            ram_total=get_size(ram.total),
+            ram_available=get_size(ram.available),
+            ram_used=get_size(ram.used),
+            ram_free=get_size(ram.free),
+            ram_percentage=ram.percent,
+            swap_total=get_size(swap.total),
+            swap_used=get_size(swap.used),
+            swap_free=get_size(swap.free),
+            swap_percentage=swap.percent,
+            disks=get_disk_info(),
+            sampled_at=time.time(),
+        )
+        self.samples.append(info)
+        return info
+
+    def latest(self) -> SystemInfo | None:
+        """
+        Get the latest sample
+
+        Returns:
+            SystemInfo | None: The sample, None if nothing is sampled yet
+        """
+        return self.samples[-1] if self.samples else None
+
+    def trend(self, metric: str) -> MetricTrend | None:
+        """
+        Get the spread of a metric over the buffered samples
+
+        Args:
+            metric (str): Numeric SystemInfo field, e.g. "cpu_usage_total"
+
+        Returns:
+            MetricTrend | None: The spread, None if nothing is sampled yet
+        """
+        values = [float(getattr(sample, metric)) for sample in self.samples]
+        if not values:
+            return None
+        return MetricTrend(
+            minimum=min(values),
+            average=round(sum(values) / len(values), 1),
+            maximum=max(values),
+            samples=len(values),
+        )
+
+
+system_sampler = SystemSampler()
+"""Process-wide system sampler, fed by the stats extension"""
+
+
+def get_system_info() -> SystemInfo:
+    """
+    Get system information, sampling now only if nothing is sampled yet
+
+    Returns:
+        SystemInfo: System information
+    """
+    return system_sampler.latest() or system_sampler.sample()
+
+
+@cache
+def get_pip_pkgs() -> tuple[PackageInfo, ...]:
+    """
+    Get pip packages, listed once per process
+
+    Returns:
+        tuple[PackageInfo, ...]: Installed packages, sorted by name
+    """
+    packages: dict[str, PackageInfo] = {}
+    for dist in distributions():
+        meta = dist.metadata
+        name = meta["Name"]
+        # the first match on sys.path is the one imported
+        if not name or name in packages:
+            continue
+        packages[name] = PackageInfo(
+            name=name,
+            version=meta["Version"],
+            license=meta.get("License") or "*Licence not found*",
+        )
+    return tuple(sorted(packages.values(), key=lambda package: package.name))
+
+
+__all__ = [
+    "SAMPLE_HISTORY",
+    "SAMPLE_INTERVAL",
+    "DiskInfo",
+    "MetricTrend",
+    "PackageInfo",
+    "SystemInfo",
+    "SystemSampler",
+    "get_disk_info",
+    "get_pip_pkgs",
+    "get_size",
+    "get_system_info",
+    "system_sampler",
+]
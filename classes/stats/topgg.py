@@ -78,24 +78,31 @@ class TopGGBotStruct:
 class TopGG:
     """# Top.gg API Wrapper"""
 
-    def __init__(self, token: str = TOPGG_API_TOKEN, bot_id: int = BOT_CLIENT_ID):
+    def __init__(
+        self,
+        token: str = TOPGG_API_TOKEN,
+        bot_id: int = BOT_CLIENT_ID,
+        session: aiohttp.ClientSession | None = None,
+    ):
         """
         ## Top.gg API Wrapper
 
         Args:
             token (str, optional): Top.gg API token. Defaults to TOPGG_API_TOKEN.
             bot_id (int, optional): Bot's client ID. Defaults to BOT_CLIENT_ID.
+            session (aiohttp.ClientSession | None, optional): Session shared with other clients, left open on exit. Defaults to None.
         """
         self.token = token
         self.base_url = "https://top.gg/api"
-        self.session = None
-        self.headers = None
+        self.session = session
+        self._own_session = session is None
+        self.headers = {"Authorization": self.token}
         self.bot_id = bot_id
 
     async def __aenter__(self):
         """Enter async context"""
-        self.session = aiohttp.ClientSession()
-        self.headers = {"Authorization": self.token}
+        if self.session is None:
+            self.session = aiohttp.ClientSession()
         return self
 
     async def __aexit__(self, exc_type, exc, tb):  # type: ignore
@@ -104,7 +111,8 @@ class TopGG:
 
     async def close(self):
         """Close the session"""
-        await self.session.close() if self.session else None
+        if self.session and self._own_session:
+            await self.session.close()
 
     async def get_bot_stats(self) -> TopGGBotStruct:
         """
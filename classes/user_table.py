@@ -0,0 +1,292 @@
+"""
+# User Table
+
+Typed, columnar view of the user database.
+
+The database is read with an explicit schema: snowflakes and timestamps are
+int64 columns, guild names and timezones are categories, and usernames keep
+the string dtype. Large files are split into shards on line boundaries and
+parsed concurrently.
+"""
+
+import io
+import os
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from modules.lazy_import import lazy_import
+
+pd = lazy_import("pandas")
+
+USER_TABLE_SCHEMA: dict[str, str] = {
+    "discordId": "int64",
+    "discordUsername": "str",
+    "discordJoined": "int64",
+    "malUsername": "str",
+    "malId": "int64",
+    "malJoined": "int64",
+    "registeredAt": "int64",
+    "registeredGuildId": "int64",
+    "registeredBy": "int64",
+    "registeredGuildName": "category",
+    "anilistUsername": "str",
+    "anilistId": "Int64",
+    "lastfmUsername": "str",
+    "shikimoriId": "Int64",
+    "shikimoriUsername": "str",
+    "userBirthdate": "datetime64[s]",
+    "userTimezone": "category",
+    "userBirthdayPermission": "Int8",
+}
+"""Column types of the user database, columns missing from a file are added empty"""
+SHARD_MIN_BYTES = 16 << 20
+"""File size below which the database is parsed in one go"""
+SHARD_WORKERS = min(os.cpu_count() or 1, 8)
+"""Shards parsed concurrently"""
+
+_INTEGER_DTYPES = {"int64", "Int64", "Int8"}
+
+
+def _read_dtypes(columns: list[str]) -> dict[str, str]:
+    """Types to parse columns with, integers are converted afterwards"""
+    dtypes: dict[str, str] = {}
+    for column in columns:
+        dtype = USER_TABLE_SCHEMA.get(column, "str")
+        dtypes[column] = dtype if dtype in _INTEGER_DTYPES | {"category"} else "str"
+    return dtypes
+
+
+def _to_integer(series: "pd.Series", dtype: str) -> "pd.Series":
+    """Convert a string column to integers, invalid values become missing"""
+    numbers = pd.to_numeric(series, errors="coerce", dtype_backend="numpy_nullable")
+    if numbers.dtype.kind == "f":
+        numbers = numbers.round()
+    if dtype == "int64" and numbers.isna().any():
+        dtype = "Int64"
+    return numbers.astype(dtype)
+
+
+def _apply_schema(frame: "pd.DataFrame") -> "pd.DataFrame":
+    """Convert parsed columns to the schema, and add missing ones"""
+    for column, dtype in USER_TABLE_SCHEMA.items():
+        if column not in frame:
+            frame[column] = pd.Series(
+                pd.NA if dtype != "datetime64[s]" else pd.NaT,
+                index=frame.index,
+                dtype="Int64" if dtype == "int64" else dtype,
+            )
+            continue
+        series = frame[column]
+        if dtype in _INTEGER_DTYPES and series.dtype != dtype:
+            frame[column] = _to_integer(series.astype("str"), dtype)
+        elif dtype == "datetime64[s]":
+            frame[column] = pd.to_datetime(
+                series, format="%Y-%m-%d", errors="coerce"
+            ).astype(dtype)
+        elif dtype == "category" and not isinstance(series.dtype, pd.CategoricalDtype):
+            frame[column] = series.astype(dtype)
+    return frame
+
+
+def _parse(source: Path | memoryview, **kwargs) -> "pd.DataFrame":
+    """Parse a file or a shard with the schema, falling back to lenient conversion"""
+
+    def read() -> "pd.DataFrame":
+        data = source if isinstance(source, Path) else io.BytesIO(source)
+        return pd.read_csv(data, sep="\t", **kwargs)
+
+    try:
+        return read()
+    except (ValueError, OverflowError):
+        # malformed integers, convert column by column instead
+        kwargs["dtype"] = "str"
+        return read()
+
+
+def _shard_bounds(data: bytes, shards: int) -> list[tuple[int, int]]:
+    """Split data into byte ranges that end on line boundaries"""
+    start = 0
+    bounds: list[tuple[int, int]] = []
+    for index in range(shards):
+        end = len(data) if index == shards - 1 else len(data) // shards * (index + 1)
+        if end < len(data):
+            end = data.find(b"\n", end)
+            end = len(data) if end < 0 else end + 1
+        if end > start:
+            bounds.append((start, end))
+        start = max(start, end)
+    return bounds
+
+
+def read_user_table(
+    filepath: Path | str, workers: int | None = None
+) -> "pd.DataFrame | None":
+    """
+    Read the user database into typed columns
+
+    Args:
+        filepath (Path | str): Path to the database
+        workers (int | None, optional): Shards to parse concurrently. Defaults to SHARD_WORKERS.
+
+    Returns:
+        pd.DataFrame | None: Table following `USER_TABLE_SCHEMA`, None if the file doesn't exist or is empty
+    """
+    filepath = Path(filepath)
+    try:
+        size = filepath.stat().st_size
+        with open(filepath, "rb") as file:
+            header = file.readline()
+            workers = workers or SHARD_WORKERS
+            data = file.read() if workers > 1 and size >= SHARD_MIN_BYTES else b""
+    except FileNotFoundError:
+        return None
+    if not header.strip():
+        return None
+    columns = header.decode("utf-8").rstrip("\r\n").split("\t")
+    options: dict[str, Any] = {
+        "header": None,
+        "names": columns,
+        "dtype": _read_dtypes(columns),
+        "keep_default_na": False,
+        "na_values": [""],
+    }
+    # quoted fields may span lines, only split files without quotes
+    bounds = _shard_bounds(data, workers) if data and b'"' not in data else []
+    if len(bounds) > 1:
+        view = memoryview(data)
+        with ThreadPoolExecutor(max_workers=len(bounds)) as executor:
+            frames = list(
+                executor.map(
+                    lambda bound: _parse(view[bound[0] : bound[1]], **options), bounds
+                )
+            )
+        frame = pd.concat(frames, ignore_index=True)
+    else:
+        del data
+        try:
+            frame = _parse(filepath, skiprows=1, **options)
+        except pd.errors.EmptyDataError:
+            frame = pd.DataFrame({column: pd.Series(dtype="str") for column in columns})
+    return _apply_schema(frame)
+
+
+def _column_values(series: "pd.Series") -> list[Any]:
+    """Python values of a column, with None for missing ones"""
+    if series.dtype.kind == "M":
+        return [
+            None if pd.isna(value) else value.to_pydatetime()
+            for value in series.dt.tz_localize(timezone.utc)
+        ]
+    return series.astype(object).where(series.notna(), None).tolist()
+
+
+class UserTable:
+    """Typed user database, one row per registered user"""
+
+    def __init__(self, frame: "pd.DataFrame"):
+        """
+        Wrap a table read by `read_user_table`
+
+        Args:
+            frame (pd.DataFrame): The table
+        """
+        self.frame = frame
+        self._ids = frame["discordId"].to_numpy(dtype="int64", na_value=-1)
+
+    @classmethod
+    def read(cls, filepath: Path | str) -> "UserTable | None":
+        """
+        Read a database file
+
+        Args:
+            filepath (Path | str): Path to the database
+
+        Returns:
+            UserTable | None: The table, None if the file doesn't exist or is empty
+        """
+        frame = read_user_table(filepath)
+        return None if frame is None else cls(frame)
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    def __contains__(self, discord_id: object) -> bool:
+        return self.find(discord_id) is not None
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the columns, in bytes"""
+        return int(self.frame.memory_usage(deep=True).sum())
+
+    def find(self, discord_id: object) -> int | None:
+        """
+        Find the row of a user
+
+        Args:
+            discord_id (object): Discord ID of the user
+
+        Returns:
+            int | None: Position of the first matching row, None if not registered
+        """
+        try:
+            discord_id = int(discord_id)  # type: ignore[call-overload]
+        except (TypeError, ValueError):
+            return None
+        if discord_id < 0 or discord_id >= 1 << 63:
+            return None
+        matches = (self._ids == discord_id).nonzero()[0]
+        return int(matches[0]) if len(matches) else None
+
+    def record(self, position: int) -> dict[str, Any]:
+        """
+        Get a row as Python values
+
+        Args:
+            position (int): Position of the row
+
+        Returns:
+            dict[str, Any]: Values keyed by column, None for missing ones
+        """
+        return next(self.records(self.frame.iloc[[position]]))
+
+    def records(self, frame: "pd.DataFrame | None" = None) -> Iterator[dict[str, Any]]:
+        """
+        Iterate rows as Python values, converting a column at a time
+
+        Args:
+            frame (pd.DataFrame | None, optional): Rows to convert. Defaults to the whole table.
+
+        Yields:
+            dict[str, Any]: Values keyed by column, None for missing ones
+        """
+        frame = self.frame if frame is None else frame
+        columns = list(frame.columns)
+        values = [_column_values(frame[column]) for column in columns]
+        for row in zip(*values, strict=True):
+            yield dict(zip(columns, row, strict=True))
+
+
+def timestamp_to_datetime(value: int | None) -> datetime | None:
+    """
+    Convert a Unix timestamp column value to a datetime
+
+    Args:
+        value (int | None): Seconds since the epoch
+
+    Returns:
+        datetime | None: Time in UTC, None if missing
+    """
+    return None if value is None else datetime.fromtimestamp(value, tz=timezone.utc)
+
+
+__all__ = [
+    "SHARD_MIN_BYTES",
+    "SHARD_WORKERS",
+    "USER_TABLE_SCHEMA",
+    "UserTable",
+    "read_user_table",
+    "timestamp_to_datetime",
+]
@@ -1,13 +1,21 @@
-import json
-
 import aiohttp
 from fake_useragent import FakeUserAgent  # type: ignore
 from interactions import Snowflake
 
-from classes.cache import Caching
+from classes.cache import SharedRemoteDataset
 
 USER_AGENT = FakeUserAgent(browsers=["chrome", "edge", "opera"]).random
-Cache = Caching(cache_directory="cache/userpfp", cache_expiration_time=216000)
+RAW_URL = "https://raw.githubusercontent.com/UserPFP/UserPFP/main/source/data.json"
+
+userpfp_dataset: SharedRemoteDataset[dict[str, str]] = SharedRemoteDataset(
+    name="UserPFP",
+    url=RAW_URL,
+    file_path="cache/userpfp/data.json",
+    parser=lambda data: data["avatars"],
+    refresh_after=216000 * 0.8,
+    headers={"User-Agent": USER_AGENT},
+)
+"""Process-wide UserPFP avatars, keyed by Discord ID"""
 
 
 class UserPFP:
@@ -15,9 +23,7 @@ class UserPFP:
 
     def __init__(self):
         """Initialize the UserBackground class."""
-        self.raw_url = (
-            "https://raw.githubusercontent.com/UserPFP/UserPFP/main/source/data.json"
-        )
+        self.raw_url = RAW_URL
         self.session = None
         self.headers = None
 
@@ -35,18 +41,14 @@ class UserPFP:
         """Close the aiohttp session."""
         await self.session.close()
 
-    async def _fetch_background(self) -> dict:
+    async def _fetch_background(self) -> dict[str, str]:
         """
-        Fetch the background from the GitHub repository.
+        Get the shared UserPFP avatars, downloading them on first use.
 
         Returns:
-            dict: The background data.
+            dict[str, str]: The avatars, keyed by Discord ID.
         """
-        print("Fetching UserPFP from GitHub...")
-        async with self.session.get(self.raw_url) as response:
-            resp = await response.text()
-            data = json.loads(resp)
-            return data
+        return await userpfp_dataset.get()
 
     @staticmethod
     async def _find_user(user_id: Snowflake, data: dict[str, str]) -> str | None:
@@ -75,15 +77,7 @@ class UserPFP:
             str: The user profile picture.
             None: If user can't be found
         """
-        data: dict[str, dict[str, str]] | None
-        # Get cache path
-        cache_path = Cache.get_cache_path("userpfp.json")
-        # Read cache
-        data = Cache.read_cache(cache_path)
-        # If cache is expired, fetch from GitHub
-        if data is None:
-            data = await self._fetch_background()
-            Cache.write_cache(cache_path, data)
+        data = await self._fetch_background()
         # Find user
-        user = await self._find_user(user_id, data["avatars"])
+        user = await self._find_user(user_id, data)
         return user
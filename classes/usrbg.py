@@ -1,15 +1,13 @@
 from dataclasses import dataclass
-from typing import Any
 
 import aiohttp
 from interactions import Snowflake
 
-from classes.cache import Caching
+from classes.cache import SharedRemoteDataset
 from modules.const import USER_AGENT
 
 # 2 days and half
 day2h = 60 * 60 * 60
-Cache = Caching(cache_directory="cache/usrbg", cache_expiration_time=day2h)
 
 BASE_URL = "https://usrbg.is-hardly.online"
 
@@ -35,6 +33,18 @@ class UsrBgDataStruct:
         )
 
 
+usrbg_dataset: SharedRemoteDataset[UsrBgDataStruct] = SharedRemoteDataset(
+    name="UsrBG",
+    url=f"{BASE_URL}/users",
+    file_path="cache/usrbg/users.json",
+    parser=lambda data: UsrBgDataStruct(**data),
+    # refresh ahead, before the cache cleaner drops the file
+    refresh_after=day2h * 0.8,
+    headers={"User-Agent": USER_AGENT},
+)
+"""Process-wide UsrBG dataset, shared by every UsrBg instance"""
+
+
 class UsrBg:
     """A class to interact with the UsrBG API"""
 
@@ -42,7 +52,6 @@ class UsrBg:
         """Initialize the class"""
         self.headers = {"User-Agent": USER_AGENT}
         self.session = None
-        self.database: dict[str, str] = {}
 
     async def __aenter__(self):
         """Return the class instance"""
@@ -53,27 +62,11 @@ class UsrBg:
         """Close the session"""
         await self.session.close() if self.session else None
 
-    async def _fetch_background(self) -> Any:
-        """Get the user's background from the API"""
-        cache_path = Cache.get_cache_path("usrbg.json")
-        self.database = Cache.read_cache(cache_path)
-        if self.database:
-            return self.database
-
-        async with (
-            aiohttp.ClientSession(headers=self.headers) as session,
-            session.get(f"{BASE_URL}/users") as resp,
-        ):
-            if resp.status == 200:
-                self.database = await resp.json()
-                Cache.write_cache(cache_path, self.database)
-                return self.database
-            resp.raise_for_status()
+    async def _fetch_background(self) -> UsrBgDataStruct:
+        """Get the shared UsrBG dataset, downloading it on first use"""
+        return await usrbg_dataset.get()
 
     async def get_background(self, user_id: Snowflake) -> str:
         """Get the user's background from the API"""
-        if not self.database:
-            await self._fetch_background()
-
-        resp = UsrBgDataStruct(**self.database).get_user_banner(user_id)
-        return resp
+        database = await self._fetch_background()
+        return database.get_user_banner(user_id)
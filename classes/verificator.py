@@ -4,14 +4,24 @@ Verificator class
 This class is used to verify user input during registration
 """
 
+import asyncio
+import json
+import os
+import time
 from dataclasses import asdict, dataclass
 from datetime import datetime, timezone
 from uuid import uuid4
 
 from classes.cache import Caching
+from classes.jikan import JikanApi
 
 Cache = Caching(cache_directory="cache/verify", cache_expiration_time=43200)
 
+CLUB_MEMBER_TTL = 21600
+"""Seconds a confirmed club membership is trusted without checking again"""
+CLUB_ROSTER_REFRESH = 21600
+"""Seconds before the club member list is fetched again in the background"""
+
 
 @dataclass
 class VerificatorUser:
@@ -110,3 +120,135 @@ class Verificator:
             verify = VerificatorUser(**cached_data)
             return verify
         return None
+
+
+class ClubRoster:
+    """
+    Usernames of every member of a club, kept in memory
+
+    The list is stored on disk and refreshed in the background once it is
+    older than `refresh_after` seconds; lookups never wait for a refresh,
+    they only miss while no list has been fetched yet.
+    """
+
+    def __init__(self, club_id: int, refresh_after: float = CLUB_ROSTER_REFRESH):
+        """
+        Initialize the roster
+
+        Args:
+            club_id (int): MyAnimeList club ID
+            refresh_after (float, optional): Seconds before a background refresh. Defaults to CLUB_ROSTER_REFRESH.
+        """
+        self.club_id = club_id
+        self.refresh_after = float(refresh_after)
+        self.file_path = Cache.get_cache_path(f"club/{club_id}/roster.json")
+        self._members: frozenset[str] | None = None
+        self._fetched_at = 0.0
+        self._refresh_task: asyncio.Task[None] | None = None
+
+    def _load_file(self) -> None:
+        """Read the stored roster, if there is one"""
+        try:
+            with open(self.file_path, "r", encoding="utf-8") as file:
+                members = frozenset(member.lower() for member in json.load(file))
+            fetched_at = os.path.getmtime(self.file_path)
+        except (OSError, ValueError, TypeError, AttributeError):
+            return
+        self._members = members
+        self._fetched_at = fetched_at
+
+    async def refresh(self) -> None:
+        """Fetch the member list from Jikan and store it"""
+        async with JikanApi() as jikan:
+            members = await jikan.get_club_members(self.club_id)
+        self._members = frozenset(member.lower() for member in members)
+        self._fetched_at = time.time()
+        await asyncio.to_thread(self._write_file)
+
+    def _write_file(self) -> None:
+        """Store the roster on disk"""
+        os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
+        with open(self.file_path, "w", encoding="utf-8") as file:
+            json.dump(sorted(self._members or ()), file)
+
+    async def _refresh_logged(self) -> None:
+        """Refresh, logging failures instead of raising them"""
+        try:
+            await self.refresh()
+        # pylint: disable=broad-exception-caught
+        except Exception as error:  # noqa: BLE001
+            print(f"[Vrf] [Club] Failed to refresh club {self.club_id} roster: {error}")
+
+    def contains(self, username: str) -> bool | None:
+        """
+        Check if a user is listed in the club, starting a refresh if stale
+
+        Args:
+            username (str): MyAnimeList username
+
+        Returns:
+            bool | None: True if listed, False if not, None if no list is available yet
+        """
+        if self._members is None:
+            self._load_file()
+        if time.time() - self._fetched_at >= self.refresh_after and (
+            self._refresh_task is None or self._refresh_task.done()
+        ):
+            self._refresh_task = asyncio.create_task(
+                self._refresh_logged(), name=f"roster:{self.club_id}"
+            )
+        if self._members is None:
+            return None
+        return username.lower() in self._members
+
+
+class ClubVerifier:
+    """
+    Club membership checks for account verification
+
+    Confirmed memberships are cached for `ttl` seconds. Otherwise the user's
+    club list is paginated until the club shows up, with the remaining pages
+    fetched concurrently. Non-members are never cached, as they may join at
+    any time. With `use_roster`, the club's own member list is checked first.
+    """
+
+    def __init__(
+        self, club_id: int, ttl: float = CLUB_MEMBER_TTL, use_roster: bool = False
+    ):
+        """
+        Initialize the verifier
+
+        Args:
+            club_id (int): MyAnimeList club ID
+            ttl (float, optional): Seconds to trust a confirmed membership. Defaults to CLUB_MEMBER_TTL.
+            use_roster (bool, optional): Check the club member list before the user's clubs. Defaults to False.
+        """
+        self.club_id = club_id
+        self.ttl = float(ttl)
+        self.roster = ClubRoster(club_id) if use_roster else None
+
+    def _cache_path(self, username: str) -> str:
+        """Cache path of a confirmed membership"""
+        return Cache.get_cache_path(f"club/{self.club_id}/{username.lower()}.json")
+
+    async def is_member(self, username: str) -> bool:
+        """
+        Check if a user is a member of the club
+
+        Args:
+            username (str): MyAnimeList username
+
+        Returns:
+            bool: True if the user is a member of the club
+        """
+        cache_path = self._cache_path(username)
+        if Cache.read_cache(cache_path, self.ttl) is not None:
+            return True
+        if self.roster is not None and self.roster.contains(username):
+            Cache.write_cache(cache_path, True)
+            return True
+        async with JikanApi() as jikan:
+            member = await jikan.user_in_club(username, self.club_id)
+        if member:
+            Cache.write_cache(cache_path, True)
+        return member
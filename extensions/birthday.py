@@ -5,20 +5,23 @@ from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 
 import interactions as ipy
-import numpy as np
-import pandas as pd
 from aiohttp import ClientSession
-from fuzzywuzzy import fuzz  # type: ignore
 from interactions.ext.paginators import Paginator
 
 from classes.cache import Caching
-from classes.database import UserBirthdayPermission, UserDatabase
+from classes.database import UserBirthdayPermission, UserDatabase, request_snapshot
 from modules.commons import (
     PlatformErrType,
     platform_exception_embed,
     save_traceback_to_file,
 )
 from modules.const import BIRTHDAY_SERVER, BIRTHDAY_WEBHOOK
+from modules.discord import fetch_user_payload
+from modules.lazy_import import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+fuzz = lazy_import("fuzzywuzzy.fuzz")
 
 Cache = Caching("cache/birthday", 86400)
 
@@ -85,24 +88,25 @@ def lookup_timezone(query: str) -> Iterable[dict[str, str]]:
 
 
 async def generate_birthday_embed(ctx: ipy.SlashContext) -> tuple[ipy.Embed, int]:
-    async with UserDatabase() as udb:
-        if not await udb.check_if_registered(ctx.author.id):
-            pfembed = platform_exception_embed(
-                description="You are not registered in the database! Please register first with `/register`",
-                error="User not registered",
-                error_type=PlatformErrType.USER,
-            )
-            return (pfembed, 1)
-        usrdata = await udb.get_user_data(ctx.author.id)
-        bday = usrdata.user_birthdate
-        if bday is None:
-            pfembed = platform_exception_embed(
-                description="You have not set your birthday yet!",
-                error="Birthday not set",
-                error_type=PlatformErrType.USER,
-            )
-            return (pfembed, 1)
-        tz = usrdata.user_timezone
+    with request_snapshot():
+        async with UserDatabase() as udb:
+            if not await udb.check_if_registered(ctx.author.id):
+                pfembed = platform_exception_embed(
+                    description="You are not registered in the database! Please register first with `/register`",
+                    error="User not registered",
+                    error_type=PlatformErrType.USER,
+                )
+                return (pfembed, 1)
+            usrdata = await udb.get_user_data(ctx.author.id)
+            bday = usrdata.user_birthdate
+            if bday is None:
+                pfembed = platform_exception_embed(
+                    description="You have not set your birthday yet!",
+                    error="Birthday not set",
+                    error_type=PlatformErrType.USER,
+                )
+                return (pfembed, 1)
+            tz = usrdata.user_timezone
     embed = ipy.Embed(
         title="Your birthday information",
         description="-# To unset your birthday, use `/birthday unset`",
@@ -256,11 +260,13 @@ class Birthday(ipy.Extension):
                 perm = UserBirthdayPermission(0)
             if perm.use_korean_age:
                 age += 1
-            usr = await self.bot.fetch_user(user.discord_id)
-            usr_http = await self.bot.http.get_user(user.discord_id)
-            http_data = None
-            if usr:
-                http_data = ipy.User.from_dict(usr_http, self.bot)  # type: ignore
+            usr: ipy.User | None = None
+            try:
+                usr_http = await fetch_user_payload(self.bot, user.discord_id)
+                usr = ipy.User.from_dict(usr_http, self.bot)  # type: ignore
+            except ipy.errors.NotFound:
+                pass
+            http_data = usr
             unnecessary_greet = np.random.choice(greets)
             msg_embed = ipy.Embed(
                 title="Happy Birthday!",
@@ -393,38 +399,39 @@ class Birthday(ipy.Extension):
                 )
             )
             return
-        async with UserDatabase() as udb:
-            if not await udb.check_if_registered(ctx.author.id):
-                pfembed = platform_exception_embed(
-                    description="You are not registered in the database! Please register first with `/register`",
-                    error="User not registered",
-                    error_type=PlatformErrType.USER,
-                )
-                await ctx.send(embed=pfembed)
-                return
-            usrdata = await udb.get_user_data(ctx.author.id)
-            bday = usrdata.user_birthdate
-            if bday is not None:
-                pfembed = platform_exception_embed(
-                    description="You have already set your birthday! If you want to change it, unset your birthday by `/birthday unset`",
-                    error="Birthday already set",
-                    error_type=PlatformErrType.USER,
+        with request_snapshot():
+            async with UserDatabase() as udb:
+                if not await udb.check_if_registered(ctx.author.id):
+                    pfembed = platform_exception_embed(
+                        description="You are not registered in the database! Please register first with `/register`",
+                        error="User not registered",
+                        error_type=PlatformErrType.USER,
+                    )
+                    await ctx.send(embed=pfembed)
+                    return
+                usrdata = await udb.get_user_data(ctx.author.id)
+                bday = usrdata.user_birthdate
+                if bday is not None:
+                    pfembed = platform_exception_embed(
+                        description="You have already set your birthday! If you want to change it, unset your birthday by `/birthday unset`",
+                        error="Birthday already set",
+                        error_type=PlatformErrType.USER,
+                    )
+                    await ctx.send(embed=pfembed)
+                    return
+                await udb.update_user(ctx.author.id, "userBirthdate", date)
+                await udb.update_user(ctx.author.id, "userTimezone", timezone)
+                await udb.update_user(
+                    ctx.author.id,
+                    "userBirthdayPermission",
+                    UserBirthdayPermission.from_dict(
+                        {
+                            "show_year": show_year,
+                            "show_age": show_age,
+                            "use_korean_age": korean_age,
+                        }
+                    ).identifier,
                 )
-                await ctx.send(embed=pfembed)
-                return
-            await udb.update_user(ctx.author.id, "userBirthdate", date)
-            await udb.update_user(ctx.author.id, "userTimezone", timezone)
-            await udb.update_user(
-                ctx.author.id,
-                "userBirthdayPermission",
-                UserBirthdayPermission.from_dict(
-                    {
-                        "show_year": show_year,
-                        "show_age": show_age,
-                        "use_korean_age": korean_age,
-                    }
-                ).identifier,
-            )
         await ctx.send(
             embed=ipy.Embed(
                 title="Birthday set!",
@@ -602,27 +609,28 @@ class Birthday(ipy.Extension):
     async def birthday_unset(self, ctx: ipy.SlashContext):
         """Unset your birthday"""
         await ctx.defer()
-        async with UserDatabase() as udb:
-            if not await udb.check_if_registered(ctx.author.id):
-                pfembed = platform_exception_embed(
-                    description="You are not registered in the database! Please register first with `/register`",
-                    error="User not registered",
-                    error_type=PlatformErrType.USER,
-                )
-                await ctx.send(embed=pfembed)
-                return
-            usrdata = await udb.get_user_data(ctx.author.id)
-            bday = usrdata.user_birthdate
-            if bday is None:
-                pfembed = platform_exception_embed(
-                    description="You have not set your birthday yet!",
-                    error="Birthday not set",
-                    error_type=PlatformErrType.USER,
-                )
-                await ctx.send(embed=pfembed)
-                return
-            await udb.update_user(ctx.author.id, "userBirthdate", None)
-            await udb.update_user(ctx.author.id, "userTimezone", None)
+        with request_snapshot():
+            async with UserDatabase() as udb:
+                if not await udb.check_if_registered(ctx.author.id):
+                    pfembed = platform_exception_embed(
+                        description="You are not registered in the database! Please register first with `/register`",
+                        error="User not registered",
+                        error_type=PlatformErrType.USER,
+                    )
+                    await ctx.send(embed=pfembed)
+                    return
+                usrdata = await udb.get_user_data(ctx.author.id)
+                bday = usrdata.user_birthdate
+                if bday is None:
+                    pfembed = platform_exception_embed(
+                        description="You have not set your birthday yet!",
+                        error="Birthday not set",
+                        error_type=PlatformErrType.USER,
+                    )
+                    await ctx.send(embed=pfembed)
+                    return
+                await udb.update_user(ctx.author.id, "userBirthdate", None)
+                await udb.update_user(ctx.author.id, "userTimezone", None)
         await ctx.send(
             embed=ipy.Embed(
                 title="Birthday unset!",
@@ -1,5 +1,4 @@
 import asyncio
-import re
 from datetime import datetime as dtime
 from datetime import timezone as tz
 from subprocess import check_output as chout
@@ -19,6 +18,7 @@ from modules.const import (
     GT_HSH,
     USER_AGENT,
 )
+from modules.text import get_emoji_id
 
 
 class CommonCommands(ipy.Extension):
@@ -192,7 +192,7 @@ If you want to contact the author, send a DM to [{AUTHOR_USERNAME}]({AUTHOR_USER
             color=0x996422,
         )
         embed.add_fields(*fields)
-        emoji = re.sub(r"<:[a-zA-Z0-9_]+:([0-9]+)>", r"\1", EMOJI_SUCCESS)
+        emoji = get_emoji_id(EMOJI_SUCCESS)
         embed.set_thumbnail(url=f"https://cdn.discordapp.com/emojis/{emoji}.png?v=1")
         await send.edit(
             embed=embed,
@@ -3,8 +3,6 @@ from datetime import datetime, timezone
 from typing import ClassVar
 
 import interactions as ipy
-import pandas as pd
-from fuzzywuzzy import fuzz
 
 from classes.converter import Length, Mass, Temperature, Time, Volume
 from classes.excepts import ProviderHttpError
@@ -15,6 +13,10 @@ from modules.commons import (
     save_traceback_to_file,
 )
 from modules.const import EMOJI_SUCCESS, EMOJI_UNEXPECTED_ERROR
+from modules.lazy_import import lazy_import
+
+pd = lazy_import("pandas")
+fuzz = lazy_import("fuzzywuzzy.fuzz")
 
 emoji_err = re.sub(r"(<:.*:)(\d+)(>)", r"\2", EMOJI_UNEXPECTED_ERROR)
 emoji_success = re.sub(r"(<:.*:)(\d+)(>)", r"\2", EMOJI_SUCCESS)
@@ -14,7 +14,6 @@ from datetime import datetime, timezone
 from typing import Literal
 
 import interactions as ipy
-import pandas as pd
 import yaml
 
 from classes.anilist import AniList
@@ -34,6 +33,9 @@ from modules.const import (
     VERIFICATION_SERVER,
     VERIFIED_ROLE,
 )
+from modules.lazy_import import lazy_import
+
+pd = lazy_import("pandas")
 
 
 class DataControl(ipy.Extension):
@@ -10,7 +10,7 @@ from modules.commons import (
     generate_utils_except_embed,
     save_traceback_to_file,
 )
-from modules.discord import generate_discord_profile_embed
+from modules.discord import fetch_user_payload, generate_discord_profile_embed
 
 GIF_ISSUE = (
     "Image might be outdated because cache or it's actually a GIF/animated image"
@@ -96,7 +96,7 @@ class DiscordCog(ipy.Extension):
         if not user:
             user = ctx.author
 
-        udata: dict[str, Any] = await self.bot.http.get_user(user.id)  # type: ignore
+        udata: dict[str, Any] = await fetch_user_payload(self.bot, user.id)
         udict = ipy.User.from_dict(udata, self.bot)  # type: ignore
 
         if scope == "usrbg":
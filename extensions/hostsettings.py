@@ -1,7 +1,6 @@
+import asyncio
 import os
 import re
-import shutil
-import tarfile
 import tempfile
 from pathlib import Path
 
@@ -9,6 +8,7 @@ import aiohttp
 import interactions as ipy
 
 from classes.database import UserDatabase
+from modules.backup import commit_backup_index, export_backup, import_backup
 from modules.const import (
     AUTHOR_USERID,
     EMOJI_SUCCESS,
@@ -17,7 +17,7 @@ from modules.const import (
     VERIFICATION_SERVER,
     VERIFIED_ROLE,
 )
-from modules.crypto_utils import CryptoUtils
+from modules.crypto_utils import STREAM_CHUNK_SIZE
 from modules.discord import format_username
 
 hostsettings_head = ipy.SlashCommand(
@@ -104,58 +104,47 @@ class HostSettings(ipy.Extension):
     @database.subcommand(
         sub_cmd_name="export",
         sub_cmd_description="Export and encrypt all databases and configuration",
+        options=[
+            ipy.SlashCommandOption(
+                name="incremental",
+                description="Only export files changed since the last export",
+                required=False,
+                type=ipy.OptionType.BOOLEAN,
+            ),
+            ipy.SlashCommandOption(
+                name="key",
+                description="Reuse an encryption key, e.g. the one of the full backup",
+                required=False,
+                type=ipy.OptionType.STRING,
+            ),
+        ],
     )
-    async def hostsettings_database_export(self, ctx: ipy.SlashContext):
+    async def hostsettings_database_export(
+        self,
+        ctx: ipy.SlashContext,
+        incremental: bool = False,
+        key: str | None = None,
+    ):
         await ctx.defer(ephemeral=True)
 
         with tempfile.TemporaryDirectory() as tmpdir:
-            temp_dir_to_archive = Path(tmpdir) / "backup_content"
-            temp_dir_to_archive.mkdir()
-
-            # Add database directory
-            if os.path.exists("database"):
-                shutil.copytree(
-                    "database", temp_dir_to_archive / "database", dirs_exist_ok=True
-                )
-
-            # Add .env file
-            if os.path.exists(".env"):
-                shutil.copy2(".env", temp_dir_to_archive / ".env")
-
-            # Add any private_ files/folders (e.g., extensions/private_seasonal.py)
-            for path in Path(".").rglob("private_*"):
-                if (
-                    "__pycache__" in str(path)
-                    or ".mypy_cache" in str(path)
-                    or ".ruff_cache" in str(path)
-                ):
-                    continue
-
-                relative_path = path.relative_to(".")
-                dest_path = temp_dir_to_archive / relative_path
-
-                if path.is_dir():
-                    shutil.copytree(path, dest_path, dirs_exist_ok=True)
-                else:
-                    dest_path.parent.mkdir(parents=True, exist_ok=True)
-                    shutil.copy2(path, dest_path)
-
-            # Create tar archive
-            archive_path_base = Path(tmpdir) / "backup"
-            archive_path = Path(
-                shutil.make_archive(
-                    str(archive_path_base), "tar", root_dir=temp_dir_to_archive
-                )
-            )
-
+            enc_path = Path(tmpdir) / "backup.tar.gz.enc"
             try:
-                enc_path, key = CryptoUtils.encrypt_and_package(archive_path)
+                key, index = await asyncio.to_thread(
+                    export_backup, enc_path, incremental=incremental, key=key
+                )
                 file = ipy.File(str(enc_path), file_name="backup.tar.gz.enc")
+                kind = (
+                    f"Incremental backup of {len(index.packed)} changed files"
+                    if incremental
+                    else "Backup"
+                )
                 await ctx.send(
-                    content=f"Backup exported successfully.\n**Encryption Key:** `{key}`\nKeep this key safe, you will need it to import the backup back.",
+                    content=f"{kind} exported successfully.\n**Encryption Key:** `{key}`\nKeep this key safe, you will need it to import the backup back.",
                     file=file,
                 )
-                enc_path.unlink()
+                # only chain later backups to one the host received
+                await asyncio.to_thread(commit_backup_index, index)
             except Exception as e:  # noqa: BLE001
                 embed = self.generate_error_embed(
                     header="Error!",
@@ -187,42 +176,27 @@ class HostSettings(ipy.Extension):
     ):
         await ctx.defer(ephemeral=True)
         temp_enc_path = Path("backup_temp.enc")
-        temp_tar_path = Path("backup_temp.tar")
 
         try:
-            # Download the file
+            # Download the file, without holding it in memory
             async with (
                 aiohttp.ClientSession() as session,
                 session.get(file.url) as resp,
             ):
-                if resp.status == 200:
-                    data = await resp.read()
-                    temp_enc_path.write_bytes(data)
-                else:
+                if resp.status != 200:
                     raise RuntimeError(
                         f"Failed to download attachment: HTTP {resp.status}"
                     )
+                with open(temp_enc_path, "wb") as f_out:  # noqa: ASYNC230
+                    async for chunk in resp.content.iter_chunked(STREAM_CHUNK_SIZE):
+                        f_out.write(chunk)
 
-            # Decrypt and decompress to tar
-            CryptoUtils.decrypt_and_extract(temp_enc_path, key, temp_tar_path)
-
-            # Create backup of current state
-            if os.path.exists("database"):
-                if os.path.exists("database_backup"):
-                    shutil.rmtree("database_backup")
-                shutil.copytree("database", "database_backup")
-            if os.path.exists(".env"):
-                shutil.copy2(".env", ".env.bak")
-
-            # Extract tar
-            with tarfile.open(temp_tar_path, "r") as tar:
-                tar.extractall(path=".")
+            # Decrypt and extract, current files are kept as database_backup and .env.bak
+            await asyncio.to_thread(import_backup, temp_enc_path, key)
 
-            # Delete temp files before restart
+            # Delete temp file before restart
             if temp_enc_path.exists():
                 temp_enc_path.unlink()
-            if temp_tar_path.exists():
-                temp_tar_path.unlink()
 
             embed = self.generate_success_embed(
                 header="Success!",
@@ -256,8 +230,6 @@ class HostSettings(ipy.Extension):
         finally:
             if temp_enc_path.exists():
                 temp_enc_path.unlink()
-            if temp_tar_path.exists():
-                temp_tar_path.unlink()
 
     @staticmethod
     def generate_error_embed(
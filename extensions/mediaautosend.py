@@ -3,7 +3,6 @@ Automatically send a media (anime, manga, games, movie, tv) embed info
 to a channel when a message is sent with a link to a supported site.
 """
 
-import os
 import re
 from typing import Literal
 
@@ -12,6 +11,7 @@ import interactions as ipy
 import regex_spm
 from interactions.api.events import MessageCreate
 
+from classes.allowlist import autoembed_allowlist
 from classes.anilist import AniList
 from classes.animeapi import AnimeApi
 from classes.mangadex import Manga, Mangadex
@@ -115,7 +115,7 @@ If you can't see the slash commands, please re-invite the bot to your server, an
             )
             return
 
-        if not os.path.exists(f"database/allowlist_autoembed/{ctx.author.id}"):
+        if ctx.author.id not in autoembed_allowlist:
             return
 
         send_to: Literal["anilist", "mal", "simkl", "rawg"] | None = None
@@ -6,14 +6,17 @@ Contains:
   of a user on MyAnimeList directly on Discord
 """
 
+import asyncio
 import re
 from datetime import datetime as dtime
 from datetime import timezone as tz
 from typing import Literal
 from urllib.parse import quote
 
+import aiohttp
 import interactions as ipy
 
+from classes.cache import TtlCache
 from classes.database import DatabaseException, UserDatabase
 from classes.excepts import ProviderHttpError
 from classes.html.myanimelist import HtmlMyAnimeList
@@ -28,6 +31,54 @@ from modules.commons import (
     save_traceback_to_file,
 )
 
+PROFILE_CACHE_TTL = 60.0
+"""Seconds to reuse a rendered profile embed for the same username and layout"""
+
+profile_cache: TtlCache[tuple[str, str], tuple[ipy.Embed, list[ipy.Button]]] = TtlCache(
+    ttl=PROFILE_CACHE_TTL, maxsize=256
+)
+"""Rendered profile embeds and buttons, keyed by lowercased username and layout"""
+
+
+def _format_rss_activity(items: list[RssItem]) -> list[str]:
+    """
+    Format the latest RSS items as a numbered activity list
+
+    Args:
+        items (list[RssItem]): RSS items, newest first
+
+    Returns:
+        list[str]: Formatted lines
+    """
+    total = len(items)
+    if total == 0:
+        return ["No recent activity"]
+    lines: list[str] = []
+    for index, item in enumerate(items[:5]):
+        title = item.title if len(item.title) < 50 else item.title[:47] + "..."
+        # convert to epoch
+        timestamp = int(item.updated.timestamp())
+        status = ""
+        match item.status:
+            case MediaStatus.WATCHING | MediaStatus.READING:
+                status = "👀"
+            case MediaStatus.COMPLETED:
+                status = "✅"
+            case MediaStatus.ON_HOLD:
+                status = "⏸️"
+            case MediaStatus.DROPPED:
+                status = "🗑️"
+            case MediaStatus.PLAN_TO_WATCH | MediaStatus.PLAN_TO_READ:
+                status = "⏰"
+            case MediaStatus.RE_WATCHING | MediaStatus.RE_READING:
+                status = "🔁"
+        progress_to = "*Unknown*" if item.progress_to is None else item.progress_to
+        lines.append(
+            f"{index + 1}. {status} [{title}]({item.url}), {item.progress_from}/{progress_to}, <t:{timestamp}:R>"
+        )
+    lines.append(f"And {total - 5} more...")
+    return lines
+
 
 class MyAnimeListCog(ipy.Extension):
     """Extension for interacting with MyAnimeList"""
@@ -100,9 +151,6 @@ class MyAnimeListCog(ipy.Extension):
         """
         await ctx.defer()
         user_data: JikanUserStruct | None = None
-        extended: JikanUserStruct = JikanUserStruct(
-            mal_id=0, username="", url="", joined=dtime.now(tz=tz.utc)
-        )
 
         if mal_username and user:
             embed = platform_exception_embed(
@@ -134,30 +182,66 @@ Use `/register` to register, or use `/myanimelist profile mal_username:<username
             await ctx.send(embed=embed)
             return
 
-        try:
-            async with HtmlMyAnimeList() as html:
-                extended = await html.get_user(mal_username)
-            if embed_layout not in ["timeline", "timeline_title"]:
-                async with JikanApi() as jikan:
-                    user_data = await jikan.get_user_data(mal_username.lower())
-            else:
-                user_data = extended
-        except JikanException as error:
-            embed = platform_exception_embed(
-                description="Jikan API returned an error",
-                error_type=error.status_code,
-                error=error.message,
-            )
-            await ctx.send(embed=embed)
-            save_traceback_to_file("myanimelist_profile", ctx.author, error)
-        except ProviderHttpError as error:
-            embed = platform_exception_embed(
-                description="MyAnimeList returned an error",
-                error_type=error.status_code,
-                error=error.message,
+        cache_key = (mal_username.lower(), embed_layout)
+        cached = profile_cache.get(cache_key)
+        if cached is not None:
+            embed, components = cached
+            await ctx.send(embed=embed, components=components)
+            return
+
+        is_timeline = embed_layout in ["timeline", "timeline_title"]
+
+        async def fetch_jikan() -> JikanUserStruct | None:
+            if is_timeline:
+                return None
+            async with JikanApi() as jikan:
+                return await jikan.get_user_data(mal_username.lower())
+
+        async def fetch_rss(media_type: Literal["anime", "manga"]) -> list[RssItem]:
+            if not is_timeline:
+                return []
+            async with Rss(
+                media_type, embed_layout == "timeline", session=session
+            ) as rss:
+                return await rss.get_user(mal_username)
+
+        # the scrape and both RSS feeds hit myanimelist.net, so they share a
+        # session (and its connection pool), while Jikan goes out in parallel
+        async with (
+            aiohttp.ClientSession() as session,
+            HtmlMyAnimeList(session=session) as html,
+        ):
+            html_res, jikan_res, ani_res, man_res = await asyncio.gather(
+                html.get_user(mal_username),
+                fetch_jikan(),
+                fetch_rss("anime"),
+                fetch_rss("manga"),
+                return_exceptions=True,
             )
-            await ctx.send(embed=embed)
-            save_traceback_to_file("myanimelist_profile", ctx.author, error)
+
+        for result in (jikan_res, html_res):
+            if isinstance(result, JikanException):
+                embed = platform_exception_embed(
+                    description="Jikan API returned an error",
+                    error_type=result.status_code,
+                    error=result.message,
+                )
+                await ctx.send(embed=embed)
+                save_traceback_to_file("myanimelist_profile", ctx.author, result)
+                return
+            if isinstance(result, ProviderHttpError):
+                embed = platform_exception_embed(
+                    description="MyAnimeList returned an error",
+                    error_type=result.status_code,
+                    error=result.message,
+                )
+                await ctx.send(embed=embed)
+                save_traceback_to_file("myanimelist_profile", ctx.author, result)
+                return
+            if isinstance(result, BaseException):
+                raise result
+        extended = html_res
+        user_data = extended if is_timeline else jikan_res
 
         if user_data is None:
             embed = platform_exception_embed(
@@ -396,109 +480,27 @@ Use `/register` to register, or use `/myanimelist profile mal_username:<username
                     inline=True,
                 ),
             )
-        elif embed_layout in ["timeline", "timeline_title"]:
-            try:
-                async with Rss("anime", embed_layout == "timeline") as ani:
-                    ani_data = await ani.get_user(username)
-                    ani_data_total = len(ani_data)
-                if ani_data_total > 0:
-                    ani_data: list[RssItem | str] = ani_data[:5]
-                    for index, anime in enumerate(ani_data):
-                        if isinstance(anime, str):
-                            continue
-                        if len(anime.title) >= 50:
-                            anime.title = anime.title[:47] + "..."
-                        # convert to epoch
-                        timestamp = int(anime.updated.timestamp())
-                        status = ""
-                        match anime.status:
-                            case MediaStatus.WATCHING:
-                                status = "👀"
-                            case MediaStatus.COMPLETED:
-                                status = "✅"
-                            case MediaStatus.ON_HOLD:
-                                status = "⏸️"
-                            case MediaStatus.DROPPED:
-                                status = "🗑️"
-                            case MediaStatus.PLAN_TO_WATCH:
-                                status = "⏰"
-                            case MediaStatus.RE_WATCHING:
-                                status = "🔁"
-                        anime.progress_to = (
-                            "*Unknown*"
-                            if anime.progress_to is None
-                            else anime.progress_to
-                        )
-                        ani_data[index] = (
-                            f"{index + 1}. {status} [{anime.title}]({anime.url}), {anime.progress_from}/{anime.progress_to}, <t:{timestamp}:R>"
-                        )
-                    ani_data.append(f"And {ani_data_total - 5} more...")
-                else:
-                    ani_data = ["No recent activity"]
-            except ProviderHttpError as err:
-                if err.status_code == 403:
-                    man_data = [
-                        "No recent activity, most likely due to private profile."
-                    ]
-                else:
-                    embed = platform_exception_embed(
-                        description="MyAnimeList returned an error",
-                        error_type=err.status_code,
-                        error=err.message,
+        elif is_timeline:
+            activities: list[list[str]] = []
+            for feed in (ani_res, man_res):
+                if isinstance(feed, ProviderHttpError) and feed.status_code == 403:
+                    activities.append(
+                        ["No recent activity, most likely due to private profile."]
                     )
-                await ctx.send(embed=embed)
-                save_traceback_to_file("myanimelist_profile", ctx.author, err)
-            try:
-                async with Rss("manga", embed_layout == "timeline") as man:
-                    man_data = await man.get_user(username)
-                man_data_total = len(man_data)
-                if man_data_total > 0:
-                    man_data: list[RssItem | str] = man_data[:5]
-                    for index, manga in enumerate(man_data):
-                        if isinstance(manga, str):
-                            continue
-                        if len(manga.title) >= 50:
-                            manga.title = manga.title[:47] + "..."
-                        # convert to epoch
-                        timestamp = int(manga.updated.timestamp())
-                        status = ""
-                        match manga.status:
-                            case MediaStatus.READING:
-                                status = "👀"
-                            case MediaStatus.PLAN_TO_READ:
-                                status = "⏰"
-                            case MediaStatus.COMPLETED:
-                                status = "✅"
-                            case MediaStatus.ON_HOLD:
-                                status = "⏸️"
-                            case MediaStatus.DROPPED:
-                                status = "🗑️"
-                            case MediaStatus.RE_READING:
-                                status = "🔁"
-                        manga.progress_to = (
-                            "*Unknown*"
-                            if manga.progress_to is None
-                            else manga.progress_to
-                        )
-                        man_data[index] = (
-                            f"{index + 1}. {status} [{manga.title}]({manga.url}), {manga.progress_from}/{manga.progress_to}, <t:{timestamp}:R>"
-                        )
-                    man_data.append(f"And {man_data_total - 5} more...")
-                else:
-                    man_data = ["No recent activity"]
-            except ProviderHttpError as err:
-                if err.status_code == 403:
-                    man_data = [
-                        "No recent activity, most likely due to private profile."
-                    ]
-                else:
+                elif isinstance(feed, ProviderHttpError):
                     embed = platform_exception_embed(
                         description="MyAnimeList returned an error",
-                        error_type=err.status_code,
-                        error=err.message,
+                        error_type=feed.status_code,
+                        error=feed.message,
                     )
-                await ctx.send(embed=embed)
-                save_traceback_to_file("myanimelist_profile", ctx.author, err)
+                    await ctx.send(embed=embed)
+                    save_traceback_to_file("myanimelist_profile", ctx.author, feed)
+                    return
+                elif isinstance(feed, BaseException):
+                    raise feed
+                else:
+                    activities.append(_format_rss_activity(feed))
+            ani_data, man_data = activities
             # convert to string
             ani_data = "\n".join(ani_data)
             man_data = "\n".join(man_data)
@@ -573,6 +575,7 @@ Use `/register` to register, or use `/myanimelist profile mal_username:<username
 
         embed.set_footer(text=foo)
 
+        profile_cache.set(cache_key, (embed, components))
         await ctx.send(embed=embed, components=components)
 
 
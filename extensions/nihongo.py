@@ -1,15 +1,17 @@
 from datetime import datetime, timezone
 from typing import Literal
 
-import cutlet
 import interactions as ipy
-import pykakasi
 
 from modules.commons import (
     generate_commons_except_embed,
     sanitize_markdown,
     save_traceback_to_file,
 )
+from modules.lazy_import import lazy_import
+
+cutlet = lazy_import("cutlet")
+pykakasi = lazy_import("pykakasi")
 
 
 class JapaneseCog(ipy.Extension):
@@ -1,5 +1,3 @@
-import re
-
 import interactions as ipy
 
 from classes.randomorg import ProviderHttpError, RandomOrg
@@ -10,6 +8,7 @@ from modules.const import (
     EMOJI_SUCCESS,
     EMOJI_UNEXPECTED_ERROR,
 )
+from modules.text import get_emoji_id
 
 
 class Random(ipy.Extension):
@@ -50,7 +49,7 @@ class Random(ipy.Extension):
                 color=0xFF0000,
             )
             embed.set_footer(text="Please try again later")
-            emoji = re.sub(r"<:[a-zA-Z0-9_]+:([0-9]+)>", r"\1", EMOJI_UNEXPECTED_ERROR)
+            emoji = get_emoji_id(EMOJI_UNEXPECTED_ERROR)
             embed.set_thumbnail(url=f"https://cdn.discordapp.com/emojis/{emoji}.png")
             await ctx.send(embed=embed)
             save_traceback_to_file("random_8ball", ctx.author, e)
@@ -87,7 +86,7 @@ class Random(ipy.Extension):
         else:
             emoji = EMOJI_UNEXPECTED_ERROR
 
-        emoji = re.sub(r"<:[a-zA-Z0-9_]+:([0-9]+)>", r"\1", emoji)
+        emoji = get_emoji_id(emoji)
         emoji_url = f"https://cdn.discordapp.com/emojis/{emoji}.png"
 
         embed = ipy.Embed(
@@ -193,7 +192,7 @@ class Random(ipy.Extension):
                 color=0xFF0000,
             )
             embed.set_footer(text="Please try again later")
-            emoji = re.sub(r"<:[a-zA-Z0-9_]+:([0-9]+)>", r"\1", EMOJI_UNEXPECTED_ERROR)
+            emoji = get_emoji_id(EMOJI_UNEXPECTED_ERROR)
             embed.set_thumbnail(url=f"https://cdn.discordapp.com/emojis/{emoji}.png")
             await ctx.send(embed=embed)
             save_traceback_to_file("random_number", ctx.author, e)
@@ -274,7 +273,7 @@ class Random(ipy.Extension):
                 color=0xFF0000,
             )
             embed.set_footer(text="Please try again later")
-            emoji = re.sub(r"<:[a-zA-Z0-9_]+:([0-9]+)>", r"\1", EMOJI_UNEXPECTED_ERROR)
+            emoji = get_emoji_id(EMOJI_UNEXPECTED_ERROR)
             embed.set_thumbnail(url=f"https://cdn.discordapp.com/emojis/{emoji}.png")
             await ctx.send(embed=embed)
             save_traceback_to_file("random_string", ctx.author, e)
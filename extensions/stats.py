@@ -4,219 +4,26 @@ Stats extension for the bot.
 This extension is used to show bot stats via /stats command.
 """
 
-import platform as pfm
+import asyncio
 import sys
-from dataclasses import dataclass
 from datetime import datetime, timezone
-from importlib.metadata import distributions
 
 import interactions as ipy
-import psutil
+from interactions.api.events import Startup
 from interactions.ext.paginators import Paginator
 
-from classes.stats.dbl import DiscordBotList
-from classes.stats.infinity import InfinityBots
-from classes.stats.topgg import TopGG
+from classes.stats.listing import fetch_listing_votes, listing_votes
+from classes.stats.system import (
+    SAMPLE_INTERVAL,
+    MetricTrend,
+    get_pip_pkgs,
+    get_system_info,
+    system_sampler,
+)
 from modules.commons import save_traceback_to_file
 from modules.const import GIT_COMMIT_HASH, GT_HSH, USER_AGENT, VERIFICATION_SERVER
 
 
-@dataclass
-class ProviderVoteStruct:
-    """Provider Vote Struct"""
-
-    name: str
-    """Name of the provider"""
-    bot_id: int
-    """ID of the bot"""
-    base_url: str
-    """Base URL of the provider"""
-    total_votes: int
-    """Total votes on the provider"""
-    upvote_path: str = "/vote"
-    """Path to upvote on the provider"""
-    time_limit: int = 0
-    """Time limit of vote stats on the provider in hours"""
-
-    @property
-    def as_text(self) -> str:
-        """
-        Get the provider vote stats as text
-
-        Returns:
-            str: The provider vote stats as text
-        """
-        url = f"{self.base_url}{self.bot_id}{self.upvote_path}"
-        if self.time_limit == 0:
-            return f"* [{self.name}]({url}): {self.total_votes:,} in total"
-        return f"* [{self.name}]({url}): {self.total_votes:,} in last {self.time_limit} hours"
-
-
-@dataclass
-class DiskInfo:
-    """Disk Information"""
-
-    mountpoint: str
-    disk_total: str | None
-    disk_used: str | None
-    disk_free: str | None
-    disk_percentage: float
-
-
-@dataclass
-class SystemInfo:
-    """System Information"""
-
-    system: str
-    release: str
-    version: str
-    machine: str
-    processor: str
-    uptime: datetime
-    cpu_physical_cores: int
-    cpu_total_cores: int
-    cpu_max_frequency: str
-    cpu_min_frequency: str
-    cpu_current_frequency: str
-    cpu_usage_cores: list[float]
-    cpu_usage_total: float
-    ram_total: str | None
-    ram_available: str | None
-    ram_used: str | None
-    ram_free: str | None
-    ram_percentage: float
-    swap_total: str | None
-    swap_used: str | None
-    swap_free: str | None
-    swap_percentage: float
-    disks: list[DiskInfo]
-
-
-@dataclass
-class PackageInfo:
-    """Package Information"""
-
-    name: str
-    version: str
-    license: str
-
-
-def get_size(bytes: float | None, suffix: str = "B") -> str | None:
-    """
-    Scale bytes to its proper format
-    e.g:
-        1253656 => '1.20MB'
-        1253656678 => '1.17GB'
-    """
-    if bytes is None:
-        return None
-    factor = 1024
-    for unit in ["", "K", "M", "G", "T", "P"]:
-        if bytes < factor:
-            return f"{bytes:.2f}{unit}{suffix}"
-        bytes /= factor
-
-
-def get_disk_info() -> list[DiskInfo]:
-    """
-    Get disk information
-
-    Returns:
-        list[DiskInfo]: List of disk information
-    """
-    disks: list[DiskInfo] = []
-    partitions = psutil.disk_partitions()
-    for partition in partitions:
-        try:
-            disk_usage = psutil.disk_usage(partition.mountpoint)
-        except PermissionError:
-            continue
-        mountpoint = partition.mountpoint
-        disk_total = get_size(disk_usage.total)
-        disk_used = get_size(disk_usage.used)
-        disk_free = get_size(disk_usage.free)
-        disk_percentage = disk_usage.percent
-        disks.append(
-            DiskInfo(
-                mountpoint=mountpoint,
-                disk_total=disk_total,
-                disk_used=disk_used,
-                disk_free=disk_free,
-                disk_percentage=disk_percentage,
-            )
-        )
-    return disks
-
-
-def get_system_info() -> SystemInfo:
-    """
-    Get system information
-
-    Returns:
-        SystemInfo: System information
-    """
-    cpu_usage_cores = psutil.cpu_percent(percpu=True)
-    cpu_usage_total = psutil.cpu_percent()
-    ram = psutil.virtual_memory()
-    swap = psutil.swap_memory()
-    disks = get_disk_info()
-    return SystemInfo(
-        system=pfm.system(),
-        release=pfm.release(),
-        version=pfm.version(),
-        machine=pfm.machine(),
-        processor=pfm.processor(),
-        uptime=datetime.fromtimestamp(psutil.boot_time(), tz=timezone.utc),
-        cpu_physical_cores=psutil.cpu_count(logical=False),
-        cpu_total_cores=psutil.cpu_count(logical=True),
-        cpu_max_frequency=f"{psutil.cpu_freq().max:.2f}Mhz",
-        cpu_min_frequency=f"{psutil.cpu_freq().min:.2f}Mhz",
-        cpu_current_frequency=f"{psutil.cpu_freq().current:.2f}Mhz",
-        cpu_usage_cores=cpu_usage_cores,
-        cpu_usage_total=cpu_usage_total,
-        ram_total=get_size(ram.total),
-        ram_available=get_size(ram.available),
-        ram_used=get_size(ram.used),
-        ram_free=get_size(ram.free),
-        ram_percentage=ram.percent,
-        swap_total=get_size(swap.total),
-        swap_used=get_size(swap.used),
-        swap_free=get_size(swap.free),
-        swap_percentage=swap.percent,
-        disks=disks,
-    )
-
-
-def get_pkg_license(pkg_name: str) -> str:
-    try:
-        from importlib.metadata import metadata
-
-        meta = metadata(pkg_name)
-        return meta.get("License", "*Licence not found*")
-    except Exception:  # noqa: BLE001
-        return "*Licence not found*"
-
-
-def get_pip_pkgs() -> list[PackageInfo]:
-    """
-    Get pip packages
-
-    Returns:
-        list[PackageInfo]: List of pip packages
-    """
-    final: list[PackageInfo] = []
-    for pkg in distributions():
-        pkg_name = pkg.name
-        final.append(
-            PackageInfo(
-                name=pkg_name, version=pkg.version, license=get_pkg_license(pkg_name)
-            )
-        )
-    # sort by name
-    final.sort(key=lambda x: x.name)
-    return final
-
-
 class Stats(ipy.Extension):
     """Stats command"""
 
@@ -236,6 +43,40 @@ class Stats(ipy.Extension):
         """
         self.bot = bot
         self.now = now if now is not None else datetime.now(tz=timezone.utc)
+        # pylint: disable-next=no-member
+        self.sample_system.start()
+
+    @ipy.listen(Startup)
+    async def load_package_inventory(self) -> None:
+        """List installed packages once, off the event loop"""
+        await asyncio.to_thread(get_pip_pkgs)
+
+    @ipy.Task.create(ipy.IntervalTrigger(seconds=SAMPLE_INTERVAL))
+    async def sample_system(self) -> None:
+        """Add a system metric sample to the ring buffer"""
+        try:
+            await asyncio.to_thread(system_sampler.sample)
+        except Exception as err:  # noqa: BLE001
+            print(f"[Sts] [System] Failed to sample system metrics: {err}")
+
+    @staticmethod
+    def _trend_text(trend: MetricTrend | None) -> str:
+        """
+        Format the spread of a metric for an embed field
+
+        Args:
+            trend (MetricTrend | None): The spread
+
+        Returns:
+            str: The spread as a list item, empty if there is no history yet
+        """
+        if trend is None or trend.samples < 2:
+            return ""
+        minutes = trend.samples * SAMPLE_INTERVAL // 60
+        return (
+            f"\n* Last {minutes} minutes: {trend.minimum}% min, "
+            f"{trend.average}% avg, {trend.maximum}% max"
+        )
 
     base = ipy.SlashCommand(
         name="stats",
@@ -293,55 +134,13 @@ class Stats(ipy.Extension):
         verinfo = sys.version_info
         py_ver = f"{verinfo.major}.{verinfo.minor}.{verinfo.micro}"
 
-        # get upvotes
-        provider_votes: list[ProviderVoteStruct] = []
-
-        try:
-            async with TopGG() as tgg:
-                tgg_info = await tgg.get_bot_stats()
-                provider_votes.append(
-                    ProviderVoteStruct(
-                        name="Top.gg",
-                        bot_id=bot_id,
-                        base_url="https://top.gg/bot/",
-                        total_votes=tgg_info.points,
-                    )
-                )
-        except Exception as err:  # noqa: BLE001
-            save_traceback_to_file("stats_general-tgg", ctx.author, err, True)
+        # get upvotes, from the last poll if it is recent enough
+        provider_votes = listing_votes.get(int(bot_id))
+        if provider_votes is None:
+            provider_votes, failed = await fetch_listing_votes(int(bot_id))
+            for site, err in failed.items():
+                save_traceback_to_file(f"stats_general-{site}", ctx.author, err, True)
 
-        try:
-            async with DiscordBotList() as dbl:
-                dbl_stats = await dbl.get_recent_upvotes()
-                # dbl_upvote = dbl_stats.total
-                provider_votes.append(
-                    ProviderVoteStruct(
-                        name="Discord Bot List",
-                        bot_id=bot_id,
-                        base_url="https://discordbotlist.com/bots/",
-                        upvote_path="/upvotes",
-                        total_votes=dbl_stats.total,
-                        time_limit=12,
-                    )
-                )
-        except Exception as err:  # noqa: BLE001
-            save_traceback_to_file("stats_general-dbl", ctx.author, err, True)
-
-        try:
-            async with InfinityBots() as ibl:
-                ibl_info = await ibl.get_bot_info(bot_id)
-                provider_votes.append(
-                    ProviderVoteStruct(
-                        name="Infinity Bots",
-                        bot_id=bot_id,
-                        base_url="https://omniplex.gg/bot/",
-                        total_votes=ibl_info.votes,
-                    )
-                )
-        except Exception as err:  # noqa: BLE001
-            save_traceback_to_file("stats_general-ibl", ctx.author, err, True)
-
-        provider_votes.sort(key=lambda x: x.name)
         votes_str = "\n".join([vt.as_text for vt in provider_votes]) or "No reports"
 
         embed = ipy.Embed(
@@ -386,7 +185,9 @@ class Stats(ipy.Extension):
             )
         )
 
-        sys_info = get_system_info()
+        sys_info = system_sampler.latest() or await asyncio.to_thread(get_system_info)
+        cpu_trend = self._trend_text(system_sampler.trend("cpu_usage_total"))
+        ram_trend = self._trend_text(system_sampler.trend("ram_percentage"))
 
         cores = ""
         for index, core in enumerate(sys_info.cpu_usage_cores):
@@ -395,7 +196,7 @@ class Stats(ipy.Extension):
         embed = ipy.Embed(
             title="System stats for bot",
             color=0x771921,
-            timestamp=ipy.Timestamp.now(tz=timezone.utc),
+            timestamp=ipy.Timestamp.fromtimestamp(sys_info.sampled_at, tz=timezone.utc),
         )
         embed.add_fields(
             ipy.EmbedField(
@@ -414,7 +215,7 @@ class Stats(ipy.Extension):
 * Max Frequency: {sys_info.cpu_max_frequency}
 * Min Frequency: {sys_info.cpu_min_frequency}
 * Current Frequency: {sys_info.cpu_current_frequency}
-* Usage:
+* Usage: {sys_info.cpu_usage_total}%{cpu_trend}
 {cores}""",
                 inline=True,
             ),
@@ -424,7 +225,7 @@ class Stats(ipy.Extension):
 * Available: {sys_info.ram_available}
 * Used: {sys_info.ram_used}
 * Free: {sys_info.ram_free}
-* Percentage: {sys_info.ram_percentage}%""",
+* Percentage: {sys_info.ram_percentage}%{ram_trend}""",
                 inline=True,
             ),
             ipy.EmbedField(
@@ -474,7 +275,7 @@ class Stats(ipy.Extension):
             )
             return
         message: list[ipy.Embed] = []
-        packages = get_pip_pkgs()
+        packages = await asyncio.to_thread(get_pip_pkgs)
         now = ipy.Timestamp.now(tz=timezone.utc)
 
         for page in range(0, len(packages), 15):
@@ -1,6 +1,9 @@
+import asyncio
 import os
 import time
+from collections.abc import Callable, Sized
 
+import aiohttp
 from interactions import (
     Activity,
     ActivityType,
@@ -9,13 +12,28 @@ from interactions import (
     Extension,
     IntervalTrigger,
     Task,
+    listen,
 )
+from interactions.api.events import Startup
 
-from classes.stats.dbgg import DiscordBotsGG
-from classes.stats.dbl import DiscordBotList
-from classes.stats.infinity import InfinityBots
-from classes.stats.topgg import TopGG
+from classes.allowlist import (
+    AUTOEMBED_ALLOWLIST_PATH,
+    AUTOEMBED_LEGACY_DIR,
+    get_autoembed_allowlist,
+)
+from classes.animeapi import ANIMEAPI_DUMP_PATH, reload_relation_index
+from classes.malindex import MAL_INDEX_PATH, get_mal_index, reload_mal_index
+from classes.nekomimidb import (
+    NEKOMIMI_DB_PATH,
+    get_nekomimi_dataset,
+    reload_nekomimi_dataset,
+)
+from classes.stats.listing import fetch_listing_votes, post_listing_stats
+from classes.userpfp import userpfp_dataset
+from classes.usrbg import usrbg_dataset
 from modules.commons import save_traceback_to_file
+from modules.myanimelist import mal_submit_stats
+from modules.prefetch import PREFETCH_QUIET_HOURS, is_quiet_hour, warm_caches
 
 
 class BotTasker(Extension):
@@ -30,8 +48,39 @@ class BotTasker(Extension):
         self.poll_stats.start()
         self.update_bot_activity.start()
         self.update_deps_database.start()
+        self.refresh_shared_datasets.start()
+        self.prefetch_hot_titles.start()
+        self.log_pipeline_latency.start()
         # pylint: enable=no-member
 
+    @listen(Startup)
+    async def preload_local_indexes(self) -> None:
+        """Load local datasets into memory before the first command needs them"""
+        datasets: list[tuple[str, str, Callable[[], Sized]]] = [
+            ("MAL index", MAL_INDEX_PATH, get_mal_index),
+            ("AnimeAPI relation index", ANIMEAPI_DUMP_PATH, reload_relation_index),
+            ("nekomimiDb", NEKOMIMI_DB_PATH, get_nekomimi_dataset),
+            # marker files of the old allowlist are migrated on load
+            (
+                "autoembed allowlist",
+                AUTOEMBED_ALLOWLIST_PATH
+                if os.path.exists(AUTOEMBED_ALLOWLIST_PATH)
+                else AUTOEMBED_LEGACY_DIR,
+                get_autoembed_allowlist,
+            ),
+        ]
+        for name, path, loader in datasets:
+            if not os.path.exists(path):
+                continue
+            try:
+                loaded = await asyncio.to_thread(loader)
+                print(f"[Tsk] [Database] Loaded {len(loaded):,} rows to {name}")
+            except Exception as error:  # noqa: BLE001
+                print(f"[Tsk] [Database] Failed to load {name}: {error}")
+                save_traceback_to_file(
+                    "tasker_preload", self.bot.user, error, mute_error=True
+                )
+
     @Task.create(IntervalTrigger(minutes=10))
     async def delete_cache(self) -> None:
         """Automatically delete caches stored in the cache folder saved as JSON"""
@@ -99,63 +148,28 @@ class BotTasker(Extension):
 
     @Task.create(IntervalTrigger(minutes=15))
     async def poll_stats(self) -> None:
-        """Poll bot statistic to 3rd party listing sites"""
+        """Poll bot statistic to 3rd party listing sites, and fetch upvotes back"""
         server_count = len(self.bot.guilds)
         shard_count = self.bot.total_shards
-        show_msg: list[str] = []
-        try:
-            async with TopGG() as top:
-                await top.post_bot_stats(
-                    guild_count=server_count,
-                    shard_count=shard_count,
-                )
-        except Exception as error:  # noqa: BLE001
-            print(f"[Tsk] [Stats] Failed to poll to Top.gg: {error}")
+        async with aiohttp.ClientSession() as session:
+            failed, (_, vote_failed) = await asyncio.gather(
+                post_listing_stats(server_count, shard_count, session=session),
+                fetch_listing_votes(int(self.bot.user.id), session=session),
+            )
+        for site, error in failed.items():
+            print(f"[Tsk] [Stats] Failed to poll to {site}: {error!r}")
             save_traceback_to_file(
-                "tasker_topgg", self.bot.user, error, mute_error=True
+                f"tasker_stats-{site}", self.bot.user, error, mute_error=True
             )
-            show_msg.append("Top.gg")
-
-        try:
-            async with DiscordBotsGG() as dbgg:
-                await dbgg.post_bot_stats(
-                    guild_count=server_count,
-                    shard_count=shard_count,
-                )
-        except Exception as error:  # noqa: BLE001
-            print(f"[Tsk] [Stats] Failed to poll to DiscordBots.gg: {error}")
-            save_traceback_to_file("tasker_dbgg", self.bot.user, error, mute_error=True)
-            show_msg.append("DiscordBots.gg")
-
-        try:
-            async with DiscordBotList() as dbl:
-                await dbl.post_bot_stats(
-                    guild_count=server_count,
-                    members=0,
-                )
-        except Exception as error:  # noqa: BLE001
-            print(f"[Tsk] [Stats] Failed to poll to DiscordBotList: {error}")
-            save_traceback_to_file("tasker_dbl", self.bot.user, error, mute_error=True)
-            show_msg.append("DiscordBotList.com")
-
-        try:
-            async with InfinityBots() as ibgg:
-                await ibgg.post_bot_stats(
-                    guild_count=server_count,
-                    shard_count=shard_count,
-                    members=0,
-                )
-        except Exception as error:  # noqa: BLE001
-            print(f"[Tsk] [Stats] Failed to poll to InfinityBots: {error}")
-            save_traceback_to_file("tasker_ibgg", self.bot.user, error, mute_error=True)
-            show_msg.append("InfinityBots")
+        for site, error in vote_failed.items():
+            print(f"[Tsk] [Stats] Failed to fetch upvotes from {site}: {error!r}")
 
         print(
             "[Tsk] [Stats] Polled stats.",
             f"{server_count:,} servers,",
             f"{shard_count:,} shards,",
-            f"failed to poll to {', '.join(show_msg)}"
-            if len(show_msg) > 0
+            f"failed to poll to {', '.join(failed)}"
+            if len(failed) > 0
             else "successfully polled to all sites",
         )
 
@@ -218,14 +232,52 @@ class BotTasker(Extension):
             from modules.oobe.getNekomimi import nk_run
             from modules.oobe.malIndexer import mal_run
 
-            await nk_run()
-            await mal_run()
+            if await nk_run():
+                await asyncio.to_thread(reload_nekomimi_dataset)
+            if await mal_run():
+                await asyncio.to_thread(reload_mal_index)
+                await asyncio.to_thread(reload_relation_index)
         except Exception as error:  # noqa: BLE001
             print(f"[Tsk] [Database] Failed to update dependencies database: {error}")
             save_traceback_to_file(
                 "tasker_update_deps", self.bot.user, error, mute_error=True
             )
 
+    @Task.create(IntervalTrigger(hours=1))
+    async def refresh_shared_datasets(self) -> None:
+        """Refresh in-memory remote datasets ahead of expiry, so lookups never wait"""
+        for dataset in (usrbg_dataset, userpfp_dataset):
+            if await dataset.refresh_if_stale():
+                print(f"[Tsk] [Cache] Refreshed {dataset.name} dataset")
+
+    @Task.create(IntervalTrigger(hours=1))
+    async def prefetch_hot_titles(self) -> None:
+        """Warm AniList and Jikan caches with hot titles during quiet hours"""
+        if not is_quiet_hour():
+            return
+        try:
+            # lookup counts decay on the first run of the night only
+            first_run = time.gmtime().tm_hour == PREFETCH_QUIET_HOURS.start
+            report = await warm_caches(decay=first_run)
+            print(
+                "[Tsk] [Prefetch] Warmed",
+                f"{report.anilist:,} AniList media,",
+                f"{report.jikan:,} Jikan anime ({report.fresh:,} still fresh),",
+                f"{report.failed:,} failed",
+            )
+        except Exception as error:  # noqa: BLE001
+            print(f"[Tsk] [Prefetch] Failed to warm caches: {error}")
+            save_traceback_to_file(
+                "tasker_prefetch", self.bot.user, error, mute_error=True
+            )
+
+    @Task.create(IntervalTrigger(hours=1))
+    async def log_pipeline_latency(self) -> None:
+        """Log which providers dominate /anime info latency"""
+        report = mal_submit_stats.report()
+        if report is not None:
+            print(f"[Tsk] [Pipeline] /anime info: {report}")
+
 
 def setup(bot: Client | AutoShardedClient) -> None:
     BotTasker(bot)
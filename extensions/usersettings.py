@@ -1,9 +1,9 @@
 import asyncio
-import os
 
 import interactions as ipy
 
 from classes import cache
+from classes.allowlist import autoembed_allowlist
 from classes.anilist import AniList
 from classes.database import UserDatabase
 from classes.jikan import JikanApi
@@ -157,8 +157,7 @@ class UserSettings(ipy.Extension):
     )
     async def usersettings_autoembed(self, ctx: ipy.SlashContext, state: str):
         """Enable or disable autoembed"""
-        file_path = f"database/allowlist_autoembed/{ctx.author.id}"
-        path_exist = os.path.exists(file_path)
+        path_exist = ctx.author.id in autoembed_allowlist
         state_ = "true" == state
         if path_exist and state_ is True:
             await ctx.send(
@@ -174,12 +173,7 @@ class UserSettings(ipy.Extension):
             return
 
         if state_:
-
-            def _write_empty():
-                with open(file_path, "w", encoding="utf-8") as file:
-                    file.write("")
-
-            await asyncio.to_thread(_write_empty)
+            await asyncio.to_thread(autoembed_allowlist.add, ctx.author.id)
             await ctx.send(
                 """Feature enabled, now Ryuusei will automatically respond to your message with supported sites.
 
@@ -202,7 +196,7 @@ RAWG""",
             )
             return
 
-        os.remove(file_path)
+        await asyncio.to_thread(autoembed_allowlist.discard, ctx.author.id)
         await ctx.send("Feature disabled.", ephemeral=True)
 
 
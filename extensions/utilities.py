@@ -6,7 +6,6 @@ from urllib.parse import urlencode as urlenc
 
 import interactions as ipy
 import validators  # type: ignore
-from PIL import Image, ImageDraw, ImageFont
 from plusminus import BaseArithmeticParser as BAP  # type: ignore
 
 from classes.isitdownrightnow import WebsiteChecker, WebsiteStatus
@@ -16,6 +15,11 @@ from modules.commons import (
     save_traceback_to_file,
     snowflake_to_datetime,
 )
+from modules.lazy_import import lazy_import
+
+Image = lazy_import("PIL.Image")
+ImageDraw = lazy_import("PIL.ImageDraw")
+ImageFont = lazy_import("PIL.ImageFont")
 
 
 class Utilities(ipy.Extension):
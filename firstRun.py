@@ -134,6 +134,12 @@ async def first_run(py_bin: str = py_bin_path()):
     print("Migrating database to new schema...")
     await migrate()
 
+    # Cache git metadata, so the bot doesn't need to run git on startup
+    print("Caching git metadata...")
+    from modules.const import write_build_info
+
+    write_build_info()
+
     # Import backup option
     if os.isatty(0):
         print("\nDo you have a backup to import? (y/N) ")
@@ -1,18 +1,15 @@
 import argparse
 import asyncio
-import os
-import shutil
-import tarfile
 from pathlib import Path
 
 import aiohttp
 
-from modules.crypto_utils import CryptoUtils
+from modules import backup
+from modules.crypto_utils import STREAM_CHUNK_SIZE
 
 
 async def import_backup(file_path: str, key: str):
     temp_enc_path = Path("backup_temp.enc")
-    temp_tar_path = Path("backup_temp.tar")
     is_url = file_path.startswith(("http://", "https://"))
 
     try:
@@ -22,13 +19,13 @@ async def import_backup(file_path: str, key: str):
                 aiohttp.ClientSession() as session,
                 session.get(file_path) as resp,
             ):
-                if resp.status == 200:
-                    data = await resp.read()
-                    temp_enc_path.write_bytes(data)
-                else:
+                if resp.status != 200:
                     raise RuntimeError(
                         f"Failed to download attachment: HTTP {resp.status}"
                     )
+                with open(temp_enc_path, "wb") as f_out:  # noqa: ASYNC230
+                    async for chunk in resp.content.iter_chunked(STREAM_CHUNK_SIZE):
+                        f_out.write(chunk)
             print("Download complete.")
         else:
             temp_enc_path = Path(file_path)
@@ -36,103 +33,57 @@ async def import_backup(file_path: str, key: str):
                 print(f"Error: File {file_path} not found.")
                 return
 
-        print("Decrypting backup...")
-        CryptoUtils.decrypt_and_extract(temp_enc_path, key, temp_tar_path)
-
-        # Create backup of current state
-        print("Creating backup of current state...")
-        if os.path.exists("database"):
-            if os.path.exists("database_backup"):
-                shutil.rmtree("database_backup")
-            shutil.copytree("database", "database_backup")
-            print("Current 'database' folder backed up to 'database_backup'.")
-
-        if os.path.exists(".env"):
-            shutil.copy2(".env", ".env.bak")
-            print("Current '.env' backed up to '.env.bak'.")
-
-        # Extract tar
-        print("Extracting files...")
-        with tarfile.open(temp_tar_path, "r") as tar:
-            tar.extractall(path=".")
-
-        print("Backup imported successfully!")
+        print("Decrypting and extracting backup...")
+        restored = await asyncio.to_thread(backup.import_backup, temp_enc_path, key)
+        print(
+            "Current 'database' folder and '.env' backed up to 'database_backup' and '.env.bak'."
+        )
+        print(f"Backup imported successfully! Restored {len(restored)} files.")
 
     except Exception as e:  # noqa: BLE001
         print(f"An error occurred during import: {e}")
     finally:
-        if temp_tar_path.exists():
-            temp_tar_path.unlink()
         if is_url and temp_enc_path.exists():
             temp_enc_path.unlink()
 
 
-async def export_backup(output_path: str):
-    import tempfile
+async def restore_backups(file_paths: list[str], keys: list[str]):
+    if len(keys) not in (1, len(file_paths)):
+        print("Error: Pass one key for every backup, or one key for all of them.")
+        return
+    try:
+        print(f"Decrypting and replaying {len(file_paths)} backups...")
+        restored = await asyncio.to_thread(
+            backup.restore_backups,
+            list(zip(file_paths, keys * len(file_paths) if len(keys) == 1 else keys)),
+        )
+        print(
+            "Current 'database' folder and '.env' backed up to 'database_backup' and '.env.bak'."
+        )
+        print(f"Backups restored successfully! Restored {len(restored)} files.")
+
+    except Exception as e:  # noqa: BLE001
+        print(f"An error occurred during restore: {e}")
+
 
+async def export_backup(
+    output_path: str, incremental: bool = False, key: str | None = None
+):
     try:
-        print("Packaging files...")
-        with tempfile.TemporaryDirectory() as tmpdir:
-            temp_dir_to_archive = Path(tmpdir) / "backup_content"
-            temp_dir_to_archive.mkdir()
-
-            # Add database directory
-            if os.path.exists("database"):
-                shutil.copytree(
-                    "database", temp_dir_to_archive / "database", dirs_exist_ok=True
-                )
-                print("Added 'database' folder to backup.")
-
-            # Add .env file
-            if os.path.exists(".env"):
-                shutil.copy2(".env", temp_dir_to_archive / ".env")
-                print("Added '.env' file to backup.")
-
-            # Add any private_ files/folders (e.g., extensions/private_seasonal.py)
-            private_count = 0
-            for path in Path(".").rglob("private_*"):
-                if (
-                    "__pycache__" in str(path)
-                    or ".mypy_cache" in str(path)
-                    or ".ruff_cache" in str(path)
-                ):
-                    continue
-
-                relative_path = path.relative_to(".")
-                dest_path = temp_dir_to_archive / relative_path
-
-                if path.is_dir():
-                    shutil.copytree(path, dest_path, dirs_exist_ok=True)
-                else:
-                    dest_path.parent.mkdir(parents=True, exist_ok=True)
-                    shutil.copy2(path, dest_path)
-                private_count += 1
-
-            if private_count > 0:
-                print(f"Added {private_count} private files/folders to backup.")
-
-            # Create tar archive
-            archive_path_base = Path(tmpdir) / "backup"
-            archive_path = Path(
-                shutil.make_archive(
-                    str(archive_path_base), "tar", root_dir=temp_dir_to_archive
-                )
-            )
-
-            print("Compressing and encrypting backup...")
-            enc_path, key = CryptoUtils.encrypt_and_package(archive_path)
-
-            final_path = Path(output_path)
-            final_path.parent.mkdir(parents=True, exist_ok=True)
-            if final_path.exists():
-                final_path.unlink()
-            shutil.move(enc_path, final_path)
-
-            print(f"Backup exported successfully to {final_path}")
-            print(f"Encryption Key: {key}")
-            print(
-                "Please save this key in a secure place. It is required to decrypt/import the backup."
-            )
+        print("Packaging, compressing and encrypting files...")
+        key, index = await asyncio.to_thread(
+            backup.export_backup, output_path, incremental=incremental, key=key
+        )
+        # the output file is complete, later backups can chain to it
+        backup.commit_backup_index(index)
+        print(
+            f"Added {len(index.packed)} {'changed ' if incremental else ''}files to backup."
+        )
+        print(f"Backup exported successfully to {output_path}")
+        print(f"Encryption Key: {key}")
+        print(
+            "Please save this key in a secure place. It is required to decrypt/import the backup."
+        )
 
     except Exception as e:  # noqa: BLE001
         print(f"An error occurred during export: {e}")
@@ -159,8 +110,32 @@ if __name__ == "__main__":
         default="backup.tar.gz.enc",
         help="The output encrypted backup file path",
     )
+    export_parser.add_argument(
+        "-i",
+        "--incremental",
+        action="store_true",
+        help="Only back up files changed since the last export",
+    )
+    export_parser.add_argument(
+        "-k", "--key", help="Reuse an encryption key instead of generating one"
+    )
+
+    # Restore parser
+    restore_parser = subparsers.add_parser(
+        "restore", help="Restore a full backup and its incremental backups, in order"
+    )
+    restore_parser.add_argument(
+        "files", nargs="+", help="The full backup, then incremental backups"
+    )
+    restore_parser.add_argument(
+        "-k",
+        "--key",
+        action="append",
+        required=True,
+        help="The encryption key, once for all backups or once per backup",
+    )
 
-    if len(sys.argv) == 3 and sys.argv[1] not in ("import", "export"):
+    if len(sys.argv) == 3 and sys.argv[1] not in ("import", "export", "restore"):
         asyncio.run(import_backup(sys.argv[1], sys.argv[2]))
     else:
         subparsers.required = True
@@ -168,4 +143,6 @@ if __name__ == "__main__":
         if args.action == "import":
             asyncio.run(import_backup(args.file, args.key))
         elif args.action == "export":
-            asyncio.run(export_backup(args.output))
+            asyncio.run(export_backup(args.output, args.incremental, args.key))
+        elif args.action == "restore":
+            asyncio.run(restore_backups(args.files, args.key))
@@ -1,9 +1,51 @@
+import argparse
 import asyncio
 import sys
 import traceback
+from contextlib import AbstractContextManager, nullcontext
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Any
 
+from modules.lazy_import import enable_lazy_imports
+from modules.startup_profile import StartupProfiler
+
+
+def parse_arguments() -> argparse.Namespace:
+    """
+    Parse command line arguments
+
+    Returns:
+        argparse.Namespace: Parsed arguments
+    """
+    parser = argparse.ArgumentParser(description="Run Ryuuzaki Ryuusei")
+    parser.add_argument(
+        "--lazy-imports",
+        action="store_true",
+        help="defer heavy third-party imports until a command needs them",
+    )
+    parser.add_argument(
+        "--profile-startup",
+        nargs="?",
+        const="",
+        default=None,
+        metavar="JSON_PATH",
+        help="print import and extension load times, optionally saving them as JSON",
+    )
+    args, _ = parser.parse_known_args()
+    return args
+
+
+args = parse_arguments()
+"""Command line arguments"""
+profiler: StartupProfiler | None = None
+"""Startup profiler, only set with --profile-startup"""
+if args.profile_startup is not None:
+    profiler = StartupProfiler()
+    profiler.start()
+enable_lazy_imports(args.lazy_imports)
+
+# pylint: disable=wrong-import-position
 import interactions as ipy
 from aiohttp import ClientConnectorError
 from interactions.client import const as ipy_const
@@ -12,6 +54,8 @@ from modules.commons import convert_float_to_time
 from modules.const import BOT_TOKEN, SENTRY_DSN, USER_AGENT
 from modules.oobe.commons import UnsupportedVersion
 
+# pylint: enable=wrong-import-position
+
 # Check Python version
 py_ver = sys.version_info
 if py_ver < (3, 10):
@@ -126,13 +170,14 @@ def load_custom_extensions() -> None:
         module_path = f"extensions.{ext_name}"
 
         try:
-            # Load extension with special params if needed
-            if ext_name in special_extensions:
-                print_status("[Cog]", f"Loading {ext_name} (with custom params)...")
-                bot.load_extension(module_path, now=now)
-            else:
-                print_status("[Cog]", f"Loading {ext_name}...")
-                bot.load_extension(module_path)
+            with profile_section(ext_name, is_extension=True):
+                # Load extension with special params if needed
+                if ext_name in special_extensions:
+                    print_status("[Cog]", f"Loading {ext_name} (with custom params)...")
+                    bot.load_extension(module_path, now=now)
+                else:
+                    print_status("[Cog]", f"Loading {ext_name}...")
+                    bot.load_extension(module_path)
 
             loaded_count += 1
 
@@ -147,10 +192,46 @@ def load_custom_extensions() -> None:
     )
 
 
+def profile_section(
+    name: str, is_extension: bool = False
+) -> AbstractContextManager[Any]:
+    """
+    Time a startup section if --profile-startup is set
+
+    Args:
+        name: Phase or extension name
+        is_extension: Whether the section loads an extension
+
+    Returns:
+        Context manager recording the section, or a no-op one
+    """
+    if profiler is None:
+        return nullcontext()
+    if is_extension:
+        return profiler.extension(name)
+    return profiler.phase(name)
+
+
+def report_startup_profile() -> None:
+    """Stop the startup profiler and print its report"""
+    if profiler is None:
+        return
+    profiler.stop()
+    print_status("[Prf]", "Startup profile:")
+    for line in profiler.format_report().splitlines():
+        print_status("[Prf]", line, indent=True)
+    if args.profile_startup:
+        profiler.save_report(args.profile_startup)
+        print_status("[Prf]", f"Saved to {args.profile_startup}", indent=True)
+
+
 async def main():
     """Main function - loads extensions and starts the bot"""
-    load_core_extensions()
-    load_custom_extensions()
+    with profile_section("core extensions"):
+        load_core_extensions()
+    with profile_section("custom extensions"):
+        load_custom_extensions()
+    report_startup_profile()
     await bot.astart()
 
 
@@ -17,6 +17,7 @@ from interactions import (
 )
 
 from classes.anilist import AniList, AniListMediaStruct
+from classes.anilist import Cache as AniListCache
 from classes.excepts import MediaIsNsfw, ProviderHttpError
 from modules.commons import (
     PlatformErrType,
@@ -24,6 +25,7 @@ from modules.commons import (
     generate_trailer,
     get_nsfw_status,
     platform_exception_embed,
+    rendered_responses,
     sanitize_markdown,
     save_traceback_to_file,
     send_or_edit_message,
@@ -31,6 +33,7 @@ from modules.commons import (
 )
 from modules.const import BANNED_TAGS, MESSAGE_WARN_CONTENTS
 from modules.platforms import Platform, media_id_to_platform
+from modules.prefetch import lookup_stats
 
 
 async def search_al_anime(title: str) -> list[dict[str, Any]]:
@@ -432,14 +435,26 @@ async def anilist_submit(
         None
     """
     buttons: list[Button] = []
+    if not from_mal:
+        lookup_stats.record("manga", media_id)
     try:
         nsfw_bool = await get_nsfw_status(ctx)
+        render_key = ("manga", media_id, from_mal, nsfw_bool)
+        rendered = rendered_responses.get(render_key)
+        if rendered is not None:
+            await send_or_edit_message(
+                ctx, rendered.embed, rendered.components, replace
+            )
+            return
         embed, button_2 = await generate_anilist(
             entry_id=media_id,
             is_nsfw=nsfw_bool,
             from_mal=from_mal,
         )
         buttons.extend(button_2)
+        rendered_responses.set(
+            render_key, embed, buttons, [(AniListCache, f"manga/{media_id}.json")]
+        )
         await send_or_edit_message(ctx, embed, buttons, replace)
         return
 
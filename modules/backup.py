@@ -0,0 +1,560 @@
+"""
+# Backup Module
+
+This module exports and imports encrypted host backups: the database, the
+`.env` file, and private extensions or modules.
+
+Backups are streamed: files are archived with tar, compressed with gzip, and
+encrypted in authenticated frames straight into the output file, so memory
+use stays flat whatever the size of the database. Imports are streamed the
+same way into a staging folder, and only replace the current files once the
+whole backup is decrypted and verified.
+
+Every backup carries an index of the content hash of each file. The index
+of the last delivered export is kept locally, so an incremental backup only
+packs files changed since then, and lists the ones deleted. The index is only
+committed once the backup reached its destination, so a failed delivery never
+leaves the chain pointing at a backup nobody holds. Restoring replays a
+full backup and its chain of incremental ones, in order.
+
+Every function here blocks, run them in a worker thread from the bot.
+"""
+
+import hashlib
+import io
+import json
+import os
+import shutil
+import tarfile
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from uuid import uuid4
+
+from cryptography.fernet import InvalidToken
+
+from modules.crypto_utils import (
+    STREAM_CHUNK_SIZE,
+    CryptoUtils,
+    DecryptingReader,
+    EncryptingWriter,
+)
+
+BACKUP_MANIFEST: tuple[str, ...] = (
+    ".env",
+    "database",
+    "private_*",
+    "classes/private_*",
+    "extensions/private_*",
+    "modules/private_*",
+)
+"""Glob patterns, relative to the bot folder, of what goes into a backup"""
+BACKUP_SKIP: frozenset[str] = frozenset({"__pycache__", ".mypy_cache", ".ruff_cache"})
+"""Folder names never backed up"""
+BACKUP_INDEX_PATH = "cache/backup/index.json"
+"""Index of the last export, incremental backups are made against it"""
+INDEX_MEMBER = ".backup/index.json"
+"""Archive member holding the index of a backup"""
+BACKUP_ADD_ATTEMPTS = 3
+"""Times a file changed while being packed is packed again"""
+
+
+@dataclass
+class BackupIndex:
+    """Content hashes of the files in a backup, and its place in a chain"""
+
+    id: str = field(default_factory=lambda: uuid4().hex)
+    """Backup ID"""
+    parent: str | None = None
+    """ID of the backup this one is made against, None for a full backup"""
+    created: float = field(default_factory=time.time)
+    """Unix time the backup was made at"""
+    files: dict[str, dict[str, int | str]] = field(default_factory=dict)
+    """`sha256`, `size`, and `mtime_ns` of every file the backup restores to"""
+    packed: list[str] = field(default_factory=list)
+    """Files packed in this backup"""
+    deleted: list[str] = field(default_factory=list)
+    """Files deleted since the parent backup"""
+
+    @property
+    def is_full(self) -> bool:
+        """Whether the backup restores on its own"""
+        return self.parent is None
+
+    def to_json(self) -> bytes:
+        """Serialize the index"""
+        return json.dumps(asdict(self), sort_keys=True).encode()
+
+    @classmethod
+    def from_json(cls, data: bytes | str) -> "BackupIndex":
+        """Deserialize an index"""
+        return cls(**json.loads(data))
+
+
+def collect_backup_files(
+    root: str | Path = ".", manifest: tuple[str, ...] = BACKUP_MANIFEST
+) -> list[str]:
+    """
+    List the files matched by the backup manifest
+
+    Args:
+        root (str | Path, optional): Bot folder. Defaults to ".".
+        manifest (tuple[str, ...], optional): Glob patterns. Defaults to BACKUP_MANIFEST.
+
+    Returns:
+        list[str]: Paths relative to the root, in POSIX form, sorted
+    """
+    root = Path(root)
+    found: set[str] = set()
+    for pattern in manifest:
+        for path in root.glob(pattern):
+            if path.is_dir():
+                for folder, dirs, files in os.walk(path):
+                    dirs[:] = [name for name in dirs if name not in BACKUP_SKIP]
+                    found.update(
+                        (Path(folder) / name).relative_to(root).as_posix()
+                        for name in files
+                    )
+            elif path.is_file():
+                found.add(path.relative_to(root).as_posix())
+    return sorted(found)
+
+
+def _sha256(path: Path) -> str:
+    """Hash a file in chunks"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        while chunk := file.read(STREAM_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_files(
+    files: list[str],
+    root: str | Path = ".",
+    previous: dict[str, dict[str, int | str]] | None = None,
+) -> dict[str, dict[str, int | str]]:
+    """
+    Hash files, reusing the previous hash of files with the same size and mtime
+
+    Args:
+        files (list[str]): Paths relative to the root
+        root (str | Path, optional): Bot folder. Defaults to ".".
+        previous (dict[str, dict[str, int | str]] | None, optional): Files of an earlier index. Defaults to None.
+
+    Returns:
+        dict[str, dict[str, int | str]]: `sha256`, `size`, and `mtime_ns` of every file
+    """
+    root = Path(root)
+    previous = previous or {}
+    hashed: dict[str, dict[str, int | str]] = {}
+    for name in files:
+        try:
+            stat = (root / name).stat()
+            entry = previous.get(name)
+            if entry is None or (entry["size"], entry["mtime_ns"]) != (
+                stat.st_size,
+                stat.st_mtime_ns,
+            ):
+                entry = {
+                    "sha256": _sha256(root / name),
+                    "size": stat.st_size,
+                    "mtime_ns": stat.st_mtime_ns,
+                }
+        except FileNotFoundError:
+            # deleted since it was listed
+            continue
+        hashed[name] = entry
+    return hashed
+
+
+def load_last_index(state_path: str | Path = BACKUP_INDEX_PATH) -> BackupIndex | None:
+    """
+    Read the index of the last export
+
+    Args:
+        state_path (str | Path, optional): Index file. Defaults to BACKUP_INDEX_PATH.
+
+    Returns:
+        BackupIndex | None: The index, None if nothing was exported yet
+    """
+    try:
+        return BackupIndex.from_json(Path(state_path).read_bytes())
+    except (OSError, ValueError, TypeError):
+        return None
+
+
+class _HashingReader:
+    """File wrapper handing tar a fixed number of bytes, and hashing them"""
+
+    def __init__(self, file: io.BufferedReader, size: int):
+        self._file = file
+        self._left = size
+        self.digest = hashlib.sha256()
+
+    def read(self, size: int = -1) -> bytes:
+        if size < 0 or size > self._left:
+            size = self._left
+        data = self._file.read(size)
+        # the file shrank, pad it, the stat check packs it again
+        data += b"\0" * (size - len(data))
+        self._left -= size
+        self.digest.update(data)
+        return data
+
+
+def _add_file(
+    tar: tarfile.TarFile, root: Path, name: str
+) -> dict[str, int | str] | None:
+    """
+    Pack a file, hashing the bytes written to the archive
+
+    A file changed while it was packed is packed again, up to
+    `BACKUP_ADD_ATTEMPTS` times; the last copy wins on extraction, and its
+    hash is the one returned.
+
+    Returns:
+        dict[str, int | str] | None: `sha256`, `size`, and `mtime_ns` of the packed copy, None if the file is gone
+    """
+    path = root / name
+    entry: dict[str, int | str] | None = None
+    for _ in range(BACKUP_ADD_ATTEMPTS):
+        try:
+            with open(path, "rb") as file:
+                before = os.fstat(file.fileno())
+                info = tar.gettarinfo(arcname=name, fileobj=file)
+                reader = _HashingReader(file, info.size)
+                tar.addfile(info, reader)  # type: ignore[arg-type]
+            after = path.stat()
+        except FileNotFoundError:
+            return None
+        entry = {
+            "sha256": reader.digest.hexdigest(),
+            "size": info.size,
+            "mtime_ns": before.st_mtime_ns,
+        }
+        if (before.st_ino, before.st_size, before.st_mtime_ns) == (
+            after.st_ino,
+            after.st_size,
+            after.st_mtime_ns,
+        ):
+            break
+    return entry
+
+
+def write_backup(
+    output_path: str | Path,
+    files: list[str],
+    root: str | Path = ".",
+    key: str | None = None,
+    index: BackupIndex | None = None,
+) -> str:
+    """
+    Write an encrypted backup of files
+
+    Files are hashed from the bytes written to the archive, and the index is
+    written last, so it always matches the packed copies even when files
+    change during the export. Packed files are updated in the index, files
+    gone since they were listed are dropped from it.
+
+    Args:
+        output_path (str | Path): Backup file to write
+        files (list[str]): Paths relative to the root, from `collect_backup_files`
+        root (str | Path, optional): Bot folder. Defaults to ".".
+        key (str | None, optional): Encryption key. Defaults to None, a new key.
+        index (BackupIndex | None, optional): Index to complete and store in the backup. Defaults to None.
+
+    Returns:
+        str: The encryption key
+    """
+    key = key or CryptoUtils.generate_key()
+    root = Path(root)
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "wb") as raw:
+        writer = EncryptingWriter(raw, key)
+        with tarfile.open(fileobj=writer, mode="w|gz") as tar:
+            packed: list[str] = []
+            for name in files:
+                entry = _add_file(tar, root, name)
+                if index is None:
+                    continue
+                if entry is None:
+                    index.files.pop(name, None)
+                    if not index.is_full:
+                        index.deleted = sorted({*index.deleted, name})
+                    continue
+                index.files[name] = entry
+                packed.append(name)
+            if index is not None:
+                index.packed = packed
+                data = index.to_json()
+                info = tarfile.TarInfo(INDEX_MEMBER)
+                info.size = len(data)
+                info.mtime = int(index.created)
+                tar.addfile(info, io.BytesIO(data))
+        writer.close()
+    return key
+
+
+def export_backup(
+    output_path: str | Path,
+    root: str | Path = ".",
+    manifest: tuple[str, ...] = BACKUP_MANIFEST,
+    incremental: bool = False,
+    key: str | None = None,
+    state_path: str | Path | None = BACKUP_INDEX_PATH,
+) -> tuple[str, BackupIndex]:
+    """
+    Back up the files matched by the manifest
+
+    An incremental backup falls back to a full one when there is no index
+    of an earlier export. The new index is not stored, pass it to
+    `commit_backup_index` once the backup is delivered.
+
+    Args:
+        output_path (str | Path): Backup file to write
+        root (str | Path, optional): Bot folder. Defaults to ".".
+        manifest (tuple[str, ...], optional): Glob patterns. Defaults to BACKUP_MANIFEST.
+        incremental (bool, optional): Only pack files changed since the last export. Defaults to False.
+        key (str | None, optional): Encryption key. Defaults to None, a new key.
+        state_path (str | Path | None, optional): Index of the last export, relative to the root, None for a full backup. Defaults to BACKUP_INDEX_PATH.
+
+    Returns:
+        tuple[str, BackupIndex]: The encryption key, and the index of the backup
+    """
+    root = Path(root)
+    files = collect_backup_files(root, manifest)
+    last = load_last_index(root / state_path) if state_path else None
+    index = BackupIndex()
+    packed = files
+    if incremental and last is not None:
+        # unchanged files keep these hashes, packed ones are hashed again as
+        # they are written
+        hashed = hash_files(files, root, last.files)
+        index.parent = last.id
+        index.files = hashed
+        packed = [
+            name
+            for name, entry in hashed.items()
+            if last.files.get(name, {}).get("sha256") != entry["sha256"]
+        ]
+        index.deleted = sorted(set(last.files) - set(hashed))
+    key = write_backup(output_path, packed, root, key, index)
+    return key, index
+
+
+def commit_backup_index(
+    index: BackupIndex,
+    root: str | Path = ".",
+    state_path: str | Path = BACKUP_INDEX_PATH,
+) -> None:
+    """
+    Store the index of a delivered backup, later incremental ones chain to it
+
+    Args:
+        index (BackupIndex): Index returned by `export_backup`
+        root (str | Path, optional): Bot folder. Defaults to ".".
+        state_path (str | Path, optional): Index file, relative to the root. Defaults to BACKUP_INDEX_PATH.
+    """
+    state_file = Path(root) / state_path
+    state_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = state_file.with_name(f"{state_file.name}.tmp")
+    tmp_file.write_bytes(index.to_json())
+    os.replace(tmp_file, state_file)
+
+
+def _extract_all(tar: tarfile.TarFile, path: Path) -> None:
+    """Extract every member, refusing ones pointing outside the path"""
+    if hasattr(tarfile, "data_filter"):
+        tar.extractall(path, filter="data")
+    else:
+        tar.extractall(path)
+
+
+def read_backup(encrypted_path: str | Path, key: str, target: str | Path) -> None:
+    """
+    Decrypt and extract a backup into a folder
+
+    Backups made before streaming, a single Fernet token, are still read, but
+    are decrypted in memory.
+
+    Args:
+        encrypted_path (str | Path): Backup file
+        key (str): Encryption key
+        target (str | Path): Folder to extract into
+
+    Raises:
+        ValueError: Wrong key, or the backup is corrupted or truncated
+    """
+    encrypted_path = Path(encrypted_path)
+    target = Path(target)
+    if CryptoUtils.is_streamed(encrypted_path):
+        with open(encrypted_path, "rb") as raw:
+            reader = io.BufferedReader(
+                DecryptingReader(raw, key), buffer_size=STREAM_CHUNK_SIZE
+            )
+            with tarfile.open(fileobj=reader, mode="r|gz") as tar:
+                _extract_all(tar, target)
+        return
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tar_path = Path(tmpdir) / "backup.tar"
+        legacy_path = Path(tmpdir) / "backup.enc"
+        shutil.copyfile(encrypted_path, legacy_path)
+        try:
+            CryptoUtils.decrypt_and_extract(legacy_path, key, tar_path)
+        except InvalidToken as error:
+            raise ValueError("Invalid key, or the backup is corrupted") from error
+        with tarfile.open(tar_path, "r") as tar:
+            _extract_all(tar, target)
+
+
+def snapshot_current_state(root: str | Path = ".") -> None:
+    """
+    Keep a copy of the current database and `.env` before they are replaced
+
+    Args:
+        root (str | Path, optional): Bot folder. Defaults to ".".
+    """
+    root = Path(root)
+    database = root / "database"
+    if database.exists():
+        shutil.rmtree(root / "database_backup", ignore_errors=True)
+        shutil.copytree(database, root / "database_backup")
+    if (root / ".env").exists():
+        shutil.copy2(root / ".env", root / ".env.bak")
+
+
+def _replay(backups: list[tuple[str | Path, str]], staging: Path) -> set[str]:
+    """
+    Extract a full backup and its incremental ones over each other
+
+    Args:
+        backups (list[tuple[str | Path, str]]): Backup files and their keys, full one first
+        staging (Path): Folder to rebuild the files in
+
+    Raises:
+        ValueError: A backup can't be read, or the chain is broken
+
+    Returns:
+        set[str]: Files deleted along the chain, and not restored
+    """
+    index_path = staging / INDEX_MEMBER
+    last: BackupIndex | None = None
+    deleted: set[str] = set()
+    for position, (encrypted_path, key) in enumerate(backups):
+        index_path.unlink(missing_ok=True)
+        read_backup(encrypted_path, key, staging)
+        # backups made before indexes restore on their own
+        index = (
+            BackupIndex.from_json(index_path.read_bytes())
+            if index_path.exists()
+            else None
+        )
+        expected_parent = last.id if last is not None else None
+        if position > 0 and (index is None or index.parent is None):
+            raise ValueError(f"{encrypted_path} is not an incremental backup")
+        if index is not None and index.parent != expected_parent:
+            raise ValueError(
+                f"{encrypted_path} is an incremental backup of another backup"
+                if position > 0
+                else f"{encrypted_path} is an incremental backup, restore its full backup first"
+            )
+        if index is not None:
+            for name in index.deleted:
+                (staging / name).unlink(missing_ok=True)
+            deleted.update(index.deleted)
+        last = index
+    shutil.rmtree(index_path.parent, ignore_errors=True)
+    if last is None:
+        return deleted
+    restored = collect_backup_files(staging, ("*",))
+    mismatched = set(restored) ^ set(last.files) or {
+        name
+        for name in restored
+        if _sha256(staging / name) != last.files[name]["sha256"]
+    }
+    if mismatched:
+        raise ValueError(
+            f"Restored files do not match the last backup: {', '.join(sorted(mismatched)[:5])}"
+        )
+    return deleted - set(last.files)
+
+
+def restore_backups(
+    backups: list[tuple[str | Path, str]], root: str | Path = "."
+) -> list[str]:
+    """
+    Restore a full backup, and optionally its incremental ones, over the bot folder
+
+    Backups are replayed in a staging folder first, and the result is checked
+    against the hashes of the last one; current files are only touched once
+    every backup is decrypted and checked, after a copy of the database and
+    `.env` is kept as `database_backup` and `.env.bak`. Files deleted along
+    the chain are deleted, other files missing from the backups are left as
+    they are.
+
+    Args:
+        backups (list[tuple[str | Path, str]]): Backup files and their keys, full one first
+        root (str | Path, optional): Bot folder. Defaults to ".".
+
+    Raises:
+        ValueError: Wrong key, a corrupted or truncated backup, or a broken chain
+
+    Returns:
+        list[str]: Restored files, relative to the root
+    """
+    root = Path(root)
+    # stage on the same filesystem, so files are moved, not copied
+    with tempfile.TemporaryDirectory(dir=root, prefix=".backup_import_") as staging:
+        deleted = _replay(backups, Path(staging))
+        restored = collect_backup_files(staging, ("*",))
+        snapshot_current_state(root)
+        for name in deleted:
+            (root / name).unlink(missing_ok=True)
+        for name in restored:
+            destination = root / name
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(Path(staging) / name, destination)
+    return restored
+
+
+def import_backup(
+    encrypted_path: str | Path, key: str, root: str | Path = "."
+) -> list[str]:
+    """
+    Restore a full backup over the bot folder
+
+    Args:
+        encrypted_path (str | Path): Backup file
+        key (str): Encryption key
+        root (str | Path, optional): Bot folder. Defaults to ".".
+
+    Raises:
+        ValueError: Wrong key, the backup is corrupted or truncated, or it is incremental
+
+    Returns:
+        list[str]: Restored files, relative to the root
+    """
+    return restore_backups([(encrypted_path, key)], root)
+
+
+__all__ = [
+    "BACKUP_ADD_ATTEMPTS",
+    "BACKUP_INDEX_PATH",
+    "BACKUP_MANIFEST",
+    "BACKUP_SKIP",
+    "INDEX_MEMBER",
+    "BackupIndex",
+    "collect_backup_files",
+    "commit_backup_index",
+    "export_backup",
+    "hash_files",
+    "import_backup",
+    "load_last_index",
+    "read_backup",
+    "restore_backups",
+    "snapshot_current_state",
+    "write_backup",
+]
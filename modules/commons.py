@@ -5,10 +5,8 @@ This module contains the common functions used by the other modules.
 """
 
 import re
-import traceback
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timedelta
 from enum import Enum
-from re import sub as rSub
 from typing import Any
 from uuid import uuid4 as id4
 
@@ -29,8 +27,12 @@ from interactions import (
 )
 
 from classes.anilist import AniListTrailerStruct
+from classes.cache import RenderCache
 from modules.const import EMOJI_FORBIDDEN, EMOJI_USER_ERROR
 from modules.const import EMOJI_UNEXPECTED_ERROR as EUNER
+from modules.error_sink import error_sink
+from modules.text import get_emoji_id, sanitize_markdown, trim_synopsis
+from modules.text import html_to_markdown as convert_html_to_markdown
 
 
 def snowflake_to_datetime(snowflake: int) -> int:
@@ -54,97 +56,6 @@ def snowflake_to_datetime(snowflake: int) -> int:
     return timestamp_unix
 
 
-def trim_synopsis(message: str) -> str:
-    """
-    Trim a string to 1000 characters and add ellipsis if it exceeds that length.
-
-    Args:
-        message (str): The string to be trimmed.
-
-    Returns:
-        str: The trimmed string with ellipsis appended if the original string exceeded 1000 characters.
-
-    Example:
-        >>> trim_synopsis("This is a very long string that is over 1000 characters and needs to be trimmed.")
-        'This is a very long string that is over 1000 characters and needs to be trimmed...'
-    """
-    if len(message) > 1000:
-        msg = message[:1000]
-        # trim spaces
-        msg = msg.strip()
-        return msg + "..."
-    return message
-
-
-def sanitize_markdown(text: str) -> str:
-    """
-    Sanitize a string of Markdown-formatted text by escaping certain characters.
-
-    The following characters are escaped: * _ ` ~ | > < [ ] ( ) / @
-
-    Args:
-        text (str): The string of Markdown-formatted text to sanitize.
-
-    Returns:
-        str: The sanitized string of text.
-    """
-    replacements = {
-        "\\": "\\\\",
-        "\r": " ",  # remove carriage returns
-        "_": "\\_",
-        "(": "\\(",
-        ")": "\\)",
-        "[": "\\[",
-        "]": "\\]",
-        "@": "\\@",
-        "*": "\\*",
-        "/": "\\/",
-        "#": "\\#",
-        "`": "\\`",
-        "<": "\\<",
-        ">": "\\>",
-        "|": "\\|",
-        "~": "\\~",
-    }
-
-    for pattern, repl in replacements.items():
-        text = text.replace(pattern, repl)
-
-    return text.strip()
-
-
-def convert_html_to_markdown(text: str) -> str:
-    """
-    Convert a string of HTML-formatted text to Markdown.
-
-    Args:
-        text (str): The string of HTML-formatted text to convert.
-
-    Returns:
-        str: The converted string of Markdown-formatted text.
-    """
-    replacements = {
-        r"\n": "",
-        r"<(/)?i>|<(/)?em>": "*",
-        r"<(/)?b>|<(/)?strong>": "**",
-        r"<(/)?u>": "__",
-        r"<(/)?strike>|<(/)?s>": "~~",
-        r"<(/)?br>": "\n",
-        r"<h1>": "\n# ",
-        r"<h2>": "\n## ",
-        r"<h3>": "\n### ",
-        r"<(/)?h[1-6]>": "",
-        r"<p>": "\n",
-        r"<(/)?p>": "",
-        r"<a href=\"(.*)\">(.*)</a>": r"[\2](\1)",
-    }
-
-    for pattern, repl in replacements.items():
-        text = re.sub(pattern, repl, text, flags=re.IGNORECASE)
-
-    return text
-
-
 def get_random_seed(value: int = 9) -> int:
     """
     Get a random seed number with a specific length.
@@ -228,7 +139,7 @@ def generate_utils_except_embed(
         >>> generate_utils_except_embed("An error occurred while processing the request.", "Field", "Value", "Error message")
         <discord.Embed object at 0x...>
     """
-    emoji = rSub(r"(<:.*:)(\d+)(>)", r"\2", EUNER)
+    emoji = get_emoji_id(EUNER)
     embed = Embed(
         color=color,
         title="Error",
@@ -267,7 +178,7 @@ def generate_commons_except_embed(
     if isinstance(error, Exception):
         error = str(error)
 
-    emoji = rSub(r"(<:.*:)(\d+)(>)", r"\2", EUNER)
+    emoji = get_emoji_id(EUNER)
     embed = Embed(
         color=color,
         title="Error",
@@ -450,7 +361,7 @@ def platform_exception_embed(
         error_type = error_type.value
     else:
         error_type = str(error_type)
-    emoji = re.sub(r"(<:.*:)(\d+)(>)", r"\2", error_type)
+    emoji = get_emoji_id(error_type)
     embed = Embed(
         color=color,
         title="Error",
@@ -496,7 +407,10 @@ def save_traceback_to_file(
     mute_error: bool = False,
 ) -> None:
     """
-    Save traceback to a file.
+    Save traceback to the error log.
+
+    The error is queued to the shared error sink, which groups identical
+    tracebacks and appends them to JSONL segments in the background.
 
     Args:
         command (str): Command name
@@ -507,22 +421,15 @@ def save_traceback_to_file(
     Raises:
         error (Exception): Re-raise the error (for logging purpose), if mute_error is False.
     """
-    error_type = type(error).__name__
-    error_str = str(error)
-    error_traceback = "".join(
-        traceback.format_exception(type(error), error, error.__traceback__)
-    )
-    with open(
-        f"errors/{command}_{author.id}_{datetime.now(tz=timezone.utc).strftime('%Y-%m-%d_%H-%M-%S')}.txt",
-        "w",
-        encoding="utf-8",
-    ) as file_:
-        file_.write(f"{error_type}: {error_str}\n\n{error_traceback}")
+    error_sink.record(command, getattr(author, "id", None), error)
     if mute_error is False:
         # re-raise the error
         raise error
 
 
+_FRACTION_PATTERN = re.compile(r"\.\d+")
+
+
 def custom_datetime_converter(time: str, zone: str = "Z", remove_millis: bool = True):
     """
     Converts inconventional datetime into ISO standard
@@ -536,13 +443,17 @@ def custom_datetime_converter(time: str, zone: str = "Z", remove_millis: bool =
     """
     time = time.replace(zone, "+00:00")
     if remove_millis:
-        time = re.sub(r"\.[\d]+", "", time)
+        time = _FRACTION_PATTERN.sub("", time)
     return datetime.fromisoformat(time)
 
 
+rendered_responses = RenderCache(maxsize=1024)
+"""Rendered info responses, keyed by (command, media ID, channel NSFW status)"""
+
+
 async def send_or_edit_message(
     ctx: SlashContext | ComponentContext | Message,
-    embed: Embed,
+    embed: Embed | dict[str, Any],
     components: list[Any] | None = None,
     replace: bool = False,
 ) -> None:
@@ -551,7 +462,7 @@ async def send_or_edit_message(
 
     Args:
         ctx (SlashContext | ComponentContext | Message): The context.
-        embed (Embed): The embed to send/edit.
+        embed (Embed | dict[str, Any]): The embed to send/edit, or its dict form.
         components (list[Any], optional): Components to attach. Defaults to None.
         replace (bool, optional): Whether to replace the original message. Defaults to False.
     """
@@ -583,6 +494,7 @@ __all__ = [
     "get_random_seed",
     "platform_exception_embed",
     "pluralize",
+    "rendered_responses",
     "sanitize_markdown",
     "save_traceback_to_file",
     "send_or_edit_message",
@@ -9,7 +9,10 @@ However, you can use the .env.example file as a template to create your own .env
 This module also contains some mutable variables/constant that are used oftenly in the bot.
 """
 
+import json
 from os import getenv as ge
+from pathlib import Path
+from subprocess import CalledProcessError
 from subprocess import check_output as chout
 from typing import Final, cast
 
@@ -46,6 +49,8 @@ BOT_TOKEN: Final[str] = cast(str, ge("BOT_TOKEN"))
 """The bot's token"""
 CLUB_ID: Final[int] = cast(int, ge("CLUB_ID"))
 """MyAnimeList club ID"""
+CLUB_ROSTER_CHECK: Final[bool] = (ge("CLUB_ROSTER_CHECK") or "").lower() == "true"
+"""Check the club member list before the user's club list on verification"""
 DBGG_API_TOKEN: Final[str] = cast(str, ge("DBGG_API_TOKEN"))
 """Discord Bots API token"""
 DBL_API_TOKEN: Final[str] = cast(str, ge("DBL_API_TOKEN"))
@@ -156,16 +161,110 @@ def get_current_git_branch() -> str:
     return output
 
 
-# Call the get_current_git_branch() funct
+BUILD_INFO_PATH = "cache/build_info.json"
+"""Path to the git metadata cached at build time by firstRun.py"""
 
 
-GIT_REMOTE = get_git_remote_url()
+def read_git_head_commit(git_dir: str = ".git") -> str | None:
+    """
+    Read the commit hash of HEAD straight from the git directory, without spawning git
+
+    Args:
+        git_dir (str, optional): Path to the git directory. Defaults to ".git".
+
+    Returns:
+        str | None: The commit hash, or None if it can't be resolved
+    """
+    git_path = Path(git_dir)
+    try:
+        head = (git_path / "HEAD").read_text(encoding="utf-8").strip()
+        if not head.startswith("ref: "):
+            return head
+        ref = head.removeprefix("ref: ")
+        ref_path = git_path / ref
+        if ref_path.exists():
+            return ref_path.read_text(encoding="utf-8").strip()
+        packed = git_path / "packed-refs"
+        for line in packed.read_text(encoding="utf-8").splitlines():
+            if line.endswith(f" {ref}"):
+                return line.split(" ", 1)[0]
+    except OSError:
+        pass
+    return None
+
+
+def collect_git_metadata() -> dict[str, str]:
+    """
+    Collect git metadata by running git, falling back to "unknown" on failure
+
+    Returns:
+        dict[str, str]: Remote URL, branch, commit hash, and short commit hash
+    """
+    getters = {
+        "remote": get_git_remote_url,
+        "branch": get_current_git_branch,
+        "commit": get_git_revision_hash,
+        "short_commit": get_git_revision_short_hash,
+    }
+    metadata: dict[str, str] = {}
+    for key, getter in getters.items():
+        try:
+            metadata[key] = getter()
+        except (CalledProcessError, OSError):
+            metadata[key] = "unknown"
+    return metadata
+
+
+def write_build_info(path: str = BUILD_INFO_PATH) -> dict[str, str]:
+    """
+    Collect git metadata and cache it, so the bot doesn't need to run git at import
+
+    Args:
+        path (str, optional): Path to the cache file. Defaults to BUILD_INFO_PATH.
+
+    Returns:
+        dict[str, str]: The cached metadata
+    """
+    metadata = collect_git_metadata()
+    try:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(metadata, file)
+    except OSError:
+        pass
+    return metadata
+
+
+def load_build_info(path: str = BUILD_INFO_PATH) -> dict[str, str]:
+    """
+    Load cached git metadata, refreshing it if HEAD moved since it was cached
+
+    Args:
+        path (str, optional): Path to the cache file. Defaults to BUILD_INFO_PATH.
+
+    Returns:
+        dict[str, str]: Remote URL, branch, commit hash, and short commit hash
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            metadata = json.load(file)
+        head = read_git_head_commit()
+        if head is None or metadata.get("commit") == head:
+            return metadata
+    except (OSError, ValueError):
+        pass
+    return write_build_info(path)
+
+
+_build_info = load_build_info()
+
+GIT_REMOTE = _build_info["remote"]
 """The git remote URL"""
-GIT_BRANCH = get_current_git_branch()
+GIT_BRANCH = _build_info["branch"]
 """The git branch"""
-GIT_COMMIT_HASH = get_git_revision_hash()
+GIT_COMMIT_HASH = _build_info["commit"]
 """The git revision hash"""
-GT_HSH = get_git_revision_short_hash()
+GT_HSH = _build_info["short_commit"]
 """The git revision short hash"""
 
 USER_AGENT: Final[str] = (
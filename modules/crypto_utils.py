@@ -1,11 +1,152 @@
+import base64
 import gzip
+import io
+import os
 import shutil
+import struct
 from pathlib import Path
+from typing import BinaryIO
 
+from cryptography.exceptions import InvalidTag
 from cryptography.fernet import Fernet
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+STREAM_MAGIC = b"RYUUBAK1"
+"""Header of streamed backups, older ones are a single Fernet token"""
+STREAM_CHUNK_SIZE = 1 << 20
+"""Plaintext bytes sealed per frame"""
+_FRAME_HEADER = struct.Struct(">BI")
+_NONCE_PREFIX_SIZE = 7
+
+
+def _stream_nonce(prefix: bytes, counter: int, final: bool) -> bytes:
+    """Nonce of a frame, binding its position and whether it is the last one"""
+    return prefix + counter.to_bytes(4, "big") + (b"\x01" if final else b"\x00")
+
+
+class EncryptingWriter(io.RawIOBase):
+    """
+    Writable stream sealing data in AES-GCM frames as it is written
+
+    Each frame is authenticated along with its position, and the last one is
+    marked as such, so reordered, dropped, or truncated frames fail to
+    decrypt. Only one frame is held in memory at a time.
+    """
+
+    def __init__(
+        self, raw: BinaryIO, key: str, chunk_size: int = STREAM_CHUNK_SIZE
+    ) -> None:
+        """
+        Start a stream
+
+        Args:
+            raw (BinaryIO): Output file, left open on close
+            key (str): Key from `CryptoUtils.generate_key`
+            chunk_size (int, optional): Plaintext bytes per frame. Defaults to STREAM_CHUNK_SIZE.
+        """
+        super().__init__()
+        self._raw = raw
+        self._aead = AESGCM(base64.urlsafe_b64decode(key))
+        self._prefix = os.urandom(_NONCE_PREFIX_SIZE)
+        self._chunk_size = chunk_size
+        self._counter = 0
+        self._buffer = bytearray()
+        raw.write(STREAM_MAGIC + self._prefix)
+
+    def writable(self) -> bool:
+        return True
+
+    def _seal(self, data: bytes, final: bool) -> None:
+        nonce = _stream_nonce(self._prefix, self._counter, final)
+        sealed = self._aead.encrypt(nonce, data, STREAM_MAGIC)
+        self._raw.write(_FRAME_HEADER.pack(int(final), len(sealed)))
+        self._raw.write(sealed)
+        self._counter += 1
+
+    def write(self, data) -> int:  # type: ignore[override]
+        self._buffer += data
+        # keep the tail, the last frame is sealed on close
+        while len(self._buffer) > self._chunk_size:
+            self._seal(bytes(self._buffer[: self._chunk_size]), final=False)
+            del self._buffer[: self._chunk_size]
+        return memoryview(data).nbytes
+
+    def close(self) -> None:
+        if not self.closed:
+            self._seal(bytes(self._buffer), final=True)
+            self._buffer.clear()
+        super().close()
+
+
+class DecryptingReader(io.RawIOBase):
+    """Readable stream opening frames written by `EncryptingWriter` as they are read"""
+
+    def __init__(self, raw: BinaryIO, key: str) -> None:
+        """
+        Open a stream
+
+        Args:
+            raw (BinaryIO): Input file, positioned at the start of the backup
+            key (str): Key the backup was encrypted with
+
+        Raises:
+            ValueError: Not a streamed backup
+        """
+        super().__init__()
+        header = raw.read(len(STREAM_MAGIC) + _NONCE_PREFIX_SIZE)
+        if not header.startswith(STREAM_MAGIC):
+            raise ValueError("Not a streamed backup")
+        self._raw = raw
+        self._aead = AESGCM(base64.urlsafe_b64decode(key))
+        self._prefix = header[len(STREAM_MAGIC) :]
+        self._counter = 0
+        self._buffer = bytearray()
+        self._done = False
+
+    def readable(self) -> bool:
+        return True
+
+    def _read_exact(self, size: int) -> bytes:
+        data = self._raw.read(size)
+        if len(data) != size:
+            raise ValueError("Backup is truncated")
+        return data
+
+    def _open_frame(self) -> None:
+        final, size = _FRAME_HEADER.unpack(self._read_exact(_FRAME_HEADER.size))
+        sealed = self._read_exact(size)
+        nonce = _stream_nonce(self._prefix, self._counter, bool(final))
+        try:
+            self._buffer += self._aead.decrypt(nonce, sealed, STREAM_MAGIC)
+        except InvalidTag as error:
+            raise ValueError("Invalid key, or the backup is corrupted") from error
+        self._counter += 1
+        if final:
+            self._done = True
+            if self._raw.read(1):
+                raise ValueError("Unexpected data after the end of the backup")
+
+    def readinto(self, buffer) -> int:  # type: ignore[override]
+        while not self._buffer and not self._done:
+            self._open_frame()
+        size = min(len(buffer), len(self._buffer))
+        buffer[:size] = self._buffer[:size]
+        del self._buffer[:size]
+        return size
 
 
 class CryptoUtils:
+    @staticmethod
+    def generate_key() -> str:
+        """Generates a backup key."""
+        return Fernet.generate_key().decode()
+
+    @staticmethod
+    def is_streamed(encrypted_path: Path) -> bool:
+        """Checks if a backup was written by `EncryptingWriter`."""
+        with open(encrypted_path, "rb") as f_in:
+            return f_in.read(len(STREAM_MAGIC)) == STREAM_MAGIC
+
     @staticmethod
     def encrypt_and_package(file_path: Path) -> tuple[Path, str]:
         """Compresses, encrypts, and packages a file."""
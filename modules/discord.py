@@ -1,10 +1,27 @@
 from datetime import datetime
+from typing import Any
 
 import interactions as ipy
 
+from classes.cache import TtlCache
 from classes.database import UserDatabase
 from classes.pronoundb import PronounDBV2
 from modules.commons import sanitize_markdown
+from modules.pipeline import FetchPipeline
+
+DISCORD_PAYLOAD_TTL = 60.0
+"""Seconds to keep raw user and member payloads in memory"""
+PROFILE_FETCH_DEADLINE = 5.0
+"""Seconds before optional profile lookups are dropped from the embed"""
+
+_DISCORD_DATE_FORMAT = "%Y-%m-%dT%H:%M:%S.%f%z"
+
+_user_payloads: TtlCache[int, dict[str, Any]] = TtlCache(
+    ttl=DISCORD_PAYLOAD_TTL, maxsize=2048
+)
+_member_payloads: TtlCache[tuple[int, int], dict[str, Any]] = TtlCache(
+    ttl=DISCORD_PAYLOAD_TTL, maxsize=2048
+)
 
 
 def format_username(
@@ -25,6 +42,76 @@ def format_username(
     return username
 
 
+async def fetch_user_payload(
+    bot: ipy.AutoShardedClient | ipy.Client,
+    user_id: int | str,
+) -> dict[str, Any]:
+    """
+    Fetch raw user payload from REST, cached in memory for a short while
+
+    Gateway cache is not used, as it lacks banner and accent color of users.
+
+    Args:
+        bot (ipy.AutoShardedClient | ipy.Client): The bot client
+        user_id (int | str): User snowflake
+
+    Returns:
+        dict[str, Any]: User payload, as returned by Discord
+    """
+    key = int(user_id)
+    payload = _user_payloads.get(key)
+    if payload is None:
+        payload = await bot.http.get_user(key)
+        _user_payloads.set(key, payload)  # type: ignore
+    return payload  # type: ignore
+
+
+def _member_to_payload(member: ipy.Member) -> dict[str, Any]:
+    """
+    Convert a gateway-cached member to the fields of a REST member payload
+
+    Args:
+        member (ipy.Member): Cached member
+
+    Returns:
+        dict[str, Any]: Partial member payload
+    """
+    premium = member.premium_since
+    return {
+        "avatar": member.guild_avatar.hash if member.guild_avatar else None,
+        "nick": member.nick,
+        "joined_at": member.joined_at.strftime(_DISCORD_DATE_FORMAT),
+        "premium_since": premium.strftime(_DISCORD_DATE_FORMAT) if premium else None,
+    }
+
+
+async def fetch_member_payload(
+    bot: ipy.AutoShardedClient | ipy.Client,
+    guild_id: int | str,
+    user_id: int | str,
+) -> dict[str, Any]:
+    """
+    Fetch raw member payload, preferring gateway cache, then memory, then REST
+
+    Args:
+        bot (ipy.AutoShardedClient | ipy.Client): The bot client
+        guild_id (int | str): Guild snowflake
+        user_id (int | str): User snowflake
+
+    Returns:
+        dict[str, Any]: Member payload, with at least `avatar`, `nick`, `joined_at`, and `premium_since`
+    """
+    key = (int(guild_id), int(user_id))
+    member = bot.cache.get_member(*key)
+    if member is not None and member.joined_at is not None:
+        return _member_to_payload(member)
+    payload = _member_payloads.get(key)
+    if payload is None:
+        payload = await bot.http.get_member(*key)
+        _member_payloads.set(key, payload)  # type: ignore
+    return payload  # type: ignore
+
+
 async def generate_discord_profile_embed(
     bot: ipy.AutoShardedClient | ipy.Client,
     ctx: ipy.SlashContext,
@@ -46,18 +133,35 @@ async def generate_discord_profile_embed(
         userId = str(ctx.author.id)
     else:
         userId = str(user.id)
-    servData = {}
-    user_data = await bot.http.get_user(userId)
-    data = ipy.User.from_dict(user_data, bot)  # type: ignore
-    if ctx.guild:
-        servData = await bot.http.get_member(ctx.guild.id, userId)
+    guild = ctx.guild
+    is_author = userId == str(ctx.author.id)
+
+    async def fetch_pronouns(_: dict[str, Any]) -> str:
+        # lookups are batched and cached by the wrapper, no session needed here
+        pdb = PronounDBV2()
+        found = await pdb.get_pronouns(pdb.Platform.DISCORD, userId)
+        return "Not set" if len(found.pronouns.en) == 0 else str(found)
+
+    async def fetch_registered(_: dict[str, Any]) -> bool:
+        async with UserDatabase() as db:
+            return await db.check_if_registered(discord_id=ipy.Snowflake(int(userId)))
+
+    pipeline = FetchPipeline(deadline=PROFILE_FETCH_DEADLINE)
+    pipeline.add("user", lambda _: fetch_user_payload(bot, userId), required=True)
+    pipeline.add("pronouns", fetch_pronouns)
+    if guild:
+        pipeline.add("member", lambda _: fetch_member_payload(bot, guild.id, userId))
+    if is_author:
+        pipeline.add("registered", fetch_registered)
+    fetched = await pipeline.run()
+
+    data = ipy.User.from_dict(fetched.get("user"), bot)  # type: ignore
+    servData: dict[str, Any] | None = fetched.get("member")
     if data.accent_color:
         color = data.accent_color.value
     else:
         color = 0x000000
-    async with PronounDBV2() as pdb:
-        pronouns = await pdb.get_pronouns(pdb.Platform.DISCORD, userId)
-    pronouns = "Not set" if len(pronouns.pronouns.en) == 0 else str(pronouns)
+    pronouns: str = fetched.get("pronouns", "Not set")
 
     fields = [
         ipy.EmbedField(
@@ -88,10 +192,10 @@ async def generate_discord_profile_embed(
     ]
     avatar = data.avatar.url
     # if user is on a server, show server-specific info
-    if ctx.guild:
+    if guild and servData:
         if servData["avatar"]:  # type: ignore
             # type: ignore
-            avatar = f"https://cdn.discordapp.com/guilds/{ctx.guild.id}/users/{userId}/avatars/{servData['avatar']}"
+            avatar = f"https://cdn.discordapp.com/guilds/{guild.id}/users/{userId}/avatars/{servData['avatar']}"
             # if avatar is animated, add .gif extension
             if servData["avatar"].startswith("a_"):  # type: ignore
                 avatar += ".gif"
@@ -103,14 +207,14 @@ async def generate_discord_profile_embed(
         else:
             nick = sanitize_markdown(data.username)
             nick += " (*default*)"
-        joined = datetime.strptime(servData["joined_at"], "%Y-%m-%dT%H:%M:%S.%f%z")
+        joined = datetime.strptime(servData["joined_at"], _DISCORD_DATE_FORMAT)
         joined = int(joined.timestamp())
         joined = f"<t:{joined}:R>"
         if servData["premium_since"]:  # type: ignore
             premium_dt: datetime = datetime.strptime(
                 # type: ignore
                 servData["premium_since"],
-                "%Y-%m-%dT%H:%M:%S.%f%z",
+                _DISCORD_DATE_FORMAT,
             )
             premium_ts: int = int(premium_dt.timestamp())
             premium_str: str = f"Boosting server since <t:{premium_ts}:R>"
@@ -141,9 +245,7 @@ async def generate_discord_profile_embed(
     regStatus = ""
     if data.bot:
         botStatus = "\n🤖 This account is a bot"
-    async with UserDatabase() as db:
-        reg = await db.check_if_registered(discord_id=ipy.Snowflake(int(userId)))
-    if reg is True and userId == str(ctx.author.id):
+    if fetched.get("registered") is True:
         regStatus = "\n✅ This user is registered on this bot"
     embed: ipy.Embed = ipy.Embed(
         title="Discord Profile",
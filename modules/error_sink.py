@@ -0,0 +1,361 @@
+"""
+# Error Sink Module
+
+This module collects exceptions into rotating JSONL segments in the `errors`
+folder. Recording an error only queues it; a background thread groups
+identical tracebacks by fingerprint and appends one line per group, so an
+outage of a provider produces a handful of lines with counts instead of
+thousands of files.
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import queue
+import threading
+import time
+import traceback
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any
+
+ERROR_LOG_DIR = "errors"
+"""Folder holding the error segments"""
+SEGMENT_PREFIX = "errors-"
+SEGMENT_SUFFIX = ".jsonl"
+
+
+def fingerprint_error(error: BaseException) -> str:
+    """
+    Fingerprint an exception by its type and the frames it went through
+
+    The message is left out on purpose, as it often holds IDs or URLs that
+    differ between otherwise identical failures.
+
+    Args:
+        error (BaseException): The exception
+
+    Returns:
+        str: 16 characters hex fingerprint
+    """
+    parts = [f"{type(error).__module__}.{type(error).__qualname__}"]
+    parts.extend(
+        f"{frame.filename}:{frame.name}:{frame.lineno}"
+        for frame in traceback.extract_tb(error.__traceback__)
+    )
+    return hashlib.sha1("\n".join(parts).encode(), usedforsecurity=False).hexdigest()[
+        :16
+    ]
+
+
+@dataclass
+class ErrorSummary:
+    """Aggregated occurrences of one error fingerprint"""
+
+    fingerprint: str
+    """Fingerprint of the traceback"""
+    error_type: str
+    """Exception class name"""
+    message: str
+    """Message of the latest occurrence"""
+    count: int = 0
+    """Number of occurrences"""
+    first_seen: datetime | None = None
+    """Time of the earliest occurrence"""
+    last_seen: datetime | None = None
+    """Time of the latest occurrence"""
+    commands: list[str] = field(default_factory=list)
+    """Commands the error was raised from"""
+    traceback: str = ""
+    """Formatted traceback of one occurrence"""
+
+
+@dataclass
+class _Group:
+    """Occurrences of a fingerprint in a command waiting to be written"""
+
+    event: dict[str, Any]
+    count: int = 1
+    first_seen: float = 0.0
+    last_seen: float = 0.0
+
+
+def _iso(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat()
+
+
+class ErrorSink:
+    """
+    Queue-fed error writer, deduplicating identical tracebacks
+
+    ## Usage
+
+    >>> sink = ErrorSink("errors")
+    >>> try:
+    ...     1 / 0
+    ... except ZeroDivisionError as error:
+    ...     sink.record("calc", 123, error)
+    >>> sink.flush()
+    >>> sink.top_errors(limit=5)
+    """
+
+    def __init__(
+        self,
+        directory: str = ERROR_LOG_DIR,
+        segment_size: int = 4 * 1024 * 1024,
+        max_segments: int = 20,
+        flush_interval: float = 2.0,
+        max_pending: int = 10000,
+    ):
+        """
+        Initialize the sink, the writer thread starts on first record
+
+        Args:
+            directory (str, optional): Folder holding the segments. Defaults to ERROR_LOG_DIR.
+            segment_size (int, optional): Bytes before a new segment is started. Defaults to 4 MiB.
+            max_segments (int, optional): Segments to keep, oldest are removed first. Defaults to 20.
+            flush_interval (float, optional): Seconds occurrences are grouped before writing. Defaults to 2.0.
+            max_pending (int, optional): Queued occurrences before new ones are dropped. Defaults to 10000.
+        """
+        self.directory = directory
+        self.segment_size = segment_size
+        self.max_segments = max_segments
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.dropped = 0
+        """Occurrences dropped because the queue was full"""
+        self._queue: queue.Queue[dict[str, Any] | threading.Event] = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._segment: str | None = None
+        self._with_traceback: set[str] = set()
+        """Fingerprints whose traceback is already in the current segment"""
+
+    def record(
+        self, command: str, author_id: int | str | None, error: BaseException
+    ) -> str:
+        """
+        Queue an exception, without touching the disk
+
+        Args:
+            command (str): Command or task name
+            author_id (int | str | None): ID of the user who triggered the error
+            error (BaseException): The exception
+
+        Returns:
+            str: Fingerprint of the exception
+        """
+        fingerprint = fingerprint_error(error)
+        if self._queue.qsize() >= self.max_pending:
+            self.dropped += 1
+            return fingerprint
+        with self._lock:
+            need_traceback = fingerprint not in self._with_traceback
+            self._with_traceback.add(fingerprint)
+        event: dict[str, Any] = {
+            "fingerprint": fingerprint,
+            "command": command,
+            "author": str(author_id) if author_id is not None else None,
+            "type": type(error).__name__,
+            "message": str(error),
+            "time": time.time(),
+        }
+        if need_traceback:
+            # frames can't be kept around for the writer, format them here
+            event["traceback"] = "".join(
+                traceback.format_exception(type(error), error, error.__traceback__)
+            )
+        self._queue.put(event)
+        self._ensure_writer()
+        return fingerprint
+
+    def flush(self, timeout: float | None = 10.0) -> bool:
+        """
+        Wait until every queued occurrence is written
+
+        Args:
+            timeout (float | None, optional): Seconds to wait. Defaults to 10.0.
+
+        Returns:
+            bool: True if the queue was drained in time
+        """
+        if self._thread is None or not self._thread.is_alive():
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def _ensure_writer(self) -> None:
+        """Start the writer thread if it is not running"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(
+                target=self._writer, name="error-sink", daemon=True
+            )
+            self._thread.start()
+
+    def _writer(self) -> None:
+        """Group queued occurrences for a flush interval, then write them"""
+        while True:
+            item = self._queue.get()
+            groups: dict[tuple[str, str], _Group] = {}
+            waiters: list[threading.Event] = []
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if isinstance(item, threading.Event):
+                    # flush requested, write what we have right away
+                    waiters.append(item)
+                    break
+                key = (item["fingerprint"], item["command"])
+                group = groups.get(key)
+                if group is None:
+                    groups[key] = _Group(item, 1, item["time"], item["time"])
+                else:
+                    group.count += 1
+                    group.last_seen = item["time"]
+                    group.event["message"] = item["message"]
+                    group.event["author"] = item["author"]
+                    if "traceback" in item:
+                        group.event.setdefault("traceback", item["traceback"])
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+            try:
+                self._write(groups)
+            except OSError as error:
+                print(f"[Err] [Sink] Failed to write {len(groups)} errors: {error}")
+            for waiter in waiters:
+                waiter.set()
+
+    def _write(self, groups: dict[tuple[str, str], "_Group"]) -> None:
+        """Append grouped occurrences to the current segment"""
+        if not groups:
+            return
+        lines = []
+        for group in groups.values():
+            line = {
+                "fingerprint": group.event["fingerprint"],
+                "command": group.event["command"],
+                "author": group.event["author"],
+                "type": group.event["type"],
+                "message": group.event["message"],
+                "count": group.count,
+                "first_seen": _iso(group.first_seen),
+                "last_seen": _iso(group.last_seen),
+            }
+            if "traceback" in group.event:
+                line["traceback"] = group.event["traceback"]
+            lines.append(json.dumps(line, ensure_ascii=False) + "\n")
+        path = self._current_segment()
+        with open(path, "a", encoding="utf-8") as file:
+            file.writelines(lines)
+
+    def _current_segment(self) -> str:
+        """Get the segment to append to, rotating it when it grows too large"""
+        if self._segment is not None and (
+            not os.path.exists(self._segment)
+            or os.path.getsize(self._segment) < self.segment_size
+        ):
+            return self._segment
+        os.makedirs(self.directory, exist_ok=True)
+        stamp = datetime.now(tz=timezone.utc).strftime("%Y%m%d-%H%M%S-%f")
+        self._segment = os.path.join(
+            self.directory, f"{SEGMENT_PREFIX}{stamp}{SEGMENT_SUFFIX}"
+        )
+        with self._lock:
+            # a new segment must be readable without the previous ones
+            self._with_traceback.clear()
+        for old in self.segments()[: -(self.max_segments - 1) or None]:
+            try:
+                os.remove(old)
+            except OSError:
+                pass
+        return self._segment
+
+    def segments(self) -> list[str]:
+        """
+        List segment files, oldest first
+
+        Returns:
+            list[str]: Paths of the segments
+        """
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(
+            os.path.join(self.directory, name)
+            for name in os.listdir(self.directory)
+            if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX)
+        )
+
+    def top_errors(
+        self,
+        since: datetime | None = None,
+        limit: int = 10,
+    ) -> list[ErrorSummary]:
+        """
+        Get the most frequent errors, reading every segment from the disk
+
+        Args:
+            since (datetime | None, optional): Only count occurrences seen after this time. Defaults to None, all time.
+            limit (int, optional): Number of errors to return. Defaults to 10.
+
+        Returns:
+            list[ErrorSummary]: Errors, most frequent first
+        """
+        self.flush()
+        summaries: dict[str, ErrorSummary] = {}
+        for path in self.segments():
+            if since is not None and os.path.getmtime(path) < since.timestamp():
+                continue
+            with open(path, encoding="utf-8") as file:
+                for raw in file:
+                    try:
+                        line = json.loads(raw)
+                    except json.JSONDecodeError:
+                        continue
+                    last_seen = datetime.fromisoformat(line["last_seen"])
+                    if since is not None and last_seen < since:
+                        continue
+                    first_seen = datetime.fromisoformat(line["first_seen"])
+                    summary = summaries.setdefault(
+                        line["fingerprint"],
+                        ErrorSummary(
+                            fingerprint=line["fingerprint"],
+                            error_type=line["type"],
+                            message=line["message"],
+                            first_seen=first_seen,
+                            last_seen=last_seen,
+                        ),
+                    )
+                    summary.count += line["count"]
+                    summary.first_seen = min(summary.first_seen, first_seen)  # type: ignore
+                    if last_seen >= summary.last_seen:  # type: ignore
+                        summary.last_seen = last_seen
+                        summary.message = line["message"]
+                    if line["command"] not in summary.commands:
+                        summary.commands.append(line["command"])
+                    if not summary.traceback and line.get("traceback"):
+                        summary.traceback = line["traceback"]
+        return sorted(summaries.values(), key=lambda s: -s.count)[:limit]
+
+
+error_sink = ErrorSink()
+"""Shared sink used by `save_traceback_to_file`"""
+atexit.register(error_sink.flush, 5.0)
+
+
+__all__ = [
+    "ERROR_LOG_DIR",
+    "ErrorSink",
+    "ErrorSummary",
+    "error_sink",
+    "fingerprint_error",
+]
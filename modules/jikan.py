@@ -7,7 +7,11 @@ API wrapper specifically are saved in classes/jikan.py
 """
 
 from classes.jikan import JikanApi
-from modules.const import CLUB_ID
+from classes.verificator import ClubVerifier
+from modules.const import CLUB_ID, CLUB_ROSTER_CHECK
+
+club_verifier = ClubVerifier(CLUB_ID, use_roster=CLUB_ROSTER_CHECK)
+"""Membership checks of the verification club"""
 
 
 async def get_member_clubs(username: str) -> list[dict]:
@@ -48,5 +52,4 @@ async def check_club_membership(username: str) -> bool:
     Returns:
         bool: True if the user is a member of the club, False if not
     """
-    clubs = await get_member_clubs(username)
-    return await check_if_club_in_list(clubs)
+    return await club_verifier.is_member(username)
@@ -0,0 +1,107 @@
+"""
+# Lazy Import Module
+
+This module allows heavy third-party packages to be imported on first use
+instead of when an extension is loaded, so the bot can connect to Discord
+sooner. Lazy mode is opt-in, enabled by `main.py --lazy-imports`; otherwise
+`lazy_import` behaves like a regular import.
+"""
+
+import importlib
+import sys
+import time
+from types import ModuleType
+from typing import Any
+
+_enabled = False
+
+first_use_timings: dict[str, float] = {}
+"""Seconds spent importing each lazy module on its first use"""
+
+
+def enable_lazy_imports(enabled: bool = True) -> None:
+    """
+    Turn lazy import mode on or off, must be called before extensions load
+
+    Args:
+        enabled (bool, optional): Whether to defer imports. Defaults to True.
+    """
+    global _enabled  # pylint: disable=global-statement
+    _enabled = enabled
+
+
+def is_lazy_imports_enabled() -> bool:
+    """
+    Check if lazy import mode is on
+
+    Returns:
+        bool: True if imports are deferred
+    """
+    return _enabled
+
+
+class LazyModule(ModuleType):
+    """Module placeholder that imports the real module on first attribute access"""
+
+    def __init__(self, name: str):
+        """
+        Initialize the placeholder
+
+        Args:
+            name (str): Fully qualified module name
+        """
+        super().__init__(name)
+        self.__dict__["_lazy_module"] = None
+
+    def _load(self) -> ModuleType:
+        """
+        Import the real module, once
+
+        Returns:
+            ModuleType: The real module
+        """
+        module = self.__dict__["_lazy_module"]
+        if module is None:
+            start = time.perf_counter()
+            module = importlib.import_module(self.__name__)
+            first_use_timings[self.__name__] = time.perf_counter() - start
+            self.__dict__["_lazy_module"] = module
+        return module
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+
+    def __dir__(self) -> list[str]:
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.__dict__["_lazy_module"] is not None else "deferred"
+        return f"<lazy module {self.__name__!r} ({state})>"
+
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    Import a module, deferring the import to first use when lazy mode is on
+
+    Args:
+        name (str): Fully qualified module name, e.g. `PIL.Image`
+
+    Returns:
+        ModuleType: The module, or a placeholder that loads it on first use
+
+    Example:
+        >>> pd = lazy_import("pandas")
+        >>> pd.DataFrame()  # pandas is imported here
+    """
+    if not _enabled or name in sys.modules:
+        return importlib.import_module(name)
+    return LazyModule(name)
+
+
+__all__ = [
+    "LazyModule",
+    "enable_lazy_imports",
+    "first_use_timings",
+    "is_lazy_imports_enabled",
+    "lazy_import",
+]
@@ -4,6 +4,7 @@
 This module contains modules that are related to MyAnimeList or Jikan API.
 """
 
+import asyncio
 import html
 import re
 from datetime import datetime, timezone
@@ -11,7 +12,7 @@ from typing import Any
 from urllib.parse import quote
 from zoneinfo import ZoneInfo
 
-import pandas as pd
+import aiohttp
 from interactions import (
     ActionRow,
     Button,
@@ -27,25 +28,32 @@ from interactions import (
 )
 
 from classes.anilist import AniList, AniListMediaStruct
+from classes.anilist import Cache as AniListCache
 from classes.animeapi import AnimeApi, AnimeApiAnime
+from classes.cache import Caching
 from classes.excepts import MediaIsNsfw, ProviderHttpError
-from classes.jikan import JikanApi
+from classes.jikan import Cache as JikanCache
+from classes.jikan import JikanAnimeStruct, JikanApi
+from classes.kitsu import Cache as KitsuCache
 from classes.kitsu import Kitsu
+from classes.malindex import MalIndexEntry, get_mal_index
 from classes.myanimelist import MyAnimeList
 from modules.commons import (
     PlatformErrType,
     generate_commons_except_embed,
     generate_trailer,
     get_nsfw_status,
-    get_random_seed,
     platform_exception_embed,
+    rendered_responses,
     sanitize_markdown,
     save_traceback_to_file,
     send_or_edit_message,
     trim_synopsis,
 )
 from modules.const import MESSAGE_WARN_CONTENTS, MYANIMELIST_CLIENT_ID
+from modules.pipeline import FetchPipeline, PipelineStats, StageStatus
 from modules.platforms import Platform, media_id_to_platform
+from modules.prefetch import lookup_stats
 
 
 def generate_animethemes_slug(title: str) -> str:
@@ -82,20 +90,56 @@ def lookup_random_anime() -> int:
     Returns:
         int: MAL ID of a random anime
     """
-    seed = get_random_seed()
-    # open database/mal.csv
-    dataframe = pd.read_csv("database/mal.csv", sep="\t")
-    # get random anime
-    rand_anime = dataframe.sample(n=1, random_state=seed)
-    # get anime id
-    rand_anime_id: int = rand_anime["mal_id"].values[0]
-    return rand_anime_id
+    return get_mal_index().random_id()
+
+
+MAL_SEARCH_TIMEOUT = 5.0
+"""Seconds to wait for MyAnimeList search before falling back to the local index"""
+
+
+def _local_entry_to_node(entry: MalIndexEntry) -> dict[str, Any]:
+    """
+    Shape a local index entry like a MyAnimeList search result
+
+    Args:
+        entry (MalIndexEntry): Local index entry
+
+    Returns:
+        dict[str, Any]: Search result node
+    """
+    return {
+        "node": {
+            "id": entry.mal_id,
+            "title": entry.title,
+            "alternative_titles": {},
+            "start_season": {"year": None, "season": None},
+            "media_type": "unknown",
+        }
+    }
+
+
+def search_local_anime(title: str, limit: int = 5) -> list[dict[str, Any]]:
+    """
+    Search anime on the local MAL title index
+
+    Args:
+        title (str): Anime title
+        limit (int, optional): Maximum number of results. Defaults to 5.
+
+    Returns:
+        list[dict[str, Any]]: Anime data, shaped like `search_mal_anime` results
+    """
+    return [
+        _local_entry_to_node(entry) for entry in get_mal_index().search(title, limit)
+    ]
 
 
 async def search_mal_anime(title: str) -> list[dict[str, Any]]:
     """
     Search anime via MyAnimeList API
 
+    Falls back to the local MAL title index if the API is slow or unavailable.
+
     Args:
         title (str): Anime title
 
@@ -110,8 +154,20 @@ async def search_mal_anime(title: str) -> list[dict[str, Any]]:
         "media_type",
     ]
     fields = ",".join(fields)
-    async with MyAnimeList(MYANIMELIST_CLIENT_ID) as mal:
-        data = await mal.search(title, limit=5, fields=fields)
+    try:
+        async with MyAnimeList(MYANIMELIST_CLIENT_ID) as mal:
+            data = await asyncio.wait_for(
+                mal.search(title, limit=5, fields=fields), timeout=MAL_SEARCH_TIMEOUT
+            )
+    except (asyncio.TimeoutError, ProviderHttpError, aiohttp.ClientError):
+        try:
+            results = await asyncio.to_thread(search_local_anime, title)
+        except OSError:
+            # no index before the first mal_run, report the API error instead
+            results = []
+        if not results:
+            raise
+        return results
     for dat in data["data"]:
         # drop main_picture
         dat["node"].pop("main_picture", None)
@@ -131,11 +187,85 @@ async def search_mal_anime(title: str) -> list[dict[str, Any]]:
 
 
 # old code taken from ipy/v4.3.4
+MAL_SUBMIT_DEADLINE = 8.0
+"""Seconds to wait for optional providers before building the embed without them"""
+
+mal_submit_stats = PipelineStats()
+"""Per-provider latency of recent mal_submit calls"""
+
+
+def _empty_kitsu() -> dict:
+    """
+    Get a Kitsu response placeholder without any image
+
+    Returns:
+        dict: Kitsu response placeholder
+    """
+    return {"data": {"attributes": {"posterImage": None, "coverImage": None}}}
+
+
+def build_mal_pipeline(
+    entry_id: int, deadline: float | None = MAL_SUBMIT_DEADLINE
+) -> FetchPipeline:
+    """
+    Build the provider fetch pipeline of a MAL anime embed
+
+    Jikan is fetched alongside AnimeAPI, AniList waits for the AniList ID from
+    AnimeAPI, and Kitsu is only fetched when AniList has no images.
+
+    Args:
+        entry_id (int): MAL ID
+        deadline (float | None, optional): Seconds to wait for optional providers. Defaults to MAL_SUBMIT_DEADLINE.
+
+    Returns:
+        FetchPipeline: Pipeline with "jikan", "relation", "anilist", and "kitsu" stages
+    """
+
+    async def fetch_jikan(_: dict[str, Any]) -> JikanAnimeStruct:
+        async with JikanApi() as jikan:
+            return await jikan.get_anime_data(entry_id)
+
+    async def fetch_relation(_: dict[str, Any]) -> AnimeApiAnime:
+        async with AnimeApi() as aniapi:
+            return await aniapi.get_relation(
+                media_id=entry_id, platform=aniapi.AnimeApiPlatforms.MYANIMELIST
+            )
+
+    async def fetch_anilist(deps: dict[str, Any]) -> AniListMediaStruct | None:
+        relation: AnimeApiAnime = deps["relation"]
+        if relation.anilist is None:
+            return None
+        async with AniList() as anilist:
+            try:
+                return await anilist.anime(media_id=relation.anilist)
+            except ProviderHttpError:
+                return None
+
+    async def fetch_kitsu(deps: dict[str, Any]) -> dict | None:
+        relation: AnimeApiAnime = deps["relation"]
+        alist: AniListMediaStruct | None = deps["anilist"]
+        if alist is not None and (alist.bannerImage or alist.coverImage):
+            return None
+        if not relation.kitsu:
+            return None
+        async with Kitsu() as kts:
+            return await kts.get_anime(relation.kitsu)
+
+    pipeline = FetchPipeline(deadline=deadline)
+    pipeline.add("jikan", fetch_jikan, required=True)
+    pipeline.add("relation", fetch_relation)
+    pipeline.add("anilist", fetch_anilist, depends_on=["relation"])
+    pipeline.add("kitsu", fetch_kitsu, depends_on=["relation", "anilist"])
+    return pipeline
+
+
 async def generate_mal(
     entry_id: int,
     is_nsfw: bool | None = False,
     anilist_data: AniListMediaStruct | None = None,
     anime_api: AnimeApiAnime | None = None,
+    jikan_data: JikanAnimeStruct | None = None,
+    kitsu_data: dict | None = None,
 ) -> tuple[Embed, list[Button]]:
     """
     Generate an embed for /anime with MAL via Jikan
@@ -145,6 +275,8 @@ async def generate_mal(
         is_nsfw (bool, optional): NSFW status. Defaults to False.
         anilist_data (AniListMediaStruct, optional): AniList data. Defaults to None.
         anime_api (dict, optional): Anime API data. Defaults to None.
+        jikan_data (JikanAnimeStruct, optional): Prefetched Jikan data, fetched if None. Defaults to None.
+        kitsu_data (dict, optional): Prefetched Kitsu data, fetched when needed if None. Defaults to None.
 
     Raises:
         MediaIsNsfw: NSFW is not allowed
@@ -153,8 +285,11 @@ async def generate_mal(
         list[Embed | list[ActionRow]]: Embed and button
     """
 
-    async with JikanApi() as jikan:
-        jk_dat = await jikan.get_anime_data(entry_id)
+    if jikan_data is not None:
+        jk_dat = jikan_data
+    else:
+        async with JikanApi() as jikan:
+            jk_dat = await jikan.get_anime_data(entry_id)
 
     if anilist_data is not None:
         alist: AniListMediaStruct = anilist_data
@@ -208,11 +343,13 @@ async def generate_mal(
         al_post = alist.coverImage.extraLarge
     al_bg = alist.bannerImage
 
-    if anime_api is not None and anime_api.kitsu and (not al_post and not al_bg):
+    if kitsu_data is not None:
+        kts = kitsu_data
+    elif anime_api is not None and anime_api.kitsu and (not al_post and not al_bg):
         async with Kitsu() as kts:
             kts = await kts.get_anime(anime_api.kitsu)
     else:
-        kts = {"data": {"attributes": {"posterImage": None, "coverImage": None}}}
+        kts = _empty_kitsu()
 
     kts_post = kts["data"]["attributes"].get("posterImage")
     kts_post: str | None = kts_post.get("original") if kts_post else None
@@ -560,33 +697,43 @@ async def mal_submit(
     Raises:
         *None*
     """
+    lookup_stats.record("anime", ani_id)
     nsfw_bool = await get_nsfw_status(ctx)
     trailer: Button | None = None
+    render_key = ("anime", ani_id, nsfw_bool)
+    rendered = rendered_responses.get(render_key)
+    if rendered is not None:
+        await send_or_edit_message(ctx, rendered.embed, rendered.components, replace)
+        return
 
     try:
-        async with AnimeApi() as aniapi:
-            animeapi = await aniapi.get_relation(
-                media_id=ani_id, platform=aniapi.AnimeApiPlatforms.MYANIMELIST
+        fetched = await build_mal_pipeline(ani_id).run()
+        mal_submit_stats.record(fetched)
+        late = [
+            name
+            for name, timing in fetched.timings.items()
+            if timing.status is StageStatus.TIMEOUT
+        ]
+        if late:
+            print(
+                f"[Mal] [Pipeline] Deadline hit on {ani_id}, built without: {', '.join(late)}"
             )
 
-        al_data: AniListMediaStruct | None = None
+        animeapi: AnimeApiAnime | None = fetched.get("relation")
+        al_data: AniListMediaStruct | None = fetched.get("anilist")
         embed: Embed
         buttons: list[Button] = []
 
-        if animeapi.anilist is not None:
-            async with AniList() as anilist:
-                try:
-                    al_data = await anilist.anime(media_id=animeapi.anilist)
-                except ProviderHttpError:
-                    al_data = None
-
-                if al_data is not None and al_data.trailer is not None:
-                    trailer = generate_trailer(data=al_data.trailer)
-        else:
-            al_data = AniListMediaStruct(id=0)
+        if al_data is not None and al_data.trailer is not None:
+            trailer = generate_trailer(data=al_data.trailer)
 
         embed, buttons = await generate_mal(
-            ani_id, is_nsfw=nsfw_bool, anilist_data=al_data, anime_api=animeapi
+            ani_id,
+            is_nsfw=nsfw_bool,
+            anilist_data=al_data,
+            anime_api=animeapi,
+            jikan_data=fetched.get("jikan"),
+            kitsu_data=fetched.get("kitsu") or _empty_kitsu(),
         )
         if trailer is not None:
             buttons.append(trailer)
@@ -603,6 +750,15 @@ async def mal_submit(
             final_buttons.append(ActionRow(*unlabeled_buttons[i : i + 5]))
         for i in range(0, len(labeled_buttons), 5):
             final_buttons.append(ActionRow(*labeled_buttons[i : i + 5]))
+        # responses missing a late or failed provider are not kept, so the next
+        # call retries it
+        if not late and not fetched.errors:
+            sources: list[tuple[Caching, str]] = [(JikanCache, f"anime/{ani_id}.json")]
+            if al_data is not None:
+                sources.append((AniListCache, f"anime/{al_data.id}.json"))
+            if fetched.get("kitsu") and animeapi is not None:
+                sources.append((KitsuCache, f"anime/{animeapi.kitsu}.json"))
+            rendered_responses.set(render_key, embed, final_buttons, sources)
         await send_or_edit_message(ctx, embed, final_buttons, replace)
         return
 
@@ -129,6 +129,3 @@ def prepare_database():
         if not os.path.exists(file["path"]):
             with open(file["path"], "w", encoding="utf-8") as f:
                 f.write(file["header"] + "\n")
-
-    if not os.path.exists("database/allowlist_autoembed"):
-        os.mkdir("database/allowlist_autoembed")
@@ -0,0 +1,122 @@
+import json
+import os
+from tempfile import NamedTemporaryFile
+
+import aiohttp
+
+CHUNK_SIZE = 1 << 16
+"""Size of each chunk read from the response body, in bytes"""
+
+
+def _meta_path(file_path: str) -> str:
+    """
+    Get the path of the validator file stored next to a downloaded file
+
+    Args:
+        file_path (str): Path to the downloaded file
+
+    Returns:
+        str: Path to the validator file
+    """
+    return f"{file_path}.meta.json"
+
+
+def _read_validators(file_path: str) -> dict[str, str]:
+    """
+    Read the ETag and Last-Modified validators of a downloaded file
+
+    Args:
+        file_path (str): Path to the downloaded file
+
+    Returns:
+        dict[str, str]: Stored validators, empty if the file is missing
+    """
+    if not os.path.exists(file_path):
+        return {}
+    try:
+        with open(_meta_path(file_path), "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return {k: v for k, v in data.items() if k in ("etag", "last_modified") and v}
+
+
+def _write_validators(file_path: str, etag: str | None, last_modified: str | None):
+    """
+    Store the ETag and Last-Modified validators of a downloaded file
+
+    Args:
+        file_path (str): Path to the downloaded file
+        etag (str | None): ETag header of the response
+        last_modified (str | None): Last-Modified header of the response
+    """
+    with open(_meta_path(file_path), "w", encoding="utf-8") as f:
+        json.dump({"etag": etag, "last_modified": last_modified}, f)
+
+
+async def conditional_download(
+    url: str, file_path: str, headers: dict[str, str] | None = None
+) -> bool:
+    """
+    Download a file only if upstream has changed since the last download
+
+    The request carries `If-None-Match`/`If-Modified-Since` from the previous
+    response, and the body is streamed in chunks to a temporary file that
+    replaces `file_path` atomically once complete. An unchanged upstream
+    rewrites the validators, so the sidecar stays as fresh as the file.
+
+    Args:
+        url (str): URL to download
+        file_path (str): Path to save the file to
+        headers (dict[str, str] | None, optional): Extra request headers, such as User-Agent. Defaults to None.
+
+    Raises:
+        aiohttp.ClientError: If there is an issue with the GET request.
+
+    Returns:
+        bool: True if the file was replaced, False if upstream is unchanged
+    """
+    validators = _read_validators(file_path)
+    headers = dict(headers or {})
+    if "etag" in validators:
+        headers["If-None-Match"] = validators["etag"]
+    if "last_modified" in validators:
+        headers["If-Modified-Since"] = validators["last_modified"]
+
+    directory = os.path.dirname(file_path) or "."
+    os.makedirs(directory, exist_ok=True)
+    async with (
+        aiohttp.ClientSession() as session,
+        session.get(url, headers=headers) as response,
+    ):
+        if response.status == 304:
+            _write_validators(
+                file_path,
+                response.headers.get("ETag", validators.get("etag")),
+                response.headers.get("Last-Modified", validators.get("last_modified")),
+            )
+            return False
+        if response.status != 200:
+            raise aiohttp.ClientResponseError(
+                response.request_info,
+                response.history,
+                status=response.status,
+                message=f"Error fetching data: {response.reason}",
+            )
+        with NamedTemporaryFile(
+            "wb", dir=directory, prefix=".download-", delete=False
+        ) as tmp:
+            try:
+                async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                    tmp.write(chunk)
+            except BaseException:
+                tmp.close()
+                os.remove(tmp.name)
+                raise
+        os.replace(tmp.name, file_path)
+        _write_validators(
+            file_path,
+            response.headers.get("ETag"),
+            response.headers.get("Last-Modified"),
+        )
+    return True
@@ -1,59 +1,36 @@
 #!/usr/bin/env python3
 
-import asyncio
-import os
-from time import time
-
 import aiohttp
 
+from modules.oobe.downloader import conditional_download
+
 MAIN_SITE = "https://raw.githubusercontent.com/nattadasu/nekomimiDb/main/index.tsv"
+FILE_PATH = "database/nekomimiDb.tsv"
 
 
-async def nk_get_data() -> None:
+async def nk_get_data() -> bool:
     """
-    Fetches the data from the nekomimiDb main site and writes it to file.
-
-    Raises:
-        aiohttp.ClientError: If there is an issue with the GET request.
+    Fetches the data from the nekomimiDb main site and writes it to file, if upstream has changed.
 
     Returns:
-        None
+        bool: True if a new version was downloaded
     """
     try:
-        async with (
-            aiohttp.ClientSession() as session,
-            session.get(MAIN_SITE) as response,
-        ):
-            if response.status != 200:
-                print(f"Error fetching data: HTTP {response.status}: {response.reason}")
-                return
-            data = await response.text()
+        return await conditional_download(MAIN_SITE, FILE_PATH)
     except aiohttp.ClientError as e:
         print(f"Error fetching data: {e}")
-        return
-
-    # save data to file
-    def _write_tsv():
-        with open("database/nekomimiDb.tsv", "w") as f:
-            f.write(data)
-
-    await asyncio.to_thread(_write_tsv)
+        return False
 
 
-async def nk_run() -> None:
+async def nk_run() -> bool:
     """
-    Check if nekomimiDb.tsv file exists. If it does, check if it's >= 14 days old.
-    If it is, get the latest version of the file and overwrite the old one.
-    If it doesn't exist, download the latest version of the file.
+    Get the latest version of nekomimiDb.tsv, sending the validators of the
+    current file so unchanged data is not downloaded again.
 
     Returns:
-        None
+        bool: True if the file was replaced
     """
-    if not os.path.exists("database/nekomimiDb.tsv"):
-        await nk_get_data()
-    else:
-        # check if the file is >= 14 days old
-        if os.stat("database/nekomimiDb.tsv").st_mtime < (time() - 86400):
-            await nk_get_data()
-        else:
-            print("nekomimiDb.tsv is up to date")
+    changed = await nk_get_data()
+    if not changed:
+        print("nekomimiDb.tsv is up to date")
+    return changed
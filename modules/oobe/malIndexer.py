@@ -1,56 +1,76 @@
 #!/usr/bin/env python3
 
-from io import StringIO
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
 
 import aiohttp
-import pandas as pd
 
-from classes.cache import Caching
+from modules.oobe.downloader import conditional_download
 
 MAIN_SITE = r"https://animeapi.my.id/animeapi.tsv"
-CACHE_PATH = "cache/"
-FILE_NAME = "mal.remote.tsv"
+FILE_PATH = "cache/animeapi.tsv"
+OUTPUT_PATH = "database/mal.csv"
 
-Cache = Caching(cache_directory=CACHE_PATH, cache_expiration_time=86400)
-FILE_PATH = Cache.get_cache_path(FILE_NAME)
 
+async def mal_get_data() -> bool:
+    """
+    Fetches data from MAIN_SITE and saves it to a TSV file, if upstream has changed.
 
-async def mal_get_data() -> None:
-    """Fetches data from MAIN_SITE and saves it to a TSV file."""
-    async with aiohttp.ClientSession() as session, session.get(MAIN_SITE) as response:
-        if response.status not in [200, 302, 304]:
-            print(f"Error fetching data: HTTP {response.status}: {response.reason}")
-            return
-        data = await response.text()
-    Cache.write_cache(FILE_PATH, data)
+    Returns:
+        bool: True if a new version was downloaded
+    """
+    try:
+        return await conditional_download(MAIN_SITE, FILE_PATH)
+    except aiohttp.ClientError as e:
+        print(f"Error fetching data: {e}")
+        return False
 
 
-def mal_load_data() -> str:
+def mal_build_index(source: str = FILE_PATH, output: str = OUTPUT_PATH) -> None:
     """
-    Loads data from the TSV file and returns it as a string.
+    Transforms AnimeAPI TSV dump into MAL ID and title index, replacing the output atomically.
 
-    Returns:
-        str: Loaded data.
+    Meant to be run in a worker process, as parsing the dump is CPU heavy.
+
+    Args:
+        source (str, optional): Path to AnimeAPI TSV dump. Defaults to FILE_PATH.
+        output (str, optional): Path to write the index to. Defaults to OUTPUT_PATH.
     """
-    return Cache.read_cache(FILE_PATH)
-
-
-async def mal_run() -> None:
-    """Fetches MyAnimeList data, processes it, and saves it to a CSV file."""
-    is_valid = Cache.read_cache(FILE_PATH)
-    if is_valid is None:
-        await mal_get_data()
-    data = mal_load_data()
-    df = pd.read_csv(StringIO(data), sep="\t")
-    # only select title and myAnimelist columns
-    df = df[["myanimelist", "title"]]
+    import pandas as pd
+
+    df = pd.read_csv(source, sep="\t", usecols=["myanimelist", "title"])
     # drop rows with null myanimelist values
     df = df.dropna(subset=["myanimelist"])
     # convert myanimelist to int
     df["myanimelist"] = df["myanimelist"].astype(int)
     # rename myanimelist to mal_id
-    df.rename(columns={"myanimelist": "mal_id"}, inplace=True)
+    df = df[["myanimelist", "title"]].rename(columns={"myanimelist": "mal_id"})
     # sort by mal_id
     df.sort_values(by="mal_id", inplace=True)
-    # save to csv file with utf-8 encoding and \t as delimiter
-    df.to_csv("database/mal.csv", encoding="utf-8", sep="\t", index=False)
+    # save to a temporary file first, so readers never see a partial index
+    tmp_output = f"{output}.tmp"
+    df.to_csv(tmp_output, encoding="utf-8", sep="\t", index=False)
+    os.replace(tmp_output, output)
+
+
+async def mal_run() -> bool:
+    """
+    Fetches MyAnimeList data, processes it, and saves it to a CSV file.
+
+    All work is skipped when upstream has not changed since the last run and
+    the index already exists.
+
+    Returns:
+        bool: True if `database/mal.csv` was regenerated
+    """
+    changed = await mal_get_data()
+    if not os.path.exists(FILE_PATH):
+        return False
+    if not changed and os.path.exists(OUTPUT_PATH):
+        print("mal.csv is up to date")
+        return False
+    loop = asyncio.get_running_loop()
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        await loop.run_in_executor(pool, mal_build_index, FILE_PATH, OUTPUT_PATH)
+    return True
@@ -0,0 +1,309 @@
+"""
+# Fetch Pipeline Module
+
+This module runs provider calls that depend on each other concurrently: each
+stage starts as soon as the stages it depends on have finished, and the whole
+run is bounded by a deadline. Stages that have not finished when the deadline
+passes are cancelled, so callers can build a response from whatever arrived.
+"""
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass, field, replace
+from enum import Enum
+from typing import Any
+
+StageFunc = Callable[[dict[str, Any]], Awaitable[Any]]
+"""Stage coroutine function, receives results of the stages it depends on"""
+
+
+class StageStatus(Enum):
+    """Stage Status"""
+
+    DONE = "done"
+    """Stage finished and returned a result"""
+    FAILED = "failed"
+    """Stage raised an exception"""
+    SKIPPED = "skipped"
+    """A dependency of the stage failed, timed out, or was skipped"""
+    TIMEOUT = "timeout"
+    """Stage did not finish before the deadline"""
+
+
+@dataclass
+class StageTiming:
+    """Stage Timing"""
+
+    name: str
+    """Stage name"""
+    status: StageStatus
+    """How the stage ended"""
+    started: float | None = None
+    """Seconds between pipeline start and stage start, None if never started"""
+    seconds: float = 0.0
+    """Seconds spent running the stage itself"""
+
+
+@dataclass
+class PipelineResult:
+    """Pipeline Result"""
+
+    results: dict[str, Any] = field(default_factory=dict)
+    """Results of stages that finished"""
+    errors: dict[str, BaseException] = field(default_factory=dict)
+    """Exceptions raised by stages that failed"""
+    timings: dict[str, StageTiming] = field(default_factory=dict)
+    """Timing of every stage, in registration order"""
+    total: float = 0.0
+    """Seconds spent running the whole pipeline"""
+
+    def get(self, name: str, default: Any = None) -> Any:
+        """
+        Get result of a stage
+
+        Args:
+            name (str): Stage name
+            default (Any, optional): Value if the stage did not finish. Defaults to None.
+
+        Returns:
+            Any: Stage result
+        """
+        return self.results.get(name, default)
+
+
+@dataclass
+class _Stage:
+    name: str
+    func: StageFunc
+    depends_on: tuple[str, ...]
+    required: bool
+
+
+class FetchPipeline:
+    """
+    Dependency-aware concurrent fetch pipeline with an overall deadline
+
+    Required stages are awaited even after the deadline passes, as the caller
+    can't build a response without them; their exceptions are re-raised.
+
+    ## Usage
+
+    >>> pipeline = FetchPipeline(deadline=8)
+    >>> pipeline.add("relation", fetch_relation)
+    >>> pipeline.add("anilist", fetch_anilist, depends_on=["relation"])
+    >>> pipeline.add("jikan", fetch_jikan, required=True)
+    >>> result = await pipeline.run()
+    >>> result.get("anilist")
+    """
+
+    def __init__(self, deadline: float | None = None):
+        """
+        Initialize the pipeline
+
+        Args:
+            deadline (float | None, optional): Seconds before unfinished optional stages are cancelled. Defaults to None, no deadline.
+        """
+        self.deadline = deadline
+        self._stages: dict[str, _Stage] = {}
+
+    def add(
+        self,
+        name: str,
+        func: StageFunc,
+        depends_on: Iterable[str] = (),
+        required: bool = False,
+    ) -> "FetchPipeline":
+        """
+        Register a stage
+
+        Args:
+            name (str): Stage name
+            func (StageFunc): Coroutine function receiving a dict of dependency results
+            depends_on (Iterable[str], optional): Stages that must finish first. Defaults to ().
+            required (bool, optional): Whether to wait for the stage past the deadline. Defaults to False.
+
+        Raises:
+            ValueError: Stage name is taken, or a dependency is not registered yet
+
+        Returns:
+            FetchPipeline: The pipeline, for chaining
+        """
+        if name in self._stages:
+            raise ValueError(f"Stage {name} is already registered")
+        depends_on = tuple(depends_on)
+        for dep in depends_on:
+            if dep not in self._stages:
+                raise ValueError(f"Stage {name} depends on unknown stage {dep}")
+        self._stages[name] = _Stage(name, func, depends_on, required)
+        return self
+
+    async def run(self) -> PipelineResult:
+        """
+        Run all stages, starting each one as soon as its dependencies finish
+
+        Raises:
+            Exception: Exception raised by a required stage
+            TimeoutError: A required stage was skipped, as a dependency has no result
+
+        Returns:
+            PipelineResult: Results, errors, and per-stage timings
+        """
+        result = PipelineResult()
+        begin = time.perf_counter()
+        tasks: dict[str, asyncio.Task[Any]] = {}
+        for stage in self._stages.values():
+            result.timings[stage.name] = StageTiming(stage.name, StageStatus.SKIPPED)
+            tasks[stage.name] = asyncio.create_task(
+                self._run_stage(stage, tasks, result, begin),
+                name=f"pipeline:{stage.name}",
+            )
+
+        try:
+            _, pending = await asyncio.wait(tasks.values(), timeout=self.deadline)
+            required = [
+                tasks[name]
+                for name, stage in self._stages.items()
+                if stage.required and tasks[name] in pending
+            ]
+            for task in pending:
+                if task not in required:
+                    task.cancel()
+            # required stages may still wait on optional dependencies that just
+            # got cancelled, which in turn resolves them as skipped
+            if required:
+                await asyncio.wait(required)
+            await asyncio.gather(*pending, return_exceptions=True)
+        finally:
+            for task in tasks.values():
+                task.cancel()
+        result.total = time.perf_counter() - begin
+
+        for name, stage in self._stages.items():
+            if not stage.required or name in result.results:
+                continue
+            if name in result.errors:
+                raise result.errors[name]
+            raise TimeoutError(f"Required stage {name} has no result")
+        return result
+
+    async def _run_stage(
+        self,
+        stage: _Stage,
+        tasks: dict[str, "asyncio.Task[Any]"],
+        result: PipelineResult,
+        begin: float,
+    ) -> None:
+        """Wait for dependencies of a stage, then run it and record the outcome"""
+        timing = result.timings[stage.name]
+        if stage.depends_on:
+            await asyncio.wait([tasks[dep] for dep in stage.depends_on])
+            if any(dep not in result.results for dep in stage.depends_on):
+                return
+        deps = {dep: result.results[dep] for dep in stage.depends_on}
+        start = time.perf_counter()
+        timing.started = start - begin
+        timing.status = StageStatus.TIMEOUT
+        try:
+            result.results[stage.name] = await stage.func(deps)
+            timing.status = StageStatus.DONE
+        # pylint: disable=broad-exception-caught
+        except Exception as err:  # noqa: BLE001
+            result.errors[stage.name] = err
+            timing.status = StageStatus.FAILED
+        finally:
+            timing.seconds = time.perf_counter() - start
+
+
+class PipelineStats:
+    """
+    Rolling per-stage latency statistics of recent pipeline runs
+
+    Only timings are kept, never stage results or errors, so payloads and
+    tracebacks of past runs are not held for the life of the process.
+    """
+
+    def __init__(self, maxlen: int = 200):
+        """
+        Initialize the statistics
+
+        Args:
+            maxlen (int, optional): Number of recent runs to keep. Defaults to 200.
+        """
+        self.runs: deque[tuple[float, tuple[StageTiming, ...]]] = deque(maxlen=maxlen)
+        """Total seconds and stage timings of recent runs"""
+
+    def record(self, result: PipelineResult) -> None:
+        """
+        Record timings of a pipeline run
+
+        Args:
+            result (PipelineResult): Result of the run
+        """
+        self.runs.append(
+            (result.total, tuple(replace(timing) for timing in result.timings.values()))
+        )
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """
+        Summarize latency of each stage over recent runs
+
+        Returns:
+            dict[str, dict[str, float]]: Per stage run count, mean, p95, and max seconds, plus timeout count; "total" covers whole runs
+        """
+        samples: dict[str, list[float]] = {}
+        timeouts: dict[str, int] = {}
+        for total, timings in self.runs:
+            samples.setdefault("total", []).append(total)
+            for timing in timings:
+                if timing.started is None:
+                    continue
+                samples.setdefault(timing.name, []).append(timing.seconds)
+                if timing.status is StageStatus.TIMEOUT:
+                    timeouts[timing.name] = timeouts.get(timing.name, 0) + 1
+        summary: dict[str, dict[str, float]] = {}
+        for name, values in samples.items():
+            values.sort()
+            summary[name] = {
+                "runs": len(values),
+                "mean": sum(values) / len(values),
+                "p95": values[min(len(values) - 1, int(len(values) * 0.95))],
+                "max": values[-1],
+                "timeouts": timeouts.get(name, 0),
+            }
+        return summary
+
+    def report(self, stages: int = 3) -> str | None:
+        """
+        Describe recent latency in one line, slowest stages first
+
+        Args:
+            stages (int, optional): Number of stages to list. Defaults to 3.
+
+        Returns:
+            str | None: The description, None if nothing was recorded yet
+        """
+        summary = self.summary()
+        total = summary.pop("total", None)
+        if total is None:
+            return None
+        slowest = sorted(summary.items(), key=lambda item: item[1]["p95"], reverse=True)
+        parts = [
+            f"{name} {stat['mean']:.2f}s mean/{stat['p95']:.2f}s p95"
+            + (f" ({stat['timeouts']:,.0f} timed out)" if stat["timeouts"] else "")
+            for name, stat in slowest[:stages]
+        ]
+        return (
+            f"{total['runs']:,.0f} runs, {total['mean']:.2f}s mean/"
+            f"{total['p95']:.2f}s p95; slowest: {', '.join(parts)}"
+        )
+
+
+__all__ = [
+    "FetchPipeline",
+    "PipelineResult",
+    "PipelineStats",
+    "StageStatus",
+    "StageTiming",
+]
@@ -0,0 +1,303 @@
+"""
+# Prefetch Module
+
+This module warms the AniList and Jikan caches with titles users are likely
+to look up: the current season, what is trending on AniList, and the titles
+looked up the most on the bot itself. It is run by the tasker during quiet
+hours, so the first lookup of a hot title at peak time is served from cache.
+
+AniList is warmed in pages of up to 50 media per request; Jikan has no bulk
+endpoint, so it is warmed one title at a time, paced under its rate limit.
+"""
+
+import asyncio
+import atexit
+import json
+import os
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Literal
+
+from aiohttp import ClientError
+from animeapi import Platform
+
+from classes.anilist import AniList
+from classes.animeapi import get_relation_index
+from classes.excepts import ProviderHttpError
+from classes.jikan import Cache as JikanCache
+from classes.jikan import JikanApi, JikanException
+
+LOOKUP_STATS_PATH = "cache/prefetch/lookups.json"
+"""File keeping lookup counts across restarts"""
+PREFETCH_QUIET_HOURS = range(17, 23)
+"""UTC hours the prefetch job may run in, 00:00 to 06:00 in Indonesia"""
+PREFETCH_TOP_N = 100
+"""Most looked-up titles to warm per media type"""
+PREFETCH_MAX_AGE = 43200
+"""Seconds after which a cached title is warmed again, so it outlives the next peak"""
+PREFETCH_JIKAN_LIMIT = 150
+"""Maximum Jikan requests per run"""
+JIKAN_REQUEST_INTERVAL = 1.0
+"""Seconds between Jikan requests, Jikan allows 3 per second and 60 per minute"""
+
+MediaType = Literal["anime", "manga"]
+_SEASONS = ("WINTER", "SPRING", "SUMMER", "FALL")
+
+
+class LookupStats:
+    """
+    Lookup counts of titles, used to pick the titles to prefetch
+
+    Counts are halved once a day, so titles that stop being looked up fall
+    out of the top over a few days.
+    """
+
+    def __init__(self, path: str = LOOKUP_STATS_PATH):
+        """
+        Initialize the stats
+
+        Args:
+            path (str, optional): File to persist the counts to. Defaults to LOOKUP_STATS_PATH.
+        """
+        self.path = path
+        self._counts: Counter[str] | None = None
+
+    @property
+    def counts(self) -> Counter[str]:
+        """Lookup counts keyed by `<media type>:<ID>`, loaded on first use"""
+        if self._counts is None:
+            self._counts = Counter()
+            try:
+                with open(self.path, "r", encoding="utf-8") as file:
+                    self._counts.update(json.load(file))
+            except (OSError, ValueError, TypeError):
+                pass
+        return self._counts
+
+    def record(self, media_type: MediaType, media_id: int) -> None:
+        """
+        Count a lookup of a title
+
+        Args:
+            media_type (MediaType): "anime" for MyAnimeList IDs, "manga" for AniList IDs
+            media_id (int): ID of the title
+        """
+        self.counts[f"{media_type}:{media_id}"] += 1
+
+    def top(self, media_type: MediaType, limit: int = PREFETCH_TOP_N) -> list[int]:
+        """
+        Get the most looked-up titles of a media type
+
+        Args:
+            media_type (MediaType): Media type
+            limit (int, optional): Number of titles. Defaults to PREFETCH_TOP_N.
+
+        Returns:
+            list[int]: Title IDs, most looked-up first
+        """
+        prefix = f"{media_type}:"
+        ranked = [
+            int(key[len(prefix) :])
+            for key, _ in self.counts.most_common()
+            if key.startswith(prefix)
+        ]
+        return ranked[:limit]
+
+    def decay(self) -> None:
+        """Halve every count, and forget titles that drop to zero"""
+        self._counts = Counter(
+            {key: count // 2 for key, count in self.counts.items() if count > 1}
+        )
+
+    def save(self) -> None:
+        """Write the counts to disk"""
+        if self._counts is None:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as file:
+            json.dump(self._counts, file)
+
+
+lookup_stats = LookupStats()
+"""Process-wide lookup counts"""
+
+atexit.register(lookup_stats.save)
+
+
+@dataclass
+class PrefetchReport:
+    """Outcome of a prefetch run"""
+
+    anilist: int = 0
+    """AniList media cached, including ones still fresh"""
+    jikan: int = 0
+    """Jikan anime fetched"""
+    fresh: int = 0
+    """Jikan anime skipped as their cache is still fresh"""
+    failed: int = 0
+    """Requests that failed"""
+
+
+def is_quiet_hour(now: datetime | None = None) -> bool:
+    """
+    Check if the bot is in its quiet hours
+
+    Args:
+        now (datetime | None, optional): Time to check. Defaults to None, the current time.
+
+    Returns:
+        bool: True if prefetching may run
+    """
+    now = now or datetime.now(tz=timezone.utc)
+    return now.astimezone(timezone.utc).hour in PREFETCH_QUIET_HOURS
+
+
+def current_season(now: datetime | None = None) -> tuple[str, int]:
+    """
+    Get the anime season of a date
+
+    Args:
+        now (datetime | None, optional): The date. Defaults to None, the current time.
+
+    Returns:
+        tuple[str, int]: AniList season name and year
+    """
+    now = now or datetime.now(tz=timezone.utc)
+    return _SEASONS[(now.month - 1) // 3], now.year
+
+
+async def warm_anilist(
+    anilist: AniList, report: PrefetchReport, top_n: int = PREFETCH_TOP_N
+) -> list[int]:
+    """
+    Warm AniList with seasonal, trending, and most looked-up media
+
+    Args:
+        anilist (AniList): Open AniList client
+        report (PrefetchReport): Report to count into
+        top_n (int, optional): Most looked-up titles to warm. Defaults to PREFETCH_TOP_N.
+
+    Returns:
+        list[int]: MyAnimeList IDs of the hot anime, for Jikan
+    """
+    season, year = current_season()
+    mal_ids: list[int] = []
+    pages = [
+        ("ANIME", {"sort": "POPULARITY_DESC", "season": season, "season_year": year}),
+        ("ANIME", {"sort": "TRENDING_DESC"}),
+        ("MANGA", {"sort": "TRENDING_DESC"}),
+    ]
+    for media_type, options in pages:
+        try:
+            media = await anilist.hot_media(media_type, **options)
+        except ProviderHttpError as error:
+            print(f"[Tsk] [Prefetch] Failed to list hot {media_type.lower()}: {error}")
+            report.failed += 1
+            continue
+        report.anilist += len(media)
+        if media_type == "ANIME":
+            mal_ids.extend(entry.idMal for entry in media if entry.idMal)
+
+    # looked-up anime are counted by MAL ID, AniList needs its own IDs
+    top_anime = lookup_stats.top("anime", top_n)
+    mal_ids.extend(top_anime)
+    index = get_relation_index()
+    anilist_ids: list[int] = []
+    if index is not None:
+        for mal_id in top_anime:
+            relation = index.lookup(mal_id, Platform.MYANIMELIST)
+            if relation is not None and relation.anilist:
+                anilist_ids.append(relation.anilist)
+    for media_type, media_ids in (
+        ("ANIME", anilist_ids),
+        ("MANGA", lookup_stats.top("manga", top_n)),
+    ):
+        try:
+            fetched = await anilist.media_batch(
+                media_ids, media_type, max_age=PREFETCH_MAX_AGE
+            )
+            report.anilist += len(fetched)
+        except ProviderHttpError as error:
+            print(f"[Tsk] [Prefetch] Failed to batch {media_type.lower()}: {error}")
+            report.failed += 1
+    return mal_ids
+
+
+async def warm_jikan(
+    mal_ids: list[int],
+    report: PrefetchReport,
+    limit: int = PREFETCH_JIKAN_LIMIT,
+    interval: float = JIKAN_REQUEST_INTERVAL,
+) -> None:
+    """
+    Warm Jikan anime one by one, paced under the rate limit
+
+    Args:
+        mal_ids (list[int]): MyAnimeList IDs, in priority order
+        report (PrefetchReport): Report to count into
+        limit (int, optional): Maximum requests. Defaults to PREFETCH_JIKAN_LIMIT.
+        interval (float, optional): Seconds between requests. Defaults to JIKAN_REQUEST_INTERVAL.
+    """
+    async with JikanApi() as jikan:
+        for mal_id in dict.fromkeys(mal_ids):
+            if report.jikan + report.failed >= limit:
+                break
+            cache_path = JikanCache.get_cache_path(f"anime/{mal_id}.json")
+            if JikanCache.read_cache(cache_path, PREFETCH_MAX_AGE) is not None:
+                report.fresh += 1
+                continue
+            # the aging entry keeps serving until the new one is written
+            try:
+                await jikan.get_anime_data(mal_id, max_age=PREFETCH_MAX_AGE)
+                report.jikan += 1
+            except (
+                JikanException,
+                ProviderHttpError,
+                ClientError,
+                TimeoutError,
+                ValueError,
+            ):
+                report.failed += 1
+            await asyncio.sleep(interval)
+
+
+async def warm_caches(
+    top_n: int = PREFETCH_TOP_N, decay: bool = False
+) -> PrefetchReport:
+    """
+    Warm the AniList and Jikan caches with hot titles
+
+    Args:
+        top_n (int, optional): Most looked-up titles to warm per media type. Defaults to PREFETCH_TOP_N.
+        decay (bool, optional): Halve lookup counts after the run, done once a day. Defaults to False.
+
+    Returns:
+        PrefetchReport: Outcome of the run
+    """
+    report = PrefetchReport()
+    async with AniList() as anilist:
+        mal_ids = await warm_anilist(anilist, report, top_n)
+    await warm_jikan(mal_ids, report)
+    if decay:
+        lookup_stats.decay()
+    lookup_stats.save()
+    return report
+
+
+__all__ = [
+    "JIKAN_REQUEST_INTERVAL",
+    "LOOKUP_STATS_PATH",
+    "PREFETCH_JIKAN_LIMIT",
+    "PREFETCH_MAX_AGE",
+    "PREFETCH_QUIET_HOURS",
+    "PREFETCH_TOP_N",
+    "LookupStats",
+    "PrefetchReport",
+    "current_season",
+    "is_quiet_hour",
+    "lookup_stats",
+    "warm_anilist",
+    "warm_caches",
+    "warm_jikan",
+]
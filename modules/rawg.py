@@ -12,10 +12,12 @@ from interactions import (
 )
 
 from classes.excepts import ProviderHttpError
+from classes.rawg import Cache as RawgCache
 from classes.rawg import RawgApi, RawgGameData
 from modules.commons import (
     PlatformErrType,
     platform_exception_embed,
+    rendered_responses,
     sanitize_markdown,
     save_traceback_to_file,
     trim_synopsis,
@@ -177,9 +179,18 @@ async def rawg_submit(
         None
     """
     try:
-        async with RawgApi() as api:
-            game_data = await api.get_data(slug)
-        embed, buttons = await generate_rawg(data=game_data)
+        # RAWG has no NSFW check, so the channel is not part of the key
+        render_key = ("games", slug)
+        rendered = rendered_responses.get(render_key)
+        if rendered is not None:
+            embed, buttons = rendered.embed, rendered.components
+        else:
+            async with RawgApi() as api:
+                game_data = await api.get_data(slug)
+            embed, buttons = await generate_rawg(data=game_data)
+            rendered_responses.set(
+                render_key, embed, buttons, [(RawgCache, f"{slug}.json")]
+            )
         if isinstance(ctx, Message):
             await ctx.reply(embed=embed, components=buttons)  # type: ignore
         else:
@@ -3,14 +3,18 @@ from typing import Any, Literal
 
 import interactions as ipy
 
+from classes.cache import Caching
 from classes.excepts import MediaIsNsfw, ProviderHttpError
+from classes.simkl import Cache as SimklCache
 from classes.simkl import Simkl
+from classes.tmdb import Cache as TmdbCache
 from classes.tmdb import TheMovieDb
 from modules.commons import (
     PlatformErrType,
     generate_trailer,
     get_nsfw_status,
     platform_exception_embed,
+    rendered_responses,
     save_traceback_to_file,
     send_or_edit_message,
     trim_synopsis,
@@ -399,28 +403,45 @@ async def simkl_submit(
         replace (bool, optional): Whether to replace the original message. Defaults to False.
     """
     try:
+        channel_nsfw = await get_nsfw_status(ctx)
+        render_key = (media_type, f"{media_id}", channel_nsfw)
+        rendered = rendered_responses.get(render_key)
+        if rendered is not None:
+            await send_or_edit_message(
+                ctx, rendered.embed, rendered.components, replace
+            )
+            return
+
         async with Simkl() as simkl:
             if media_type == "tv":
                 data: dict[str, Any] = await simkl.get_show(f"{media_id}")
             else:
                 data: dict[str, Any] = await simkl.get_movie(f"{media_id}")
+        sources: list[tuple[Caching, str]] = [
+            (
+                SimklCache,
+                f"show/{media_id}/data.json"
+                if media_type == "tv"
+                else f"movie/{media_id}.json",
+            )
+        ]
 
         tmdb_id = data.get("ids", {"tmdb": None}).get("tmdb", None)
         if tmdb_id is not None:
             try:
                 async with TheMovieDb() as tmdb:
-                    media_nsfw: bool = await tmdb.get_nsfw_status(
-                        tmdb_id,
+                    tmdb_type = (
                         tmdb.MediaType.TV
                         if media_type == "tv"
-                        else tmdb.MediaType.MOVIE,
+                        else tmdb.MediaType.MOVIE
                     )
+                    media_nsfw: bool = await tmdb.get_nsfw_status(tmdb_id, tmdb_type)
+                sources.append((TmdbCache, f"{tmdb_type.value}/{tmdb_id}.json"))
             except ProviderHttpError:
                 media_nsfw = False
         else:
             media_nsfw = False
 
-        channel_nsfw = await get_nsfw_status(ctx)
         embed, buttons = await create_simkl_embed(
             data=data,
             media_type=media_type,
@@ -428,6 +449,9 @@ async def simkl_submit(
             is_media_nsfw=media_nsfw,
         )
         components = ipy.spread_to_rows(*buttons)
+        if media_type == "tv":
+            sources.append((SimklCache, f"show/{data['ids']['simkl']}/episodes.json"))
+        rendered_responses.set(render_key, embed, components, sources)
         await send_or_edit_message(ctx, embed, components, replace)
         return
 
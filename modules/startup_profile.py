@@ -0,0 +1,260 @@
+"""
+# Startup Profile Module
+
+This module measures how long the bot takes to import modules and load
+extensions during startup, enabled by `main.py --profile-startup`.
+
+Import time is measured by wrapping `builtins.__import__`, and
+`importlib.import_module` which extensions are loaded with, so only modules
+imported after `StartupProfiler.start()` are counted.
+"""
+
+import builtins
+import importlib
+import importlib.util
+import json
+import sys
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+
+@dataclass
+class ImportTiming:
+    """Import Timing"""
+
+    module: str
+    """Fully qualified module name"""
+    cumulative: float
+    """Seconds spent importing the module, including its own imports"""
+    self_time: float
+    """Seconds spent importing the module, excluding its own imports"""
+    owner: str
+    """Extension or phase that triggered the import"""
+
+
+@dataclass
+class ExtensionTiming:
+    """Extension Load Timing"""
+
+    name: str
+    """Extension name"""
+    seconds: float
+    """Seconds spent loading the extension, including imports"""
+    imports: int = 0
+    """Number of modules newly imported while loading the extension"""
+
+
+@dataclass
+class StartupReport:
+    """Startup Profile Report"""
+
+    total: float = 0.0
+    """Seconds between profiler start and stop"""
+    phases: dict[str, float] = field(default_factory=dict)
+    """Seconds spent on each named phase"""
+    extensions: list[ExtensionTiming] = field(default_factory=list)
+    """Extension load timings, in load order"""
+    imports: list[ImportTiming] = field(default_factory=list)
+    """Import timings of every newly imported module"""
+
+
+class StartupProfiler:
+    """
+    Profile module imports and extension loading during startup
+
+    ## Usage
+
+    >>> profiler = StartupProfiler()
+    >>> profiler.start()
+    >>> with profiler.phase("core"):
+    ...     import interactions
+    >>> with profiler.extension("anime"):
+    ...     bot.load_extension("extensions.anime")
+    >>> profiler.stop()
+    >>> print(profiler.format_report())
+    """
+
+    def __init__(self):
+        """Initialize the profiler"""
+        self.report = StartupReport()
+        self._original_import = builtins.__import__
+        self._original_import_module = importlib.import_module
+        self._stack: list[list[float]] = []
+        self._owner = "main"
+        self._started_at = 0.0
+
+    def start(self) -> None:
+        """Start recording imports"""
+        self._started_at = time.perf_counter()
+        builtins.__import__ = self._timed_import
+        importlib.import_module = self._timed_import_module
+
+    def stop(self) -> StartupReport:
+        """
+        Stop recording imports
+
+        Returns:
+            StartupReport: The collected report
+        """
+        builtins.__import__ = self._original_import
+        importlib.import_module = self._original_import_module
+        self.report.total = time.perf_counter() - self._started_at
+        return self.report
+
+    def _timed_import(
+        self, name: str, globals_=None, locals_=None, fromlist=(), level=0
+    ):
+        """Drop-in replacement of `__import__` that times new modules"""
+        if level != 0 or name in sys.modules:
+            return self._original_import(name, globals_, locals_, fromlist, level)
+        return self._time_import(
+            name, self._original_import, name, globals_, locals_, fromlist, level
+        )
+
+    def _timed_import_module(self, name: str, package: str | None = None):
+        """Drop-in replacement of `importlib.import_module` that times new modules"""
+        resolved = importlib.util.resolve_name(name, package)
+        if resolved in sys.modules:
+            return self._original_import_module(name, package)
+        return self._time_import(resolved, self._original_import_module, name, package)
+
+    def _time_import(self, name: str, importer: Callable[..., Any], *args: Any):
+        """
+        Run an import and record its timing, nested imports count as children
+
+        Args:
+            name (str): Fully qualified module name
+            importer (Callable[..., Any]): The original import function
+            *args (Any): Arguments to pass to the import function
+
+        Returns:
+            Any: What the import function returned
+        """
+        self._stack.append([0.0])
+        start = time.perf_counter()
+        try:
+            return importer(*args)
+        finally:
+            elapsed = time.perf_counter() - start
+            children = self._stack.pop()[0]
+            if self._stack:
+                self._stack[-1][0] += elapsed
+            if name in sys.modules:
+                self.report.imports.append(
+                    ImportTiming(
+                        module=name,
+                        cumulative=elapsed,
+                        self_time=max(elapsed - children, 0.0),
+                        owner=self._owner,
+                    )
+                )
+
+    def phase(self, name: str) -> "_Section":
+        """
+        Time a named startup phase
+
+        Args:
+            name (str): Phase name
+
+        Returns:
+            _Section: Context manager recording the phase
+        """
+        return _Section(self, name, is_extension=False)
+
+    def extension(self, name: str) -> "_Section":
+        """
+        Time loading of an extension
+
+        Args:
+            name (str): Extension name
+
+        Returns:
+            _Section: Context manager recording the extension
+        """
+        return _Section(self, name, is_extension=True)
+
+    def format_report(self, top: int = 15) -> str:
+        """
+        Format the report as a human-readable table
+
+        Args:
+            top (int, optional): Number of slowest imports to show. Defaults to 15.
+
+        Returns:
+            str: The formatted report
+        """
+        report = self.report
+        lines = [f"Startup profile, {report.total * 1000:,.1f} ms total"]
+        if report.phases:
+            lines.append("Phases:")
+            lines.extend(
+                f"  {seconds * 1000:>10,.1f} ms  {name}"
+                for name, seconds in report.phases.items()
+            )
+        if report.extensions:
+            lines.append("Extensions (slowest first):")
+            lines.extend(
+                f"  {ext.seconds * 1000:>10,.1f} ms  {ext.name} ({ext.imports} new imports)"
+                for ext in sorted(report.extensions, key=lambda e: -e.seconds)
+            )
+        if report.imports:
+            lines.append(f"Imports (top {top} by self time):")
+            lines.extend(
+                f"  {imp.self_time * 1000:>10,.1f} ms  {imp.module}"
+                f" (cumulative {imp.cumulative * 1000:,.1f} ms, via {imp.owner})"
+                for imp in sorted(report.imports, key=lambda i: -i.self_time)[:top]
+            )
+        return "\n".join(lines)
+
+    def save_report(self, path: str) -> None:
+        """
+        Save the report as JSON, so timings can be compared across commits
+
+        Args:
+            path (str): Path to the JSON file
+        """
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(asdict(self.report), file, indent=2)
+
+
+class _Section:
+    """Context manager recording the time spent in a phase or extension"""
+
+    def __init__(self, profiler: StartupProfiler, name: str, is_extension: bool):
+        self.profiler = profiler
+        self.name = name
+        self.is_extension = is_extension
+        self._start = 0.0
+        self._imports_before = 0
+        self._previous_owner = ""
+
+    def __enter__(self) -> None:
+        self._previous_owner = self.profiler._owner
+        self.profiler._owner = self.name
+        self._imports_before = len(self.profiler.report.imports)
+        self._start = time.perf_counter()
+
+    def __exit__(self, *exc_info: object) -> None:
+        elapsed = time.perf_counter() - self._start
+        self.profiler._owner = self._previous_owner
+        report = self.profiler.report
+        if self.is_extension:
+            report.extensions.append(
+                ExtensionTiming(
+                    name=self.name,
+                    seconds=elapsed,
+                    imports=len(report.imports) - self._imports_before,
+                )
+            )
+        else:
+            report.phases[self.name] = report.phases.get(self.name, 0.0) + elapsed
+
+
+__all__ = [
+    "ExtensionTiming",
+    "ImportTiming",
+    "StartupProfiler",
+    "StartupReport",
+]
@@ -0,0 +1,192 @@
+"""
+Benchmark compiled decoders on payloads stored in the provider cache
+
+Compares reflection-based decoding with dacite, which AniList used before,
+against the compiled decoders, and the size of decoded structs against
+unslotted copies of the same dataclasses. The saved fixtures are used when
+the cache is empty, e.g. on a fresh checkout.
+
+Run with `python tests/bench_decoder.py [rounds]`
+"""
+
+import copy
+import dataclasses
+import glob
+import json
+import os
+import sys
+import timeit
+from collections.abc import Callable
+from datetime import datetime, timezone
+from typing import Any
+
+from dacite import Config, from_dict
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+try:
+    from classes.anilist import AniListMediaStruct, decode_media
+    from classes.jikan import JikanAnimeStruct, decode_anime
+    from classes.rawg import RawgGameData, decode_game
+    from tests.test_decoder import load_fixture
+except ImportError:
+    # add the path to the 'modules' directory to the system path
+    sys.path.insert(0, ROOT)
+    from classes.anilist import AniListMediaStruct, decode_media
+    from classes.jikan import JikanAnimeStruct, decode_anime
+    from classes.rawg import RawgGameData, decode_game
+    from tests.test_decoder import load_fixture
+
+DACITE_CONFIG = Config(
+    type_hooks={
+        datetime: lambda value: (
+            datetime.fromtimestamp(value, timezone.utc)
+            if isinstance(value, int)
+            else datetime.fromisoformat(value)
+        )
+    },
+    check_types=False,
+)
+
+
+def _jikan_for_dacite(data: dict[str, Any]) -> dict[str, Any]:
+    """dacite cannot build the theme songs object into the list type hint"""
+    data = copy.copy(data)
+    if isinstance(data.get("theme"), dict):
+        data["theme"] = [data["theme"]]
+    return data
+
+
+PROVIDERS: list[tuple[str, str, str, type, Callable[[dict], Any], Callable]] = [
+    (
+        "jikan",
+        "cache/jikan/anime/*.json",
+        "jikan_anime",
+        JikanAnimeStruct,
+        decode_anime,
+        _jikan_for_dacite,
+    ),
+    (
+        "anilist",
+        "cache/anilist/*/*.json",
+        "anilist_media",
+        AniListMediaStruct,
+        decode_media,
+        lambda data: data,
+    ),
+    (
+        "rawg",
+        "cache/rawg/*.json",
+        "rawg_game",
+        RawgGameData,
+        decode_game,
+        lambda data: data,
+    ),
+]
+
+
+def load_payloads(pattern: str, fixture: str) -> tuple[str, list[dict[str, Any]]]:
+    """
+    Collect cached payloads of a provider, or its fixture
+
+    Args:
+        pattern (str): Glob of the provider cache files, relative to the root
+        fixture (str): Fixture name used when the cache is empty
+
+    Returns:
+        tuple[str, list[dict[str, Any]]]: Payload origin and the payloads
+    """
+    payloads: list[dict[str, Any]] = []
+    for path in glob.glob(os.path.join(ROOT, pattern)):
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                data = json.load(file).get("data")
+        except (OSError, ValueError, AttributeError):
+            continue
+        if isinstance(data, dict) and ("id" in data or "mal_id" in data):
+            payloads.append(data)
+    if payloads:
+        return "cache", payloads
+    return "fixture", [load_fixture(fixture)]
+
+
+_UNSLOTTED: dict[type, type] = {}
+
+
+def _unslotted(cls: type) -> type:
+    """Copy of a dataclass without slots, holding attributes in a dict"""
+    if cls not in _UNSLOTTED:
+        _UNSLOTTED[cls] = dataclasses.make_dataclass(
+            cls.__name__, [field.name for field in dataclasses.fields(cls)]
+        )
+    return _UNSLOTTED[cls]
+
+
+def struct_sizes(value: Any) -> tuple[int, int, int]:
+    """
+    Measure the structs of a decoded object graph
+
+    Args:
+        value (Any): Decoded struct, or a value holding structs
+
+    Returns:
+        tuple[int, int, int]: Number of structs, their bytes with slots, and without
+    """
+    count = slotted = unslotted = 0
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        attrs = {
+            field.name: getattr(value, field.name)
+            for field in dataclasses.fields(value)
+        }
+        mirror = _unslotted(type(value))(**attrs)
+        count, slotted = 1, sys.getsizeof(value)
+        unslotted = sys.getsizeof(mirror) + sys.getsizeof(mirror.__dict__)
+        children = attrs.values()
+    elif isinstance(value, list):
+        children = value
+    else:
+        return 0, 0, 0
+    for child in children:
+        sizes = struct_sizes(child)
+        count, slotted, unslotted = (
+            count + sizes[0],
+            slotted + sizes[1],
+            unslotted + sizes[2],
+        )
+    return count, slotted, unslotted
+
+
+def main(rounds: int = 2000) -> None:
+    """
+    Time reflection and compiled decoding, and compare struct sizes
+
+    Args:
+        rounds (int, optional): Passes over the payloads per decoder. Defaults to 2000.
+    """
+    for name, pattern, fixture, cls, decode, prepare in PROVIDERS:
+        origin, payloads = load_payloads(pattern, fixture)
+        reflected = [prepare(payload) for payload in payloads]
+        timings = [
+            timeit.timeit(func, number=rounds) / (rounds * len(payloads)) * 1_000_000
+            for func in (
+                lambda cls=cls, reflected=reflected: [
+                    from_dict(cls, data, config=DACITE_CONFIG) for data in reflected
+                ],
+                lambda decode=decode, payloads=payloads: [
+                    decode(data) for data in payloads
+                ],
+            )
+        ]
+        count, slotted, unslotted = map(
+            sum, zip(*(struct_sizes(decode(payload)) for payload in payloads))
+        )
+        print(
+            f"{name} ({len(payloads):,} from {origin}): "
+            f"dacite {timings[0]:,.1f} µs, compiled {timings[1]:,.1f} µs "
+            f"per payload, {timings[0] / timings[1]:,.1f}x faster; "
+            f"{unslotted / count:,.0f} -> {slotted / count:,.0f} bytes per struct"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
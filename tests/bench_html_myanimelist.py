@@ -0,0 +1,50 @@
+"""
+Benchmark MyAnimeList profile extraction engines on saved profile pages
+
+Run with `python tests/bench_html_myanimelist.py [rounds]`
+"""
+
+import os
+import sys
+import timeit
+
+try:
+    from classes.html.myanimelist import HtmlMyAnimeList
+except ImportError:
+    # add the path to the 'modules' directory to the system path
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+    from classes.html.myanimelist import HtmlMyAnimeList
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+PROFILES = ["mal_profile.html", "mal_profile_hidden.html"]
+
+
+def main(rounds: int = 20) -> None:
+    """
+    Time both engines on every fixture and print the speedup
+
+    Args:
+        rounds (int, optional): Parses per engine and fixture. Defaults to 20.
+    """
+    scraper = HtmlMyAnimeList()
+    for name in PROFILES:
+        with open(os.path.join(FIXTURES, name), "r", encoding="utf-8") as file:
+            html = file.read()
+        timings: dict[str, float] = {}
+        for engine in ("soup", "fast"):
+            seconds = timeit.timeit(
+                lambda html=html, engine=engine: scraper.parse_user(
+                    html, "user", engine=engine
+                ),
+                number=rounds,
+            )
+            timings[engine] = seconds / rounds * 1000
+        print(
+            f"{name} ({len(html) / 1024:,.0f} KiB): "
+            f"soup {timings['soup']:,.2f} ms, fast {timings['fast']:,.2f} ms, "
+            f"{timings['soup'] / timings['fast']:,.1f}x faster"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
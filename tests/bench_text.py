@@ -0,0 +1,105 @@
+"""
+Benchmark text helpers on synopses stored in the provider cache
+
+AniList descriptions and Jikan synopses are read from `cache/`; the saved
+fixture corpus is used when the cache is empty, e.g. on a fresh checkout.
+
+Run with `python tests/bench_text.py [rounds]`
+"""
+
+import glob
+import json
+import os
+import sys
+import timeit
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+try:
+    from modules.text import html_to_markdown, sanitize_markdown, trim_synopsis
+    from tests.test_text import (
+        legacy_html_to_markdown,
+        legacy_sanitize_markdown,
+        load_synopses,
+    )
+except ImportError:
+    # add the path to the 'modules' directory to the system path
+    sys.path.insert(0, ROOT)
+    from modules.text import html_to_markdown, sanitize_markdown, trim_synopsis
+    from tests.test_text import (
+        legacy_html_to_markdown,
+        legacy_sanitize_markdown,
+        load_synopses,
+    )
+
+CACHE_SOURCES = [
+    ("cache/anilist/anime/*.json", "description"),
+    ("cache/anilist/manga/*.json", "description"),
+    ("cache/jikan/anime/*.json", "synopsis"),
+]
+
+
+def load_corpus() -> tuple[str, list[str]]:
+    """
+    Collect synopses from the provider cache, or the fixture corpus
+
+    Returns:
+        tuple[str, list[str]]: Corpus origin and the synopses
+    """
+    texts: list[str] = []
+    for pattern, key in CACHE_SOURCES:
+        for path in glob.glob(os.path.join(ROOT, pattern)):
+            try:
+                with open(path, "r", encoding="utf-8") as file:
+                    data = json.load(file).get("data")
+            except (OSError, ValueError):
+                continue
+            if isinstance(data, dict) and isinstance(data.get(key), str):
+                texts.append(data[key])
+    if texts:
+        return "cache", texts
+    corpus = load_synopses()
+    return "fixture", corpus["anilist"] + corpus["jikan"]
+
+
+def legacy_embed_text(text: str) -> str:
+    """Synopsis processing of an embed, with the previous helpers"""
+    return trim_synopsis(legacy_sanitize_markdown(legacy_html_to_markdown(text)))
+
+
+def embed_text(text: str) -> str:
+    """Synopsis processing of an embed, with the text module"""
+    return trim_synopsis(sanitize_markdown(html_to_markdown(text)))
+
+
+def main(rounds: int = 200) -> None:
+    """
+    Time previous and current helpers over the whole corpus
+
+    Args:
+        rounds (int, optional): Passes over the corpus per helper. Defaults to 200.
+    """
+    origin, texts = load_corpus()
+    print(f"{len(texts):,} synopses from {origin}")
+    cases = [
+        ("sanitize_markdown", legacy_sanitize_markdown, sanitize_markdown),
+        ("html_to_markdown", legacy_html_to_markdown, html_to_markdown),
+        ("per embed", legacy_embed_text, embed_text),
+    ]
+    for name, legacy, current in cases:
+        timings = [
+            timeit.timeit(
+                lambda func=func: [func(text) for text in texts], number=rounds
+            )
+            / (rounds * len(texts))
+            * 1_000_000
+            for func in (legacy, current)
+        ]
+        print(
+            f"{name}: legacy {timings[0]:,.2f} µs, current {timings[1]:,.2f} µs "
+            f"per synopsis, {timings[0] / timings[1]:,.1f}x faster"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -0,0 +1,162 @@
+"""
+Benchmark the typed user table against the string user database loader
+
+Writes synthetic databases in the format `UserDatabase.save_to_database`
+appends, then reads each in a fresh interpreter with the loader used before,
+which parses every column as Python strings, and with `read_user_table`.
+Load time, resident memory grown by the read, and the deep size of the
+resulting frame are reported.
+
+Run with `python tests/bench_user_table.py [users,...]`
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import psutil
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+try:
+    from classes.database import UserDatabase
+    from classes.user_table import USER_TABLE_SCHEMA, read_user_table
+except ImportError:
+    # add the path to the 'modules' directory to the system path
+    sys.path.insert(0, ROOT)
+    from classes.database import UserDatabase
+    from classes.user_table import USER_TABLE_SCHEMA, read_user_table
+
+LOADERS = {
+    "string": lambda path: UserDatabase._read_csv(Path(path)),
+    "typed": read_user_table,
+}
+TIMEZONES = ["Asia/Jakarta", "Asia/Tokyo", "Europe/Berlin", "America/New_York", ""]
+
+
+def _optional(rng: np.random.Generator, values: np.ndarray, rate: float) -> list:
+    """Blank out values, as most users only link some platforms"""
+    return np.where(rng.random(len(values)) < rate, values, "").tolist()
+
+
+def write_database(path: str, users: int, seed: int = 0) -> None:
+    """
+    Write a synthetic user database
+
+    Args:
+        path (str): Path of the database
+        users (int): Number of users
+        seed (int, optional): Random seed. Defaults to 0.
+    """
+    rng = np.random.default_rng(seed)
+    ids = rng.integers(10**17, 10**18, users)
+    joined = rng.integers(1_420_070_400, 1_700_000_000, users)
+    names = np.char.add("user", ids.astype(str))
+    guilds = rng.integers(0, 50, users)
+    birthdates = pd.to_datetime(rng.integers(0, 12_000, users), unit="D")
+    frame = pd.DataFrame(
+        {
+            "discordId": ids,
+            "discordUsername": names,
+            "discordJoined": joined,
+            "malUsername": names,
+            "malId": rng.integers(1, 20_000_000, users),
+            "malJoined": joined + rng.integers(0, 10**8, users),
+            "registeredAt": joined + rng.integers(10**8, 2 * 10**8, users),
+            "registeredGuildId": guilds + 10**18,
+            "registeredBy": ids,
+            "registeredGuildName": np.char.add("Guild ", guilds.astype(str)),
+            "anilistUsername": _optional(rng, names, 0.4),
+            "anilistId": _optional(rng, rng.integers(1, 10**7, users).astype(str), 0.4),
+            "lastfmUsername": _optional(rng, names, 0.2),
+            "shikimoriId": _optional(
+                rng, rng.integers(1, 10**6, users).astype(str), 0.1
+            ),
+            "shikimoriUsername": _optional(rng, names, 0.1),
+            "userBirthdate": _optional(
+                rng, birthdates.strftime("%Y-%m-%d").to_numpy(str), 0.3
+            ),
+            "userTimezone": rng.choice(TIMEZONES, users),
+            "userBirthdayPermission": _optional(
+                rng, rng.integers(0, 8, users).astype(str), 0.3
+            ),
+        },
+        columns=list(USER_TABLE_SCHEMA),
+    )
+    frame.to_csv(path, sep="\t", index=False)
+
+
+def measure(loader: str, path: str, warmup: str) -> dict[str, float]:
+    """
+    Read a database once, meant to run in a fresh interpreter
+
+    Args:
+        loader (str): Name of the loader in `LOADERS`
+        path (str): Path of the database
+        warmup (str): Path of a small database, read first to load pandas internals
+
+    Returns:
+        dict[str, float]: Load seconds, resident bytes grown, and frame bytes
+    """
+    process = psutil.Process()
+    LOADERS[loader](warmup)
+    before = process.memory_info().rss
+    start = time.perf_counter()
+    frame = LOADERS[loader](path)
+    seconds = time.perf_counter() - start
+    return {
+        "seconds": seconds,
+        "rss": process.memory_info().rss - before,
+        "frame": int(frame.memory_usage(deep=True).sum()),
+    }
+
+
+def main(sizes: list[int]) -> None:
+    """
+    Compare loaders on synthetic databases of each size
+
+    Args:
+        sizes (list[int]): Numbers of users
+    """
+    with tempfile.TemporaryDirectory() as folder:
+        warmup = os.path.join(folder, "warmup.csv")
+        write_database(warmup, 100)
+        for users in sizes:
+            path = os.path.join(folder, f"database-{users}.csv")
+            write_database(path, users)
+            results = {}
+            for loader in LOADERS:
+                output = subprocess.run(
+                    [sys.executable, __file__, "--measure", loader, path, warmup],
+                    check=True,
+                    capture_output=True,
+                    text=True,
+                    cwd=ROOT,
+                ).stdout
+                results[loader] = json.loads(output.splitlines()[-1])
+            string, typed = results["string"], results["typed"]
+            print(
+                f"{users:,} users ({os.path.getsize(path) / 2**20:,.1f} MiB): "
+                f"load {string['seconds']:,.2f} s -> {typed['seconds']:,.2f} s, "
+                f"RSS +{string['rss'] / 2**20:,.1f} -> +{typed['rss'] / 2**20:,.1f} MiB, "
+                f"frame {string['frame'] / 2**20:,.1f} -> {typed['frame'] / 2**20:,.1f} MiB "
+                f"({string['frame'] / typed['frame']:,.1f}x smaller)"
+            )
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 5 and sys.argv[1] == "--measure":
+        print(json.dumps(measure(*sys.argv[2:])))
+    else:
+        main(
+            [int(size) for size in sys.argv[1].split(",")]
+            if len(sys.argv) > 1
+            else [10_000, 100_000, 1_000_000]
+        )
@@ -0,0 +1,81 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+try:
+    from classes.allowlist import COMPACT_MIN_LINES, Allowlist
+except ImportError:
+    # add the path to the 'modules' directory to the system path
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+    from classes.allowlist import COMPACT_MIN_LINES, Allowlist
+
+
+class AllowlistTest(unittest.TestCase):
+    """Allowlist test class"""
+
+    def setUp(self):
+        """Keep files in a temporary directory"""
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.folder.name, "allowlist.log")
+        self.legacy = os.path.join(self.folder.name, "allowlist")
+
+    def tearDown(self):
+        """Remove the files"""
+        self.folder.cleanup()
+
+    def test_migrates_marker_files(self):
+        """Test if marker files are moved into the log, and removed"""
+        os.mkdir(self.legacy)
+        for name in ("123", "456", "notes.txt"):
+            with open(os.path.join(self.legacy, name), "w", encoding="utf-8"):
+                pass
+        allowlist = Allowlist(self.path, self.legacy)
+        self.assertEqual(sorted(allowlist), [123, 456])
+        self.assertEqual(os.listdir(self.legacy), ["notes.txt"])
+        self.assertEqual(sorted(Allowlist(self.path)), [123, 456])
+
+    def test_changes_persist(self):
+        """Test if changes are appended, and replayed on load"""
+        allowlist = Allowlist(self.path)
+        self.assertTrue(allowlist.add(1))
+        self.assertFalse(allowlist.add(1))
+        self.assertTrue(allowlist.add("2"))
+        self.assertTrue(allowlist.discard(1))
+        self.assertFalse(allowlist.discard(3))
+        with open(self.path, "r", encoding="utf-8") as file:
+            self.assertEqual(file.read(), "+1\n+2\n-1\n")
+        reloaded = Allowlist(self.path)
+        self.assertIn(2, reloaded)
+        self.assertIn("2", reloaded)
+        self.assertNotIn(1, reloaded)
+        self.assertNotIn("not an ID", reloaded)
+
+    def test_membership_without_io(self):
+        """Test if membership checks never touch the disk once loaded"""
+        allowlist = Allowlist(self.path)
+        allowlist.add(1)
+        with (
+            mock.patch("builtins.open") as opened,
+            mock.patch("os.stat") as stat,
+        ):
+            self.assertIn(1, allowlist)
+            self.assertNotIn(2, allowlist)
+        opened.assert_not_called()
+        stat.assert_not_called()
+
+    def test_compaction(self):
+        """Test if a long log is rewritten with live members only"""
+        allowlist = Allowlist(self.path)
+        for _ in range(COMPACT_MIN_LINES // 2):
+            allowlist.add(1)
+            allowlist.discard(1)
+        allowlist.add(7)
+        with open(self.path, "r", encoding="utf-8") as file:
+            self.assertLess(len(file.readlines()), COMPACT_MIN_LINES)
+        self.assertEqual(list(Allowlist(self.path)), [7])
+
+
+if __name__ == "__main__":
+    unittest.main()
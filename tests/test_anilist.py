@@ -1,12 +1,57 @@
 import os
+import re
 import sys
+import tempfile
 import unittest
+from typing import Any
+from unittest import mock
 
 try:
-    from classes.anilist import AniList
+    from classes.anilist import BATCH_SIZE, QUERIES, AniList
+    from classes.cache import Caching
+    from tests.test_decoder import load_fixture
 except ImportError:
     sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-    from classes.anilist import AniList
+    from classes.anilist import BATCH_SIZE, QUERIES, AniList
+    from classes.cache import Caching
+    from tests.test_decoder import load_fixture
+
+
+class FakeResponse:
+    """Response of a fake GraphQL endpoint"""
+
+    status = 200
+
+    def __init__(self, data: dict[str, Any]):
+        self.data = data
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *_):
+        return None
+
+    async def json(self) -> dict[str, Any]:
+        return self.data
+
+
+class FakeSession:
+    """Session answering batched media queries from the fixture"""
+
+    def __init__(self):
+        self.requests: list[dict[str, Any]] = []
+
+    def post(self, _url: str, json: dict[str, Any]) -> FakeResponse:
+        self.requests.append(json)
+        media = [
+            {**load_fixture("anilist_media"), "id": media_id}
+            for media_id in json["variables"]["ids"]
+            if media_id > 0
+        ]
+        return FakeResponse({"data": {"Page": {"media": media}}})
+
+    async def close(self):
+        return None
 
 
 class AniListTest(unittest.IsolatedAsyncioTestCase):
@@ -43,5 +88,34 @@ class AniListTest(unittest.IsolatedAsyncioTestCase):
         self.assertTrue(alData is not None)
 
 
+class AniListQueryTest(unittest.IsolatedAsyncioTestCase):
+    """AniList query registry and batching test class"""
+
+    def test_queries_are_static(self):
+        """Test if every registered document takes its arguments as variables"""
+        for name, query in QUERIES.items():
+            self.assertNotIn("{{", query, name)
+            for argument in re.findall(r"\((\w+): ([^)]*)\)", query):
+                if argument[0] not in ("asHtml", "perPage", "page"):
+                    self.assertTrue(argument[1].startswith("$"), (name, argument))
+
+    async def test_media_batch(self):
+        """Test if media are fetched in pages, and cached ones are not fetched again"""
+        with tempfile.TemporaryDirectory() as folder:
+            cache = Caching(cache_directory=folder, cache_expiration_time=86400)
+            with mock.patch("classes.anilist.Cache", cache):
+                anilist = AniList()
+                await anilist.session.close()
+                anilist.session = FakeSession()
+                ids = list(range(1, BATCH_SIZE + 6)) + [-1, 1]
+                found = await anilist.media_batch(ids)
+                self.assertEqual(len(anilist.session.requests), 2)
+                self.assertEqual(len(found), BATCH_SIZE + 5)
+                self.assertEqual(found[3].id, 3)
+                again = await anilist.media_batch([2, 4])
+                self.assertEqual(len(anilist.session.requests), 2)
+                self.assertEqual(again[4].title, found[4].title)
+
+
 if __name__ == "__main__":
     unittest.main(verbosity=2)
@@ -1,14 +1,15 @@
 import os
 import sys
+import tempfile
 import unittest
 from datetime import datetime
 
 try:
-    from classes.animeapi import AnimeApi, AnimeApiAnime
+    from classes.animeapi import AnimeApi, AnimeApiAnime, AnimeApiRelationIndex
 except ImportError:
     # add the path to the 'modules' directory to the system path
     sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-    from classes.animeapi import AnimeApi, AnimeApiAnime
+    from classes.animeapi import AnimeApi, AnimeApiAnime, AnimeApiRelationIndex
 
 
 class AnimeApiTest(unittest.IsolatedAsyncioTestCase):
@@ -29,5 +30,36 @@ class AnimeApiTest(unittest.IsolatedAsyncioTestCase):
         self.assertTrue(isinstance(resp, datetime))
 
 
+class AnimeApiRelationIndexTest(unittest.TestCase):
+    """Local AnimeAPI relation index test class"""
+
+    def setUp(self):
+        """Write a small dump file"""
+        handle, self.path = tempfile.mkstemp(suffix=".tsv")
+        with os.fdopen(handle, "w", encoding="utf-8") as file:
+            file.write("title\tanilist\tmyanimelist\ttrakt\ttrakt_type\ttrakt_season\n")
+            file.write("Cowboy Bebop\t1\t1\t30857\tshows\t1\n")
+            file.write("Twin A\t2\t\t99\tshows\t1\n")
+            file.write("Twin B\t3\t\t99\tshows\t1\n")
+        self.index = AnimeApiRelationIndex.from_file(self.path)
+
+    def tearDown(self):
+        """Remove the dump file"""
+        os.remove(self.path)
+
+    def test_lookup(self):
+        """Test resolving a relation offline"""
+        resp = self.index.lookup(1, AnimeApi.AnimeApiPlatforms.MYANIMELIST)
+        self.assertIsInstance(resp, AnimeApiAnime)
+        self.assertEqual(resp.anilist, 1)
+        resp = self.index.lookup("30857", AnimeApi.AnimeApiPlatforms.TRAKT, "shows", 1)
+        self.assertEqual(resp.title, "Cowboy Bebop")
+
+    def test_ambiguous_lookup(self):
+        """Test ambiguous IDs are left for the API"""
+        resp = self.index.lookup(99, AnimeApi.AnimeApiPlatforms.TRAKT, "shows", 1)
+        self.assertIsNone(resp)
+
+
 if __name__ == "__main__":
     unittest.main(verbosity=2)
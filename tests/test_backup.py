@@ -0,0 +1,228 @@
+import os
+import shutil
+import sys
+import tarfile
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+try:
+    from modules import backup
+    from modules.backup import (
+        collect_backup_files,
+        commit_backup_index,
+        export_backup,
+        import_backup,
+        restore_backups,
+    )
+    from modules.crypto_utils import CryptoUtils
+except ImportError:
+    # add the path to the 'modules' directory to the system path
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+    from modules import backup
+    from modules.backup import (
+        collect_backup_files,
+        commit_backup_index,
+        export_backup,
+        import_backup,
+        restore_backups,
+    )
+    from modules.crypto_utils import CryptoUtils
+
+FILES = {
+    ".env": b"BOT_TOKEN=secret\n",
+    "database/database.csv": b"discordId\tmalUsername\n1\tnattadasu\n",
+    "database/allowlist_autoembed/1": b"",
+    "extensions/private_seasonal.py": b"print('hi')\n",
+    "modules/private_tools/helper.py": b"x = 1\n",
+}
+
+
+class BackupTest(unittest.TestCase):
+    """Streamed backup test class"""
+
+    def setUp(self):
+        """Lay out a bot folder with files in and out of the manifest"""
+        self.folder = tempfile.TemporaryDirectory()
+        self.root = Path(self.folder.name) / "bot"
+        for name, data in {
+            **FILES,
+            "cache/private_cached.json": b"{}",
+            "extensions/__pycache__/private_seasonal.cpython-313.pyc": b"",
+            "modules/private_tools/__pycache__/helper.cpython-313.pyc": b"",
+            "main.py": b"",
+        }.items():
+            path = self.root / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(data)
+        # large enough to span several frames
+        self.big = os.urandom(3 << 20)
+        (self.root / "database/big.bin").write_bytes(self.big)
+        self.backup = Path(self.folder.name) / "backup.tar.gz.enc"
+
+    def tearDown(self):
+        """Remove the folder"""
+        self.folder.cleanup()
+
+    def _restore_root(self) -> Path:
+        """Fresh bot folder holding a stale database"""
+        restore = Path(self.folder.name) / "restore"
+        (restore / "database").mkdir(parents=True)
+        (restore / "database/database.csv").write_bytes(b"stale")
+        return restore
+
+    def test_manifest(self):
+        """Test if only manifest files are collected, without caches"""
+        self.assertEqual(
+            collect_backup_files(self.root), sorted([*FILES, "database/big.bin"])
+        )
+
+    def test_round_trip(self):
+        """Test if a backup restores every file, keeping the replaced database"""
+        key, index = export_backup(self.backup, self.root)
+        self.assertTrue(CryptoUtils.is_streamed(self.backup))
+        restore = self._restore_root()
+        self.assertEqual(import_backup(self.backup, key, restore), index.packed)
+        for name, data in FILES.items():
+            self.assertEqual((restore / name).read_bytes(), data)
+        self.assertEqual((restore / "database/big.bin").read_bytes(), self.big)
+        self.assertEqual(
+            (restore / "database_backup/database.csv").read_bytes(), b"stale"
+        )
+        self.assertEqual(
+            sorted(path.name for path in restore.iterdir()),
+            [".env", "database", "database_backup", "extensions", "modules"],
+        )
+
+    def test_rejects_bad_backups(self):
+        """Test if wrong keys, tampering, and truncation leave files untouched"""
+        key, _ = export_backup(self.backup, self.root)
+        data = self.backup.read_bytes()
+        tampered = bytearray(data)
+        tampered[len(data) // 2] ^= 1
+        cases = {
+            "wrong key": (data, CryptoUtils.generate_key()),
+            "tampered": (bytes(tampered), key),
+            "truncated": (data[: len(data) // 2], key),
+        }
+        restore = self._restore_root()
+        for case, (payload, case_key) in cases.items():
+            self.backup.write_bytes(payload)
+            with self.assertRaises(ValueError, msg=case):
+                import_backup(self.backup, case_key, restore)
+            self.assertEqual(
+                sorted(path.name for path in restore.iterdir()), ["database"], case
+            )
+            self.assertEqual((restore / "database/database.csv").read_bytes(), b"stale")
+
+    def test_legacy_backup(self):
+        """Test if backups made before streaming are still imported"""
+        archive = Path(self.folder.name) / "backup.tar"
+        with tarfile.open(archive, "w") as tar:
+            tar.add(self.root / "database", arcname="./database")
+        enc_path, key = CryptoUtils.encrypt_and_package(archive)
+        shutil.move(enc_path, self.backup)
+        restore = self._restore_root()
+        import_backup(self.backup, key, restore)
+        self.assertEqual((restore / "database/big.bin").read_bytes(), self.big)
+
+    def test_incremental_chain(self):
+        """Test if deltas only pack changes, and replay onto their base in order"""
+        full = Path(self.folder.name) / "full.enc"
+        first = Path(self.folder.name) / "delta1.enc"
+        second = Path(self.folder.name) / "delta2.enc"
+        key, index = export_backup(full, self.root)
+        commit_backup_index(index, self.root)
+        (self.root / "database/database.csv").write_bytes(b"discordId\n1\n2\n")
+        (self.root / "database/allowlist_autoembed/2").write_bytes(b"")
+        _, index = export_backup(first, self.root, incremental=True, key=key)
+        commit_backup_index(index, self.root)
+        self.assertEqual(
+            index.packed, ["database/allowlist_autoembed/2", "database/database.csv"]
+        )
+        (self.root / "database/allowlist_autoembed/1").unlink()
+        _, index = export_backup(second, self.root, incremental=True, key=key)
+        commit_backup_index(index, self.root)
+        self.assertEqual(index.packed, [])
+
+        restore = self._restore_root()
+        (restore / "database/allowlist_autoembed").mkdir()
+        (restore / "database/allowlist_autoembed/1").write_bytes(b"")
+        for backups in ([(first, key)], [(full, key), (second, key)]):
+            with self.assertRaises(ValueError):
+                restore_backups(backups, restore)
+        self.assertEqual((restore / "database/database.csv").read_bytes(), b"stale")
+
+        restore_backups([(full, key), (first, key), (second, key)], restore)
+        self.assertEqual(collect_backup_files(restore), collect_backup_files(self.root))
+        self.assertEqual(
+            (restore / "database/database.csv").read_bytes(), b"discordId\n1\n2\n"
+        )
+        self.assertFalse((restore / "database/allowlist_autoembed/1").exists())
+
+    def test_undelivered_backup_is_not_chained(self):
+        """Test if an uncommitted backup is skipped by the next incremental"""
+        full = Path(self.folder.name) / "full.enc"
+        lost = Path(self.folder.name) / "lost.enc"
+        delta = Path(self.folder.name) / "delta.enc"
+        key, index = export_backup(full, self.root)
+        commit_backup_index(index, self.root)
+        database = self.root / "database/database.csv"
+        database.write_bytes(b"discordId\n1\n2\n")
+        # the delivery of this one failed, so its index is never committed
+        _, lost_index = export_backup(lost, self.root, incremental=True, key=key)
+        self.assertEqual(lost_index.parent, index.id)
+        database.write_bytes(b"discordId\n1\n2\n3\n")
+        _, delta_index = export_backup(delta, self.root, incremental=True, key=key)
+        self.assertEqual(delta_index.parent, index.id)
+        self.assertEqual(delta_index.packed, ["database/database.csv"])
+
+        restore = self._restore_root()
+        restore_backups([(full, key), (delta, key)], restore)
+        self.assertEqual(
+            (restore / "database/database.csv").read_bytes(), b"discordId\n1\n2\n3\n"
+        )
+
+    def test_changed_during_export(self):
+        """Test if files written while they are packed still restore"""
+        database = self.root / "database/database.csv"
+        addfile = tarfile.TarFile.addfile
+        writes = iter([b"discordId\n1\n2\n", b"discordId\n3\n"])
+
+        def write_while_packing(tar, info, fileobj=None):
+            # rewrite the file after it was opened and measured
+            if info.name == "database/database.csv":
+                database.write_bytes(next(writes, database.read_bytes()))
+            return addfile(tar, info, fileobj)
+
+        with mock.patch.object(tarfile.TarFile, "addfile", write_while_packing):
+            key, index = export_backup(self.backup, self.root)
+        commit_backup_index(index, self.root)
+        restore = self._restore_root()
+        import_backup(self.backup, key, restore)
+        self.assertEqual(
+            (restore / "database/database.csv").read_bytes(), b"discordId\n3\n"
+        )
+
+        # written once its hash is reused to pick what an incremental packs
+        delta = Path(self.folder.name) / "delta.enc"
+        database.write_bytes(b"discordId\n4\n")
+        hash_files = backup.hash_files
+
+        def write_after_hashing(*args, **kwargs):
+            hashed = hash_files(*args, **kwargs)
+            database.write_bytes(b"discordId\n4\n5\n")
+            return hashed
+
+        with mock.patch.object(backup, "hash_files", write_after_hashing):
+            export_backup(delta, self.root, incremental=True, key=key)
+        restore_backups([(self.backup, key), (delta, key)], restore)
+        self.assertEqual(database.read_bytes(), b"discordId\n4\n5\n")
+        self.assertEqual(
+            (restore / "database/database.csv").read_bytes(), b"discordId\n4\n5\n"
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
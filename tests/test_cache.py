@@ -0,0 +1,202 @@
+import functools
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from datetime import datetime, timezone
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import ClassVar
+
+try:
+    from classes.cache import Caching, RenderCache, SharedRemoteDataset, TtlCache
+except ImportError:
+    # add the path to the 'modules' directory to the system path
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+    from classes.cache import Caching, RenderCache, SharedRemoteDataset, TtlCache
+
+
+class TtlCacheTest(unittest.TestCase):
+    """In-memory TTL cache test class"""
+
+    def test_expiration(self):
+        """Test if entries expire after their TTL"""
+        cache: TtlCache[str, int] = TtlCache(ttl=0.05)
+        cache.set("a", 1)
+        cache.set("b", 2, ttl=10)
+        self.assertEqual(cache.get("a"), 1)
+        time.sleep(0.06)
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get("b"), 2)
+
+    def test_lru_eviction(self):
+        """Test if the least recently used entry is evicted once full"""
+        cache: TtlCache[str, int] = TtlCache(ttl=10, maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        self.assertNotIn("b", cache)
+        self.assertIn("a", cache)
+        self.assertIn("c", cache)
+
+    def test_purge_expired(self):
+        """Test if expired entries are purged"""
+        cache: TtlCache[str, int] = TtlCache(ttl=0.01)
+        cache.set("a", 1)
+        cache.set("b", 2, ttl=10)
+        time.sleep(0.02)
+        self.assertEqual(cache.purge_expired(), 1)
+        self.assertEqual(len(cache), 1)
+
+
+class RenderCacheTest(unittest.TestCase):
+    """Rendered response cache test class"""
+
+    def setUp(self):
+        """Create a provider cache in a temporary directory"""
+        self.folder = tempfile.TemporaryDirectory()
+        self.provider = Caching(self.folder.name, 3600)
+        self.provider.write_cache(self.provider.get_cache_path("1.json"), {"id": 1})
+        self.cache = RenderCache()
+        self.embed = {"title": "Title"}
+        self.rows = [{"type": 1, "components": []}]
+
+    def tearDown(self):
+        """Remove the provider cache"""
+        self.folder.cleanup()
+
+    def test_hit_while_source_unchanged(self):
+        """Test if a response is served while its source is unchanged"""
+        self.assertTrue(
+            self.cache.set("k", self.embed, self.rows, [(self.provider, "1.json")])
+        )
+        rendered = self.cache.get("k")
+        self.assertIsNotNone(rendered)
+        self.assertEqual(rendered.embed, self.embed)  # type: ignore
+        self.assertEqual(rendered.components, self.rows)  # type: ignore
+
+    def test_timestamp_is_fresh(self):
+        """Test if a replayed embed carries the time of the hit"""
+        rendered_at = "2000-01-01T00:00:00+00:00"
+        self.embed["timestamp"] = rendered_at
+        self.cache.set("k", self.embed, self.rows, [(self.provider, "1.json")])
+        before = datetime.now(tz=timezone.utc)
+        rendered = self.cache.get("k")
+        self.assertIsNotNone(rendered)
+        replayed = datetime.fromisoformat(rendered.embed["timestamp"])  # type: ignore
+        self.assertGreaterEqual(replayed, before)
+        self.assertLessEqual(replayed, datetime.now(tz=timezone.utc))
+        self.assertEqual(rendered.embed["title"], "Title")  # type: ignore
+        # the stored copy is left as rendered
+        self.assertEqual(self.embed["timestamp"], rendered_at)
+
+    def test_source_change_invalidates(self):
+        """Test if rewriting or dropping the source invalidates the response"""
+        path = self.provider.get_cache_path("1.json")
+        self.cache.set("k", self.embed, self.rows, [(self.provider, "1.json")])
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        self.assertIsNone(self.cache.get("k"))
+        self.cache.set("k", self.embed, self.rows, [(self.provider, "1.json")])
+        self.provider.drop_cache(path)
+        self.assertIsNone(self.cache.get("k"))
+
+    def test_missing_or_expired_source_is_not_stored(self):
+        """Test if responses without a valid source are not stored"""
+        self.assertFalse(
+            self.cache.set("k", self.embed, self.rows, [(self.provider, "2.json")])
+        )
+        expired = Caching(self.folder.name, 0)
+        self.assertFalse(
+            self.cache.set("k", self.embed, self.rows, [(expired, "1.json")])
+        )
+        self.assertIsNone(self.cache.get("k"))
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    agents: ClassVar[list[str | None]] = []
+
+    def do_GET(self):
+        """Record the user agent of each request"""
+        self.agents.append(self.headers.get("User-Agent"))
+        super().do_GET()
+
+    def log_message(self, format, *args):
+        """Silence request logs"""
+
+
+class SharedRemoteDatasetTest(unittest.IsolatedAsyncioTestCase):
+    """Shared remote dataset test class, served from a local HTTP server"""
+
+    def setUp(self):
+        """Serve a JSON dataset from a temporary directory"""
+        self.served = tempfile.TemporaryDirectory()
+        self.stored = tempfile.TemporaryDirectory()
+        with open(os.path.join(self.served.name, "data.json"), "w") as file:
+            json.dump({"avatars": {"1": "https://example.com/1.png"}}, file)
+        _QuietHandler.agents = []
+        handler = functools.partial(_QuietHandler, directory=self.served.name)
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.dataset: SharedRemoteDataset[dict[str, str]] = SharedRemoteDataset(
+            name="Test",
+            url=f"http://127.0.0.1:{self.server.server_port}/data.json",
+            file_path=os.path.join(self.stored.name, "data.json"),
+            parser=lambda data: data["avatars"],
+            refresh_after=3600,
+            headers={"User-Agent": "ryuuRyuusei/test"},
+        )
+
+    def tearDown(self):
+        """Stop the server"""
+        self.server.shutdown()
+        self.server.server_close()
+        self.served.cleanup()
+        self.stored.cleanup()
+
+    async def test_get_and_conditional_refresh(self):
+        """Test if the dataset loads once and unchanged upstream is not reloaded"""
+        data = await self.dataset.get()
+        self.assertEqual(data["1"], "https://example.com/1.png")
+        self.assertIs(await self.dataset.get(), data)
+        self.assertFalse(await self.dataset.refresh())
+        self.assertIs(self.dataset.value, data)
+
+    async def test_refresh_keeps_headers_and_validators(self):
+        """Test if downloads send the headers, and a 304 refreshes the sidecar"""
+        await self.dataset.get()
+        sidecar = f"{self.dataset.file_path}.meta.json"
+        os.utime(sidecar, (0, 0))
+        self.assertFalse(await self.dataset.refresh())
+        self.assertEqual(_QuietHandler.agents, ["ryuuRyuusei/test"] * 2)
+        self.assertGreater(os.path.getmtime(sidecar), time.time() - 60)
+        validators = json.loads(Path(sidecar).read_text(encoding="utf-8"))
+        self.assertTrue(validators["last_modified"])
+
+    async def test_stale_lookup_does_not_wait(self):
+        """Test if a stale dataset is served while refreshing in background"""
+        data = await self.dataset.get()
+        self.dataset.refresh_after = 0
+        self.assertIs(await self.dataset.get(), data)
+        await self.dataset._refresh_task  # type: ignore
+
+    async def test_load_from_disk(self):
+        """Test if a stored dataset is loaded without a request"""
+        await self.dataset.get()
+        self.server.shutdown()
+        fresh: SharedRemoteDataset[dict[str, str]] = SharedRemoteDataset(
+            name="Test",
+            url=self.dataset.url,
+            file_path=self.dataset.file_path,
+            parser=lambda data: data["avatars"],
+            refresh_after=3600,
+        )
+        self.assertIn("1", await fresh.get())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,6 @@
 import os
 import sys
+import tempfile
 import unittest
 from asyncio import sleep
 from collections.abc import Coroutine
@@ -9,11 +10,11 @@ from typing import Any
 from interactions import Snowflake
 
 try:
-    from classes.database import UserDatabase, UserDatabaseClass
+    from classes.database import UserDatabase, UserDatabaseClass, request_snapshot
 except ImportError:
     # add the path to the 'modules' directory to the system path
     sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-    from classes.database import UserDatabase, UserDatabaseClass
+    from classes.database import UserDatabase, UserDatabaseClass, request_snapshot
 
 
 class DatabaseTest(unittest.IsolatedAsyncioTestCase):
@@ -80,6 +81,81 @@ class DatabaseTest(unittest.IsolatedAsyncioTestCase):
         return await super().asyncTearDown()
 
 
+class DatabaseSnapshotTest(unittest.IsolatedAsyncioTestCase):
+    """Request-scoped database snapshot test class"""
+
+    async def asyncSetUp(self):
+        """Register a user to a temporary database"""
+        handle, self.path = tempfile.mkstemp(suffix=".csv")
+        os.close(handle)
+        os.remove(self.path)
+        self.reads = 0
+        original = UserDatabase._read_csv
+        original_table = UserDatabase._read_table
+
+        def counting_read(filepath, **kwargs):
+            self.reads += 1
+            return original(filepath, **kwargs)
+
+        def counting_table(filepath):
+            self.reads += 1
+            return original_table(filepath)
+
+        self.original_read = original
+        self.original_table = original_table
+        UserDatabase._read_csv = staticmethod(counting_read)  # type: ignore
+        UserDatabase._read_table = staticmethod(counting_table)  # type: ignore
+        tmp = datetime.now(tz=timezone.utc)
+        async with UserDatabase(self.path) as ud:
+            await ud.save_to_database(
+                UserDatabaseClass(
+                    discord_id=Snowflake(1234567890),
+                    discord_username="nattadasu",
+                    mal_id=1234,
+                    mal_joined=tmp,
+                    mal_username="nattadasu",
+                    registered_at=tmp,
+                    registered_guild_id=Snowflake(1234567890),
+                    registered_by=Snowflake(1234567890),
+                )
+            )
+        self.reads = 0
+
+    async def asyncTearDown(self):
+        """Remove the temporary database"""
+        UserDatabase._read_csv = staticmethod(self.original_read)  # type: ignore
+        UserDatabase._read_table = staticmethod(self.original_table)  # type: ignore
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    async def test_reads_are_shared(self):
+        """Test if repeated reads in a snapshot parse the file once"""
+        with request_snapshot():
+            async with UserDatabase(self.path) as ud:
+                self.assertTrue(await ud.check_if_registered(Snowflake(1234567890)))
+                user = await ud.get_user_data(Snowflake(1234567890))
+                self.assertTrue(await ud.check_if_registered(Snowflake(1234567890)))
+                await ud.get_user_data(Snowflake(1234567890))
+        self.assertEqual(user.mal_username, "nattadasu")
+        self.assertEqual(self.reads, 1)
+
+    async def test_writes_invalidate(self):
+        """Test if writes within a snapshot are visible to later reads"""
+        with request_snapshot():
+            async with UserDatabase(self.path) as ud:
+                await ud.get_user_data(Snowflake(1234567890))
+                await ud.update_user(Snowflake(1234567890), "lastfmUsername", "foo")
+                user = await ud.get_user_data(Snowflake(1234567890))
+        self.assertEqual(user.lastfm_username, "foo")
+
+    async def test_without_snapshot(self):
+        """Test if reads outside a snapshot are not cached"""
+        async with UserDatabase(self.path) as ud:
+            await ud.check_if_registered(Snowflake(1234567890))
+            await ud.check_if_registered(Snowflake(1234567890))
+        self.assertEqual(self.reads, 2)
+
+
 if __name__ == "__main__":
     # tell unittest to do it step-by-step
     unittest.main(verbosity=2)
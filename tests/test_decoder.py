@@ -0,0 +1,190 @@
+import json
+import os
+import sys
+import unittest
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+try:
+    from classes.anilist import decode_media
+    from classes.anilist import decode_user as decode_anilist_user
+    from classes.decoder import DecoderRegistry
+    from classes.jikan import JikanApi, JikanImageStruct, JikanUserFavorite
+    from classes.rawg import RawgApi
+except ImportError:
+    # add the path to the 'modules' directory to the system path
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+    from classes.anilist import decode_media
+    from classes.anilist import decode_user as decode_anilist_user
+    from classes.decoder import DecoderRegistry
+    from classes.jikan import JikanApi, JikanImageStruct, JikanUserFavorite
+    from classes.rawg import RawgApi
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def load_fixture(name: str) -> dict:
+    """Load a provider payload fixture"""
+    with open(os.path.join(FIXTURES, f"{name}.json"), "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+@dataclass(slots=True)
+class Leaf:
+    """Nested struct of the registry tests"""
+
+    value: int
+
+
+@dataclass(slots=True)
+class Tree:
+    """Root struct of the registry tests"""
+
+    name: str
+    from_: int | None = None
+    leaf: Leaf | None = None
+    leaves: list[Leaf] | None = None
+    when: datetime | None = None
+
+
+class DecoderRegistryTest(unittest.TestCase):
+    """Compiled decoder test class"""
+
+    def test_nested_and_renamed_fields(self):
+        """Test if nested structs, lists, and `from` keys are decoded"""
+        registry = DecoderRegistry(type_hooks={datetime: datetime.fromisoformat})
+        tree = registry.decoder(Tree)(
+            {
+                "name": "root",
+                "from": 1,
+                "leaf": {"value": 2},
+                "leaves": [{"value": 3}, {"value": 4}],
+                "when": "2023-01-02T03:04:05+00:00",
+                "unknown": True,
+            }
+        )
+        self.assertEqual(tree.from_, 1)
+        self.assertEqual(tree.leaf, Leaf(2))
+        self.assertEqual(tree.leaves, [Leaf(3), Leaf(4)])
+        self.assertEqual(tree.when.year, 2023)
+
+    def test_missing_required_field(self):
+        """Test if a payload without a required field is rejected"""
+        with self.assertRaises(KeyError):
+            DecoderRegistry().decoder(Tree)({"leaf": None})
+
+    def test_lazy_field(self):
+        """Test if lazy fields are only decoded on first access"""
+        calls: list[dict] = []
+        registry = DecoderRegistry()
+
+        @dataclass(slots=True)
+        class Lazy:
+            """Struct with a lazy nested section"""
+
+            leaf: Leaf | None = None
+
+        decode = registry.register(
+            Lazy,
+            hooks={"leaf": lambda value: calls.append(value) or Leaf(**value)},
+            lazy=["leaf"],
+        )
+        lazy = decode({"leaf": {"value": 5}})
+        self.assertEqual(calls, [])
+        self.assertEqual(lazy.leaf, Leaf(5))
+        self.assertIs(lazy.leaf, lazy.leaf)
+        self.assertEqual(len(calls), 1)
+        lazy.leaf = None
+        self.assertIsNone(lazy.leaf)
+
+    def test_lazy_field_needs_slots(self):
+        """Test if lazy fields are refused on classes without slots"""
+
+        @dataclass
+        class Plain:
+            """Struct without slots"""
+
+            leaf: Leaf | None = None
+
+        with self.assertRaises(TypeError):
+            DecoderRegistry().register(Plain, lazy=["leaf"])
+
+
+class ProviderDecoderTest(unittest.TestCase):
+    """Provider struct decoding test class"""
+
+    def test_jikan_anime(self):
+        """Test if a Jikan anime payload is decoded into structs"""
+        anime = JikanApi.anime_dict_to_dataclass(load_fixture("jikan_anime"))
+        self.assertEqual(anime.mal_id, 5114)
+        self.assertEqual(anime.images.jpg.large_image_url[-5:], "l.jpg")
+        self.assertIsInstance(anime.trailer.images, JikanImageStruct)
+        self.assertEqual(anime.aired.from_, datetime(2009, 4, 5, tzinfo=timezone.utc))
+        self.assertEqual(anime.aired.prop.to.year, 2010)
+        self.assertEqual(anime.studios[0].name, "Bones")
+        self.assertEqual(anime.relations[0].entry[0].mal_id, 25)
+        self.assertEqual(len(anime.theme.openings), 2)
+        self.assertFalse(hasattr(anime, "__dict__"))
+
+    def test_jikan_user_lazy_sections(self):
+        """Test if Jikan user favorites are decoded on access"""
+        image = {"jpg": {"image_url": "https://cdn.myanimelist.net/a.jpg"}}
+        user = JikanApi.user_dict_to_dataclass(
+            {
+                "mal_id": 1,
+                "username": "nattadasu",
+                "url": "https://myanimelist.net/profile/nattadasu",
+                "joined": "2016-03-01T00:00:00+00:00",
+                "favorites": {
+                    "anime": [
+                        {
+                            "mal_id": 5114,
+                            "url": "https://myanimelist.net/anime/5114",
+                            "images": image,
+                            "title": "Fullmetal Alchemist: Brotherhood",
+                        }
+                    ],
+                    "manga": [],
+                },
+                "updates": None,
+            }
+        )
+        self.assertEqual(user.joined.year, 2016)
+        self.assertIsInstance(user.favorites, JikanUserFavorite)
+        self.assertEqual(user.favorites.anime[0].images.jpg.image_url[-5:], "a.jpg")
+        self.assertIsNone(user.updates)
+
+    def test_anilist(self):
+        """Test if AniList media and user payloads are decoded into structs"""
+        media = decode_media(load_fixture("anilist_media"))
+        self.assertEqual(media.title.english, "Fullmetal Alchemist: Brotherhood")
+        self.assertTrue(media.tags[3].isMediaSpoiler)
+        self.assertEqual(media.stats["scoreDistribution"][0]["score"], 10)
+        user = decode_anilist_user(
+            {
+                "id": 1,
+                "name": "nattadasu",
+                "createdAt": 1457000000,
+                "favourites": {"anime": {"nodes": [load_fixture("anilist_media")]}},
+            }
+        )
+        self.assertEqual(user.createdAt.tzinfo, timezone.utc)
+        self.assertEqual(user.favourites.anime.nodes[0].idMal, 5114)
+
+    def test_rawg(self):
+        """Test if RAWG conversions of dates, playtime, and text are kept"""
+        game = RawgApi._convert(load_fixture("rawg_game"))
+        self.assertEqual(game.released, datetime(2013, 9, 17, tzinfo=timezone.utc))
+        self.assertEqual(game.updated.tzinfo, timezone.utc)
+        self.assertEqual(game.playtime, timedelta(hours=74))
+        self.assertEqual(
+            game.description_raw, "Rockstar Games went bigger.\nThree protagonists."
+        )
+        self.assertEqual(game.platforms[0].requirements.minimum[:8], "Minimum:")
+        self.assertEqual(game.platforms[1].released_at.year, 2013)
+        self.assertEqual(game.parent_platforms[1].platform.slug, "playstation")
+        self.assertEqual(game.esrb_rating.name, "Mature")
+
+
+if __name__ == "__main__":
+    unittest.main()
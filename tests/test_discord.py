@@ -0,0 +1,82 @@
+import asyncio
+import os
+import sys
+import unittest
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+try:
+    from modules.discord import fetch_member_payload, fetch_user_payload
+except ImportError:
+    # add the path to the 'modules' directory to the system path
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+    from modules.discord import fetch_member_payload, fetch_user_payload
+
+
+class _Http:
+    """Records REST calls instead of sending them"""
+
+    def __init__(self):
+        self.calls: list[tuple] = []
+
+    async def get_user(self, user_id):
+        self.calls.append(("user", user_id))
+        return {"id": str(user_id), "username": "test"}
+
+    async def get_member(self, guild_id, user_id):
+        self.calls.append(("member", guild_id, user_id))
+        return {
+            "avatar": None,
+            "nick": None,
+            "joined_at": "2021-01-01T00:00:00.000000+00:00",
+            "premium_since": None,
+        }
+
+
+def _bot(members: dict | None = None):
+    members = members or {}
+    return SimpleNamespace(
+        http=_Http(),
+        cache=SimpleNamespace(get_member=lambda g, u: members.get((g, u))),
+    )
+
+
+class DiscordPayloadTest(unittest.TestCase):
+    """Discord payload cache test class"""
+
+    def test_user_payload_is_cached(self):
+        """Test if repeated user lookups hit REST once"""
+        bot = _bot()
+        first = asyncio.run(fetch_user_payload(bot, 1001))  # type: ignore
+        second = asyncio.run(fetch_user_payload(bot, "1001"))  # type: ignore
+        self.assertIs(first, second)
+        self.assertEqual(bot.http.calls, [("user", 1001)])
+
+    def test_member_payload_prefers_gateway_cache(self):
+        """Test if a gateway-cached member is used without a REST call"""
+        joined = datetime(2022, 5, 1, 12, 30, tzinfo=timezone.utc)
+        member = SimpleNamespace(
+            guild_avatar=SimpleNamespace(hash="a_hash"),
+            nick="Nick",
+            joined_at=joined,
+            premium_since=None,
+        )
+        bot = _bot({(1, 2): member})
+        payload = asyncio.run(fetch_member_payload(bot, 1, 2))  # type: ignore
+        self.assertEqual(bot.http.calls, [])
+        self.assertEqual(payload["avatar"], "a_hash")
+        self.assertEqual(
+            datetime.strptime(payload["joined_at"], "%Y-%m-%dT%H:%M:%S.%f%z"),
+            joined,
+        )
+
+    def test_member_payload_falls_back_to_rest(self):
+        """Test if uncached members are fetched once and kept in memory"""
+        bot = _bot()
+        asyncio.run(fetch_member_payload(bot, 3, 4))  # type: ignore
+        asyncio.run(fetch_member_payload(bot, 3, 4))  # type: ignore
+        self.assertEqual(bot.http.calls, [("member", 3, 4)])
+
+
+if __name__ == "__main__":
+    unittest.main()
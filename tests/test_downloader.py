@@ -0,0 +1,165 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import aiohttp
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+try:
+    from modules.oobe import malIndexer
+    from modules.oobe.downloader import conditional_download
+except ImportError:
+    # add the path to the 'modules' directory to the system path
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+    from modules.oobe import malIndexer
+    from modules.oobe.downloader import conditional_download
+
+ETAG = '"v1"'
+LAST_MODIFIED = "Sat, 01 Jan 2000 00:00:00 GMT"
+TSV = "title\tmyanimelist\nFoo\t2\nBar\t\nBaz\t1\n"
+
+
+class _Upstream:
+    """Local upstream serving a dataset with validators"""
+
+    def __init__(self):
+        self.body = TSV.encode()
+        self.requests: list[dict[str, str]] = []
+        self.app = web.Application()
+        self.app.router.add_get("/data", self.data)
+        self.app.router.add_get("/broken", self.broken)
+
+    async def data(self, request: web.Request) -> web.StreamResponse:
+        """Serve the body, or 304 when the client has the current version"""
+        self.requests.append(dict(request.headers))
+        if request.headers.get("If-None-Match") == ETAG:
+            return web.Response(status=304)
+        return web.Response(
+            body=self.body, headers={"ETag": ETAG, "Last-Modified": LAST_MODIFIED}
+        )
+
+    async def broken(self, request: web.Request) -> web.StreamResponse:
+        """Drop the connection halfway through the body"""
+        response = web.StreamResponse(headers={"Content-Length": "1000"})
+        await response.prepare(request)
+        await response.write(b"partial")
+        request.transport.close()  # type: ignore[union-attr]
+        return response
+
+
+class ConditionalDownloadTest(unittest.IsolatedAsyncioTestCase):
+    """Conditional download test class, served from a local aiohttp server"""
+
+    async def asyncSetUp(self):
+        """Start the server, and store files in a temporary directory"""
+        self.upstream = _Upstream()
+        self.server = TestServer(self.upstream.app)
+        await self.server.start_server()
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.folder.name, "data.tsv")
+
+    async def asyncTearDown(self):
+        """Stop the server"""
+        await self.server.close()
+        self.folder.cleanup()
+
+    def read(self, path: str) -> str:
+        """Read a stored file"""
+        return Path(path).read_text(encoding="utf-8")
+
+    async def test_download_and_not_modified(self):
+        """Test if validators are stored, sent back, and a 304 keeps the file"""
+        url = str(self.server.make_url("/data"))
+        self.assertTrue(await conditional_download(url, self.path))
+        self.assertEqual(self.read(self.path), TSV)
+        self.assertEqual(
+            json.loads(self.read(f"{self.path}.meta.json")),
+            {"etag": ETAG, "last_modified": LAST_MODIFIED},
+        )
+        self.assertNotIn("If-None-Match", self.upstream.requests[0])
+
+        self.upstream.body = b"changed"
+        self.assertFalse(await conditional_download(url, self.path))
+        self.assertEqual(self.upstream.requests[1]["If-None-Match"], ETAG)
+        self.assertEqual(self.upstream.requests[1]["If-Modified-Since"], LAST_MODIFIED)
+        self.assertEqual(self.read(self.path), TSV)
+
+        # validators without the file they describe are not sent
+        os.remove(self.path)
+        self.assertTrue(await conditional_download(url, self.path))
+        self.assertNotIn("If-None-Match", self.upstream.requests[2])
+        self.assertEqual(self.read(self.path), "changed")
+
+    async def test_interrupted_body_keeps_file(self):
+        """Test if a cut download leaves the previous file and no temporary file"""
+        Path(self.path).write_text(TSV, encoding="utf-8")
+        with self.assertRaises(aiohttp.ClientPayloadError):
+            await conditional_download(str(self.server.make_url("/broken")), self.path)
+        self.assertEqual(self.read(self.path), TSV)
+        self.assertEqual(os.listdir(self.folder.name), ["data.tsv"])
+
+    async def test_error_status(self):
+        """Test if an error status raises without touching the file"""
+        with self.assertRaises(aiohttp.ClientResponseError):
+            await conditional_download(str(self.server.make_url("/missing")), self.path)
+        self.assertEqual(os.listdir(self.folder.name), [])
+
+
+class MalIndexerTest(unittest.IsolatedAsyncioTestCase):
+    """MAL index builder test class, served from a local aiohttp server"""
+
+    async def asyncSetUp(self):
+        """Start the server, and point the indexer to a temporary directory"""
+        self.upstream = _Upstream()
+        self.server = TestServer(self.upstream.app)
+        await self.server.start_server()
+        self.folder = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.folder.name, "animeapi.tsv")
+        self.output = os.path.join(self.folder.name, "mal.csv")
+        for name, value in {
+            "MAIN_SITE": str(self.server.make_url("/data")),
+            "FILE_PATH": self.source,
+            "OUTPUT_PATH": self.output,
+        }.items():
+            patcher = mock.patch.object(malIndexer, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    async def asyncTearDown(self):
+        """Stop the server"""
+        await self.server.close()
+        self.folder.cleanup()
+
+    async def test_run_skips_unchanged(self):
+        """Test if the index is built once, and skipped while upstream is unchanged"""
+        self.assertTrue(await malIndexer.mal_run())
+        self.assertEqual(
+            Path(self.output).read_text(encoding="utf-8"),
+            "mal_id\ttitle\n1\tBaz\n2\tFoo\n",
+        )
+        self.assertFalse(await malIndexer.mal_run())
+        self.assertEqual(len(self.upstream.requests), 2)
+        # a missing index is rebuilt from the stored dump
+        os.remove(self.output)
+        self.assertTrue(await malIndexer.mal_run())
+        self.assertFalse(os.path.exists(f"{self.output}.tmp"))
+
+    async def test_failed_build_keeps_index(self):
+        """Test if a failed build leaves the previous index in place"""
+        Path(self.output).write_text("mal_id\ttitle\n", encoding="utf-8")
+        self.upstream.body = b"not\ta dump\n"
+        with self.assertRaises(ValueError):
+            await malIndexer.mal_run()
+        self.assertEqual(
+            Path(self.output).read_text(encoding="utf-8"), "mal_id\ttitle\n"
+        )
+        self.assertFalse(os.path.exists(f"{self.output}.tmp"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+
+try:
+    from modules.error_sink import ErrorSink, fingerprint_error
+except ImportError:
+    # add the path to the 'modules' directory to the system path
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+    from modules.error_sink import ErrorSink, fingerprint_error
+
+
+def _raise(error: Exception) -> Exception:
+    try:
+        raise error
+    except Exception as caught:  # noqa: BLE001
+        return caught
+
+
+class ErrorSinkTest(unittest.TestCase):
+    """Error sink test class"""
+
+    def setUp(self):
+        """Write segments to a temporary directory"""
+        self.folder = tempfile.TemporaryDirectory()
+        self.sink = ErrorSink(self.folder.name, flush_interval=0.05)
+
+    def tearDown(self):
+        """Remove the segments"""
+        self.sink.flush()
+        self.folder.cleanup()
+
+    def test_fingerprint_ignores_message(self):
+        """Test if identical tracebacks share a fingerprint regardless of message"""
+        errors = [_raise(ValueError(f"id {i}")) for i in range(2)]
+        self.assertEqual(fingerprint_error(errors[0]), fingerprint_error(errors[1]))
+        self.assertNotEqual(
+            fingerprint_error(errors[0]), fingerprint_error(_raise(KeyError("x")))
+        )
+
+    def test_identical_errors_are_grouped(self):
+        """Test if repeated errors are written as one line with a count"""
+        for i in range(50):
+            self.sink.record("anime", 1, _raise(ValueError(f"id {i}")))
+        self.assertTrue(self.sink.flush())
+        segments = self.sink.segments()
+        self.assertEqual(len(segments), 1)
+        with open(segments[0], encoding="utf-8") as file:
+            lines = [json.loads(line) for line in file]
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(lines[0]["count"], 50)
+        self.assertIn("ValueError", lines[0]["traceback"])
+
+    def test_segments_rotate(self):
+        """Test if full segments are rotated and old ones removed"""
+        sink = ErrorSink(
+            self.folder.name, segment_size=1, max_segments=2, flush_interval=0
+        )
+        for i in range(4):
+            sink.record(f"command{i}", None, _raise(ValueError("x")))
+            sink.flush()
+        self.assertEqual(len(sink.segments()), 2)
+
+    def test_top_errors(self):
+        """Test if the most frequent errors are listed first"""
+        for _ in range(3):
+            self.sink.record("manga", 1, _raise(KeyError("a")))
+        self.sink.record("games", 2, _raise(ValueError("b")))
+        top = self.sink.top_errors(limit=1)
+        self.assertEqual(len(top), 1)
+        self.assertEqual(top[0].error_type, "KeyError")
+        self.assertEqual(top[0].count, 3)
+        later = datetime.now(tz=timezone.utc) + timedelta(minutes=1)
+        self.assertEqual(self.sink.top_errors(since=later), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,11 +3,21 @@ import sys
 import unittest
 
 try:
-    from classes.html.myanimelist import HtmlMyAnimeList
+    from classes.html.myanimelist import (
+        HtmlMyAnimeList,
+        extract_profile_fields,
+        extract_profile_fields_soup,
+    )
 except ImportError:
     # add the path to the 'modules' directory to the system path
     sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-    from classes.html.myanimelist import HtmlMyAnimeList
+    from classes.html.myanimelist import (
+        HtmlMyAnimeList,
+        extract_profile_fields,
+        extract_profile_fields_soup,
+    )
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
 
 
 class HtmlMyAnimeListTest(unittest.IsolatedAsyncioTestCase):
@@ -21,5 +31,41 @@ class HtmlMyAnimeListTest(unittest.IsolatedAsyncioTestCase):
         self.assertTrue(data is not None)
 
 
+class HtmlMyAnimeListExtractorTest(unittest.TestCase):
+    """Profile extraction engines test class, using saved profile pages"""
+
+    @staticmethod
+    def _read(name: str) -> str:
+        with open(os.path.join(FIXTURES, name), "r", encoding="utf-8") as file:
+            return file.read()
+
+    def test_engines_agree(self):
+        """Test if the fast engine extracts the same fields as html5lib"""
+        for name in ("mal_profile.html", "mal_profile_hidden.html"):
+            html = self._read(name)
+            self.assertEqual(
+                extract_profile_fields(html), extract_profile_fields_soup(html)
+            )
+
+    def test_parse_user(self):
+        """Test parsing a profile into user information"""
+        user = HtmlMyAnimeList().parse_user(self._read("mal_profile.html"), "nattadasu")
+        self.assertEqual(user.mal_id, 6338737)
+        self.assertEqual(user.gender, "Male")
+        self.assertEqual(user.location, "Jakarta, Indonesia")
+        self.assertIsNotNone(user.birthday)
+        self.assertIsNotNone(user.joined)
+
+    def test_parse_user_hidden_fields(self):
+        """Test parsing a profile with hidden status rows"""
+        user = HtmlMyAnimeList().parse_user(
+            self._read("mal_profile_hidden.html"), "kyouko"
+        )
+        self.assertEqual(user.mal_id, 1234567)
+        self.assertIsNone(user.gender)
+        self.assertIsNone(user.birthday)
+        self.assertIsNotNone(user.last_online)
+
+
 if __name__ == "__main__":
     unittest.main(verbosity=2)
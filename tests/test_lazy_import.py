@@ -0,0 +1,65 @@
+import os
+import sys
+import tempfile
+import unittest
+
+try:
+    from modules import lazy_import as lazy
+    from modules.lazy_import import LazyModule, enable_lazy_imports, lazy_import
+except ImportError:
+    # add the path to the 'modules' directory to the system path
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+    from modules import lazy_import as lazy
+    from modules.lazy_import import LazyModule, enable_lazy_imports, lazy_import
+
+PROBE = "_lazy_import_probe"
+
+
+class LazyImportTest(unittest.TestCase):
+    """Lazy import test class"""
+
+    def setUp(self):
+        """Write a probe module that is not imported yet"""
+        self.enabled = lazy.is_lazy_imports_enabled()
+        self.folder = tempfile.TemporaryDirectory()
+        with open(os.path.join(self.folder.name, f"{PROBE}.py"), "w") as file:
+            file.write("VALUE = 42\n")
+        sys.path.insert(0, self.folder.name)
+
+    def tearDown(self):
+        """Forget the probe module, and restore the mode"""
+        enable_lazy_imports(self.enabled)
+        sys.path.remove(self.folder.name)
+        sys.modules.pop(PROBE, None)
+        lazy.first_use_timings.pop(PROBE, None)
+        self.folder.cleanup()
+
+    def test_deferred_until_first_use(self):
+        """Test if a lazy module is only imported when an attribute is read"""
+        enable_lazy_imports(True)
+        module = lazy_import(PROBE)
+        self.assertIsInstance(module, LazyModule)
+        self.assertNotIn(PROBE, sys.modules)
+        self.assertIn("deferred", repr(module))
+        self.assertEqual(module.VALUE, 42)
+        self.assertIn(PROBE, sys.modules)
+        self.assertIn(PROBE, lazy.first_use_timings)
+        self.assertIn("loaded", repr(module))
+        self.assertIn("VALUE", dir(module))
+
+    def test_imported_module_is_returned(self):
+        """Test if an already imported module is returned as is"""
+        enable_lazy_imports(True)
+        self.assertIs(lazy_import("os"), os)
+
+    def test_disabled_passthrough(self):
+        """Test if imports happen right away when lazy mode is off"""
+        enable_lazy_imports(False)
+        module = lazy_import(PROBE)
+        self.assertNotIsInstance(module, LazyModule)
+        self.assertIs(module, sys.modules[PROBE])
+        self.assertNotIn(PROBE, lazy.first_use_timings)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import asyncio
+import os
+import sys
+import unittest
+from unittest import mock
+
+try:
+    from classes.stats.listing import fetch_listing_votes, gather_sites, listing_votes
+except ImportError:
+    # add the path to the 'modules' directory to the system path
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+    from classes.stats.listing import fetch_listing_votes, gather_sites, listing_votes
+
+
+async def _answer(value: int, delay: float = 0) -> int:
+    """Answer after a delay"""
+    await asyncio.sleep(delay)
+    return value
+
+
+async def _fail(*_) -> int:
+    """Fail like a site down"""
+    raise ConnectionError("site down")
+
+
+class ListingSites(unittest.IsolatedAsyncioTestCase):
+    """Bot listing sites test class"""
+
+    async def test_slow_site_times_out_alone(self):
+        """Test if a slow site only fails itself, without delaying the others"""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        done, failed = await gather_sites(
+            {"fast": _answer(1), "slow": _answer(2, 5), "down": _fail()},
+            timeout=0.1,
+        )
+        self.assertLess(loop.time() - started, 1)
+        self.assertEqual(done, {"fast": 1})
+        self.assertIsInstance(failed["slow"], asyncio.TimeoutError)
+        self.assertIsInstance(failed["down"], ConnectionError)
+
+    async def test_votes_are_kept(self):
+        """Test if fetched upvotes are kept in memory, without the failed sites"""
+        sites = {
+            "B Site": (lambda _session, bot_id: _answer(bot_id), {"base_url": "b/"}),
+            "A Site": (lambda _session, _bot_id: _answer(7), {"base_url": "a/"}),
+            "Down": (_fail, {"base_url": "c/"}),
+        }
+        with mock.patch.dict("classes.stats.listing._VOTE_SITES", sites, clear=True):
+            votes, failed = await fetch_listing_votes(3, session=mock.Mock())
+        self.assertEqual([vote.name for vote in votes], ["A Site", "B Site"])
+        self.assertEqual(votes[1].total_votes, 3)
+        self.assertEqual(list(failed), ["Down"])
+        self.assertIs(listing_votes.get(3), votes)
+        self.assertEqual(votes[0].as_text, "* [A Site](a/3/vote): 7 in total")
+
+
+if __name__ == "__main__":
+    unittest.main()
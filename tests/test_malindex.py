@@ -0,0 +1,105 @@
+import asyncio
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+try:
+    from classes.malindex import MalTitleIndex
+    from modules import myanimelist
+except ImportError:
+    # add the path to the 'modules' directory to the system path
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+    from classes.malindex import MalTitleIndex
+    from modules import myanimelist
+
+
+class MalTitleIndexTest(unittest.TestCase):
+    """Local MAL title index test class"""
+
+    def setUp(self):
+        """Write a small index file"""
+        handle, self.path = tempfile.mkstemp(suffix=".csv")
+        with os.fdopen(handle, "w", encoding="utf-8") as file:
+            file.write("mal_id\ttitle\n")
+            file.write("1\tCowboy Bebop\n")
+            file.write("5\tCowboy Bebop: Tengoku no Tobira\n")
+            file.write("121\tFullmetal Alchemist\n")
+            file.write("5114\tFullmetal Alchemist: Brotherhood\n")
+            file.write('9253\t"Steins;Gate"\n')
+        self.index = MalTitleIndex.from_file(self.path)
+
+    def tearDown(self):
+        """Remove the index file"""
+        os.remove(self.path)
+
+    def test_random_id(self):
+        """Test picking a random ID"""
+        self.assertEqual(len(self.index), 5)
+        self.assertIn(self.index.random_id(), {1, 5, 121, 5114, 9253})
+
+    def test_prefix_search(self):
+        """Test searching by title prefix"""
+        res = self.index.prefix_search("fullmetal")
+        self.assertEqual([entry.mal_id for entry in res], [121, 5114])
+
+    def test_substring_search(self):
+        """Test searching by title fragment"""
+        res = self.index.substring_search("bebop")
+        self.assertEqual([entry.mal_id for entry in res], [1, 5])
+        self.assertEqual(res[1].title, "Cowboy Bebop: Tengoku no Tobira")
+
+    def test_search_fallbacks(self):
+        """Test combined search falls back to fuzzy matching"""
+        res = self.index.search("stein gate", limit=1)
+        self.assertEqual(res[0].mal_id, 9253)
+
+
+class FailingMyAnimeList:
+    """MyAnimeList client whose search always times out"""
+
+    def __init__(self, *_):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *_):
+        return None
+
+    async def search(self, *_, **__):
+        raise asyncio.TimeoutError
+
+
+class SearchFallbackTest(unittest.IsolatedAsyncioTestCase):
+    """MyAnimeList search fallback test class"""
+
+    async def test_missing_index_keeps_api_error(self):
+        """Test if a missing local index re-raises the API error"""
+        with (
+            mock.patch.object(myanimelist, "MyAnimeList", FailingMyAnimeList),
+            mock.patch.object(
+                myanimelist, "get_mal_index", side_effect=FileNotFoundError
+            ),
+            self.assertRaises(asyncio.TimeoutError),
+        ):
+            await myanimelist.search_mal_anime("Cowboy Bebop")
+
+    async def test_falls_back_to_index(self):
+        """Test if the local index answers when the API fails"""
+        handle, path = tempfile.mkstemp(suffix=".csv")
+        with os.fdopen(handle, "w", encoding="utf-8") as file:
+            file.write("mal_id\ttitle\n1\tCowboy Bebop\n")
+        self.addCleanup(os.remove, path)
+        index = MalTitleIndex.from_file(path)
+        with (
+            mock.patch.object(myanimelist, "MyAnimeList", FailingMyAnimeList),
+            mock.patch.object(myanimelist, "get_mal_index", return_value=index),
+        ):
+            results = await myanimelist.search_mal_anime("Cowboy Bebop")
+        self.assertEqual(results[0]["node"]["id"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,104 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+try:
+    from classes import nekomimidb
+    from classes.nekomimidb import (
+        NekomimiDataset,
+        NekomimiDb,
+        NekomimiGender,
+        get_nekomimi_dataset,
+        reload_nekomimi_dataset,
+    )
+except ImportError:
+    # add the path to the 'modules' directory to the system path
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+    from classes import nekomimidb
+    from classes.nekomimidb import (
+        NekomimiDataset,
+        NekomimiDb,
+        NekomimiGender,
+        get_nekomimi_dataset,
+        reload_nekomimi_dataset,
+    )
+
+HEADER = "\t".join(NekomimiDataset.COLUMNS)
+
+
+def _row(id_: int, gender: str) -> str:
+    """Build a dataset line"""
+    return (
+        f"{id_}\thttps://example.com/{id_}.png\tartist\thttps://example.com\t"
+        f"pixiv\thttps://www.pixiv.net/artworks/{id_}\t\t{gender}"
+    )
+
+
+class NekomimiDatasetTest(unittest.TestCase):
+    """nekomimiDb dataset test class"""
+
+    def setUp(self):
+        """Write a dataset to a temporary file, and forget the shared one"""
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.folder.name, "nekomimiDb.tsv")
+        self.write(_row(1, "boy"), _row(2, "girl"), _row(3, "girl"), _row(4, "nb"))
+        patcher = mock.patch.object(nekomimidb, "_dataset", None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        """Remove the file"""
+        self.folder.cleanup()
+
+    def write(self, *lines: str):
+        """Replace the dataset content"""
+        with open(self.path, "w", encoding="utf-8") as file:
+            file.write("\n".join([HEADER, *lines]) + "\n")
+
+    def test_pick_per_gender(self):
+        """Test if picks only come from the requested gender"""
+        dataset = NekomimiDataset.from_file(self.path)
+        self.assertEqual(len(dataset), 4)
+        self.assertEqual(list(dataset.by_gender["girl"]), [1, 2])
+        for _ in range(20):
+            self.assertEqual(dataset.pick("boy")[0], "1")
+            self.assertIn(dataset.pick("girl")[0], {"2", "3"})
+            self.assertIn(dataset.pick()[0], {"1", "2", "3", "4"})
+        # the shared dataset is loaded once, NekomimiDb reuses it
+        get_nekomimi_dataset(self.path)
+        picked = NekomimiDb(NekomimiGender.NONBINARY).get_random_nekomimi()
+        self.assertEqual(picked.id, 4)
+        self.assertEqual(picked.girlOrBoy, NekomimiGender.UNKNOWN)
+
+    def test_empty_bucket(self):
+        """Test if picking from a gender without rows raises IndexError"""
+        dataset = NekomimiDataset.from_file(self.path)
+        with self.assertRaises(IndexError):
+            dataset.pick("both")
+        with self.assertRaises(IndexError):
+            dataset.pick("unlisted")
+        self.write()
+        with self.assertRaises(IndexError):
+            NekomimiDataset.from_file(self.path).pick()
+
+    def test_atomic_reload(self):
+        """Test if a reload swaps the whole dataset, and a failed one keeps it"""
+        old = get_nekomimi_dataset(self.path)
+        self.assertIs(get_nekomimi_dataset(self.path), old)
+        self.write(_row(5, "both"))
+        new = reload_nekomimi_dataset(self.path)
+        self.assertIs(get_nekomimi_dataset(self.path), new)
+        self.assertEqual(new.pick("both")[0], "5")
+        # readers holding the old copy keep a complete dataset
+        self.assertEqual(len(old), 4)
+        self.assertEqual(old.pick("boy")[0], "1")
+        os.remove(self.path)
+        with self.assertRaises(FileNotFoundError):
+            reload_nekomimi_dataset(self.path)
+        self.assertIs(get_nekomimi_dataset(self.path), new)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import asyncio
+import gc
+import os
+import sys
+import unittest
+import weakref
+
+try:
+    from modules.pipeline import FetchPipeline, PipelineStats, StageStatus
+except ImportError:
+    # add the path to the 'modules' directory to the system path
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+    from modules.pipeline import FetchPipeline, PipelineStats, StageStatus
+
+
+def _sleeper(delay: float, value=None, error: Exception | None = None):
+    async def stage(deps):
+        await asyncio.sleep(delay)
+        if error is not None:
+            raise error
+        return value if value is not None else deps
+
+    return stage
+
+
+class _TrackedError(ValueError):
+    """Error that can be weakly referenced"""
+
+
+class FetchPipelineTest(unittest.TestCase):
+    """Fetch pipeline test class"""
+
+    def test_independent_stages_run_concurrently(self):
+        """Test if independent stages overlap instead of running in sequence"""
+        pipeline = FetchPipeline(deadline=2)
+        pipeline.add("a", _sleeper(0.2, "a"))
+        pipeline.add("b", _sleeper(0.2, "b"))
+        pipeline.add("c", _sleeper(0.0), depends_on=["a", "b"])
+        result = asyncio.run(pipeline.run())
+        self.assertEqual(result.get("c"), {"a": "a", "b": "b"})
+        self.assertLess(result.total, 0.35)
+        self.assertGreaterEqual(result.timings["c"].started, 0.2)
+
+    def test_deadline_cancels_optional_stages(self):
+        """Test if slow optional stages time out while required ones finish"""
+        pipeline = FetchPipeline(deadline=0.1)
+        pipeline.add("slow", _sleeper(5, "slow"))
+        pipeline.add("after", _sleeper(0, "after"), depends_on=["slow"])
+        pipeline.add("required", _sleeper(0.2, "required"), required=True)
+        result = asyncio.run(pipeline.run())
+        self.assertEqual(result.get("required"), "required")
+        self.assertIsNone(result.get("slow"))
+        self.assertEqual(result.timings["slow"].status, StageStatus.TIMEOUT)
+        self.assertEqual(result.timings["after"].status, StageStatus.SKIPPED)
+        self.assertLess(result.total, 1)
+
+    def test_failed_stage_skips_dependents(self):
+        """Test if failures are recorded and dependents are skipped"""
+        pipeline = FetchPipeline(deadline=1)
+        pipeline.add("broken", _sleeper(0, error=ValueError("boom")))
+        pipeline.add("after", _sleeper(0, "after"), depends_on=["broken"])
+        result = asyncio.run(pipeline.run())
+        self.assertIsInstance(result.errors["broken"], ValueError)
+        self.assertEqual(result.timings["broken"].status, StageStatus.FAILED)
+        self.assertEqual(result.timings["after"].status, StageStatus.SKIPPED)
+
+    def test_required_failure_is_raised(self):
+        """Test if an exception of a required stage is re-raised"""
+        pipeline = FetchPipeline(deadline=1)
+        pipeline.add("required", _sleeper(0, error=KeyError("x")), required=True)
+        with self.assertRaises(KeyError):
+            asyncio.run(pipeline.run())
+
+    def test_unknown_dependency(self):
+        """Test if depending on an unregistered stage is rejected"""
+        with self.assertRaises(ValueError):
+            FetchPipeline().add("a", _sleeper(0), depends_on=["missing"])
+
+    def test_stats_summary(self):
+        """Test if stats summarize stage latency across runs"""
+        stats = PipelineStats()
+        for _ in range(3):
+            pipeline = FetchPipeline(deadline=1)
+            pipeline.add("a", _sleeper(0, "a"))
+            stats.record(asyncio.run(pipeline.run()))
+        summary = stats.summary()
+        self.assertEqual(summary["a"]["runs"], 3)
+        self.assertIn("total", summary)
+        self.assertTrue(stats.report().startswith("3 runs"))  # type: ignore[union-attr]
+        self.assertIsNone(PipelineStats().report())
+
+    def test_stats_keep_timings_only(self):
+        """Test if stats drop stage results and errors of recorded runs"""
+        stats = PipelineStats()
+        pipeline = FetchPipeline(deadline=1)
+        pipeline.add("payload", _sleeper(0, {"large": "payload"}))
+        pipeline.add("broken", _sleeper(0, error=_TrackedError("boom")))
+        result = asyncio.run(pipeline.run())
+        stats.record(result)
+        result_ref = weakref.ref(result)
+        error_ref = weakref.ref(result.errors["broken"])
+        del result, pipeline
+        gc.collect()
+        self.assertIsNone(result_ref())
+        self.assertIsNone(error_ref())
+        self.assertEqual(stats.summary()["broken"]["runs"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import json
+import os
+import sys
+import tempfile
+import time
+import unittest
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest import mock
+
+import aiohttp
+
+try:
+    from classes.cache import Caching
+    from modules.prefetch import (
+        PREFETCH_MAX_AGE,
+        LookupStats,
+        PrefetchReport,
+        current_season,
+        is_quiet_hour,
+        warm_jikan,
+    )
+except ImportError:
+    # add the path to the 'modules' directory to the system path
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+    from classes.cache import Caching
+    from modules.prefetch import (
+        PREFETCH_MAX_AGE,
+        LookupStats,
+        PrefetchReport,
+        current_season,
+        is_quiet_hour,
+        warm_jikan,
+    )
+
+
+class PrefetchTest(unittest.IsolatedAsyncioTestCase):
+    """Cache prefetch test class"""
+
+    def setUp(self):
+        """Keep files in a temporary directory"""
+        self.folder = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        """Remove the files"""
+        self.folder.cleanup()
+
+    def test_lookup_stats(self):
+        """Test if lookups are ranked per media type, decayed, and persisted"""
+        path = os.path.join(self.folder.name, "prefetch", "lookups.json")
+        stats = LookupStats(path)
+        for media_id, count in ((1, 3), (2, 5), (3, 1)):
+            for _ in range(count):
+                stats.record("anime", media_id)
+        stats.record("manga", 9)
+        self.assertEqual(stats.top("anime"), [2, 1, 3])
+        self.assertEqual(stats.top("anime", 1), [2])
+        self.assertEqual(stats.top("manga"), [9])
+        stats.decay()
+        self.assertEqual(stats.top("anime"), [2, 1])
+        stats.save()
+        self.assertEqual(LookupStats(path).top("anime"), [2, 1])
+
+    def test_schedule(self):
+        """Test if quiet hours and seasons follow the calendar"""
+        self.assertTrue(is_quiet_hour(datetime(2024, 1, 1, 18, tzinfo=timezone.utc)))
+        self.assertFalse(is_quiet_hour(datetime(2024, 1, 1, 12, tzinfo=timezone.utc)))
+        self.assertEqual(current_season(datetime(2024, 4, 1)), ("SPRING", 2024))
+        self.assertEqual(current_season(datetime(2024, 12, 31)), ("FALL", 2024))
+
+    async def test_warm_jikan_skips_fresh(self):
+        """Test if anime with a fresh cache are not fetched again"""
+        cache = Caching(self.folder.name, 86400)
+        for mal_id in (1, 2):
+            cache.write_cache(cache.get_cache_path(f"anime/{mal_id}.json"), {})
+        report = PrefetchReport()
+        with mock.patch("modules.prefetch.JikanCache", cache):
+            await warm_jikan([1, 2, 1], report, interval=0)
+        self.assertEqual((report.fresh, report.jikan, report.failed), (2, 0, 0))
+
+    async def test_warm_jikan_keeps_aging_entry(self):
+        """Test if a failed refresh keeps the aging entry, and the run goes on"""
+        cache = Caching(self.folder.name, 86400)
+        paths = [cache.get_cache_path(f"anime/{mal_id}.json") for mal_id in (1, 2, 3)]
+        os.makedirs(os.path.dirname(paths[0]))
+        aging = json.dumps({"timestamp": time.time() - 50000, "data": {}})
+        for path in paths:
+            Path(path).write_text(aging, encoding="utf-8")
+        errors = iter([aiohttp.ClientError("reset"), TimeoutError(), None])
+        calls: list[tuple[int, float | None]] = []
+
+        class FakeJikan:
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *_):
+                return None
+
+            async def get_anime_data(self, mal_id, max_age=None):
+                calls.append((mal_id, max_age))
+                error = next(errors)
+                if error is not None:
+                    raise error
+
+        report = PrefetchReport()
+        with (
+            mock.patch("modules.prefetch.JikanCache", cache),
+            mock.patch("modules.prefetch.JikanApi", FakeJikan),
+        ):
+            await warm_jikan([1, 2, 3], report, interval=0)
+        self.assertEqual((report.fresh, report.jikan, report.failed), (0, 1, 2))
+        self.assertEqual(calls, [(mal_id, PREFETCH_MAX_AGE) for mal_id in (1, 2, 3)])
+        self.assertTrue(all(os.path.exists(path) for path in paths))
+
+
+if __name__ == "__main__":
+    unittest.main()
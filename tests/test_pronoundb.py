@@ -1,11 +1,18 @@
+import asyncio
+import gc
 import os
 import sys
 import unittest
+from unittest import mock
 
 try:
+    from classes import pronoundb
+    from classes.excepts import ProviderHttpError
     from classes.pronoundb import PronounData, PronounDB
 except ImportError:
     sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+    from classes import pronoundb
+    from classes.excepts import ProviderHttpError
     from classes.pronoundb import PronounData, PronounDB
 
 
@@ -27,5 +34,93 @@ class PronounDbTest(unittest.IsolatedAsyncioTestCase):
         self.assertIsInstance(pronouns, dict)
 
 
+class PronounDbBatchTest(unittest.IsolatedAsyncioTestCase):
+    """Test batching and caching of PronounDB lookups, without network"""
+
+    async def asyncSetUp(self):
+        """Patch the lookup endpoint and file cache"""
+        self.calls: list[list[str]] = []
+
+        async def fake_lookup(_, platform, ids):
+            self.calls.append(list(ids))
+            return {i: {"sets": {"en": ["they"]}} for i in ids if i != "404"}
+
+        pronoundb._memory.clear()
+        self.patches = [
+            mock.patch.object(PronounDB, "lookup", fake_lookup),
+            mock.patch.object(pronoundb.Cache, "read_cache", return_value=None),
+            mock.patch.object(pronoundb.Cache, "write_cache"),
+        ]
+        for patch in self.patches:
+            patch.start()
+
+    async def asyncTearDown(self):
+        """Remove the patches"""
+        for patch in self.patches:
+            patch.stop()
+        pronoundb._memory.clear()
+
+    async def test_concurrent_lookups_are_batched(self):
+        """Test if lookups arriving together are sent in one request"""
+        pdb = PronounDB()
+        results = await asyncio.gather(
+            pdb.get_pronouns(pdb.Platform.DISCORD, "1"),
+            pdb.get_pronouns(pdb.Platform.DISCORD, "2"),
+            pdb.get_pronouns(pdb.Platform.DISCORD, "2"),
+            pdb.get_pronouns(pdb.Platform.DISCORD, "404"),
+        )
+        self.assertEqual(self.calls, [["1", "2", "404"]])
+        self.assertEqual(str(results[0]), "they/them")
+        self.assertEqual(str(results[3]), "Not set")
+
+    async def test_memory_cache(self):
+        """Test if repeated lookups, found or not, are served from memory"""
+        pdb = PronounDB()
+        await pdb.get_pronouns_bulk(pdb.Platform.DISCORD, ["1", "404"])
+        await pdb.get_pronouns_bulk(pdb.Platform.DISCORD, ["1", "404"])
+        self.assertEqual(len(self.calls), 1)
+
+    async def test_bulk_is_chunked(self):
+        """Test if prefetching more than 50 users is split into chunks"""
+        pdb = PronounDB()
+        await pdb.prefetch(pdb.Platform.DISCORD, [str(i) for i in range(120)])
+        self.assertEqual([len(call) for call in self.calls], [50, 50, 20])
+
+    async def test_batch_task_is_kept(self):
+        """Test if a pending batch holds its task until the batch resolves"""
+        release = asyncio.Event()
+
+        async def slow_lookup(_, platform, ids):
+            await release.wait()
+            return {i: {"sets": {"en": ["they"]}} for i in ids}
+
+        pdb = PronounDB()
+        batcher = pronoundb._batcher
+        with mock.patch.object(PronounDB, "lookup", slow_lookup):
+            lookup = asyncio.create_task(pdb.get_pronouns(pdb.Platform.DISCORD, "1"))
+            await asyncio.sleep(pronoundb.BATCH_WINDOW * 2)
+            self.assertEqual(len(batcher._tasks), 1)
+            task = next(iter(batcher._tasks))
+            gc.collect()
+            release.set()
+            self.assertEqual(str(await lookup), "they/them")
+            await task
+        self.assertEqual(batcher._tasks, set())
+
+    async def test_prefetch_swallows_errors(self):
+        """Test if a failed prefetch never reaches the caller"""
+        pdb = PronounDB()
+        for error in (
+            ProviderHttpError("down", 503),
+            ValueError("bad JSON"),
+            TimeoutError(),
+        ):
+            pronoundb._memory.clear()
+            with mock.patch.object(
+                PronounDB, "lookup", mock.AsyncMock(side_effect=error)
+            ):
+                await pdb.prefetch(pdb.Platform.DISCORD, ["1", "2"])
+
+
 if __name__ == "__main__":
     unittest.main(verbosity=2)
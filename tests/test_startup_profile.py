@@ -0,0 +1,103 @@
+import builtins
+import importlib
+import os
+import sys
+import tempfile
+import unittest
+
+try:
+    from modules.startup_profile import (
+        ExtensionTiming,
+        ImportTiming,
+        StartupProfiler,
+    )
+except ImportError:
+    # add the path to the 'modules' directory to the system path
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+    from modules.startup_profile import (
+        ExtensionTiming,
+        ImportTiming,
+        StartupProfiler,
+    )
+
+PARENT = "_startup_probe_parent"
+CHILD = "_startup_probe_child"
+
+
+class StartupProfilerTest(unittest.TestCase):
+    """Startup profiler test class"""
+
+    def setUp(self):
+        """Write a probe extension that imports a slow module"""
+        self.folder = tempfile.TemporaryDirectory()
+        probes = {
+            PARENT: f"import time\nimport {CHILD}\ntime.sleep(0.02)\n",
+            CHILD: "import time\ntime.sleep(0.05)\n",
+        }
+        for name, source in probes.items():
+            with open(os.path.join(self.folder.name, f"{name}.py"), "w") as file:
+                file.write(source)
+        sys.path.insert(0, self.folder.name)
+
+    def tearDown(self):
+        """Forget the probe modules"""
+        sys.path.remove(self.folder.name)
+        for name in (PARENT, CHILD):
+            sys.modules.pop(name, None)
+        self.folder.cleanup()
+
+    def test_self_and_cumulative_time(self):
+        """Test if nested imports are split into self and cumulative time"""
+        original_import = builtins.__import__
+        original_import_module = importlib.import_module
+        profiler = StartupProfiler()
+        profiler.start()
+        with profiler.extension("probe"):
+            # extensions are loaded this way, not through `__import__`
+            importlib.import_module(PARENT)
+        report = profiler.stop()
+        self.assertIs(builtins.__import__, original_import)
+        self.assertIs(importlib.import_module, original_import_module)
+
+        timings = {timing.module: timing for timing in report.imports}
+        parent, child = timings[PARENT], timings[CHILD]
+        self.assertGreaterEqual(child.cumulative, 0.05)
+        self.assertAlmostEqual(child.self_time, child.cumulative)
+        self.assertGreaterEqual(parent.cumulative, child.cumulative + 0.02)
+        self.assertAlmostEqual(parent.self_time, parent.cumulative - child.cumulative)
+        self.assertEqual({parent.owner, child.owner}, {"probe"})
+        self.assertEqual(report.extensions[0].name, "probe")
+        self.assertEqual(report.extensions[0].imports, 2)
+        self.assertGreaterEqual(report.extensions[0].seconds, parent.cumulative)
+
+    def test_format_report(self):
+        """Test if the report lists phases, slowest extensions, and top imports"""
+        profiler = StartupProfiler()
+        report = profiler.report
+        report.total = 1.5
+        report.phases["core"] = 0.25
+        report.extensions = [
+            ExtensionTiming(name="fast", seconds=0.1),
+            ExtensionTiming(name="slow", seconds=0.9, imports=3),
+        ]
+        report.imports = [
+            ImportTiming(module="a", cumulative=0.4, self_time=0.1, owner="slow"),
+            ImportTiming(module="b", cumulative=0.3, self_time=0.3, owner="slow"),
+        ]
+        self.assertEqual(
+            profiler.format_report(top=1).splitlines(),
+            [
+                "Startup profile, 1,500.0 ms total",
+                "Phases:",
+                "       250.0 ms  core",
+                "Extensions (slowest first):",
+                "       900.0 ms  slow (3 new imports)",
+                "       100.0 ms  fast (0 new imports)",
+                "Imports (top 1 by self time):",
+                "       300.0 ms  b (cumulative 300.0 ms, via slow)",
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
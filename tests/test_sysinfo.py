@@ -0,0 +1,39 @@
+import os
+import sys
+import unittest
+
+try:
+    from classes.stats.system import SystemSampler, get_pip_pkgs
+except ImportError:
+    # add the path to the 'modules' directory to the system path
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+    from classes.stats.system import SystemSampler, get_pip_pkgs
+
+
+class SystemInventory(unittest.TestCase):
+    """System and package inventory test class"""
+
+    def test_packages_listed_once(self):
+        """Test if packages are listed once, sorted, without duplicates"""
+        packages = get_pip_pkgs()
+        self.assertIs(get_pip_pkgs(), packages)
+        names = [package.name for package in packages]
+        self.assertIn("psutil", names)
+        self.assertEqual(names, sorted(set(names)))
+
+    def test_sampler_ring_buffer(self):
+        """Test if the buffer keeps the newest samples, and spreads them"""
+        sampler = SystemSampler(history=3)
+        self.assertIsNone(sampler.latest())
+        self.assertIsNone(sampler.trend("ram_percentage"))
+        samples = [sampler.sample() for _ in range(5)]
+        self.assertEqual(list(sampler.samples), samples[2:])
+        self.assertIs(sampler.latest(), samples[-1])
+        trend = sampler.trend("ram_percentage")
+        values = [sample.ram_percentage for sample in samples[2:]]
+        self.assertEqual(trend.samples, 3)
+        self.assertEqual((trend.minimum, trend.maximum), (min(values), max(values)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import json
+import os
+import re
+import sys
+import unittest
+
+try:
+    from modules.text import (
+        get_emoji_id,
+        html_to_markdown,
+        sanitize_markdown,
+        trim_synopsis,
+    )
+except ImportError:
+    # add the path to the 'modules' directory to the system path
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+    from modules.text import (
+        get_emoji_id,
+        html_to_markdown,
+        sanitize_markdown,
+        trim_synopsis,
+    )
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "synopses.json")
+
+
+def legacy_sanitize_markdown(text: str) -> str:
+    """Replace-per-character escaping, as done before the text module"""
+    for char in "\\\r_()[]@*/#`<>|~":
+        text = text.replace(char, " " if char == "\r" else "\\" + char)
+    return text.strip()
+
+
+def legacy_html_to_markdown(text: str) -> str:
+    """Regex-per-tag conversion, as done before the text module"""
+    replacements = {
+        r"\n": "",
+        r"<(/)?i>|<(/)?em>": "*",
+        r"<(/)?b>|<(/)?strong>": "**",
+        r"<(/)?u>": "__",
+        r"<(/)?strike>|<(/)?s>": "~~",
+        r"<(/)?br>": "\n",
+        r"<h1>": "\n# ",
+        r"<h2>": "\n## ",
+        r"<h3>": "\n### ",
+        r"<(/)?h[1-6]>": "",
+        r"<p>": "\n",
+        r"<(/)?p>": "",
+        r"<a href=\"(.*)\">(.*)</a>": r"[\2](\1)",
+    }
+    for pattern, repl in replacements.items():
+        text = re.sub(pattern, repl, text, flags=re.IGNORECASE)
+    return text
+
+
+def load_synopses() -> dict[str, list[str]]:
+    """Load the synopsis corpus fixture"""
+    with open(FIXTURE, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+class TextTest(unittest.TestCase):
+    """Text helpers test class"""
+
+    def test_sanitize_matches_legacy(self):
+        """Test if table-based escaping matches per-character replacing"""
+        for corpus in load_synopses().values():
+            for text in corpus:
+                self.assertEqual(
+                    sanitize_markdown(text), legacy_sanitize_markdown(text)
+                )
+
+    def test_html_matches_legacy(self):
+        """Test if the single-pass converter matches per-tag conversion"""
+        for text in load_synopses()["anilist"]:
+            self.assertEqual(html_to_markdown(text), legacy_html_to_markdown(text))
+
+    def test_html_multiple_links(self):
+        """Test if each link is converted on its own, with formatted labels"""
+        text = '<a href="https://a.example">A</a> and <a href="https://b.example"><i>B</i></a>'
+        self.assertEqual(
+            html_to_markdown(text),
+            "[A](https://a.example) and [*B*](https://b.example)",
+        )
+
+    def test_trim_synopsis(self):
+        """Test if long synopses are trimmed with an ellipsis"""
+        self.assertEqual(trim_synopsis("short"), "short")
+        trimmed = trim_synopsis("a" * 999 + " " + "b" * 50)
+        self.assertEqual(trimmed, "a" * 999 + "...")
+
+    def test_get_emoji_id(self):
+        """Test if emoji IDs are extracted from static and animated emojis"""
+        self.assertEqual(get_emoji_id("<:success:123>"), "123")
+        self.assertEqual(get_emoji_id("<a:spin:456>"), "456")
+        self.assertEqual(get_emoji_id("plain"), "plain")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+import os
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from unittest import mock
+
+from interactions import Snowflake
+
+try:
+    from classes import user_table
+    from classes.database import UserDatabase
+    from classes.user_table import USER_TABLE_SCHEMA, UserTable, read_user_table
+except ImportError:
+    # add the path to the 'modules' directory to the system path
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+    from classes import user_table
+    from classes.database import UserDatabase
+    from classes.user_table import USER_TABLE_SCHEMA, UserTable, read_user_table
+
+HEADER = "\t".join(USER_TABLE_SCHEMA)
+ROWS = [
+    (
+        "1234567890123456789\tnattadasu\t1600000000\tnattadasu\t1\t1600000001\t"
+        "1600000002\t99\t98\tRyuusei\t\t5\t\t\t\t2000-01-31\tAsia/Jakarta\t3"
+    ),
+    "2\tfoo\t1\tfoo\t2\t3\t4\t99\t6\tRyuusei\tbar\t\tbaz\t7\tqux\t\t\t",
+]
+
+
+class UserTableTest(unittest.TestCase):
+    """Typed user table test class"""
+
+    def setUp(self):
+        """Write a database to a temporary file"""
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.folder.name, "database.csv")
+        self.write(HEADER, *ROWS)
+
+    def tearDown(self):
+        """Remove the file"""
+        self.folder.cleanup()
+
+    def write(self, *lines: str):
+        """Replace the database content"""
+        with open(self.path, "w", encoding="utf-8") as file:
+            file.write("\n".join(lines) + "\n")
+
+    def test_schema(self):
+        """Test if columns are read with the schema types"""
+        frame = read_user_table(self.path)
+        self.assertIsNotNone(frame)
+        self.assertEqual(
+            {column: str(dtype) for column, dtype in frame.dtypes.items()},
+            USER_TABLE_SCHEMA,
+        )
+        self.assertEqual(frame["discordId"].tolist(), [1234567890123456789, 2])
+
+    def test_legacy_and_malformed(self):
+        """Test if missing columns are added, and bad numbers become missing"""
+        self.write("discordId\tmalId\tanilistId", "1\t2\tnope", "3\t4\t5")
+        table = UserTable.read(self.path)
+        self.assertIsNotNone(table)
+        self.assertEqual(len(table.frame.columns), len(USER_TABLE_SCHEMA))
+        self.assertEqual(table.frame["discordId"].dtype, "int64")
+        self.assertEqual([record["anilistId"] for record in table.records()], [None, 5])
+        self.write(HEADER)
+        self.assertEqual(len(UserTable.read(self.path)), 0)  # type: ignore[arg-type]
+        os.remove(self.path)
+        self.assertIsNone(UserTable.read(self.path))
+
+    def test_shards(self):
+        """Test if a sharded read matches a single one"""
+        self.write(HEADER, *(ROWS * 500))
+        single = read_user_table(self.path, workers=1)
+        with mock.patch.object(user_table, "SHARD_MIN_BYTES", 0):
+            sharded = read_user_table(self.path, workers=4)
+        self.assertIsNotNone(single)
+        self.assertTrue(single.equals(sharded))
+
+    def test_lookup(self):
+        """Test if users are found and converted from the table"""
+        table = UserTable.read(self.path)
+        self.assertIsNotNone(table)
+        self.assertIn(Snowflake(1234567890123456789), table)
+        self.assertIn("2", table)
+        self.assertNotIn(3, table)
+        self.assertNotIn(-1, table)
+        self.assertEqual(table.find(2), 1)
+        record = table.record(0)
+        self.assertEqual(record["userTimezone"], "Asia/Jakarta")
+        self.assertEqual(
+            record["userBirthdate"], datetime(2000, 1, 31, tzinfo=timezone.utc)
+        )
+        self.assertIsNone(record["shikimoriId"])
+
+
+class UserTableDatabaseTest(unittest.IsolatedAsyncioTestCase):
+    """User database reads through the typed table"""
+
+    def setUp(self):
+        """Write a database to a temporary file"""
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.folder.name, "database.csv")
+        with open(self.path, "w", encoding="utf-8") as file:
+            file.write("\n".join([HEADER, *ROWS]) + "\n")
+
+    def tearDown(self):
+        """Remove the file"""
+        self.folder.cleanup()
+
+    async def test_users(self):
+        """Test if users are built with typed values"""
+        async with UserDatabase(self.path) as ud:
+            users = await ud.get_all_users()
+            user = await ud.get_user_data(Snowflake(2))
+        self.assertEqual(len(users), 2)
+        self.assertEqual(users[1], user)
+        first = users[0]
+        self.assertEqual(first.discord_id, 1234567890123456789)
+        self.assertEqual(
+            first.mal_joined, datetime.fromtimestamp(1600000001, tz=timezone.utc)
+        )
+        self.assertEqual(first.anilist_id, 5)
+        self.assertIsNone(first.anilist_username)
+        self.assertEqual(first.birthday_permissions.identifier, 3)  # type: ignore[union-attr]
+        self.assertEqual(user.lastfm_username, "baz")
+        self.assertIsNone(user.user_birthdate)
+
+
+if __name__ == "__main__":
+    unittest.main()
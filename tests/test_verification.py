@@ -1,13 +1,69 @@
+import asyncio
+import json
 import os
 import sys
+import tempfile
 import unittest
+from pathlib import Path
+from typing import Any
+from unittest import mock
 
 try:
-    from classes.verificator import Verificator, VerificatorUser
+    from classes.cache import Caching
+    from classes.jikan import JikanApi
+    from classes.verificator import ClubVerifier, Verificator, VerificatorUser
 except ImportError:
     # add the path to the 'modules' directory to the system path
     sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-    from classes.verificator import Verificator, VerificatorUser
+    from classes.cache import Caching
+    from classes.jikan import JikanApi
+    from classes.verificator import ClubVerifier, Verificator, VerificatorUser
+
+
+class FakeClubsResponse:
+    """Page of a fake paginated Jikan endpoint"""
+
+    status = 200
+    reason = "OK"
+
+    def __init__(self, session: "FakeClubsSession", page: int):
+        self.session = session
+        self.page = page
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *_):
+        return None
+
+    async def json(self) -> dict[str, Any]:
+        if self.page in self.session.slow:
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                self.session.cancelled.append(self.page)
+                raise
+        return {
+            "data": [{"mal_id": club_id} for club_id in self.session.pages[self.page]],
+            "pagination": {"last_visible_page": len(self.session.pages)},
+        }
+
+
+class FakeClubsSession:
+    """Session serving a user's club list, with some pages never answering"""
+
+    def __init__(self, pages: list[list[int]], slow: tuple[int, ...] = ()):
+        self.pages = dict(enumerate(pages, start=1))
+        self.slow = set(slow)
+        self.requested: list[int] = []
+        self.cancelled: list[int] = []
+
+    def get(self, _url: str, params: dict[str, int]) -> FakeClubsResponse:
+        self.requested.append(params["page"])
+        return FakeClubsResponse(self, params["page"])
+
+    async def close(self):
+        return None
 
 
 class AccountUuid(unittest.TestCase):
@@ -24,3 +80,105 @@ class AccountUuid(unittest.TestCase):
         with Verificator() as verificator:
             user = verificator.get_user_uuid(123456789)
         self.assertTrue(user is not None)
+
+
+class ClubMembership(unittest.IsolatedAsyncioTestCase):
+    """Club membership verification test class"""
+
+    async def test_stops_at_club_page(self):
+        """Test if the check returns once the club is found, cancelling the rest"""
+        jikan = JikanApi(page_interval=1.0)
+        jikan.session = FakeClubsSession([[1], [2, 99], [3], [4], [5]], slow=(3, 4, 5))
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        self.assertTrue(await jikan.user_in_club("nattadasu", 99))
+        self.assertLess(loop.time() - start, 0.5)
+        started = [page for page in jikan.session.requested if page > 2]
+        self.assertTrue(started)
+        self.assertEqual(sorted(jikan.session.cancelled), started)
+
+    async def test_not_member(self):
+        """Test if every page is read when the club is not listed, within the rate"""
+        jikan = JikanApi(page_interval=0.2)
+        jikan.session = FakeClubsSession([[1], [2], [3], [4], [5]])
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        self.assertFalse(await jikan.user_in_club("nattadasu", 99))
+        # 3 requests per interval, the last 2 wait for a slot
+        self.assertGreaterEqual(loop.time() - start, 0.2)
+        self.assertLess(loop.time() - start, 0.4)
+        self.assertEqual(sorted(jikan.session.requested), [1, 2, 3, 4, 5])
+
+    async def test_verifier_caches_members_only(self):
+        """Test if confirmed members are cached, and non-members checked again"""
+        session = FakeClubsSession([[1], [99]])
+
+        class FakeJikan(JikanApi):
+            async def __aenter__(self):
+                self.session = session
+                self.page_interval = 0
+                return self
+
+        with (
+            tempfile.TemporaryDirectory() as folder,
+            mock.patch("classes.verificator.JikanApi", FakeJikan),
+            mock.patch("classes.verificator.Cache", Caching(folder, 43200)),
+        ):
+            verifier = ClubVerifier(99)
+            self.assertTrue(await verifier.is_member("Nattadasu"))
+            requests = len(session.requested)
+            self.assertTrue(await verifier.is_member("nattadasu"))
+            self.assertEqual(len(session.requested), requests)
+            self.assertFalse(await ClubVerifier(42).is_member("nattadasu"))
+            self.assertFalse(await ClubVerifier(42).is_member("nattadasu"))
+            self.assertEqual(len(session.requested), requests + 4)
+
+    async def test_verifier_uses_roster(self):
+        """Test if the club roster skips requests, and refreshes once at a time"""
+        session = FakeClubsSession([[1], [99]])
+        release = asyncio.Event()
+        fetched: list[int] = []
+
+        class FakeJikan(JikanApi):
+            async def __aenter__(self):
+                self.session = session
+                self.page_interval = 0
+                return self
+
+            async def get_club_members(self, club_id: int) -> list[str]:
+                fetched.append(club_id)
+                await release.wait()
+                return ["Nattadasu", "Someone"]
+
+        with (
+            tempfile.TemporaryDirectory() as folder,
+            mock.patch("classes.verificator.JikanApi", FakeJikan),
+            mock.patch("classes.verificator.Cache", Caching(folder, 43200)),
+        ):
+            verifier = ClubVerifier(99, use_roster=True)
+            roster = verifier.roster
+            assert roster is not None
+            os.makedirs(os.path.dirname(roster.file_path))
+            Path(roster.file_path).write_text(json.dumps(["Listed"]), encoding="utf-8")
+
+            # listed in the stored roster, matched whatever the case
+            self.assertTrue(await verifier.is_member("LISTED"))
+            self.assertEqual(session.requested, [])
+            # not listed, the user's clubs are checked instead
+            self.assertTrue(await verifier.is_member("nattadasu"))
+            self.assertEqual(sorted(session.requested), [1, 2])
+            self.assertEqual(fetched, [])
+
+            roster.refresh_after = 0
+            self.assertFalse(roster.contains("someone"))
+            task = roster._refresh_task
+            self.assertIsNotNone(task)
+            await asyncio.sleep(0)
+            self.assertFalse(roster.contains("someone"))
+            self.assertIs(roster._refresh_task, task)
+            self.assertEqual(fetched, [99])
+            release.set()
+            await task  # type: ignore[misc]
+            roster.refresh_after = 3600
+            self.assertTrue(roster.contains("Someone"))
+            self.assertEqual(fetched, [99])